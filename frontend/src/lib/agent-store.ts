@@ -1,8 +1,10 @@
 import { create } from "mutative";
 import { AGENT_SECTION_COMPONENT_TYPE } from "@/constants/agent";
 import type {
+  AgentComponentMessage,
   AgentConversationsStore,
   ChatItem,
+  ComponentAppendDelta,
   ConversationView,
   SectionComponentType,
   SSEData,
@@ -84,6 +86,65 @@ function addOrUpdateItem(
   }
 }
 
+/**
+ * Apply an append delta to serialized component content.
+ * Items are appended to the content itself when it is a JSON array, else to
+ * its `data` field (kept JSON-encoded when it is a string).
+ */
+export function applyComponentDelta(content: string, delta: string): string {
+  const change: ComponentAppendDelta = JSON.parse(delta);
+  const value = JSON.parse(content);
+
+  const isList = Array.isArray(value);
+  const encoded = !isList && typeof value.data === "string";
+  const target: unknown[] = isList
+    ? value
+    : encoded
+      ? JSON.parse(value.data)
+      : (value.data ?? []);
+
+  target.push(...change.items);
+  if (change.max_items != null && target.length > change.max_items) {
+    target.splice(change.keep_head ?? 0, target.length - change.max_items);
+  }
+
+  if (isList) return JSON.stringify(target);
+  Object.assign(value, change.fields ?? {});
+  value.data = encoded ? JSON.stringify(target) : target;
+  return JSON.stringify(value);
+}
+
+// Apply a component delta to the item it extends; deltas that do not follow
+// the shown version are dropped until the next snapshot replaces the item
+function handleComponentDeltaEvent(
+  draft: AgentConversationsStore,
+  data: AgentComponentMessage,
+) {
+  const { conversation, task } = ensurePath(draft, data);
+  const componentType = data.payload.component_type;
+  const targetTask = AGENT_SECTION_COMPONENT_TYPE.includes(
+    componentType as SectionComponentType,
+  )
+    ? ensureSection(
+        conversation,
+        componentType as SectionComponentType,
+        data.task_id,
+      )
+    : task;
+
+  const existing = targetTask.items.find(
+    (item) => item.item_id === data.item_id,
+  ) as AgentComponentMessage | undefined;
+  const seq = data.payload.seq ?? 0;
+  if (!existing || existing.payload.seq !== seq - 1) return;
+
+  existing.payload.content = applyComponentDelta(
+    existing.payload.content,
+    data.payload.content,
+  );
+  existing.payload.seq = seq;
+}
+
 // Generic handler for events that create chat items
 function handleChatItemEvent(
   draft: AgentConversationsStore,
@@ -119,6 +180,11 @@ function processSSEEvent(draft: AgentConversationsStore, sseData: SSEData) {
     case "component_generator": {
       const component_type = data.payload.component_type;
 
+      if (data.payload.delta === "append") {
+        handleComponentDeltaEvent(draft, data);
+        break;
+      }
+
       switch (component_type) {
         case "scheduled_task_result":
         case "filtered_line_chart":
@@ -36,8 +36,21 @@ export type AgentSystemFailedMessage = AgentChunkMessage;
 export type AgentComponentMessage = MessageWithPayload<{
   component_type: AgentComponentType;
   content: string;
+  /** Version of a sequenced component (snapshot or delta) */
+  seq?: number | null;
+  /** Set when content is a ComponentAppendDelta instead of a full snapshot */
+  delta?: "append" | null;
 }>;
 
+// Content of an append delta, applied on top of component version seq - 1
+export interface ComponentAppendDelta {
+  items: unknown[];
+  max_items?: number | null;
+  /** Leading items (e.g. a header row) kept when trimming to max_items */
+  keep_head?: number;
+  fields?: Record<string, unknown>;
+}
+
 export type AgentToolCallMessage = MessageWithPayload<{
   /**
    * @deprecated the tool call id is similar to the item_id
@@ -6,9 +6,11 @@ Global financial market data including stocks, funds, bonds, and economic indica
 
 import logging
 import os
+import threading
+import time
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 
@@ -18,6 +20,7 @@ except ImportError:
     ak = None
 
 from .base import AdapterCapability, BaseDataAdapter
+from .singleflight import SingleFlight
 from .types import (
     Asset,
     AssetPrice,
@@ -34,6 +37,13 @@ from .types import (
 
 logger = logging.getLogger(__name__)
 
+# Full-market real-time quote endpoints, one table per market type
+SPOT_ENDPOINTS = {
+    "a_shares": "stock_zh_a_spot_em",
+    "hk_stocks": "stock_hk_spot_em",
+    "us_stocks": "stock_us_spot_em",
+}
+
 
 class AKShareAdapter(BaseDataAdapter):
     """AKShare data adapter for Chinese financial markets."""
@@ -75,7 +85,8 @@ class AKShareAdapter(BaseDataAdapter):
             "hk_stocks": {
                 "code": ["symbol", "code", "代码"],
                 "name": ["name", "名称", "short_name"],
-                "open": ["开盘", "open"],
+                "price": ["最新价", "lasttrade", "price"],
+                "open": ["开盘", "今开", "open"],
                 "high": ["最高", "high"],
                 "low": ["最低", "low"],
                 "close": ["收盘", "close"],
@@ -88,11 +99,13 @@ class AKShareAdapter(BaseDataAdapter):
             "us_stocks": {
                 "code": ["代码", "symbol", "ticker"],
                 "name": ["名称", "name", "short_name"],
-                "open": ["开盘", "open"],
-                "high": ["最高", "high"],
-                "low": ["最低", "low"],
+                "price": ["最新价", "price"],
+                "open": ["开盘", "开盘价", "open"],
+                "high": ["最高", "最高价", "high"],
+                "low": ["最低", "最低价", "low"],
                 "close": ["收盘", "close"],
                 "volume": ["成交量", "volume", "vol"],
+                "market_cap": ["总市值", "market_cap"],
                 "change": ["涨跌额", "change"],
                 "change_percent": ["涨跌幅", "change_percent", "pct_chg"],
                 "date": ["日期", "date", "trade_date"],
@@ -124,6 +137,12 @@ class AKShareAdapter(BaseDataAdapter):
             Exchange.AMEX: "107",
         }
 
+        # Full-market spot snapshots: market type -> (fetched_at, ticker -> row)
+        self.spot_cache_ttl = self.config.get("spot_cache_ttl", 5)
+        self._spot_snapshots: Dict[str, Tuple[float, Dict[str, Dict[str, Any]]]] = {}
+        self._spot_lock = threading.Lock()
+        self._spot_flight = SingleFlight()
+
         # Special exchange code for US indices
         self.us_index_exchange_code = "100"
 
@@ -206,6 +225,50 @@ class AKShareAdapter(BaseDataAdapter):
         """AKShare does not support search assets."""
         return []
 
+    def get_listings(self) -> List[AssetSearchResult]:
+        """Get all listed A-shares (SSE, SZSE, BSE) with their Chinese names.
+
+        Returns:
+            List of listed A-shares as search results
+        """
+        try:
+            df = ak.stock_info_a_code_name()
+        except Exception as e:
+            logger.warning(f"Failed to fetch A-share listings: {e}")
+            return []
+
+        if df is None or df.empty:
+            return []
+
+        code_field = self._get_field_name(df, "code", Exchange.SSE) or "code"
+        name_field = self._get_field_name(df, "name", Exchange.SSE) or "name"
+
+        results = []
+        for code, name in zip(df[code_field], df[name_field]):
+            code = str(code).strip().zfill(6)
+            exchange = self._mainland_exchange(code)
+            if exchange is None:
+                logger.debug(f"Skipping listing {code}: unknown exchange")
+                continue
+            internal_ticker = f"{exchange.value}:{code}"
+            name = str(name).strip()
+            try:
+                results.append(
+                    AssetSearchResult(
+                        ticker=internal_ticker,
+                        asset_type=AssetType.STOCK,
+                        names={"zh-Hans": name},
+                        exchange=exchange.value,
+                        country="CN",
+                        currency="CNY",
+                    )
+                )
+            except Exception as e:
+                logger.debug(f"Skipping listing {code}: {e}")
+
+        logger.info(f"Fetched {len(results)} A-share listings from AKShare")
+        return results
+
     def __get_xq_symbol(self, ticker: str) -> str:
         """Get XQ symbol for a specific asset.
         Args:
@@ -509,7 +572,213 @@ class AKShareAdapter(BaseDataAdapter):
             )
             return None
 
+    def _fetch_spot_snapshot(self, market: str) -> Dict[str, Dict[str, Any]]:
+        """Download one full-market spot table and index it by internal ticker.
+
+        Args:
+            market: Market type ('a_shares', 'hk_stocks' or 'us_stocks')
+
+        Returns:
+            Dictionary mapping internal ticker to its spot row
+        """
+        df = getattr(ak, SPOT_ENDPOINTS[market])()
+        if df is None or df.empty:
+            return {}
+
+        # Any exchange of the market works for field mapping lookups
+        exchange = {
+            "a_shares": Exchange.SSE,
+            "hk_stocks": Exchange.HKEX,
+            "us_stocks": Exchange.NASDAQ,
+        }[market]
+        code_field = self._get_field_name(df, "code", exchange)
+        if not code_field:
+            logger.warning(f"Spot table for {market} has no code column")
+            return {}
+
+        fields = {
+            field: self._get_field_name(df, field, exchange)
+            for field in (
+                "price",
+                "open",
+                "high",
+                "low",
+                "volume",
+                "change",
+                "change_percent",
+                "market_cap",
+            )
+        }
+
+        snapshot: Dict[str, Dict[str, Any]] = {}
+        for record in df.to_dict("records"):
+            code = str(record[code_field]).strip()
+            if market == "a_shares":
+                exchange = self._mainland_exchange(code.zfill(6))
+                if exchange is None:
+                    continue
+                internal_ticker = f"{exchange.value}:{code.zfill(6)}"
+            elif market == "hk_stocks":
+                internal_ticker = f"{Exchange.HKEX.value}:{code.zfill(5)}"
+            else:
+                # US codes carry an exchange prefix (e.g. "105.AAPL")
+                exchange_code = code.split(".", 1)[0]
+                if not self.us_exchange_codes_reverse.get(exchange_code):
+                    continue
+                internal_ticker = self.convert_to_internal_ticker(code)
+            snapshot[internal_ticker] = {
+                field: record[column] if column else None
+                for field, column in fields.items()
+            }
+
+        logger.info(f"Fetched {market} spot snapshot with {len(snapshot)} quotes")
+        return snapshot
+
+    def _get_spot_snapshot(
+        self, market: str, allow_fetch: bool = True
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Get a cached spot snapshot, refreshing it when older than the TTL.
+
+        Concurrent refreshes of the same market share a single download.
+
+        Args:
+            market: Market type ('a_shares', 'hk_stocks' or 'us_stocks')
+            allow_fetch: Whether to download a new snapshot if none is fresh
+
+        Returns:
+            Ticker-indexed snapshot, or None if unavailable
+        """
+        with self._spot_lock:
+            cached = self._spot_snapshots.get(market)
+        if cached and time.monotonic() - cached[0] < self.spot_cache_ttl:
+            return cached[1]
+        if not allow_fetch:
+            return None
+
+        def _refresh() -> Dict[str, Dict[str, Any]]:
+            snapshot = self._fetch_spot_snapshot(market)
+            with self._spot_lock:
+                self._spot_snapshots[market] = (time.monotonic(), snapshot)
+            return snapshot
+
+        try:
+            snapshot, _ = self._spot_flight.do(market, _refresh)
+            return snapshot
+        except Exception as e:
+            logger.warning(f"Failed to fetch {market} spot snapshot: {e}")
+            return None
+
+    def _spot_row_to_price(
+        self, ticker: str, exchange: Exchange, row: Dict[str, Any]
+    ) -> Optional[AssetPrice]:
+        """Convert a spot snapshot row to an AssetPrice."""
+
+        def _decimal(value: Any) -> Optional[Decimal]:
+            if value is None or value == "-" or pd.isna(value):
+                return None
+            return Decimal(str(value))
+
+        price = _decimal(row.get("price"))
+        if price is None:
+            return None
+
+        return AssetPrice(
+            ticker=ticker,
+            price=price,
+            currency=self._get_currency(exchange),
+            timestamp=datetime.now(),
+            volume=_decimal(row.get("volume")),
+            open_price=_decimal(row.get("open")) or None,
+            high_price=_decimal(row.get("high")),
+            low_price=_decimal(row.get("low")),
+            close_price=price,
+            change=_decimal(row.get("change")),
+            change_percent=_decimal(row.get("change_percent")),
+            market_cap=_decimal(row.get("market_cap")),
+            source=DataSource.AKSHARE,
+        )
+
+    def get_multiple_prices(
+        self, tickers: List[str]
+    ) -> Dict[str, Optional[AssetPrice]]:
+        """Get real-time prices for many assets from full-market spot tables.
+
+        Each market (A-shares, Hong Kong, US) is priced from one cached spot
+        table, so any number of tickers costs at most one upstream request per
+        market. Tickers missing from the spot tables (e.g. indices and ETFs)
+        fall back to per-ticker minute data.
+
+        Args:
+            tickers: List of asset tickers in internal format
+
+        Returns:
+            Dictionary mapping tickers to price data
+        """
+        results: Dict[str, Optional[AssetPrice]] = {}
+        by_market: Dict[str, List[Tuple[str, Exchange]]] = {}
+
+        for ticker in tickers:
+            try:
+                exchange = Exchange(ticker.split(":", 1)[0])
+            except ValueError:
+                results[ticker] = None
+                continue
+            if exchange == Exchange.CRYPTO:
+                results[ticker] = None
+                continue
+            by_market.setdefault(self._get_market_type(exchange), []).append(
+                (ticker, exchange)
+            )
+
+        fallback_tickers = []
+        for market, items in by_market.items():
+            snapshot = self._get_spot_snapshot(market)
+            for ticker, exchange in items:
+                row = snapshot.get(ticker.upper()) if snapshot else None
+                price = self._spot_row_to_price(ticker, exchange, row) if row else None
+                if price is None:
+                    fallback_tickers.append(ticker)
+                results[ticker] = price
+
+        for ticker in fallback_tickers:
+            try:
+                results[ticker] = self._get_minute_price(ticker)
+            except Exception as e:
+                logger.error(f"Error fetching price for {ticker}: {e}")
+                results[ticker] = None
+
+        return results
+
     def get_real_time_price(self, ticker: str) -> Optional[AssetPrice]:
+        """Get real-time price data for an asset.
+
+        Answers from a fresh full-market spot snapshot when one is cached, and
+        otherwise fetches the latest 1-minute bar for the ticker.
+
+        Args:
+            ticker: Asset ticker in internal format (e.g., "SSE:600519", "HKEX:00700", "NASDAQ:AAPL")
+
+        Returns:
+            Latest AssetPrice object, or None if data not available
+        """
+        try:
+            exchange = Exchange(ticker.split(":", 1)[0])
+        except ValueError:
+            exchange = None
+
+        if exchange is not None and exchange != Exchange.CRYPTO:
+            snapshot = self._get_spot_snapshot(
+                self._get_market_type(exchange), allow_fetch=False
+            )
+            row = snapshot.get(ticker.upper()) if snapshot else None
+            if row:
+                price = self._spot_row_to_price(ticker, exchange, row)
+                if price is not None:
+                    return price
+
+        return self._get_minute_price(ticker)
+
+    def _get_minute_price(self, ticker: str) -> Optional[AssetPrice]:
         """Get real-time price data for an asset using Eastmoney 1-minute API.
 
         This method fetches the latest 1-minute price data to get real-time information.
@@ -1177,19 +1446,12 @@ class AKShareAdapter(BaseDataAdapter):
                     exchange_enum = self.us_exchange_codes_reverse[exchange_code]
                     return f"{exchange_enum.value}:{symbol}"
 
-        # Handle Chinese A-shares by ticker format
-        # Shanghai Stock Exchange: 6-digit codes starting with 6
-        # Shenzhen Stock Exchange: 6-digit codes starting with 0 or 3
-        # Beijing Stock Exchange: 6-digit codes starting with 4 or 8
+        # Handle Chinese A-shares (and B-shares) by ticker format
         if source_ticker.isdigit():
             if len(source_ticker) == 6:
-                first_digit = source_ticker[0]
-                if first_digit == "6":
-                    return f"{Exchange.SSE.value}:{source_ticker}"
-                elif first_digit in ["0", "3"]:
-                    return f"{Exchange.SZSE.value}:{source_ticker}"
-                elif first_digit in ["4", "8"]:
-                    return f"{Exchange.BSE.value}:{source_ticker}"
+                exchange = self._mainland_exchange(source_ticker)
+                if exchange is not None:
+                    return f"{exchange.value}:{source_ticker}"
 
             # Handle Hong Kong stocks (5-digit codes, can have leading zeros)
             # Hong Kong stocks are typically 5 digits (e.g., "00700", "01810")
@@ -1217,6 +1479,28 @@ class AKShareAdapter(BaseDataAdapter):
         )
         return f"AKSHARE:{source_ticker}"
 
+    @staticmethod
+    def _mainland_exchange(code: str) -> Optional[Exchange]:
+        """Exchange of a 6-digit mainland China stock code.
+
+        Shanghai: 6xxxxx A-shares and 900xxx B-shares. Shenzhen: 0xxxxx and
+        3xxxxx A-shares and 200xxx B-shares. Beijing: 4xxxxx, 8xxxxx and the
+        newer 920xxx codes.
+
+        Args:
+            code: 6-digit stock code
+
+        Returns:
+            Exchange, or None if the code matches no known range
+        """
+        if code.startswith(("6", "900")):
+            return Exchange.SSE
+        if code.startswith(("0", "3", "200")):
+            return Exchange.SZSE
+        if code.startswith(("4", "8", "920")):
+            return Exchange.BSE
+        return None
+
     def validate_ticker(self, ticker: str) -> bool:
         """Validate if ticker is supported by AKShare and matches standard format."""
         try:
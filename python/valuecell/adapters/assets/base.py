@@ -140,6 +140,17 @@ class BaseDataAdapter(ABC):
                 results[ticker] = None
         return results
 
+    def get_listings(self) -> List[AssetSearchResult]:
+        """Get the full list of assets listed on the exchanges this adapter covers.
+
+        Used to populate the local symbol index. Adapters without a listing
+        endpoint return an empty list.
+
+        Returns:
+            List of listed assets as search results
+        """
+        return []
+
     def validate_ticker(self, ticker: str) -> bool:
         """Validate if a ticker format is supported by this adapter.
 
@@ -5,6 +5,7 @@ localized asset names, descriptions, and other text content.
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 
 from ...server.config.i18n import I18nConfig, get_i18n_config
@@ -14,6 +15,9 @@ from .types import Asset, AssetSearchResult, AssetType, MarketStatus
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent upstream lookups when naming many assets at once
+NAME_LOOKUP_WORKERS = 16
+
 
 class AssetI18nService:
     """Service for handling asset internationalization."""
@@ -167,6 +171,13 @@ class AssetI18nService:
             config = get_i18n_config()
             language = config.language
 
+        name = self._known_asset_name(ticker, language)
+        if name is None:
+            name = self._fetch_asset_name(ticker, language)
+        return name or ticker
+
+    def _known_asset_name(self, ticker: str, language: str) -> Optional[str]:
+        """Look up a name from the cache or predefined translations only."""
         # Check cache first
         if ticker in self._name_cache and language in self._name_cache[ticker]:
             return self._name_cache[ticker][language]
@@ -181,7 +192,10 @@ class AssetI18nService:
                 self._name_cache[ticker][language] = translations[language]
                 return translations[language]
 
-        # Try to get from asset data
+        return None
+
+    def _fetch_asset_name(self, ticker: str, language: str) -> Optional[str]:
+        """Fetch a name from upstream asset data and cache it."""
         try:
             asset = self.adapter_manager.get_asset_info(ticker)
             if asset:
@@ -195,8 +209,62 @@ class AssetI18nService:
         except Exception as e:
             logger.warning(f"Could not fetch asset info for {ticker}: {e}")
 
-        # Fallback to ticker
-        return ticker
+        return None
+
+    def get_localized_asset_names(
+        self,
+        tickers: List[str],
+        language: Optional[str] = None,
+        fallback_names: Optional[Dict[str, str]] = None,
+        fallback_language: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """Get localized names for many assets at once.
+
+        Tickers are resolved from the cache and predefined translations
+        first. ``fallback_names`` (e.g. names already loaded from the
+        database) are used directly when ``fallback_language`` is the
+        requested language; the remaining tickers are looked up upstream
+        concurrently, and ``fallback_names`` only fill in tickers the
+        upstream lookup cannot name.
+
+        Args:
+            tickers: Asset tickers in internal format
+            language: Target language code (uses current i18n config if None)
+            fallback_names: Known names by ticker used when no localized
+                name can be found
+            fallback_language: Language ``fallback_names`` are written in
+
+        Returns:
+            Dictionary mapping each ticker to its localized name (or the ticker)
+        """
+        if language is None:
+            config = get_i18n_config()
+            language = config.language
+
+        fallback_names = fallback_names or {}
+        use_fallback = fallback_language == language
+        names: Dict[str, str] = {}
+        missing: List[str] = []
+
+        for ticker in dict.fromkeys(tickers):
+            name = self._known_asset_name(ticker, language)
+            if name is None and use_fallback:
+                name = fallback_names.get(ticker)
+            if name:
+                names[ticker] = name
+            else:
+                missing.append(ticker)
+
+        if missing:
+            workers = min(len(missing), NAME_LOOKUP_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                fetched = executor.map(
+                    lambda ticker: self._fetch_asset_name(ticker, language), missing
+                )
+                for ticker, name in zip(missing, fetched):
+                    names[ticker] = name or fallback_names.get(ticker) or ticker
+
+        return names
 
     def localize_asset(self, asset: Asset, language: Optional[str] = None) -> Asset:
         """Add localized names to an asset object.
@@ -424,6 +492,17 @@ class AssetI18nService:
 
         logger.info(f"Added translation for {ticker} in {language}: {name}")
 
+    def get_known_translations(self) -> Dict[str, Dict[str, str]]:
+        """Get all known asset name translations.
+
+        Returns:
+            Dictionary mapping tickers to language-name mappings
+        """
+        return {
+            ticker: dict(names)
+            for ticker, names in self._predefined_translations.items()
+        }
+
     def clear_cache(self) -> None:
         """Clear the translation cache."""
         self._name_cache.clear()
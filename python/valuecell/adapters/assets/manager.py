@@ -8,14 +8,18 @@ import json
 import logging
 import os
 import threading
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from openai import OpenAI
 
 from .akshare_adapter import AKShareAdapter
 from .base import BaseDataAdapter
+from .routing import TickerRouter
+from .singleflight import CoalescingCache, ResultCache
+from .symbol_index import SCORE_EXACT_NAME, AssetSymbolIndex
 from .types import (
     Asset,
     AssetPrice,
@@ -23,13 +27,29 @@ from .types import (
     AssetSearchResult,
     AssetType,
     DataSource,
-    Exchange,
     Watchlist,
 )
 from .yfinance_adapter import YFinanceAdapter
 
 logger = logging.getLogger(__name__)
 
+# Lifetimes for coalesced upstream results (seconds)
+ASSET_INFO_CACHE_TTL = 300
+SEARCH_CACHE_TTL = 60
+NOT_FOUND_CACHE_TTL = 30
+PRICE_CACHE_TTL = 5
+FALLBACK_TICKERS_CACHE_TTL = 3600
+
+
+def _normalize_ticker(ticker: str) -> str:
+    """Normalize a ticker for use as a cache key."""
+    return ticker.strip().upper()
+
+
+def _normalize_query(query: str) -> str:
+    """Normalize a free-text search query for use as a cache key."""
+    return " ".join(query.split()).lower()
+
 
 class AdapterManager:
     """Manager for coordinating multiple asset data adapters."""
@@ -38,54 +58,58 @@ class AdapterManager:
         """Initialize adapter manager."""
         self.adapters: Dict[DataSource, BaseDataAdapter] = {}
 
-        # Exchange → Adapters routing table (simplified)
-        # Note: Keys are Exchange.value strings for efficient lookup
-        self.exchange_routing: Dict[str, List[BaseDataAdapter]] = {}
-
-        # Ticker → Adapter cache for fast lookups
-        self._ticker_cache: Dict[str, BaseDataAdapter] = {}
-        self._cache_lock = threading.Lock()
+        # Exchange → adapters table, bounded ticker route cache and
+        # per-adapter circuit breakers
+        self.router = TickerRouter()
 
         self.lock = threading.RLock()
 
+        # Single-flight request coalescing backed by short-lived result caches.
+        # Negative results (not found / no matches) expire sooner.
+        self._asset_info_cache = CoalescingCache(
+            ttl_seconds=ASSET_INFO_CACHE_TTL,
+            negative_ttl_seconds=NOT_FOUND_CACHE_TTL,
+        )
+        self._search_cache = CoalescingCache(
+            ttl_seconds=SEARCH_CACHE_TTL,
+            negative_ttl_seconds=NOT_FOUND_CACHE_TTL,
+        )
+        # Memoized LLM ticker candidates per normalized fallback query
+        self._fallback_tickers_cache = CoalescingCache(
+            ttl_seconds=FALLBACK_TICKERS_CACHE_TTL,
+            negative_ttl_seconds=NOT_FOUND_CACHE_TTL,
+        )
+
+        # Very short-lived quote cache shared by batch price requests; missing
+        # quotes are not cached so they are retried on the next request
+        self._price_cache = ResultCache(
+            ttl_seconds=PRICE_CACHE_TTL, negative_ttl_seconds=0, max_entries=4096
+        )
+
+        # Local symbol index answering searches without upstream calls
+        self.symbol_index = AssetSymbolIndex()
+        self._index_refresh_lock = threading.Lock()
+
         logger.info("Asset adapter manager initialized")
 
     def _rebuild_routing_table(self) -> None:
         """Rebuild routing table based on registered adapters' capabilities.
 
-        Simplified: Only use exchange to determine adapter routing.
+        Only the exchange prefix determines adapter routing.
         """
         with self.lock:
-            self.exchange_routing.clear()
+            self.router.rebuild(self.adapters.values())
 
-            # Build routing table: Exchange → List[Adapters]
-            for adapter in self.adapters.values():
-                capabilities = adapter.get_capabilities()
-
-                # Get all exchanges supported by this adapter (across all asset types)
-                supported_exchanges = set()
-                for cap in capabilities:
-                    for exchange in cap.exchanges:
-                        exchange_key = (
-                            exchange.value
-                            if isinstance(exchange, Exchange)
-                            else exchange
-                        )
-                        supported_exchanges.add(exchange_key)
-
-                # Register adapter for each supported exchange
-                for exchange_key in supported_exchanges:
-                    if exchange_key not in self.exchange_routing:
-                        self.exchange_routing[exchange_key] = []
-                    self.exchange_routing[exchange_key].append(adapter)
+            # Cached results may have come from a different set of adapters
+            self.clear_result_caches()
 
-            # Clear ticker cache when routing table changes
-            with self._cache_lock:
-                self._ticker_cache.clear()
-
-            logger.debug(
-                f"Routing table rebuilt with {len(self.exchange_routing)} exchanges"
-            )
+    @property
+    def exchange_routing(self) -> Dict[str, List[BaseDataAdapter]]:
+        """Exchange → adapters routing table (keys are Exchange.value strings)."""
+        return {
+            exchange: list(adapters)
+            for exchange, adapters in self.router.exchanges.items()
+        }
 
     def register_adapter(self, adapter: BaseDataAdapter) -> None:
         """Register a data adapter and rebuild routing table.
@@ -118,6 +142,25 @@ class AdapterManager:
         except Exception as e:
             logger.error(f"Failed to configure AKShare adapter: {e}")
 
+    def clear_result_caches(self) -> None:
+        """Drop cached asset info, search and fallback results."""
+        self._asset_info_cache.clear()
+        self._search_cache.clear()
+        self._fallback_tickers_cache.clear()
+        self._price_cache.clear()
+
+    def get_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get hit/miss and coalescing counters for the result caches."""
+        return {
+            "asset_info": self._asset_info_cache.get_stats(),
+            "search": self._search_cache.get_stats(),
+            "fallback_tickers": self._fallback_tickers_cache.get_stats(),
+        }
+
+    def get_routing_metrics(self) -> Dict[str, Any]:
+        """Get routing counters and per-adapter circuit breaker state."""
+        return self.router.get_metrics()
+
     def get_available_adapters(self) -> List[DataSource]:
         """Get list of available data adapters."""
         with self.lock:
@@ -132,8 +175,7 @@ class AdapterManager:
         Returns:
             List of adapters that support the exchange
         """
-        with self.lock:
-            return self.exchange_routing.get(exchange, [])
+        return self.router.adapters_for_exchange(exchange)
 
     def get_adapters_for_asset_type(
         self, asset_type: AssetType
@@ -162,7 +204,8 @@ class AdapterManager:
     def get_adapter_for_ticker(self, ticker: str) -> Optional[BaseDataAdapter]:
         """Get the best adapter for a specific ticker (with caching).
 
-        Simplified: Only based on exchange, first adapter that validates wins.
+        Routing is based on the exchange prefix; among the adapters that
+        validate the ticker, the healthiest one with a closed circuit wins.
 
         Args:
             ticker: Asset ticker in internal format (e.g., "NASDAQ:AAPL")
@@ -170,35 +213,84 @@ class AdapterManager:
         Returns:
             Best available adapter for the ticker or None if not found
         """
-        # Check cache first
-        with self._cache_lock:
-            if ticker in self._ticker_cache:
-                return self._ticker_cache[ticker]
-
-        # Parse ticker
         if ":" not in ticker:
             logger.warning(f"Invalid ticker format (missing ':'): {ticker}")
             return None
 
-        exchange, symbol = ticker.split(":", 1)
+        adapter = self.router.primary(ticker)
+        if adapter is None:
+            logger.warning(f"No suitable adapter found for ticker: {ticker}")
+        return adapter
 
-        # Get adapters for this exchange
-        adapters = self.get_adapters_for_exchange(exchange)
+    def _call_with_failover(
+        self,
+        ticker: str,
+        description: str,
+        call: Callable[[BaseDataAdapter], Any],
+    ) -> Any:
+        """Call adapters for a ticker in routing order until one has data.
+
+        Adapters whose circuit is open are skipped. Raised errors count as
+        failures towards an adapter's circuit and empty results as soft
+        failures (the adapters return None or [] when their upstream fails);
+        the next adapter is tried after either.
+
+        Args:
+            ticker: Asset ticker in internal format
+            description: What is being fetched (for logging)
+            call: Function invoking the adapter
 
-        if not adapters:
-            logger.debug(f"No adapters registered for exchange: {exchange}")
+        Returns:
+            The first non-empty result, or None if every adapter failed
+        """
+        candidates = self.router.candidates(ticker) if ":" in ticker else []
+        if not candidates:
+            logger.warning(f"No suitable adapter found for ticker: {ticker}")
             return None
 
-        # Find first adapter that validates this ticker
-        for adapter in adapters:
-            if adapter.validate_ticker(ticker):
-                # Cache the result
-                with self._cache_lock:
-                    self._ticker_cache[ticker] = adapter
-                logger.debug(f"Matched adapter {adapter.source.value} for {ticker}")
-                return adapter
+        for i, adapter in enumerate(candidates):
+            if not self.router.allow(adapter):
+                logger.debug(
+                    f"Skipping {adapter.source.value} for {ticker}: circuit open"
+                )
+                continue
+
+            started = time.monotonic()
+            try:
+                logger.debug(
+                    f"Fetching {description} for {ticker} from {adapter.source.value}"
+                )
+                result = call(adapter)
+            except Exception as e:
+                self.router.record_failure(
+                    adapter, e, (time.monotonic() - started) * 1000
+                )
+                logger.warning(
+                    f"Adapter {adapter.source.value} failed for {description} of {ticker}: {e}"
+                )
+                continue
 
-        logger.warning(f"No suitable adapter found for ticker: {ticker}")
+            latency_ms = (time.monotonic() - started) * 1000
+            if result:
+                self.router.record_success(adapter, latency_ms)
+                if i > 0:
+                    self.router.record_failover()
+                    logger.info(
+                        f"Fallback success: fetched {description} for {ticker} from {adapter.source.value}"
+                    )
+                else:
+                    logger.info(
+                        f"Successfully fetched {description} for {ticker} from {adapter.source.value}"
+                    )
+                return result
+
+            # Not a failure: unknown tickers are legitimately empty, and
+            # counting them would let a few misses open a healthy circuit
+            logger.debug(
+                f"Adapter {adapter.source.value} returned no {description} for {ticker}"
+            )
+
+        logger.error(f"All adapters failed for {description} of {ticker}")
         return None
 
     def _deduplicate_search_results(
@@ -294,13 +386,86 @@ class AdapterManager:
     def search_assets(self, query: AssetSearchQuery) -> List[AssetSearchResult]:
         """Search for assets across all available adapters.
 
+        Concurrent identical searches share one upstream fan-out, and results
+        are cached briefly (including empty results).
+
         Args:
             query: Search query parameters
 
         Returns:
             Combined and deduplicated search results
         """
-        all_results = []
+        key = ("search", _normalize_query(query.query), query.limit)
+        results = self._search_cache.get_or_load(
+            key, lambda: self._search_assets_uncached(query)
+        )
+        # Callers localize results in place, so never hand out shared objects
+        return [result.model_copy(deep=True) for result in results]
+
+    def refresh_symbol_index(self) -> int:
+        """Reload exchange listings from all adapters into the symbol index.
+
+        Returns:
+            Number of index entries added or updated (0 if a refresh is
+            already running)
+        """
+        if not self._index_refresh_lock.acquire(blocking=False):
+            logger.debug("Symbol index refresh already in progress")
+            return 0
+
+        try:
+            with self.lock:
+                adapters = list(self.adapters.values())
+
+            count = 0
+            for adapter in adapters:
+                try:
+                    count += self.symbol_index.add_many(adapter.get_listings())
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to load listings from {adapter.source.value}: {e}"
+                    )
+
+            self.symbol_index.mark_refreshed()
+            logger.info(
+                f"Symbol index refreshed: {count} listings, {len(self.symbol_index)} total"
+            )
+            return count
+        finally:
+            self._index_refresh_lock.release()
+
+    def refresh_symbol_index_async(self) -> None:
+        """Refresh the symbol index in a background thread."""
+        if self._index_refresh_lock.locked():
+            return
+        threading.Thread(
+            target=self.refresh_symbol_index,
+            name="symbol-index-refresh",
+            daemon=True,
+        ).start()
+
+    def _search_assets_uncached(
+        self, query: AssetSearchQuery
+    ) -> List[AssetSearchResult]:
+        """Search the local index, then all adapters unless it matched exactly.
+
+        Partial index hits (prefixes, substrings) are merged with the upstream
+        results, since the index may only know some of the matching assets.
+        Upstream results are learned into the index so later searches for the
+        same assets are answered locally.
+        """
+        if self.symbol_index.is_stale():
+            self.refresh_symbol_index_async()
+
+        indexed_results = self.symbol_index.search(query.query, query.limit)
+        if any(r.relevance_score >= SCORE_EXACT_NAME for r in indexed_results):
+            logger.debug(
+                f"Answered search '{query.query}' from symbol index "
+                f"({len(indexed_results)} results)"
+            )
+            return self._deduplicate_search_results(indexed_results)[: query.limit]
+
+        all_results = list(indexed_results)
 
         # Determine which adapters to use based on asset types
         target_adapters = set()
@@ -311,7 +476,7 @@ class AdapterManager:
 
         # Search in parallel across adapters
         if not target_adapters:
-            return []
+            return self._deduplicate_search_results(all_results)[: query.limit]
 
         with ThreadPoolExecutor(max_workers=len(target_adapters)) as executor:
             future_to_adapter = {
@@ -329,6 +494,8 @@ class AdapterManager:
                         f"Search failed for adapter {adapter.source.value}: {e}"
                     )
 
+        self.symbol_index.add_many(all_results[len(indexed_results) :])
+
         # Smart deduplication of results
         unique_results = self._deduplicate_search_results(all_results)
 
@@ -338,6 +505,7 @@ class AdapterManager:
                 f"No results from adapters, trying fallback search for query: {query.query}"
             )
             fallback_results = self._fallback_search_assets(query)
+            self.symbol_index.add_many(fallback_results)
             # Deduplicate fallback results with existing results
             combined_results = unique_results + fallback_results
             unique_results = self._deduplicate_search_results(combined_results)
@@ -358,77 +526,14 @@ class AdapterManager:
         Returns:
             List of validated search results
         """
-        # Get environment variables
-        api_key = os.getenv("OPENROUTER_API_KEY")
-        model_id = os.getenv("PRODUCT_MODEL_ID", "anthropic/claude-haiku-4.5")
-
-        if not api_key or not model_id:
-            logger.warning(
-                "OPENROUTER_API_KEY is not configured, skipping fallback search"
-            )
-            return []
-
         try:
-            # Initialize OpenAI client with OpenRouter
-            client = OpenAI(api_key=api_key, base_url="https://openrouter.ai/api/v1")
-
-            # Create prompt to generate possible ticker formats
-            prompt = f"""Given the user search query: "{query.query}"
-
-Generate a list of possible internal ticker IDs that match this query. The internal ticker format is: EXCHANGE:SYMBOL
-
-Supported exchanges and their formats:
-- NASDAQ: NASDAQ:SYMBOL (e.g., NASDAQ:AAPL, NASDAQ:MSFT)
-- NYSE: NYSE:SYMBOL (e.g., NYSE:JPM, NYSE:BAC)
-- AMEX: AMEX:SYMBOL (e.g., AMEX:GORO, AMEX:GLD)
-- SSE: SSE:SYMBOL (Shanghai Stock Exchange, 6-digit code, e.g., SSE:601398, SSE:510050)
-- SZSE: SZSE:SYMBOL (Shenzhen Stock Exchange, 6-digit code, e.g., SZSE:000001, SZSE:002594, SZSE:300750)
-- BSE: BSE:SYMBOL (Beijing Stock Exchange, 6-digit code, e.g., BSE:835368, BSE:560800)
-- HKEX: HKEX:SYMBOL (Hong Kong Stock Exchange, 5-digit code with leading zeros, e.g., HKEX:00700, HKEX:03033)
-- CRYPTO: CRYPTO:SYMBOL (e.g., CRYPTO:BTC, CRYPTO:ETH)
-
-Consider:
-1. Common stock symbols and company names
-2. Chinese company names (if query contains Chinese characters)
-3. Cryptocurrency names
-4. Index names
-5. ETF names
-
-Return ONLY a JSON array of ticker strings, like:
-["NASDAQ:AAPL", "NYSE:AAPL", "HKEX:00700"]
-
-Generate up to at least 1 possible ticker candidate up to 10. Be creative but realistic."""
-
-            # Call LLM API
-            response = client.chat.completions.create(
-                model=model_id,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a financial data expert that helps map search queries to standardized ticker formats. Always respond with valid JSON arrays only.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.7,
-                max_tokens=500,
+            # LLM candidates are memoized per normalized query, and concurrent
+            # fallbacks for the same query share a single LLM call
+            possible_tickers = self._fallback_tickers_cache.get_or_load(
+                ("fallback_tickers", _normalize_query(query.query)),
+                lambda: self._generate_fallback_tickers(query.query),
             )
-
-            # Parse response
-            response_text = response.choices[0].message.content.strip()
-            logger.debug(f"LLM response for query '{query.query}': {response_text}")
-
-            # Extract JSON array from response (handle cases where LLM adds markdown formatting)
-            if response_text.startswith("```json"):
-                response_text = (
-                    response_text.split("```json")[1].split("```")[0].strip()
-                )
-            elif response_text.startswith("```"):
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-
-            possible_tickers = json.loads(response_text)
-
-            if not isinstance(possible_tickers, list):
-                logger.warning(f"LLM response is not a list: {possible_tickers}")
+            if not possible_tickers:
                 return []
 
             # Validate each ticker and convert to search results
@@ -485,160 +590,174 @@ Generate up to at least 1 possible ticker candidate up to 10. Be creative but re
             logger.error(f"Fallback search failed: {e}", exc_info=True)
             return []
 
-    def get_asset_info(self, ticker: str) -> Optional[Asset]:
-        """Get detailed asset information with automatic failover.
+    def _generate_fallback_tickers(self, query_text: str) -> List[str]:
+        """Ask the LLM for candidate internal tickers matching a search query.
 
         Args:
-            ticker: Asset ticker in internal format
+            query_text: Raw user search query
 
         Returns:
-            Asset information or None if not found
+            List of candidate ticker strings (empty if the LLM is not configured
+            or did not return a list). API errors propagate so they are not cached.
         """
-        # Get the primary adapter for this ticker
-        adapter = self.get_adapter_for_ticker(ticker)
-
-        if not adapter:
-            logger.warning(f"No suitable adapter found for ticker: {ticker}")
-            return None
+        # Get environment variables
+        api_key = os.getenv("OPENROUTER_API_KEY")
+        model_id = os.getenv("PRODUCT_MODEL_ID", "anthropic/claude-haiku-4.5")
 
-        # Try the primary adapter
-        try:
-            logger.debug(
-                f"Fetching asset info for {ticker} from {adapter.source.value}"
-            )
-            asset_info = adapter.get_asset_info(ticker)
-            if asset_info:
-                logger.info(
-                    f"Successfully fetched asset info for {ticker} from {adapter.source.value}"
-                )
-                return asset_info
-            else:
-                logger.debug(
-                    f"Adapter {adapter.source.value} returned None for {ticker}"
-                )
-        except Exception as e:
+        if not api_key or not model_id:
             logger.warning(
-                f"Primary adapter {adapter.source.value} failed for {ticker}: {e}"
+                "OPENROUTER_API_KEY is not configured, skipping fallback search"
             )
+            return []
 
-        # Automatic failover: try other adapters for this exchange
-        exchange = ticker.split(":")[0] if ":" in ticker else ""
-        fallback_adapters = self.get_adapters_for_exchange(exchange)
+        # Initialize OpenAI client with OpenRouter
+        client = OpenAI(api_key=api_key, base_url="https://openrouter.ai/api/v1")
 
-        for fallback_adapter in fallback_adapters:
-            # Skip the primary adapter we already tried
-            if fallback_adapter.source == adapter.source:
-                continue
+        # Create prompt to generate possible ticker formats
+        prompt = f"""Given the user search query: "{query_text}"
 
-            if not fallback_adapter.validate_ticker(ticker):
-                continue
+Generate a list of possible internal ticker IDs that match this query. The internal ticker format is: EXCHANGE:SYMBOL
 
-            try:
-                logger.debug(
-                    f"Fallback: trying {fallback_adapter.source.value} for {ticker}"
-                )
-                asset_info = fallback_adapter.get_asset_info(ticker)
-                if asset_info:
-                    logger.info(
-                        f"Fallback success: fetched asset info for {ticker} from {fallback_adapter.source.value}"
-                    )
-                    # Update cache to use successful adapter
-                    with self._cache_lock:
-                        self._ticker_cache[ticker] = fallback_adapter
-                    return asset_info
-            except Exception as e:
-                logger.warning(
-                    f"Fallback adapter {fallback_adapter.source.value} failed for {ticker}: {e}"
-                )
-                continue
+Supported exchanges and their formats:
+- NASDAQ: NASDAQ:SYMBOL (e.g., NASDAQ:AAPL, NASDAQ:MSFT)
+- NYSE: NYSE:SYMBOL (e.g., NYSE:JPM, NYSE:BAC)
+- AMEX: AMEX:SYMBOL (e.g., AMEX:GORO, AMEX:GLD)
+- SSE: SSE:SYMBOL (Shanghai Stock Exchange, 6-digit code, e.g., SSE:601398, SSE:510050)
+- SZSE: SZSE:SYMBOL (Shenzhen Stock Exchange, 6-digit code, e.g., SZSE:000001, SZSE:002594, SZSE:300750)
+- BSE: BSE:SYMBOL (Beijing Stock Exchange, 6-digit code, e.g., BSE:835368, BSE:560800)
+- HKEX: HKEX:SYMBOL (Hong Kong Stock Exchange, 5-digit code with leading zeros, e.g., HKEX:00700, HKEX:03033)
+- CRYPTO: CRYPTO:SYMBOL (e.g., CRYPTO:BTC, CRYPTO:ETH)
 
-        logger.error(f"All adapters failed for {ticker}")
-        return None
+Consider:
+1. Common stock symbols and company names
+2. Chinese company names (if query contains Chinese characters)
+3. Cryptocurrency names
+4. Index names
+5. ETF names
 
-    def get_real_time_price(self, ticker: str) -> Optional[AssetPrice]:
-        """Get real-time price for an asset with automatic failover.
+Return ONLY a JSON array of ticker strings, like:
+["NASDAQ:AAPL", "NYSE:AAPL", "HKEX:00700"]
+
+Generate up to at least 1 possible ticker candidate up to 10. Be creative but realistic."""
+
+        # Call LLM API
+        response = client.chat.completions.create(
+            model=model_id,
+            messages=[
+                {
+                    "role": "system",
+                    "content": "You are a financial data expert that helps map search queries to standardized ticker formats. Always respond with valid JSON arrays only.",
+                },
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.7,
+            max_tokens=500,
+        )
+
+        # Parse response
+        response_text = response.choices[0].message.content.strip()
+        logger.debug(f"LLM response for query '{query_text}': {response_text}")
+
+        # Extract JSON array from response (handle cases where LLM adds markdown formatting)
+        if response_text.startswith("```json"):
+            response_text = response_text.split("```json")[1].split("```")[0].strip()
+        elif response_text.startswith("```"):
+            response_text = response_text.split("```")[1].split("```")[0].strip()
+
+        possible_tickers = json.loads(response_text)
+
+        if not isinstance(possible_tickers, list):
+            logger.warning(f"LLM response is not a list: {possible_tickers}")
+            return []
+
+        return possible_tickers
+
+    def get_asset_info(self, ticker: str) -> Optional[Asset]:
+        """Get detailed asset information with automatic failover.
+
+        Concurrent lookups of the same ticker share one upstream call, and
+        results (including "not found") are cached briefly.
 
         Args:
             ticker: Asset ticker in internal format
 
         Returns:
-            Current price data or None if not available
+            Asset information or None if not found
         """
-        # Get the primary adapter for this ticker
-        adapter = self.get_adapter_for_ticker(ticker)
+        ticker = _normalize_ticker(ticker)
+        asset_info = self._asset_info_cache.get_or_load(
+            ("asset_info", ticker), lambda: self._get_asset_info_uncached(ticker)
+        )
+        # Callers localize assets in place, so never hand out shared objects
+        return asset_info.model_copy(deep=True) if asset_info else None
 
-        if not adapter:
-            logger.warning(f"No suitable adapter found for ticker: {ticker}")
-            return None
+    def _get_asset_info_uncached(self, ticker: str) -> Optional[Asset]:
+        """Get asset information from the adapters without the result cache.
 
-        # Try the primary adapter
-        try:
-            logger.debug(f"Fetching price for {ticker} from {adapter.source.value}")
-            price = adapter.get_real_time_price(ticker)
-            if price:
-                logger.info(
-                    f"Successfully fetched price for {ticker} from {adapter.source.value}"
-                )
-                return price
-            else:
-                logger.debug(
-                    f"Adapter {adapter.source.value} returned None for {ticker}"
-                )
-        except Exception as e:
-            logger.warning(
-                f"Primary adapter {adapter.source.value} failed for {ticker}: {e}"
-            )
-
-        # Automatic failover: try other adapters for this exchange
-        exchange = ticker.split(":")[0] if ":" in ticker else ""
-        fallback_adapters = self.get_adapters_for_exchange(exchange)
+        Args:
+            ticker: Asset ticker in internal format
 
-        for fallback_adapter in fallback_adapters:
-            # Skip the primary adapter we already tried
-            if fallback_adapter.source == adapter.source:
-                continue
+        Returns:
+            Asset information or None if not found
+        """
+        return self._call_with_failover(
+            ticker, "asset info", lambda adapter: adapter.get_asset_info(ticker)
+        )
 
-            if not fallback_adapter.validate_ticker(ticker):
-                continue
+    def get_real_time_price(self, ticker: str) -> Optional[AssetPrice]:
+        """Get real-time price for an asset with automatic failover.
 
-            try:
-                logger.debug(
-                    f"Fallback: trying {fallback_adapter.source.value} for {ticker}"
-                )
-                price = fallback_adapter.get_real_time_price(ticker)
-                if price:
-                    logger.info(
-                        f"Fallback success: fetched price for {ticker} from {fallback_adapter.source.value}"
-                    )
-                    # Update cache to use successful adapter
-                    with self._cache_lock:
-                        self._ticker_cache[ticker] = fallback_adapter
-                    return price
-            except Exception as e:
-                logger.warning(
-                    f"Fallback adapter {fallback_adapter.source.value} failed for {ticker}: {e}"
-                )
-                continue
+        Args:
+            ticker: Asset ticker in internal format
 
-        logger.error(f"All adapters failed for {ticker}")
-        return None
+        Returns:
+            Current price data or None if not available
+        """
+        return self._call_with_failover(
+            ticker, "price", lambda adapter: adapter.get_real_time_price(ticker)
+        )
 
     def get_multiple_prices(
         self, tickers: List[str]
     ) -> Dict[str, Optional[AssetPrice]]:
         """Get real-time prices for multiple assets efficiently with automatic failover.
 
+        Quotes fetched within the last few seconds are served from cache and
+        only the remaining tickers are requested, in one batch per adapter.
+
         Args:
             tickers: List of asset tickers
 
         Returns:
             Dictionary mapping tickers to price data
         """
+        results: Dict[str, Optional[AssetPrice]] = {}
+        missing = []
+        for ticker in dict.fromkeys(tickers):
+            cached = self._price_cache.get(ticker)
+            if cached is CoalescingCache.MISSING:
+                missing.append(ticker)
+            else:
+                results[ticker] = cached
+
+        if missing:
+            fetched = self._fetch_multiple_prices(missing)
+            for ticker, price in fetched.items():
+                if price is not None:
+                    self._price_cache.set(ticker, price)
+            results.update(fetched)
+
+        return {ticker: results.get(ticker) for ticker in tickers}
+
+    def _fetch_multiple_prices(
+        self, tickers: List[str]
+    ) -> Dict[str, Optional[AssetPrice]]:
+        """Fetch prices for multiple assets from the adapters (no cache)."""
         # Group tickers by adapter
         adapter_tickers: Dict[BaseDataAdapter, List[str]] = {}
 
         for ticker in tickers:
-            adapter = self.get_adapter_for_ticker(ticker)
+            adapter = self.router.primary(ticker)
             if adapter:
                 if adapter not in adapter_tickers:
                     adapter_tickers[adapter] = []
@@ -652,9 +771,31 @@ Generate up to at least 1 possible ticker candidate up to 10. Be creative but re
             # If no adapters found for any tickers, return None for all
             return {ticker: None for ticker in tickers}
 
-        with ThreadPoolExecutor(max_workers=len(adapter_tickers)) as executor:
+        # Adapters whose circuit rejects the batch go straight to failover
+        for adapter in list(adapter_tickers):
+            if not self.router.allow(adapter):
+                failed_tickers.extend(adapter_tickers.pop(adapter))
+
+        def _timed_batch(adapter: BaseDataAdapter, ticker_list: List[str]):
+            started = time.monotonic()
+            try:
+                results = adapter.get_multiple_prices(ticker_list)
+            except Exception as e:
+                self.router.record_failure(
+                    adapter, e, (time.monotonic() - started) * 1000
+                )
+                raise
+            latency_ms = (time.monotonic() - started) * 1000
+            if any(price is not None for price in results.values()):
+                self.router.record_success(adapter, latency_ms)
+            elif len(ticker_list) > 1:
+                # A whole batch without a price points at the provider
+                self.router.record_empty(adapter, latency_ms)
+            return results
+
+        with ThreadPoolExecutor(max_workers=max(len(adapter_tickers), 1)) as executor:
             future_to_adapter = {
-                executor.submit(adapter.get_multiple_prices, ticker_list): adapter
+                executor.submit(_timed_batch, adapter, ticker_list): adapter
                 for adapter, ticker_list in adapter_tickers.items()
             }
 
@@ -711,70 +852,14 @@ Generate up to at least 1 possible ticker candidate up to 10. Be creative but re
         Returns:
             List of historical price data
         """
-        # Get the primary adapter for this ticker
-        adapter = self.get_adapter_for_ticker(ticker)
-
-        if not adapter:
-            logger.warning(f"No suitable adapter found for ticker: {ticker}")
-            return []
-
-        # Try the primary adapter
-        try:
-            logger.debug(
-                f"Fetching historical data for {ticker} from {adapter.source.value}"
-            )
-            prices = adapter.get_historical_prices(
+        prices = self._call_with_failover(
+            ticker,
+            "historical data",
+            lambda adapter: adapter.get_historical_prices(
                 ticker, start_date, end_date, interval
-            )
-            if prices:
-                logger.info(
-                    f"Successfully fetched {len(prices)} historical prices for {ticker} from {adapter.source.value}"
-                )
-                return prices
-            else:
-                logger.debug(
-                    f"Adapter {adapter.source.value} returned empty historical data for {ticker}"
-                )
-        except Exception as e:
-            logger.warning(
-                f"Primary adapter {adapter.source.value} failed for historical data of {ticker}: {e}"
-            )
-
-        # Automatic failover: try other adapters for this exchange
-        exchange = ticker.split(":")[0] if ":" in ticker else ""
-        fallback_adapters = self.get_adapters_for_exchange(exchange)
-
-        for fallback_adapter in fallback_adapters:
-            # Skip the primary adapter we already tried
-            if fallback_adapter.source == adapter.source:
-                continue
-
-            if not fallback_adapter.validate_ticker(ticker):
-                continue
-
-            try:
-                logger.debug(
-                    f"Fallback: trying {fallback_adapter.source.value} for historical data of {ticker}"
-                )
-                prices = fallback_adapter.get_historical_prices(
-                    ticker, start_date, end_date, interval
-                )
-                if prices:
-                    logger.info(
-                        f"Fallback success: fetched {len(prices)} historical prices for {ticker} from {fallback_adapter.source.value}"
-                    )
-                    # Update cache to use successful adapter
-                    with self._cache_lock:
-                        self._ticker_cache[ticker] = fallback_adapter
-                    return prices
-            except Exception as e:
-                logger.warning(
-                    f"Fallback adapter {fallback_adapter.source.value} failed for historical data of {ticker}: {e}"
-                )
-                continue
-
-        logger.error(f"All adapters failed for historical data of {ticker}")
-        return []
+            ),
+        )
+        return prices or []
 
 
 class WatchlistManager:
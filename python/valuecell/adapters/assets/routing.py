@@ -0,0 +1,395 @@
+"""Ticker routing with circuit breakers and health-scored failover.
+
+The router compiles an exchange → adapters table from the registered adapters'
+capabilities, memoizes the validated candidates per ticker in a bounded LRU
+cache and orders them at call time by adapter health, so an upstream that keeps
+failing is skipped (circuit open) instead of adding its timeout to every
+request. Routing decisions and adapter health are exposed as metrics.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .base import BaseDataAdapter
+from .types import DataSource, Exchange
+
+logger = logging.getLogger(__name__)
+
+# Circuit breaker states
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+# Smoothing factor for the health score and latency moving averages
+_HEALTH_ALPHA = 0.2
+
+# Adapters scoring below this are tried after healthier ones
+DEMOTION_SCORE = 0.5
+
+# Weight of an empty batch answer towards opening a circuit. The adapters
+# swallow upstream errors and return None or empty results, so a dead provider
+# shows up as batches without a single price. Empty single-ticker answers are
+# not counted: they are mostly legitimate misses (unknown tickers)
+SOFT_FAILURE_WEIGHT = 0.5
+
+
+class CircuitBreaker:
+    """Per-adapter circuit breaker.
+
+    The breaker opens after ``failure_threshold`` consecutive failures (soft
+    failures count with a lower weight). While
+    open, requests are rejected until ``recovery_timeout`` seconds have passed;
+    then a single probe request is let through (half-open). A successful probe
+    closes the breaker, a failed one re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self._state = CIRCUIT_CLOSED
+        self._consecutive_failures = 0.0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state, reporting an expired open breaker as half-open."""
+        with self._lock:
+            if (
+                self._state == CIRCUIT_OPEN
+                and time.monotonic() - self._opened_at >= self.recovery_timeout
+            ):
+                return CIRCUIT_HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent through this breaker."""
+        with self._lock:
+            if self._state == CIRCUIT_CLOSED:
+                return True
+            if self._state == CIRCUIT_OPEN:
+                if time.monotonic() - self._opened_at < self.recovery_timeout:
+                    return False
+                self._state = CIRCUIT_HALF_OPEN
+                self._probe_in_flight = False
+            # Half-open: admit one probe at a time
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """Record a successful request, closing the breaker."""
+        with self._lock:
+            self._state = CIRCUIT_CLOSED
+            self._consecutive_failures = 0.0
+            self._probe_in_flight = False
+
+    def record_failure(self, weight: float = 1.0) -> bool:
+        """Record a failed request.
+
+        Args:
+            weight: Weight of the failure (below 1.0 for soft failures)
+
+        Returns:
+            True if this failure opened the breaker
+        """
+        with self._lock:
+            self._consecutive_failures += weight
+            self._probe_in_flight = False
+            if self._state == CIRCUIT_HALF_OPEN or (
+                self._state == CIRCUIT_CLOSED
+                and self._consecutive_failures >= self.failure_threshold
+            ):
+                self._state = CIRCUIT_OPEN
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def reset(self) -> None:
+        """Force the breaker back to closed."""
+        self.record_success()
+
+
+class _AdapterHealth:
+    """Health bookkeeping for one adapter.
+
+    The health score is a moving average of request outcomes (1.0 healthy,
+    0.0 failing) that drifts back towards 1.0 with a half-life of
+    ``recovery_seconds`` so a demoted adapter is eventually retried.
+    """
+
+    def __init__(self, breaker: CircuitBreaker):
+        self.breaker = breaker
+        self._score = 1.0
+        self._scored_at = time.monotonic()
+        self.latency_ms: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def score(self) -> float:
+        half_life = max(self.breaker.recovery_timeout, 1e-3)
+        elapsed = time.monotonic() - self._scored_at
+        return 1.0 - (1.0 - self._score) * 0.5 ** (elapsed / half_life)
+
+    def observe(self, ok: bool, latency_ms: Optional[float]) -> None:
+        self._score = (1 - _HEALTH_ALPHA) * self.score + _HEALTH_ALPHA * (
+            1.0 if ok else 0.0
+        )
+        self._scored_at = time.monotonic()
+        if latency_ms is not None:
+            self.latency_ms = (
+                latency_ms
+                if self.latency_ms is None
+                else (1 - _HEALTH_ALPHA) * self.latency_ms + _HEALTH_ALPHA * latency_ms
+            )
+
+
+class TickerRouter:
+    """Route tickers to adapters by exchange prefix with health-aware failover."""
+
+    def __init__(
+        self,
+        max_cached_tickers: int = 4096,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+    ):
+        """Initialize an empty router.
+
+        Args:
+            max_cached_tickers: Maximum number of memoized ticker routes
+            failure_threshold: Consecutive failures that open an adapter's circuit
+            recovery_timeout: Seconds an open circuit waits before a probe
+        """
+        self.max_cached_tickers = max_cached_tickers
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        # Exchange prefix → adapters in priority (registration) order
+        self._table: Dict[str, Tuple[BaseDataAdapter, ...]] = {}
+        # Ticker → validated candidate adapters (bounded LRU)
+        self._ticker_cache: "OrderedDict[str, Tuple[BaseDataAdapter, ...]]" = (
+            OrderedDict()
+        )
+        self._health: Dict[DataSource, _AdapterHealth] = {}
+        self._lock = threading.Lock()
+
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._failovers = 0
+        self._unroutable = 0
+
+    def rebuild(self, adapters: Iterable[BaseDataAdapter]) -> None:
+        """Precompile the exchange → adapters table from adapter capabilities.
+
+        Health state of adapters that remain registered is preserved.
+
+        Args:
+            adapters: Registered adapters in priority order
+        """
+        table: Dict[str, List[BaseDataAdapter]] = {}
+        sources = set()
+        for adapter in adapters:
+            sources.add(adapter.source)
+            exchanges = set()
+            for cap in adapter.get_capabilities():
+                for exchange in cap.exchanges:
+                    exchanges.add(
+                        exchange.value if isinstance(exchange, Exchange) else exchange
+                    )
+            for exchange in exchanges:
+                table.setdefault(exchange, []).append(adapter)
+
+        with self._lock:
+            self._table = {key: tuple(value) for key, value in table.items()}
+            self._ticker_cache.clear()
+            for source in sources:
+                if source not in self._health:
+                    self._health[source] = _AdapterHealth(
+                        CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+                    )
+            for source in list(self._health):
+                if source not in sources:
+                    del self._health[source]
+
+        logger.debug(f"Routing table rebuilt with {len(table)} exchanges")
+
+    @property
+    def exchanges(self) -> Dict[str, Tuple[BaseDataAdapter, ...]]:
+        """The compiled exchange → adapters table."""
+        with self._lock:
+            return dict(self._table)
+
+    def adapters_for_exchange(self, exchange: str) -> List[BaseDataAdapter]:
+        """Get the adapters registered for an exchange in priority order."""
+        with self._lock:
+            return list(self._table.get(exchange, ()))
+
+    def _routes(self, ticker: str) -> Tuple[BaseDataAdapter, ...]:
+        """Get the memoized adapters that validate a ticker, in priority order."""
+        with self._lock:
+            routes = self._ticker_cache.get(ticker)
+            if routes is not None:
+                self._ticker_cache.move_to_end(ticker)
+                self._cache_hits += 1
+                return routes
+            self._cache_misses += 1
+            adapters = self._table.get(ticker.split(":", 1)[0], ())
+
+        routes = tuple(
+            adapter for adapter in adapters if adapter.validate_ticker(ticker)
+        )
+        with self._lock:
+            self._ticker_cache[ticker] = routes
+            while len(self._ticker_cache) > self.max_cached_tickers:
+                self._ticker_cache.popitem(last=False)
+            if not routes:
+                self._unroutable += 1
+        return routes
+
+    def candidates(self, ticker: str) -> List[BaseDataAdapter]:
+        """Get the adapters to try for a ticker, healthiest first.
+
+        Adapters keep their priority (registration) order, except that those
+        with a low health score are tried after healthy ones. Adapters whose
+        circuit is open are left out; an adapter due a half-open probe keeps
+        its position so the probe is sent with real traffic.
+
+        Args:
+            ticker: Asset ticker in internal format
+
+        Returns:
+            Ordered list of adapters (may be empty)
+        """
+        if ":" not in ticker:
+            return []
+
+        routes = self._routes(ticker)
+        if len(routes) <= 1:
+            return list(routes)
+
+        ranked = []
+        for priority, adapter in enumerate(routes):
+            health = self._health.get(adapter.source)
+            if health is None:
+                ranked.append((False, priority, adapter))
+                continue
+            if health.breaker.state == CIRCUIT_OPEN:
+                continue
+            ranked.append((health.score < DEMOTION_SCORE, priority, adapter))
+        ranked.sort(key=lambda item: item[:2])
+        return [item[2] for item in ranked]
+
+    def primary(self, ticker: str) -> Optional[BaseDataAdapter]:
+        """Get the adapter that should serve a ticker first."""
+        candidates = self.candidates(ticker)
+        return candidates[0] if candidates else None
+
+    def allow(self, adapter: BaseDataAdapter) -> bool:
+        """Ask an adapter's circuit breaker whether a request may be sent."""
+        health = self._health.get(adapter.source)
+        if health is None or health.breaker.allow_request():
+            return True
+        with self._lock:
+            health.rejected += 1
+        return False
+
+    def record_success(
+        self, adapter: BaseDataAdapter, latency_ms: Optional[float] = None
+    ) -> None:
+        """Record that an adapter answered with data."""
+        health = self._health.get(adapter.source)
+        if health is None:
+            return
+        health.breaker.record_success()
+        with self._lock:
+            health.successes += 1
+            health.observe(True, latency_ms)
+
+    def record_failure(
+        self,
+        adapter: BaseDataAdapter,
+        error: Optional[BaseException] = None,
+        latency_ms: Optional[float] = None,
+        weight: float = 1.0,
+    ) -> None:
+        """Record that a request to an adapter raised an error.
+
+        Args:
+            adapter: Adapter that failed
+            error: Error raised, if any
+            latency_ms: Request latency in milliseconds
+            weight: Weight of the failure towards opening the circuit
+        """
+        health = self._health.get(adapter.source)
+        if health is None:
+            return
+        opened = health.breaker.record_failure(weight)
+        with self._lock:
+            health.failures += 1
+            health.last_error = str(error) if error is not None else None
+            health.observe(False, latency_ms)
+        if opened:
+            logger.warning(
+                f"Circuit opened for adapter {adapter.source.value} "
+                f"after repeated failures: {error}"
+            )
+
+    def record_empty(
+        self, adapter: BaseDataAdapter, latency_ms: Optional[float] = None
+    ) -> None:
+        """Record that an adapter answered a batch without any data (a soft
+        failure)."""
+        self.record_failure(
+            adapter, ValueError("empty result"), latency_ms, SOFT_FAILURE_WEIGHT
+        )
+
+    def record_failover(self) -> None:
+        """Count a request answered by a non-primary adapter."""
+        with self._lock:
+            self._failovers += 1
+
+    def reset_health(self) -> None:
+        """Close all circuits and reset health scores."""
+        with self._lock:
+            for source, health in self._health.items():
+                self._health[source] = _AdapterHealth(
+                    CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+                )
+
+    def get_metrics(self) -> Dict[str, object]:
+        """Return routing counters and per-adapter health."""
+        with self._lock:
+            adapters = {
+                source.value: {
+                    "state": health.breaker.state,
+                    "health_score": round(health.score, 3),
+                    "latency_ms": (
+                        round(health.latency_ms, 1)
+                        if health.latency_ms is not None
+                        else None
+                    ),
+                    "successes": health.successes,
+                    "failures": health.failures,
+                    "rejected": health.rejected,
+                    "last_error": health.last_error,
+                }
+                for source, health in self._health.items()
+            }
+            return {
+                "exchanges": len(self._table),
+                "cached_tickers": len(self._ticker_cache),
+                "cache_hits": self._cache_hits,
+                "cache_misses": self._cache_misses,
+                "failovers": self._failovers,
+                "unroutable": self._unroutable,
+                "adapters": adapters,
+            }
@@ -0,0 +1,220 @@
+"""Request coalescing and short-lived result caching for adapter calls.
+
+Concurrent identical requests (same operation and normalized arguments) share a
+single in-flight upstream call, and completed results are kept for a short time
+so that bursts of page loads or searches do not fan out to the data sources.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class _Call:
+    """An in-flight call that followers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Ensure only one execution of a function is in flight per key.
+
+    Callers that arrive while a call for the same key is running block until it
+    finishes and receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Execute ``fn`` once for all concurrent callers sharing ``key``.
+
+        Args:
+            key: Hashable key identifying the call
+            fn: Zero-argument callable performing the upstream work
+
+        Returns:
+            Tuple of (result, shared) where shared is True if the result was
+            produced by another caller's execution
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+        return call.result, call.followers > 0
+
+    def in_flight(self) -> int:
+        """Number of keys currently being executed."""
+        with self._lock:
+            return len(self._calls)
+
+
+class ResultCache:
+    """Thread-safe TTL cache with separate lifetimes for negative results.
+
+    A result is considered negative when ``is_negative`` returns True for it
+    (by default ``None`` and empty containers), which lets "not found" answers
+    be cached for a shorter period than real data.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 60.0,
+        negative_ttl_seconds: float = 15.0,
+        max_entries: int = 2048,
+        is_negative: Optional[Callable[[Any], bool]] = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        self._is_negative = is_negative or (lambda value: not value)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for ``key`` or the ``MISSING`` sentinel."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return _MISSING
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return _MISSING
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store ``value`` with a TTL chosen by whether it is negative."""
+        ttl = (
+            self.negative_ttl_seconds if self._is_negative(value) else self.ttl_seconds
+        )
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class CoalescingCache:
+    """Combine a ``ResultCache`` with ``SingleFlight`` request coalescing."""
+
+    MISSING = _MISSING
+
+    def __init__(
+        self,
+        ttl_seconds: float = 60.0,
+        negative_ttl_seconds: float = 15.0,
+        max_entries: int = 2048,
+        is_negative: Optional[Callable[[Any], bool]] = None,
+    ):
+        self.cache = ResultCache(
+            ttl_seconds=ttl_seconds,
+            negative_ttl_seconds=negative_ttl_seconds,
+            max_entries=max_entries,
+            is_negative=is_negative,
+        )
+        self.flight = SingleFlight()
+        self.shared_calls = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Return a cached value or load it once for all concurrent callers.
+
+        Exceptions raised by ``loader`` propagate to every waiting caller and
+        are not cached.
+        """
+        value = self.cache.get(key)
+        if value is not _MISSING:
+            return value
+
+        def _load() -> Any:
+            # Another leader may have populated the cache while we were
+            # acquiring the flight slot.
+            cached = self.cache.get(key)
+            if cached is not _MISSING:
+                return cached
+            result = loader()
+            self.cache.set(key, result)
+            return result
+
+        value, shared = self.flight.do(key, _load)
+        if shared:
+            self.shared_calls += 1
+            logger.debug(f"Coalesced request for {key}")
+        return value
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a cached value."""
+        self.cache.invalidate(key)
+
+    def clear(self) -> None:
+        """Drop all cached values."""
+        self.cache.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return cache and coalescing counters."""
+        return {
+            "entries": len(self.cache),
+            "hits": self.cache.hits,
+            "misses": self.cache.misses,
+            "shared_calls": self.shared_calls,
+            "in_flight": self.flight.in_flight(),
+        }
@@ -0,0 +1,293 @@
+"""Local in-memory symbol index for instant asset search.
+
+The index holds one entry per internal ticker and answers prefix queries over
+symbols, names and localized names without touching upstream data sources.
+It is populated from the local ``assets`` table, from adapter exchange listings
+and from upstream search results, and reports staleness so callers can refresh
+it periodically.
+"""
+
+import bisect
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .types import AssetSearchResult, AssetType, Exchange
+
+logger = logging.getLogger(__name__)
+
+# Country code for each supported exchange (used when building entries from
+# sources that only know the ticker)
+EXCHANGE_COUNTRIES: Dict[str, str] = {
+    Exchange.NASDAQ.value: "US",
+    Exchange.NYSE.value: "US",
+    Exchange.AMEX.value: "US",
+    Exchange.SSE.value: "CN",
+    Exchange.SZSE.value: "CN",
+    Exchange.BSE.value: "CN",
+    Exchange.HKEX.value: "HK",
+    Exchange.CRYPTO.value: "US",
+}
+
+# Relevance scores by match kind (higher is better)
+SCORE_EXACT_SYMBOL = 1.0
+SCORE_EXACT_NAME = 0.95
+SCORE_SYMBOL_PREFIX = 0.9
+SCORE_NAME_PREFIX = 0.8
+SCORE_WORD_PREFIX = 0.7
+SCORE_SUBSTRING = 0.6
+
+# Maximum length of name suffixes indexed for substring matching
+_MAX_SUFFIX_NAME_LENGTH = 16
+
+
+def _normalize(text: str) -> str:
+    """Normalize text for indexing and lookup."""
+    return " ".join(text.split()).casefold()
+
+
+def _is_cjk(text: str) -> bool:
+    """Return True if the text contains CJK characters."""
+    return any("㐀" <= ch <= "鿿" or "豈" <= ch <= "﫿" for ch in text)
+
+
+class AssetSymbolIndex:
+    """Sorted-key prefix index over tickers and (localized) asset names.
+
+    Every entry is reachable through several keys (symbol, full name, each word
+    of the name and, for CJK names, every suffix so that substrings match).
+    Keys are kept in a sorted list so a prefix lookup is a binary search
+    followed by a short scan.
+    """
+
+    # Key kinds, ordered by match quality
+    _KIND_SYMBOL = 0
+    _KIND_NAME = 1
+    _KIND_WORD = 2
+    _KIND_SUFFIX = 3
+
+    def __init__(self, refresh_interval_seconds: float = 24 * 3600):
+        """Initialize an empty index.
+
+        Args:
+            refresh_interval_seconds: Age after which the index is reported stale
+        """
+        self.refresh_interval_seconds = refresh_interval_seconds
+
+        self._entries: Dict[str, AssetSearchResult] = {}
+        # Sorted list of (key, kind, ticker); kind orders match quality
+        self._keys: List[Tuple[str, int, str]] = []
+        self._keys_by_ticker: Dict[str, List[Tuple[str, int, str]]] = {}
+        self._lock = threading.RLock()
+
+        self._last_refreshed: Optional[float] = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, ticker: str) -> bool:
+        with self._lock:
+            return ticker.upper() in self._entries
+
+    def _build_keys(self, entry: AssetSearchResult) -> Set[Tuple[str, int, str]]:
+        """Build the index keys for an entry."""
+        ticker = entry.ticker
+        symbol = ticker.split(":", 1)[1] if ":" in ticker else ticker
+        keys = {(_normalize(symbol), self._KIND_SYMBOL, ticker)}
+
+        for name in entry.names.values():
+            normalized = _normalize(name or "")
+            if not normalized:
+                continue
+            keys.add((normalized, self._KIND_NAME, ticker))
+
+            words = normalized.split()
+            for word in words[1:]:
+                keys.add((word, self._KIND_WORD, ticker))
+
+            # CJK names have no word boundaries; index suffixes for substrings
+            if _is_cjk(normalized) and len(normalized) <= _MAX_SUFFIX_NAME_LENGTH:
+                compact = normalized.replace(" ", "")
+                for i in range(1, len(compact)):
+                    keys.add((compact[i:], self._KIND_SUFFIX, ticker))
+
+        return keys
+
+    def add(self, entry: AssetSearchResult) -> None:
+        """Add or update a single entry, merging localized names."""
+        self.add_many([entry])
+
+    def add_many(self, entries: Iterable[AssetSearchResult]) -> int:
+        """Add or update entries, merging localized names with existing ones.
+
+        Args:
+            entries: Search results to index
+
+        Returns:
+            Number of entries added or updated
+        """
+        with self._lock:
+            updated: Dict[str, AssetSearchResult] = {}
+            for entry in entries:
+                ticker = entry.ticker.upper()
+                existing = updated.get(ticker) or self._entries.get(ticker)
+                if existing is not None:
+                    entry = existing.model_copy(
+                        update={
+                            "names": {**existing.names, **entry.names},
+                            "asset_type": entry.asset_type,
+                            "currency": entry.currency or existing.currency,
+                        }
+                    )
+                else:
+                    entry = entry.model_copy(update={"ticker": ticker}, deep=True)
+                updated[ticker] = entry
+
+            if not updated:
+                return 0
+
+            if len(updated) == 1:
+                # Small update: replace the ticker's keys in place
+                ((ticker, entry),) = updated.items()
+                self._remove_keys(ticker)
+                keys = list(self._build_keys(entry))
+                for key in keys:
+                    bisect.insort(self._keys, key)
+                self._keys_by_ticker[ticker] = keys
+                self._entries[ticker] = entry
+                return 1
+
+            # Bulk update: rebuild the sorted key list once
+            new_keys: List[Tuple[str, int, str]] = []
+            for ticker, entry in updated.items():
+                keys = list(self._build_keys(entry))
+                self._keys_by_ticker[ticker] = keys
+                self._entries[ticker] = entry
+                new_keys.extend(keys)
+            self._keys = [k for k in self._keys if k[2] not in updated]
+            self._keys.extend(new_keys)
+            self._keys.sort()
+
+            return len(updated)
+
+    def _remove_keys(self, ticker: str) -> None:
+        """Remove all index keys of a ticker (lock must be held)."""
+        for key in self._keys_by_ticker.pop(ticker, []):
+            i = bisect.bisect_left(self._keys, key)
+            if i < len(self._keys) and self._keys[i] == key:
+                del self._keys[i]
+
+    def remove(self, ticker: str) -> bool:
+        """Remove an entry from the index."""
+        ticker = ticker.upper()
+        with self._lock:
+            if ticker not in self._entries:
+                return False
+            self._remove_keys(ticker)
+            del self._entries[ticker]
+            return True
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._keys.clear()
+            self._keys_by_ticker.clear()
+            self._last_refreshed = None
+
+    def _score(self, kind: int, key: str, term: str) -> float:
+        """Score a key match for a normalized search term."""
+        exact = key == term
+        if kind == self._KIND_SYMBOL:
+            return SCORE_EXACT_SYMBOL if exact else SCORE_SYMBOL_PREFIX
+        if kind == self._KIND_NAME:
+            return SCORE_EXACT_NAME if exact else SCORE_NAME_PREFIX
+        if kind == self._KIND_WORD:
+            return SCORE_WORD_PREFIX
+        return SCORE_SUBSTRING
+
+    def search(self, query: str, limit: int = 10) -> List[AssetSearchResult]:
+        """Find entries whose symbol or names start with (or contain) the query.
+
+        Args:
+            query: Free-text query or ticker (``EXCHANGE:SYMBOL`` also accepted)
+            limit: Maximum number of results
+
+        Returns:
+            Matching results ordered by relevance score (descending), each a
+            copy carrying the score in ``relevance_score``
+        """
+        term = _normalize(query)
+        if not term:
+            return []
+
+        with self._lock:
+            # Direct ticker lookup
+            if ":" in term:
+                entry = self._entries.get(term.upper())
+                if entry is None:
+                    return []
+                return [entry.model_copy(update={"relevance_score": 1.0}, deep=True)]
+
+            best: Dict[str, float] = {}
+            start = bisect.bisect_left(self._keys, (term, -1, ""))
+            for key, kind, ticker in self._keys[start:]:
+                if not key.startswith(term):
+                    break
+                # Slightly prefer shorter keys among prefix matches
+                score = (
+                    self._score(kind, key, term) - min(len(key) - len(term), 50) * 1e-4
+                )
+                if score > best.get(ticker, -1.0):
+                    best[ticker] = score
+
+            ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))
+            return [
+                self._entries[ticker].model_copy(
+                    update={"relevance_score": round(score, 4)}, deep=True
+                )
+                for ticker, score in ranked[:limit]
+            ]
+
+    def mark_refreshed(self) -> None:
+        """Record that the index was just refreshed from its sources."""
+        with self._lock:
+            self._last_refreshed = time.monotonic()
+
+    def is_stale(self) -> bool:
+        """Return True if the index has never been refreshed or is too old."""
+        with self._lock:
+            if self._last_refreshed is None:
+                return True
+            age = time.monotonic() - self._last_refreshed
+            return age >= self.refresh_interval_seconds
+
+    @staticmethod
+    def build_entry(
+        ticker: str,
+        names: Dict[str, str],
+        asset_type: AssetType = AssetType.STOCK,
+        currency: Optional[str] = None,
+    ) -> Optional[AssetSearchResult]:
+        """Build an index entry from a ticker and its names.
+
+        Returns:
+            Search result, or None if the ticker is malformed
+        """
+        if ":" not in ticker:
+            return None
+        exchange = ticker.split(":", 1)[0].upper()
+        try:
+            return AssetSearchResult(
+                ticker=ticker.upper(),
+                asset_type=asset_type,
+                names={lang: name for lang, name in names.items() if name},
+                exchange=exchange,
+                country=EXCHANGE_COUNTRIES.get(exchange, "US"),
+                currency=currency,
+            )
+        except Exception as e:
+            logger.debug(f"Could not build index entry for {ticker}: {e}")
+            return None
@@ -0,0 +1,109 @@
+"""Tests for AKShare batch pricing from full-market spot tables."""
+
+import pandas as pd
+
+from valuecell.adapters.assets import akshare_adapter
+from valuecell.adapters.assets.akshare_adapter import AKShareAdapter
+
+
+def _a_share_spot():
+    return pd.DataFrame(
+        {
+            "代码": ["600519", "000001", "430047"],
+            "名称": ["贵州茅台", "平安银行", "诺思兰德"],
+            "最新价": [1500.5, 12.3, float("nan")],
+            "今开": [1490.0, 12.0, None],
+            "最高": [1510.0, 12.5, None],
+            "最低": [1488.0, 11.9, None],
+            "成交量": [10000, 20000, None],
+            "涨跌额": [10.5, 0.3, None],
+            "涨跌幅": [0.7, 2.5, None],
+            "总市值": [1.9e12, 2.4e11, None],
+        }
+    )
+
+
+def _us_spot():
+    return pd.DataFrame(
+        {
+            "代码": ["105.AAPL", "106.IBM"],
+            "名称": ["苹果", "IBM"],
+            "最新价": [190.0, 140.0],
+            "开盘价": [188.0, 139.0],
+            "最高价": [191.0, 141.0],
+            "最低价": [187.5, 138.0],
+            "成交量": [1000, 2000],
+            "涨跌额": [2.0, 1.0],
+            "涨跌幅": [1.06, 0.72],
+            "总市值": [3.0e12, 1.3e11],
+        }
+    )
+
+
+def test_multiple_prices_use_one_spot_call_per_market(monkeypatch):
+    calls = {"a": 0, "us": 0}
+
+    def a_spot():
+        calls["a"] += 1
+        return _a_share_spot()
+
+    def us_spot():
+        calls["us"] += 1
+        return _us_spot()
+
+    minute_calls = []
+    monkeypatch.setattr(akshare_adapter.ak, "stock_zh_a_spot_em", a_spot)
+    monkeypatch.setattr(akshare_adapter.ak, "stock_us_spot_em", us_spot)
+    adapter = AKShareAdapter()
+    monkeypatch.setattr(
+        adapter, "_get_minute_price", lambda ticker: minute_calls.append(ticker)
+    )
+
+    tickers = ["SSE:600519", "SZSE:000001", "BSE:430047", "NASDAQ:AAPL", "NYSE:IBM"]
+    prices = adapter.get_multiple_prices(tickers)
+
+    assert calls == {"a": 1, "us": 1}
+    assert str(prices["SSE:600519"].price) == "1500.5"
+    assert prices["SZSE:000001"].currency == "CNY"
+    assert str(prices["NASDAQ:AAPL"].high_price) == "191.0"
+    assert prices["NYSE:IBM"].currency == "USD"
+    # Suspended stock without a last price falls back to minute data
+    assert minute_calls == ["BSE:430047"]
+
+    # Subsequent single and batch lookups are served from the cached snapshot
+    assert adapter.get_real_time_price("SSE:600519").price == prices["SSE:600519"].price
+    adapter.get_multiple_prices(["SZSE:000001"])
+    assert calls == {"a": 1, "us": 1}
+
+
+def test_failed_spot_fetch_falls_back_to_per_ticker(monkeypatch):
+    def broken():
+        raise ConnectionError("eastmoney unavailable")
+
+    monkeypatch.setattr(akshare_adapter.ak, "stock_hk_spot_em", broken)
+    adapter = AKShareAdapter()
+    minute_calls = []
+    monkeypatch.setattr(
+        adapter, "_get_minute_price", lambda ticker: minute_calls.append(ticker)
+    )
+
+    prices = adapter.get_multiple_prices(["HKEX:00700", "HKEX:09988"])
+
+    assert prices == {"HKEX:00700": None, "HKEX:09988": None}
+    assert minute_calls == ["HKEX:00700", "HKEX:09988"]
+
+
+def test_mainland_codes_map_to_their_exchanges():
+    adapter = AKShareAdapter()
+
+    assert [
+        adapter.convert_to_internal_ticker(code)
+        for code in ("600519", "900901", "000001", "200002", "430047", "920001")
+    ] == [
+        "SSE:600519",
+        "SSE:900901",
+        "SZSE:000001",
+        "SZSE:200002",
+        "BSE:430047",
+        "BSE:920001",
+    ]
@@ -0,0 +1,170 @@
+"""Tests for ticker routing, circuit breakers and failover."""
+
+import time
+from datetime import datetime
+from decimal import Decimal
+
+from valuecell.adapters.assets.base import AdapterCapability, BaseDataAdapter
+from valuecell.adapters.assets.manager import AdapterManager
+from valuecell.adapters.assets.routing import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    CircuitBreaker,
+    TickerRouter,
+)
+from valuecell.adapters.assets.types import (
+    AssetPrice,
+    AssetType,
+    DataSource,
+    Exchange,
+)
+
+
+class _PriceAdapter(BaseDataAdapter):
+    def __init__(self, source: DataSource, fail: bool = False, empty: bool = False):
+        self.fail = fail
+        self.empty = empty
+        self.calls = 0
+        super().__init__(source)
+
+    def _initialize(self) -> None:
+        pass
+
+    def search_assets(self, query):
+        return []
+
+    def get_asset_info(self, ticker):
+        return None
+
+    def get_real_time_price(self, ticker):
+        self.calls += 1
+        if self.fail:
+            raise TimeoutError("upstream timed out")
+        if self.empty:
+            # The real adapters log upstream errors and return None
+            return None
+        return AssetPrice(
+            ticker=ticker,
+            price=Decimal("1"),
+            currency="USD",
+            timestamp=datetime(2024, 1, 1),
+        )
+
+    def get_historical_prices(self, ticker, start_date, end_date, interval="1d"):
+        return []
+
+    def convert_to_source_ticker(self, internal_ticker):
+        return internal_ticker
+
+    def convert_to_internal_ticker(self, source_ticker, default_exchange=None):
+        return source_ticker
+
+    def get_capabilities(self):
+        return [AdapterCapability(AssetType.STOCK, {Exchange.NASDAQ})]
+
+
+def _manager(threshold: int = 2, recovery: float = 30.0):
+    primary = _PriceAdapter(DataSource.YFINANCE, fail=True)
+    backup = _PriceAdapter(DataSource.AKSHARE)
+    manager = AdapterManager()
+    manager.router = TickerRouter(
+        failure_threshold=threshold, recovery_timeout=recovery
+    )
+    manager.register_adapter(primary)
+    manager.register_adapter(backup)
+    return manager, primary, backup
+
+
+def test_circuit_breaker_opens_and_probes():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.05)
+    assert breaker.record_failure() is False
+    assert breaker.record_failure() is True
+    assert breaker.state == CIRCUIT_OPEN
+    assert not breaker.allow_request()
+
+    time.sleep(0.06)
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    assert breaker.allow_request()
+    # Only one probe at a time
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CIRCUIT_CLOSED
+
+
+def test_open_circuit_skips_failing_adapter():
+    manager, primary, backup = _manager(threshold=2)
+
+    for _ in range(5):
+        assert manager.get_real_time_price("NASDAQ:AAPL") is not None
+
+    # The failing primary is only hit until its circuit opens
+    assert primary.calls == 2
+    assert backup.calls == 5
+    assert manager.get_adapter_for_ticker("NASDAQ:AAPL") is backup
+
+    metrics = manager.get_routing_metrics()
+    assert metrics["adapters"]["yfinance"]["state"] == CIRCUIT_OPEN
+    assert metrics["adapters"]["yfinance"]["failures"] == 2
+    assert metrics["failovers"] == 2
+
+
+def test_unknown_tickers_do_not_open_a_healthy_circuit():
+    manager, primary, backup = _manager(threshold=2)
+    primary.fail, primary.empty = False, True
+
+    # Misses fail over to the backup but never count against the primary
+    for i in range(10):
+        assert manager.get_real_time_price(f"NASDAQ:UNKNOWN{i}") is not None
+    assert primary.calls == 10
+    metrics = manager.get_routing_metrics()["adapters"]["yfinance"]
+    assert metrics["state"] == CIRCUIT_CLOSED
+    assert metrics["failures"] == 0
+
+    primary.empty = False
+    manager.get_real_time_price("NASDAQ:AAPL")
+    assert primary.calls == 11
+
+
+def test_empty_batches_open_the_circuit():
+    manager, primary, backup = _manager(threshold=2)
+    primary.fail, primary.empty = False, True
+
+    # A batch without a single price is a soft failure: four open the circuit
+    for i in range(4):
+        manager.get_multiple_prices([f"NASDAQ:A{i}", f"NASDAQ:B{i}"])
+    metrics = manager.get_routing_metrics()["adapters"]["yfinance"]
+    assert metrics["state"] == CIRCUIT_OPEN
+
+    calls = primary.calls
+    prices = manager.get_multiple_prices(["NASDAQ:AAPL", "NASDAQ:MSFT"])
+    assert primary.calls == calls
+    assert all(price is not None for price in prices.values())
+
+
+def test_recovered_adapter_becomes_primary_again():
+    manager, primary, backup = _manager(threshold=1, recovery=0.05)
+    manager.get_real_time_price("NASDAQ:AAPL")
+    assert manager.get_adapter_for_ticker("NASDAQ:AAPL") is backup
+
+    primary.fail = False
+    time.sleep(0.06)
+    # Half-open probe goes to the recovered adapter and closes its circuit
+    assert manager.get_real_time_price("NASDAQ:AAPL") is not None
+    assert manager.router.get_metrics()["adapters"]["yfinance"]["state"] == (
+        CIRCUIT_CLOSED
+    )
+
+
+def test_ticker_cache_is_bounded_lru():
+    router = TickerRouter(max_cached_tickers=2)
+    router.rebuild([_PriceAdapter(DataSource.YFINANCE)])
+
+    for symbol in ["AAPL", "MSFT", "AAPL", "TSLA"]:
+        assert router.primary(f"NASDAQ:{symbol}") is not None
+    assert router.primary("NYSE:IBM") is None
+
+    metrics = router.get_metrics()
+    assert metrics["cached_tickers"] == 2
+    assert metrics["cache_hits"] == 1
+    assert metrics["unroutable"] == 1
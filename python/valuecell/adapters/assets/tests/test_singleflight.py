@@ -0,0 +1,87 @@
+"""Tests for request coalescing and result caching."""
+
+import threading
+import time
+
+import pytest
+
+from valuecell.adapters.assets.singleflight import (
+    CoalescingCache,
+    ResultCache,
+    SingleFlight,
+)
+
+
+def test_single_flight_shares_concurrent_calls():
+    flight = SingleFlight()
+    calls = 0
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        nonlocal calls
+        calls += 1
+        started.set()
+        release.wait(timeout=5)
+        return "value"
+
+    results = []
+
+    def worker():
+        results.append(flight.do("key", slow))
+
+    leader = threading.Thread(target=worker)
+    leader.start()
+    started.wait(timeout=5)
+    followers = [threading.Thread(target=worker) for _ in range(4)]
+    for t in followers:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in [leader, *followers]:
+        t.join(timeout=5)
+
+    assert calls == 1
+    assert [value for value, _ in results] == ["value"] * 5
+    assert sum(1 for _, shared in results if shared) >= 4
+
+
+def test_single_flight_propagates_errors_and_does_not_stick():
+    flight = SingleFlight()
+
+    def boom():
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError):
+        flight.do("key", boom)
+
+    assert flight.do("key", lambda: 1) == (1, False)
+    assert flight.in_flight() == 0
+
+
+def test_result_cache_negative_ttl_and_eviction():
+    cache = ResultCache(ttl_seconds=60, negative_ttl_seconds=0, max_entries=2)
+
+    cache.set("missing", None)
+    assert cache.get("missing") is CoalescingCache.MISSING
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is CoalescingCache.MISSING
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_coalescing_cache_caches_not_found_results():
+    cache = CoalescingCache(ttl_seconds=60, negative_ttl_seconds=60)
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return None
+
+    assert cache.get_or_load(("asset_info", "NASDAQ:NOPE"), loader) is None
+    assert cache.get_or_load(("asset_info", "NASDAQ:NOPE"), loader) is None
+    assert len(calls) == 1
+    assert cache.get_stats()["hits"] == 1
@@ -0,0 +1,129 @@
+"""Tests for the local asset symbol index."""
+
+from typing import List
+
+from valuecell.adapters.assets.base import BaseDataAdapter
+from valuecell.adapters.assets.manager import AdapterManager
+from valuecell.adapters.assets.symbol_index import AssetSymbolIndex
+from valuecell.adapters.assets.types import (
+    AssetSearchQuery,
+    AssetSearchResult,
+    AssetType,
+    DataSource,
+    Exchange,
+)
+
+
+def _entry(ticker: str, **names: str) -> AssetSearchResult:
+    return AssetSymbolIndex.build_entry(
+        ticker, {k.replace("_", "-"): v for k, v in names.items()}
+    )
+
+
+def _index() -> AssetSymbolIndex:
+    index = AssetSymbolIndex()
+    index.add_many(
+        [
+            _entry("NASDAQ:AAPL", en_US="Apple Inc.", zh_Hans="苹果公司"),
+            _entry("NASDAQ:AAL", en_US="American Airlines Group"),
+            _entry("NYSE:APLE", en_US="Apple Hospitality REIT"),
+            _entry("SSE:600519", en_US="Kweichow Moutai", zh_Hans="贵州茅台"),
+        ]
+    )
+    return index
+
+
+def test_exact_symbol_ranks_first():
+    results = _index().search("aapl", limit=5)
+    assert results[0].ticker == "NASDAQ:AAPL"
+    assert results[0].relevance_score == 1.0
+
+
+def test_prefix_and_name_matches():
+    tickers = [r.ticker for r in _index().search("app", limit=5)]
+    assert set(tickers) == {"NASDAQ:AAPL", "NYSE:APLE"}
+
+    words = [r.ticker for r in _index().search("airlines")]
+    assert words == ["NASDAQ:AAL"]
+
+
+def test_localized_substring_and_ticker_lookup():
+    index = _index()
+    assert [r.ticker for r in index.search("茅台")] == ["SSE:600519"]
+    assert [r.ticker for r in index.search("ssE:600519")] == ["SSE:600519"]
+    assert index.search("nothing here") == []
+
+
+def test_update_merges_names_and_remove():
+    index = _index()
+    index.add(_entry("NASDAQ:AAL", zh_Hans="美国航空"))
+    assert index.search("美国")[0].names["en-US"] == "American Airlines Group"
+
+    assert index.remove("NASDAQ:AAL")
+    assert index.search("american") == []
+    assert len(index) == 3
+
+
+class _FakeAdapter(BaseDataAdapter):
+    def __init__(self, results: List[AssetSearchResult]):
+        self._results = results
+        self.search_calls = 0
+        super().__init__(DataSource.YFINANCE)
+
+    def _initialize(self) -> None:
+        pass
+
+    def search_assets(self, query):
+        self.search_calls += 1
+        return list(self._results)
+
+    def get_asset_info(self, ticker):
+        return None
+
+    def get_real_time_price(self, ticker):
+        return None
+
+    def get_historical_prices(self, ticker, start_date, end_date, interval="1d"):
+        return []
+
+    def convert_to_source_ticker(self, internal_ticker):
+        return internal_ticker
+
+    def convert_to_internal_ticker(self, source_ticker, default_exchange=None):
+        return source_ticker
+
+    def get_capabilities(self):
+        return []
+
+
+def test_manager_answers_from_index_and_learns_upstream_results():
+    adapter = _FakeAdapter(
+        [
+            AssetSearchResult(
+                ticker="NASDAQ:MSFT",
+                asset_type=AssetType.STOCK,
+                names={"en-US": "Microsoft Corporation"},
+                exchange=Exchange.NASDAQ.value,
+                country="US",
+            )
+        ]
+    )
+    manager = AdapterManager()
+    manager.register_adapter(adapter)
+    manager.symbol_index.add_many(_index().search("a", limit=10))
+    manager.symbol_index.mark_refreshed()
+
+    results = manager.search_assets(AssetSearchQuery(query="AAPL"))
+    assert results[0].ticker == "NASDAQ:AAPL"
+    assert adapter.search_calls == 0
+
+    # Miss: consult upstream once and remember the result
+    results = manager.search_assets(AssetSearchQuery(query="micro"))
+    assert [r.ticker for r in results] == ["NASDAQ:MSFT"]
+    assert adapter.search_calls == 1
+    assert "NASDAQ:MSFT" in manager.symbol_index
+
+    # Partial hits are merged with upstream results rather than answered alone
+    results = manager.search_assets(AssetSearchQuery(query="ap"))
+    assert adapter.search_calls == 2
+    assert {"NASDAQ:AAPL", "NASDAQ:MSFT"} <= {r.ticker for r in results}
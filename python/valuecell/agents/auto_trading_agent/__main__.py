@@ -24,6 +24,13 @@ from valuecell.core.agent.decorator import create_wrapped_agent
 
 from .agent import AutoTradingAgent
 
-if __name__ == "__main__":
+
+async def main():
     agent = create_wrapped_agent(AutoTradingAgent)
-    asyncio.run(agent.serve())
+    # Instances that were running when the agent stopped carry on
+    await agent.resume_instances()
+    await agent.serve()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,11 +3,15 @@
 import asyncio
 import json
 import logging
+import math
 import os
-from collections import deque
+import shutil
+from collections import defaultdict, deque
 from datetime import datetime, timezone
-from typing import Any, AsyncGenerator, Deque, Dict, List, Optional
+from itertools import islice
+from typing import Any, AsyncGenerator, Deque, Dict, List, Optional, Set, Tuple
 
+import numpy as np
 from agno.agent import Agent
 from agno.models.openrouter import OpenRouter
 
@@ -20,21 +24,48 @@ from valuecell.core.types import (
     StreamResponse,
 )
 
+from .component_stream import ComponentStream
 from .constants import (
+    BACKFILL_MAX_BARS,
+    DECISION_HISTORY_LIMIT,
     DEFAULT_AGENT_MODEL,
     DEFAULT_CHECK_INTERVAL,
+    DEFAULT_TICK_POLICY,
+    DEFAULT_TRADING_HISTORY_DIR,
+    DEFAULT_WORKER_PROCESSES,
+    DEFAULT_WORKER_SHARD_BY,
+    MAX_CONCURRENT_INSTANCE_CHECKS,
+    MAX_CONCURRENT_LLM_CALLS_PER_MODEL,
+    PORTFOLIO_CHART_MAX_POINTS,
+    SYMBOL_ANALYSIS_TIMEOUT,
+    TICK_MAX_JITTER,
 )
 from .formatters import MessageFormatter
+from .mark_price import get_mark_price_oracle
+from .market_snapshot import MarketSnapshotService
+from .market_stream import ensure_market_stream
 from .models import (
     AutoTradingConfig,
+    CashManagement,
+    Position,
+    TradeHistoryRecord,
     TradingRequest,
 )
+from .portfolio_chart import build_chart_rows, merge_series
 from .portfolio_decision_manager import (
     AssetAnalysis,
     PortfolioDecisionManager,
 )
-from .technical_analysis import AISignalGenerator, TechnicalAnalyzer
+from .technical_analysis import (
+    AISignalGenerator,
+    TechnicalAnalyzer,
+    describe_position,
+)
+from .tick_scheduler import TickScheduler, session_jitter
+from .timeseries import from_epoch_us
 from .trading_executor import TradingExecutor
+from .trading_store import InstanceUpdate, get_trading_state_store
+from .worker_pool import InstanceSync, TradingWorkerPool, apply_sync
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -56,16 +87,16 @@ class AutoTradingAgent(BaseAgent):
         # Configuration
         self.parser_model_id = os.getenv("TRADING_PARSER_MODEL_ID", DEFAULT_AGENT_MODEL)
 
-        # Multi-instance state management
-        # Structure: {session_id: {instance_id: TradingInstanceData}}
-        self.trading_instances: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._init_trading_state()
 
-        # Notification cache for batch sending
-        # Structure: {session_id: deque[FilteredCardPushNotificationComponentData]}
-        # Using deque with maxlen for automatic FIFO eviction
-        self.notification_cache: Dict[
-            str, Deque[FilteredCardPushNotificationComponentData]
-        ] = {}
+        # Worker processes hosting the instances (None: run them in-process)
+        processes = int(os.getenv("TRADING_WORKER_PROCESSES", DEFAULT_WORKER_PROCESSES))
+        if processes > 0:
+            self.worker_pool = TradingWorkerPool(
+                processes,
+                self._apply_worker_sync,
+                shard_by=os.getenv("TRADING_WORKER_SHARD_BY", DEFAULT_WORKER_SHARD_BY),
+            )
 
         try:
             # Parser agent for natural language query parsing
@@ -83,6 +114,76 @@ class AutoTradingAgent(BaseAgent):
             logger.error(f"Failed to initialize Auto Trading Agent: {e}")
             raise
 
+    @classmethod
+    def create_worker_host(cls, market_snapshots) -> "AutoTradingAgent":
+        """
+        Agent hosting trading instances inside a worker process.
+
+        It has no parser agent or worker pool of its own and reads market
+        snapshots published by the coordinator.
+
+        Args:
+            market_snapshots: Source of per-tick indicators (``get_indicators``)
+        """
+        host = cls.__new__(cls)
+        host._init_trading_state()
+        host.market_snapshots = market_snapshots
+        return host
+
+    def _init_trading_state(self):
+        """Initialize the state needed to run trading instances"""
+        # Multi-instance state management
+        # Structure: {session_id: {instance_id: TradingInstanceData}}
+        self.trading_instances: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+        # Notification cache for batch sending
+        # Structure: {session_id: deque[FilteredCardPushNotificationComponentData]}
+        # Using deque with maxlen for automatic FIFO eviction
+        self.notification_cache: Dict[
+            str, Deque[FilteredCardPushNotificationComponentData]
+        ] = {}
+
+        # LLM concurrency limits shared by all instances using the same model
+        # Structure: {model_id: asyncio.Semaphore}
+        self._llm_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+        # AI signal generators (agno agent + signal cache) reused per model
+        # Structure: {(model_id, api_key, cache_ttl): AISignalGenerator}
+        self._ai_signal_generators: Dict[Tuple, AISignalGenerator] = {}
+
+        # Notifications cached per session so far (the deque evicts old ones)
+        self.notification_counts: Dict[str, int] = {}
+
+        # Snapshot/delta streams of the status and chart components
+        # Structure: {component_id: ComponentStream}
+        self._component_streams: Dict[str, ComponentStream] = {}
+
+        # Last portfolio chart per session, reused until new snapshots arrive
+        # Structure: {session_id: (cache_key, chart_json)}
+        self._chart_cache: Dict[str, Tuple[List, str]] = {}
+
+        # Indicators computed once per (symbol, tick) and shared by instances
+        self.market_snapshots = MarketSnapshotService(
+            TechnicalAnalyzer.calculate_indicators
+        )
+        # Mark prices for valuations, published from the same snapshots
+        self.mark_prices = get_mark_price_oracle()
+
+        # State shared with the trading API (appended to after every check)
+        self.trading_store = get_trading_state_store()
+
+        self.worker_pool: Optional[TradingWorkerPool] = None
+
+        # Monitoring tick schedulers (and their lag metrics) per session
+        self.tick_schedulers: Dict[str, TickScheduler] = {}
+
+        # Serializes each session's saves to the trading state store
+        self._persist_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+        # Monitoring loops running without a stream (resumed after a restart
+        # or left behind by an interrupted stream)
+        self._background_tasks: Set[asyncio.Task] = set()
+
     async def _process_trading_instance(
         self,
         session_id: str,
@@ -144,57 +245,49 @@ class AutoTradingAgent(BaseAgent):
                 # Store AI exit plans per symbol for decision history
                 symbol_ai_exit_plans = {}
 
-                for symbol in config.crypto_symbols:
-                    # Calculate indicators
-                    indicators = TechnicalAnalyzer.calculate_indicators(symbol)
+                # With batching, the AI signals come with the portfolio
+                # decision in phase 2 instead of one request per symbol
+                batch_signals = bool(llm_client) and config.batch_ai_signals
+
+                # Analyze all symbols concurrently; a symbol that fails or
+                # times out is skipped instead of stalling the whole check
+                llm_semaphore = self._get_llm_semaphore(config.agent_model)
+                symbols = list(config.crypto_symbols)
+                results = await asyncio.gather(
+                    *(
+                        asyncio.wait_for(
+                            self._analyze_symbol(
+                                symbol,
+                                None if batch_signals else ai_signal_generator,
+                                llm_semaphore,
+                                unified_timestamp,
+                                executor.positions.get(symbol),
+                            ),
+                            timeout=SYMBOL_ANALYSIS_TIMEOUT,
+                        )
+                        for symbol in symbols
+                    ),
+                    return_exceptions=True,
+                )
 
-                    if indicators is None:
+                for symbol, result in zip(symbols, results):
+                    if isinstance(result, asyncio.TimeoutError):
+                        logger.warning(
+                            f"Skipping {symbol} - analysis timed out after "
+                            f"{SYMBOL_ANALYSIS_TIMEOUT}s"
+                        )
+                        continue
+                    if isinstance(result, Exception):
+                        logger.error(f"Skipping {symbol} - analysis failed: {result}")
+                        continue
+                    if result is None:
                         logger.warning(f"Skipping {symbol} - insufficient data")
                         continue
 
-                    # Generate technical signal
-                    technical_action, technical_trade_type = (
-                        TechnicalAnalyzer.generate_signal(indicators)
-                    )
-
-                    # Generate AI signal if enabled
-                    ai_action, ai_trade_type, ai_reasoning, ai_confidence, ai_exit_plan = (
-                        None,
-                        None,
-                        None,
-                        None,
-                        None,
-                    )
-
-                    if ai_signal_generator:
-                        ai_signal = await ai_signal_generator.get_signal(indicators)
-                        if ai_signal:
-                            (
-                                ai_action,
-                                ai_trade_type,
-                                ai_reasoning,
-                                ai_confidence,
-                                ai_exit_plan,
-                            ) = ai_signal
-                            # Store exit plan for decision history
-                            if ai_exit_plan:
-                                symbol_ai_exit_plans[symbol] = ai_exit_plan
-                            logger.info(
-                                f"AI signal for {symbol}: {ai_action.value} {ai_trade_type.value} "
-                                f"(confidence: {ai_confidence}%)"
-                            )
-
-                    # Create asset analysis
-                    asset_analysis = AssetAnalysis(
-                        symbol=symbol,
-                        indicators=indicators,
-                        technical_action=technical_action,
-                        technical_trade_type=technical_trade_type,
-                        ai_action=ai_action,
-                        ai_trade_type=ai_trade_type,
-                        ai_reasoning=ai_reasoning,
-                        ai_confidence=ai_confidence,
-                    )
+                    asset_analysis, ai_exit_plan = result
+                    # Store exit plan for decision history
+                    if ai_exit_plan:
+                        symbol_ai_exit_plans[symbol] = ai_exit_plan
 
                     # Add to portfolio manager
                     portfolio_manager.add_asset_analysis(asset_analysis)
@@ -203,11 +296,11 @@ class AutoTradingAgent(BaseAgent):
                     logger.info(
                         MessageFormatter.format_market_analysis_notification(
                             symbol,
-                            indicators,
+                            asset_analysis.indicators,
                             asset_analysis.recommended_action,
                             asset_analysis.recommended_trade_type,
                             executor.positions,
-                            ai_reasoning,
+                            asset_analysis.ai_reasoning,
                         )
                     )
 
@@ -222,11 +315,28 @@ class AutoTradingAgent(BaseAgent):
                 logger.info(portfolio_summary + "\n")
 
                 # Make coordinated decision (async call for AI analysis)
-                portfolio_decision = await portfolio_manager.make_portfolio_decision(
-                    current_positions=executor.positions,
-                    available_cash=executor.get_current_capital(),
-                    total_portfolio_value=executor.get_portfolio_value(),
-                )
+                if batch_signals:
+                    (
+                        portfolio_decision,
+                        batch_exit_plans,
+                    ) = await portfolio_manager.make_batched_decision(
+                        current_positions=executor.positions,
+                        available_cash=executor.get_current_capital(),
+                        total_portfolio_value=executor.get_portfolio_value(),
+                        signal_generator=ai_signal_generator,
+                        llm_semaphore=llm_semaphore,
+                    )
+                    symbol_ai_exit_plans.update(
+                        {s: plan for s, plan in batch_exit_plans.items() if plan}
+                    )
+                else:
+                    portfolio_decision = (
+                        await portfolio_manager.make_portfolio_decision(
+                            current_positions=executor.positions,
+                            available_cash=executor.get_current_capital(),
+                            total_portfolio_value=executor.get_portfolio_value(),
+                        )
+                    )
 
                 # Display decision reasoning - cache it
                 portfolio_decision_msg = FilteredCardPushNotificationComponentData(
@@ -251,20 +361,25 @@ class AutoTradingAgent(BaseAgent):
                         + "\n\n"
                     )
 
-                    for (
-                        symbol,
-                        action,
-                        trade_type,
-                    ) in portfolio_decision.trades_to_execute:
+                    # Validate the whole batch against the risk limits first
+                    rejections = executor.check_trades(
+                        portfolio_decision.trades_to_execute
+                    )
+
+                    for (symbol, action, trade_type), rejection in zip(
+                        portfolio_decision.trades_to_execute, rejections
+                    ):
                         # Get indicators for this symbol
                         asset_analysis = portfolio_manager.asset_analyses.get(symbol)
                         if not asset_analysis:
                             continue
 
-                        # Execute trade
-                        trade_details = executor.execute_trade(
-                            symbol, action, trade_type, asset_analysis.indicators
-                        )
+                        # Execute trade (unless the risk check rejected it)
+                        trade_details = None
+                        if rejection is None:
+                            trade_details = executor.execute_trade(
+                                symbol, action, trade_type, asset_analysis.indicators
+                            )
 
                         # Store for decision history
                         executed_trades_details[symbol] = {
@@ -295,7 +410,8 @@ class AutoTradingAgent(BaseAgent):
                             trade_message = FilteredCardPushNotificationComponentData(
                                 title=f"{config.agent_model} Trade",
                                 data=f"💰 **Trade Failed:** Could not execute {action.value} "
-                                f"{trade_type.value} on {symbol}\n",
+                                f"{trade_type.value} on {symbol}"
+                                f"{f' (risk check: {rejection})' if rejection else ''}\n",
                                 filters=[config.agent_model],
                                 table_title="Trade Detail",
                                 create_time=datetime.now(timezone.utc).strftime(
@@ -342,9 +458,8 @@ class AutoTradingAgent(BaseAgent):
                     if symbol in executor.positions:
                         pos = executor.positions[symbol]
                         try:
-                            import yfinance as yf
-                            ticker = yf.Ticker(symbol)
-                            current_price = float(ticker.history(period="1d", interval="1m")["Close"].iloc[-1])
+                            # Price fetched by this check's analysis
+                            current_price = float(indicators.close_price)
                             if pos.trade_type.value == "long":
                                 unrealized_pnl = (current_price - pos.entry_price) * abs(pos.quantity)
                             else:
@@ -423,17 +538,17 @@ class AutoTradingAgent(BaseAgent):
                 decision_entry["portfolio_state"] = {
                     "total_value": float(executor.get_portfolio_value()),
                     "available_cash": float(executor.get_current_capital()),
-                    "positions_value": sum(
-                        float(pos.notional) for pos in executor.positions.values()
-                    ),
+                    "positions_value": float(executor.get_exposure()["gross_exposure"]),
                     "positions_count": len(executor.positions),
                     "total_pnl": float(executor.get_portfolio_value() - config.initial_capital),
                 }
                 
-                # Save to decision history (keep last 500 entries)
+                # Save to decision history (keep the last entries only)
                 instance["decision_history"].append(decision_entry)
-                if len(instance["decision_history"]) > 500:
-                    instance["decision_history"] = instance["decision_history"][-500:]
+                if len(instance["decision_history"]) > DECISION_HISTORY_LIMIT:
+                    instance["decision_history"] = instance["decision_history"][
+                        -DECISION_HISTORY_LIMIT:
+                    ]
 
                 # Send portfolio update
                 portfolio_value = executor.get_portfolio_value()
@@ -453,12 +568,9 @@ class AutoTradingAgent(BaseAgent):
                     portfolio_msg += "\n**Open Positions:**\n"
                     for symbol, pos in executor.positions.items():
                         try:
-                            import yfinance as yf
-
-                            ticker = yf.Ticker(symbol)
-                            current_price = ticker.history(period="1d", interval="1m")[
-                                "Close"
-                            ].iloc[-1]
+                            current_price = executor.get_mark_price(symbol)
+                            if current_price is None:
+                                raise ValueError("no mark price")
                             if pos.trade_type.value == "long":
                                 current_pnl = (current_price - pos.entry_price) * abs(
                                     pos.quantity
@@ -486,6 +598,150 @@ class AutoTradingAgent(BaseAgent):
                 logger.error(f"Error processing trading instance {instance_id}: {e}")
                 # Don't raise - let other instances continue
 
+    async def _process_trading_instance_in_worker(
+        self, session_id: str, instance_id: str, unified_timestamp: datetime
+    ) -> None:
+        """Run an instance's check on its worker process"""
+        try:
+            await self.worker_pool.check(session_id, instance_id, unified_timestamp)
+        except Exception as e:
+            # A crashed worker is restarted with the instance restored from
+            # its mirror; the check is not retried
+            logger.error(f"Error processing trading instance {instance_id}: {e}")
+
+    def _apply_worker_sync(
+        self, session_id: str, instance_id: str, sync: InstanceSync
+    ) -> None:
+        """Apply the changes a worker reported to the instance's mirror"""
+        instance = self.trading_instances.get(session_id, {}).get(instance_id)
+        if instance is None:
+            return
+        apply_sync(instance, sync)
+        for notification in sync.notifications:
+            self._cache_notification(
+                session_id, FilteredCardPushNotificationComponentData(**notification)
+            )
+
+    async def _publish_market_snapshots(
+        self, symbols: List[str], unified_timestamp: datetime
+    ) -> None:
+        """
+        Compute the tick's indicators once and share them with the workers.
+
+        The coordinator's mark prices are updated from the same snapshots, so
+        its mirrors are valued at the prices the workers traded at.
+        """
+
+        async def publish(symbol: str):
+            try:
+                indicators = await asyncio.wait_for(
+                    self.market_snapshots.get_indicators(symbol, unified_timestamp),
+                    timeout=SYMBOL_ANALYSIS_TIMEOUT,
+                )
+            except Exception as e:
+                logger.error(f"Failed to get market snapshot of {symbol}: {e}")
+                indicators = None
+            if indicators is not None:
+                self.mark_prices.update(
+                    symbol, indicators.close_price, unified_timestamp
+                )
+            try:
+                self.worker_pool.publish(symbol, unified_timestamp, indicators)
+            except Exception as e:
+                # Workers miss this symbol's snapshot; the other symbols go on
+                logger.error(f"Failed to publish market snapshot of {symbol}: {e}")
+
+        await asyncio.gather(*(publish(symbol) for symbol in symbols))
+
+    def _get_llm_semaphore(self, model_id: Optional[str]) -> asyncio.Semaphore:
+        """Get the semaphore bounding concurrent LLM calls for a model."""
+        key = model_id or "default"
+        if key not in self._llm_semaphores:
+            self._llm_semaphores[key] = asyncio.Semaphore(
+                MAX_CONCURRENT_LLM_CALLS_PER_MODEL
+            )
+        return self._llm_semaphores[key]
+
+    async def _analyze_symbol(
+        self,
+        symbol: str,
+        ai_signal_generator: Optional[AISignalGenerator],
+        llm_semaphore: asyncio.Semaphore,
+        tick: Optional[datetime] = None,
+        position: Optional[Position] = None,
+    ) -> Optional[Tuple[AssetAnalysis, Optional[Dict[str, Any]]]]:
+        """
+        Run the technical and AI analysis for one symbol.
+
+        Market data is fetched in a worker thread so the blocking HTTP calls
+        do not hold up the event loop, and is shared with every other instance
+        analyzing the symbol for the same tick. The LLM call is bounded by the
+        model's semaphore.
+
+        Args:
+            symbol: Trading symbol
+            ai_signal_generator: AI signal generator, or None if disabled
+            llm_semaphore: Semaphore limiting concurrent calls to the model
+            tick: Monitoring tick the analysis belongs to
+            position: The instance's open position in the symbol, if any
+
+        Returns:
+            Tuple of (asset analysis, AI exit plan), or None if there is not
+            enough market data
+        """
+        # Calculate indicators
+        indicators = await self.market_snapshots.get_indicators(symbol, tick)
+        if indicators is None:
+            return None
+        self.mark_prices.update(symbol, indicators.close_price, tick)
+
+        # Generate technical signal
+        technical_action, technical_trade_type = TechnicalAnalyzer.generate_signal(
+            indicators
+        )
+
+        # Generate AI signal if enabled
+        ai_action, ai_trade_type, ai_reasoning, ai_confidence, ai_exit_plan = (
+            None,
+            None,
+            None,
+            None,
+            None,
+        )
+
+        if ai_signal_generator:
+            current_position = None
+            if position is not None:
+                current_position = describe_position(position, indicators.close_price)
+            async with llm_semaphore:
+                ai_signal = await ai_signal_generator.get_signal(
+                    indicators, current_position=current_position
+                )
+            if ai_signal:
+                (
+                    ai_action,
+                    ai_trade_type,
+                    ai_reasoning,
+                    ai_confidence,
+                    ai_exit_plan,
+                ) = ai_signal
+                logger.info(
+                    f"AI signal for {symbol}: {ai_action.value} {ai_trade_type.value} "
+                    f"(confidence: {ai_confidence}%)"
+                )
+
+        asset_analysis = AssetAnalysis(
+            symbol=symbol,
+            indicators=indicators,
+            technical_action=technical_action,
+            technical_trade_type=technical_trade_type,
+            ai_action=ai_action,
+            ai_trade_type=ai_trade_type,
+            ai_reasoning=ai_reasoning,
+            ai_confidence=ai_confidence,
+        )
+        return asset_analysis, ai_exit_plan
+
     def _generate_instance_id(self, task_id: str, model_id: str) -> str:
         """
         Generate unique instance ID for a specific model
@@ -530,6 +786,9 @@ class AutoTradingAgent(BaseAgent):
         """
         self._init_notification_cache(session_id)
         self.notification_cache[session_id].append(notification)
+        self.notification_counts[session_id] = (
+            self.notification_counts.get(session_id, 0) + 1
+        )
         logger.debug(
             f"Cached notification for session {session_id}. "
             f"Cache size: {len(self.notification_cache[session_id])}"
@@ -560,6 +819,9 @@ class AutoTradingAgent(BaseAgent):
         """
         if session_id in self.notification_cache:
             self.notification_cache[session_id].clear()
+            # The next status update must replace, not extend, the feed
+            self._component_streams.pop(f"trading_status_{session_id}", None)
+            self.notification_counts.pop(session_id, None)
             logger.info(f"Cleared notification cache for session {session_id}")
 
     async def _parse_trading_request(self, query: str) -> TradingRequest:
@@ -611,12 +873,21 @@ class AutoTradingAgent(BaseAgent):
     def _initialize_ai_signal_generator(
         self, config: AutoTradingConfig
     ) -> Optional[AISignalGenerator]:
-        """Initialize AI signal generator if configured"""
+        """Initialize AI signal generator if configured (one per model)"""
         if not config.use_ai_signals:
             return None
 
+        key = (
+            config.agent_model,
+            config.openrouter_api_key,
+            config.signal_cache_ttl,
+        )
+        if key in self._ai_signal_generators:
+            return self._ai_signal_generators[key]
+
         try:
             from valuecell.utils.model import get_model
+
             # 使用 get_model() 以支持 Qwen/DeepSeek
             # 如果配置了特定模型，使用配置的模型；否则使用默认
             if config.agent_model and config.agent_model != DEFAULT_AGENT_MODEL:
@@ -639,7 +910,9 @@ class AutoTradingAgent(BaseAgent):
                 # 使用默认模型（通过 get_model 支持 Qwen/DeepSeek）
                 llm_client = get_model("TRADING_PARSER_MODEL_ID")
             
-            return AISignalGenerator(llm_client)
+            generator = AISignalGenerator(llm_client, config.signal_cache_ttl)
+            self._ai_signal_generators[key] = generator
+            return generator
 
         except Exception as e:
             logger.error(f"Failed to initialize AI signal generator: {e}")
@@ -660,20 +933,12 @@ class AutoTradingAgent(BaseAgent):
 
     def _get_position_history_data(self, executor: "TradingExecutor", positions: Dict[str, "Position"]) -> List[Dict]:
         """Get position history data with current prices and PnL"""
-        import yfinance as yf
-        
         position_list = []
         for symbol, pos in positions.items():
-            try:
-                # Get current price
-                ticker = yf.Ticker(symbol)
-                data = ticker.history(period="1d", interval="1m")
-                if not data.empty:
-                    current_price = float(data["Close"].iloc[-1])
-                else:
-                    current_price = pos.entry_price
-            except Exception as e:
-                logger.debug(f"Failed to get current price for {symbol}, using entry_price: {e}")
+            # Get current price (cached mark, entry price if unavailable)
+            current_price = executor.get_mark_price(symbol)
+            if current_price is None:
+                logger.debug(f"No mark price for {symbol}, using entry_price")
                 current_price = pos.entry_price
             
             # Calculate unrealized PnL
@@ -695,90 +960,443 @@ class AutoTradingAgent(BaseAgent):
         
         return position_list
 
-    def _save_trading_data_to_file(self):
+    def _collect_instance_update(
+        self, session_id: str, instance_id: str, instance: Dict[str, Any]
+    ) -> Tuple[InstanceUpdate, Dict[str, Any]]:
+        """
+        Collect what changed for an instance since its last save.
+
+        Per-instance cursors in ``instance["persisted"]`` track the last saved
+        portfolio snapshot, trade and decision, so each save only carries the
+        new ones.
+
+        Returns:
+            Tuple of (update, cursors to store once the update is saved)
+        """
+        executor: TradingExecutor = instance["executor"]
+        config: AutoTradingConfig = instance["config"]
+        cursor = instance.setdefault(
+            "persisted", {"portfolio_ts": None, "trades": 0, "check_number": 0}
+        )
+
+        total_value, positions_value, total_pnl = (
+            executor._position_manager.calculate_portfolio_value()
+        )
+
+        # New portfolio snapshots (the series is ordered by ts)
+        series = executor.get_portfolio_series()
+        if cursor["portfolio_ts"] is not None:
+            start = np.searchsorted(series["ts"], cursor["portfolio_ts"], side="right")
+            series = series[start:]
+        portfolio_rows = [
+            (
+                int(row["ts"]),
+                from_epoch_us(row["ts"], bool(row["tz_aware"])).isoformat(),
+                float(row["total_value"]),
+                float(row["cash"]),
+                float(row["positions_value"]),
+                float(row["total_pnl"]),
+                int(row["positions_count"]),
+            )
+            for row in series
+        ]
+
+        new_trades = executor.get_trades_since(cursor["trades"])
+        trades = [
+            (
+                cursor["trades"] + i,
+                {
+                    "timestamp": trade.timestamp.isoformat(),
+                    "symbol": str(trade.symbol),
+                    "action": str(trade.action),
+                    "trade_type": str(trade.trade_type),
+                    "price": float(trade.price),
+                    "quantity": float(trade.quantity),
+                    "notional": float(trade.notional),
+                    "pnl": float(trade.pnl) if trade.pnl is not None else None,
+                    "portfolio_value_after": float(trade.portfolio_value_after),
+                    "cash_after": float(trade.cash_after),
+                },
+            )
+            for i, trade in enumerate(new_trades)
+        ]
+
+        decisions = []
+        for decision in reversed(instance.get("decision_history", [])):
+            if decision.get("check_number", 0) <= cursor["check_number"]:
+                break
+            decisions.append(self._clean_for_json(decision))
+        decisions.reverse()
+
+        created_at = instance.get("created_at")
+        if isinstance(created_at, datetime):
+            created_at = created_at.isoformat()
+
+        # Resume checkpoint: the state is rewritten only when it changed
+        # (i.e. after trades), the cursor after every check
+        cash, positions = executor.get_state()
+        state = {
+            "config": config.model_dump(mode="json", exclude={"openrouter_api_key"}),
+            "cash": cash.model_dump(mode="json"),
+            "positions": [p.model_dump(mode="json") for p in positions.values()],
+            "history_dir": instance.get("history_dir"),
+            "created_at": created_at,
+            # The key itself is not stored; the instance needs it to resume
+            "request_api_key": config.openrouter_api_key is not None
+            or instance.get("request_api_key", False),
+        }
+        state_json = json.dumps(state, sort_keys=True)
+        last_tick = instance.get("last_tick")
+        last_check = instance.get("last_check")
+
+        update = InstanceUpdate(
+            instance_id=instance_id,
+            session_id=session_id,
+            agent_model=config.agent_model,
+            config={
+                "initial_capital": config.initial_capital,
+                "crypto_symbols": config.crypto_symbols,
+                "agent_model": config.agent_model,
+                "use_ai_signals": config.use_ai_signals,
+                "check_interval": config.check_interval,
+                "risk_per_trade": config.risk_per_trade,
+                "max_positions": config.max_positions,
+            },
+            created_at=created_at,
+            active=instance["active"],
+            initial_capital=config.initial_capital,
+            total_value=float(total_value),
+            positions_value=float(positions_value),
+            total_pnl=float(total_pnl),
+            available_cash=float(executor.current_capital),
+            check_count=instance["check_count"],
+            updated_at=datetime.now(timezone.utc).isoformat(),
+            portfolio_rows=portfolio_rows,
+            trades=trades,
+            decisions=decisions,
+            positions=self._get_position_history_data(executor, executor.positions),
+        )
+
+        # Cursors only advance after a successful save; a failed save is
+        # rolled back and its changes are sent again with the next one
+        update_cursor = {
+            "portfolio_ts": portfolio_rows[-1][0]
+            if portfolio_rows
+            else cursor["portfolio_ts"],
+            "trades": cursor["trades"] + len(trades),
+            "check_number": decisions[-1]["check_number"]
+            if decisions
+            else cursor["check_number"],
+            "state": state_json,
+        }
+        if state_json != cursor.get("state"):
+            update.checkpoint_state = state
+        update.checkpoint_cursor = {
+            "portfolio_ts": update_cursor["portfolio_ts"],
+            "trades": update_cursor["trades"],
+            "check_number": update_cursor["check_number"],
+            "last_tick": last_tick.isoformat() if last_tick else None,
+            "last_check": last_check.isoformat() if last_check else None,
+        }
+        return update, update_cursor
+
+    async def _persist_trading_state(self, session_id: Optional[str] = None):
+        """
+        Append the changes of the last check to the trading state store.
+
+        Only the instances of the given session are collected, so a check
+        costs no more than its own session's instances. The trading API reads
+        instances, history and decisions from the same store.
+
+        Args:
+            session_id: Session whose instances to persist (None for all)
+        """
+        if session_id is None:
+            for session_id in list(self.trading_instances):
+                await self._persist_trading_state(session_id)
+            return
+
+        # One save per session at a time keeps a change from being sent
+        # twice before its cursor advances
+        async with self._persist_locks[session_id]:
+            try:
+                pending = []
+                instances = self.trading_instances.get(session_id, {})
+                for instance_id, instance in list(instances.items()):
+                    update, cursor = self._collect_instance_update(
+                        session_id, instance_id, instance
+                    )
+                    pending.append((instance, update, cursor))
+
+                await self.trading_store.save_updates(
+                    [update for _, update, _ in pending]
+                )
+
+                for instance, _, cursor in pending:
+                    instance["persisted"] = cursor
+
+                logger.debug(
+                    f"Persisted trading state for {len(pending)} instances "
+                    f"of session {session_id}"
+                )
+
+            except Exception as e:
+                logger.error(f"Failed to persist trading state: {e}")
+
+    # ============ Resume After Restart ============
+
+    async def resume_instances(self) -> int:
         """
-        Save all trading instances data to file for API access
-        This enables the monitoring dashboard to access trading data
+        Resume the instances that were running when the agent stopped.
+
+        Instances are rebuilt from their checkpoints in the trading state
+        store. Each session then runs its monitoring loop in the background,
+        after recording the bars missed while the agent was down.
+
+        Returns:
+            Number of resumed instances
         """
         try:
-            data = {
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-                "instances": []
-            }
-            
-            for session_id, instances in self.trading_instances.items():
-                for instance_id, instance in instances.items():
-                    executor: TradingExecutor = instance["executor"]
-                    config: AutoTradingConfig = instance["config"]
-                    
-                    # Get current portfolio state
-                    portfolio_summary = executor.get_portfolio_summary()
-                    portfolio_history = executor.get_portfolio_history()
-                    trade_history = executor.get_trade_history()
-                    positions = executor.positions  # Use property, not method
-                    
-                    # Calculate current values
-                    total_value, positions_value, total_pnl = executor._position_manager.calculate_portfolio_value()
-                    
-                    instance_data = {
-                        "instance_id": instance_id,
-                        "session_id": session_id,
-                        "active": instance["active"],
-                        "created_at": (
-                            instance.get("created_at").isoformat() 
-                            if instance.get("created_at") and isinstance(instance.get("created_at"), datetime)
-                            else (instance.get("created_at") if isinstance(instance.get("created_at"), str) else datetime.now(timezone.utc).isoformat())
-                        ),
-                        "config": {
-                            "initial_capital": config.initial_capital,
-                            "crypto_symbols": config.crypto_symbols,
-                            "agent_model": config.agent_model,
-                            "use_ai_signals": config.use_ai_signals,
-                            "check_interval": config.check_interval,
-                            "risk_per_trade": config.risk_per_trade,
-                            "max_positions": config.max_positions,
-                        },
-                        "portfolio_history": [
-                            {
-                                "timestamp": (snapshot.timestamp.isoformat() if hasattr(snapshot.timestamp, "isoformat") and isinstance(snapshot.timestamp, datetime) else str(snapshot.timestamp)),
-                                "total_value": float(snapshot.total_value),
-                                "cash": float(snapshot.cash),
-                                "positions_value": float(snapshot.positions_value),
-                                "total_pnl": float(snapshot.total_pnl),
-                                "positions_count": int(snapshot.positions_count),
-                            }
-                            for snapshot in portfolio_history[-100:]  # Last 100 snapshots
-                        ],
-                        "trade_history": [
-                            {
-                                "timestamp": (trade.timestamp.isoformat() if hasattr(trade.timestamp, "isoformat") and isinstance(trade.timestamp, datetime) else str(trade.timestamp)),
-                                "symbol": str(trade.symbol),
-                                "action": trade.action if isinstance(trade.action, str) else str(trade.action),
-                                "trade_type": trade.trade_type if isinstance(trade.trade_type, str) else str(trade.trade_type),
-                                "price": float(trade.price),
-                                "quantity": float(trade.quantity),
-                                "notional": float(trade.notional),
-                                "pnl": float(trade.pnl) if hasattr(trade, 'pnl') and trade.pnl is not None else None,
-                            }
-                            for trade in trade_history[-50:]  # Last 50 trades
-                        ],
-                        "position_history": self._get_position_history_data(executor, positions),
-                        "decision_history": self._clean_for_json(instance.get("decision_history", []))[-100:],  # Last 100 decisions
-                    }
-                    
-                    data["instances"].append(instance_data)
-            
-            # Save to file
-            file_path = "/tmp/valuecell_trading_data.json"
-            # Clean all datetime objects before JSON serialization
-            cleaned_data = self._clean_for_json(data)
-            with open(file_path, "w") as f:
-                json.dump(cleaned_data, f, indent=2)
-            
-            logger.debug(f"Saved trading data for {len(data['instances'])} instances to {file_path}")
-        
+            records = await self.trading_store.load_checkpoints()
+        except Exception as e:
+            logger.error(f"Failed to load trading checkpoints: {e}")
+            return 0
+
+        sessions: Dict[str, List[str]] = {}
+        failed: List[str] = []
+        for record in records:
+            session_id = record["session_id"]
+            instance_id = record["instance_id"]
+            if instance_id in self.trading_instances.get(session_id, {}):
+                continue
+            try:
+                instance = self._restore_instance(record)
+            except Exception as e:
+                logger.error(f"Failed to restore instance {instance_id}: {e}")
+                failed.append(instance_id)
+                continue
+            self.trading_instances.setdefault(session_id, {})[instance_id] = instance
+            sessions.setdefault(session_id, []).append(instance_id)
+
+        # Instances that cannot be resumed are stopped rather than left
+        # active in the store with nothing running them
+        try:
+            await self.trading_store.deactivate_instances(failed)
+        except Exception as e:
+            logger.error(f"Failed to deactivate unresumable instances: {e}")
+
+        for session_id, instance_ids in sessions.items():
+            self._init_notification_cache(session_id)
+            self._run_in_background(session_id, instance_ids, recover=True)
+
+        resumed = sum(len(ids) for ids in sessions.values())
+        logger.info(f"Resumed {resumed} trading instances in {len(sessions)} sessions")
+        return resumed
+
+    def _restore_instance(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Rebuild an instance from its checkpoint and trade history.
+
+        Raises:
+            ValueError: If the instance cannot trade as it did before the
+                        restart (its AI signals would be lost)
+        """
+        state = record["state"]
+        cursor = record["cursor"]
+        config = AutoTradingConfig(**state["config"])
+        history_dir = state.get("history_dir")
+
+        # API keys that came with the request are not checkpointed
+        if (
+            config.use_ai_signals
+            and state.get("request_api_key")
+            and not os.getenv("OPENROUTER_API_KEY")
+        ):
+            raise ValueError(
+                "its OpenRouter API key came with the request and "
+                "OPENROUTER_API_KEY is not set"
+            )
+        ai_signal_generator = (
+            None if self.worker_pool else self._initialize_ai_signal_generator(config)
+        )
+        if config.use_ai_signals and not self.worker_pool and not ai_signal_generator:
+            raise ValueError("its AI signal generator could not be initialized")
+
+        executor = TradingExecutor(
+            config, history_dir=None if self.worker_pool else history_dir
+        )
+        positions = {}
+        for data in state["positions"]:
+            position = Position(**data)
+            positions[position.symbol] = position
+        trades = [
+            TradeHistoryRecord(
+                **{
+                    **trade,
+                    "timestamp": datetime.fromisoformat(trade["timestamp"]),
+                    "portfolio_value_after": trade["portfolio_value_after"] or 0.0,
+                    "cash_after": trade["cash_after"] or 0.0,
+                }
+            )
+            for trade in record["trades"]
+        ]
+        executor.restore_state(CashManagement(**state["cash"]), positions, trades)
+
+        def parse(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+
+        return {
+            "instance_id": record["instance_id"],
+            "config": config,
+            "executor": executor,
+            "ai_signal_generator": ai_signal_generator,
+            "active": True,
+            "created_at": parse(state.get("created_at")) or datetime.now(),
+            "check_count": record["check_count"],
+            "last_check": parse(cursor.get("last_check")),
+            "last_tick": parse(cursor.get("last_tick")),
+            "decision_history": [],
+            "history_dir": history_dir,
+            "request_api_key": state.get("request_api_key", False),
+            # Everything up to the checkpoint is already stored
+            "persisted": {
+                "portfolio_ts": cursor["portfolio_ts"],
+                "trades": cursor["trades"],
+                "check_number": cursor["check_number"],
+                "state": json.dumps(state, sort_keys=True),
+            },
+        }
+
+    def _run_in_background(
+        self, session_id: str, instance_ids: List[str], recover: bool
+    ) -> None:
+        """Monitor instances of a session without a stream until they are stopped"""
+        task = asyncio.create_task(
+            self._run_resumed_session(session_id, instance_ids, recover=recover)
+        )
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _run_resumed_session(
+        self, session_id: str, instance_ids: List[str], recover: bool = True
+    ):
+        """
+        Monitor instances of a session in the background until they are stopped.
+
+        Args:
+            session_id: Session ID
+            instance_ids: Instances to monitor
+            recover: Whether the instances were rebuilt after a restart (their
+                     worker placement and missed bars are recovered first)
+        """
+        instances = self.trading_instances[session_id]
+        symbols = sorted(
+            {s for i in instance_ids for s in instances[i]["config"].crypto_symbols}
+        )
+        try:
+            if recover and self.worker_pool:
+                # Workers recover the file history themselves; the bars missed
+                # while the agent was down are not backfilled
+                for instance_id in instance_ids:
+                    await self.worker_pool.add_instance(
+                        session_id, instance_id, instances[instance_id], None
+                    )
+            elif recover:
+                await self._backfill_missed_bars(session_id, instance_ids)
+            ensure_market_stream(symbols)
+            await self._persist_trading_state(session_id)
+
+            async for _ in self._monitor_instances(session_id, instance_ids, symbols):
+                # Nobody streams these instances; their updates are read back
+                # through the trading API
+                pass
         except Exception as e:
-            logger.error(f"Failed to save trading data to file: {e}")
+            logger.error(f"Background session {session_id} failed: {e}")
+        finally:
+            if self.worker_pool:
+                for instance_id in instance_ids:
+                    await self.worker_pool.remove_instance(session_id, instance_id)
+
+    async def _backfill_missed_bars(
+        self,
+        session_id: str,
+        instance_ids: List[str],
+        ticks: Optional[List[datetime]] = None,
+    ) -> int:
+        """
+        Record portfolio snapshots for the bars missed while the agent was down
+        (or for the ticks a slow check overran, with the catch_up policy).
+
+        Open positions are valued at the close of each missed bar (the last
+        known close when a bar is missing); no checks or trades are run for
+        them. Bars before the first close available for every held symbol are
+        skipped rather than valued at today's prices, since the kline cache
+        only reaches back a limited number of bars. Closes are fetched once
+        per held symbol for all instances.
+
+        Args:
+            session_id: Session ID
+            instance_ids: Resumed instances of the session
+            ticks: Bars to record (default: every bar after each instance's
+                   last tick up to the latest closed one)
+
+        Returns:
+            Number of bars backfilled over all instances
+        """
+        instances = [self.trading_instances[session_id][i] for i in instance_ids]
+        instances = [i for i in instances if i.get("last_tick")]
+        if not instances:
+            return 0
+
+        interval = DEFAULT_CHECK_INTERVAL
+        latest = math.floor(datetime.now().timestamp() / interval) * interval
+        since = min(i["last_tick"] for i in instances)
+        symbols = {s for i in instances for s in i["executor"].positions}
+
+        async def fetch(symbol: str):
+            try:
+                return symbol, await asyncio.to_thread(
+                    TechnicalAnalyzer.get_bar_closes, symbol, since
+                )
+            except Exception as e:
+                logger.warning(f"Failed to fetch missed bars of {symbol}: {e}")
+                return symbol, []
+
+        closes = {
+            symbol: {t.timestamp(): close for t, close in bars}
+            for symbol, bars in await asyncio.gather(*(fetch(s) for s in symbols))
+        }
+
+        backfilled = 0
+        for instance in instances:
+            executor: TradingExecutor = instance["executor"]
+            if ticks is None:
+                first = instance["last_tick"].timestamp() + interval
+                missed = max(int((latest - first) // interval) + 1, 0)
+                if missed > BACKFILL_MAX_BARS:
+                    first += (missed - BACKFILL_MAX_BARS) * interval
+                    missed = BACKFILL_MAX_BARS
+                bars = [first + k * interval for k in range(missed)]
+            else:
+                bars = [t.timestamp() for t in ticks if t > instance["last_tick"]]
+
+            held = list(executor.positions)
+            prices: Dict[str, float] = {}
+            for tick in bars:
+                for symbol in held:
+                    close = closes.get(symbol, {}).get(tick)
+                    if close is not None:
+                        prices[symbol] = close
+                if len(prices) < len(held):
+                    continue
+                timestamp = datetime.fromtimestamp(tick)
+                executor.snapshot_positions(timestamp, prices)
+                executor.snapshot_portfolio(timestamp, prices)
+                instance["last_tick"] = timestamp
+                backfilled += 1
+
+        logger.info(f"Backfilled {backfilled} missed bars in session {session_id}")
+        return backfilled
 
     def _get_instance_status_component_data(
         self, session_id: str, instance_id: str
@@ -819,6 +1437,16 @@ class AutoTradingAgent(BaseAgent):
         output.append(
             f"- Status: {'🟢 Active' if instance['active'] else '🔴 Stopped'}"
         )
+        ai_signal_generator = instance.get("ai_signal_generator")
+        cache_stats = (
+            ai_signal_generator.get_cache_stats() if ai_signal_generator else None
+        )
+        if cache_stats:
+            output.append(
+                f"- AI Signal Cache: {cache_stats['hit_rate'] * 100:.1f}% hit rate "
+                f"({cache_stats['hits'] + cache_stats['shared']} reused, "
+                f"{cache_stats['llm_calls']} LLM calls)"
+            )
 
         # Portfolio Summary Section
         output.append("\n💰 **Portfolio Summary**")
@@ -835,6 +1463,26 @@ class AutoTradingAgent(BaseAgent):
         output.append("\n**Cash Position**")
         output.append(f"- Available Cash: `${available_cash:,.2f}`")
 
+        # Exposure from the risk engine's aggregates (entry notionals)
+        exposure = executor.get_exposure()
+        output.append("\n**Exposure**")
+        output.append(
+            f"- Gross: `${exposure['gross_exposure']:,.2f}` "
+            f"({exposure['gross_exposure_ratio'] * 100:.1f}% of cash at risk)"
+        )
+        output.append(
+            f"- Net: `${exposure['net_exposure']:,.2f}` "
+            f"({exposure['long']['count']} long / {exposure['short']['count']} short)"
+        )
+        if exposure["by_bucket"]:
+            output.append(
+                "- By Bucket: "
+                + ", ".join(
+                    f"{bucket} `${notional:,.2f}`"
+                    for bucket, notional in sorted(exposure["by_bucket"].items())
+                )
+            )
+
         # Current Positions Section
         output.append(f"\n📈 **Current Positions ({len(executor.positions)})**")
 
@@ -848,12 +1496,9 @@ class AutoTradingAgent(BaseAgent):
 
             for symbol, pos in executor.positions.items():
                 try:
-                    import yfinance as yf
-
-                    ticker = yf.Ticker(symbol)
-                    current_price = ticker.history(period="1d", interval="1m")[
-                        "Close"
-                    ].iloc[-1]
+                    current_price = executor.get_mark_price(symbol)
+                    if current_price is None:
+                        raise ValueError("no mark price")
 
                     # Calculate unrealized P&L
                     if pos.trade_type.value == "long":
@@ -898,10 +1543,43 @@ class AutoTradingAgent(BaseAgent):
         )
         return component_data
 
-    def _get_session_portfolio_chart_data(self, session_id: str) -> str:
+    def _collect_session_portfolio_series(
+        self, session_id: str
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, float], List]:
+        """
+        Collect the portfolio value history of a session's instances, per model
+
+        Returns:
+            (model -> ts-sorted history rows, model -> initial capital,
+             key identifying the collected history)
+        """
+        model_series: Dict[str, List[np.ndarray]] = {}
+        initial_values: Dict[str, float] = {}
+        history_key = []
+
+        for instance_id, instance in self.trading_instances[session_id].items():
+            executor: TradingExecutor = instance["executor"]
+            config: AutoTradingConfig = instance["config"]
+            model_id = config.agent_model
+
+            series = executor.get_portfolio_series()
+            model_series.setdefault(model_id, []).append(series)
+            initial_values.setdefault(model_id, config.initial_capital)
+            history_key.append(
+                (instance_id, len(series), int(series["ts"][-1]) if len(series) else 0)
+            )
+
+        merged = {
+            model_id: merge_series(parts) for model_id, parts in model_series.items()
+        }
+        return merged, initial_values, history_key
+
+    def _get_session_portfolio_chart_data(
+        self, session_id: str, max_points: Optional[int] = PORTFOLIO_CHART_MAX_POINTS
+    ) -> str:
         """
         Generate FilteredLineChartComponentData for all instances in a session
-        Uses forward-fill strategy to handle missing timestamps
+        Values are joined as-of each timestamp, so gaps are forward-filled
 
         Data format:
         [
@@ -911,92 +1589,142 @@ class AutoTradingAgent(BaseAgent):
             ...
         ]
 
+        The chart is cached until one of the instances records a new
+        snapshot.
+
+        Args:
+            session_id: Session ID
+            max_points: Downsample to at most this many timestamps (None = all)
+
         Returns:
             JSON string of FilteredLineChartComponentData
         """
         if session_id not in self.trading_instances:
             return ""
 
-        # Collect portfolio value history from all instances
-        # Store as {model_id: {'initial_capital': float, 'history': [(timestamp, value)]}}
-        model_data = {}
-
-        for instance_id, instance in self.trading_instances[session_id].items():
-            executor: TradingExecutor = instance["executor"]
-            config: AutoTradingConfig = instance["config"]
-            model_id = config.agent_model
-
-            if model_id not in model_data:
-                model_data[model_id] = {
-                    "initial_capital": config.initial_capital,
-                    "history": [],
-                }
-
-            portfolio_history = executor.get_portfolio_history()
+        series, initial_values, cache_key = self._collect_session_portfolio_series(
+            session_id
+        )
+        cache_key = [max_points] + cache_key
 
-            for snapshot in portfolio_history:
-                model_data[model_id]["history"].append(
-                    (snapshot.timestamp, snapshot.total_value)
-                )
+        cached = self._chart_cache.get(session_id)
+        if cached is not None and cached[0] == cache_key:
+            return cached[1]
 
-        if not model_data:
+        data_array = build_chart_rows(series, initial_values, max_points)
+        if not data_array:
             return ""
 
-        # Sort each model's history by timestamp
-        for model_id in model_data:
-            model_data[model_id]["history"].sort(key=lambda x: x[0])
+        component_data = FilteredLineChartComponentData(
+            title=f"Portfolio Value History - Session {session_id[:8]}",
+            data=json.dumps(data_array),
+            create_time=datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+        )
 
-        # Collect all unique timestamps across all models
-        all_timestamps = set()
-        for model_id, data in model_data.items():
-            for timestamp, _ in data["history"]:
-                all_timestamps.add(timestamp)
+        chart_json = component_data.model_dump_json()
+        self._chart_cache[session_id] = (cache_key, chart_json)
+        return chart_json
+
+    def _get_component_stream(
+        self, component_id: str, component_type: str
+    ) -> ComponentStream:
+        """Get (or start) the snapshot/delta stream of a component"""
+        stream = self._component_streams.get(component_id)
+        if stream is None:
+            stream = ComponentStream(component_id, component_type)
+            self._component_streams[component_id] = stream
+        return stream
+
+    def _reset_component_streams(self, session_id: str) -> None:
+        """Start a session's components over with full snapshots"""
+        self._component_streams.pop(f"trading_status_{session_id}", None)
+        self._component_streams.pop(f"portfolio_chart_{session_id}", None)
+
+    def _get_notification_update(self, session_id: str) -> Optional[StreamResponse]:
+        """
+        Get the trading status update for notifications cached since the
+        previous update
 
-        if not all_timestamps:
-            return ""
+        Returns:
+            Snapshot or append delta of the notification feed, or None if
+            nothing was added
+        """
+        cache = self.notification_cache.get(session_id)
+        if not cache:
+            return None
 
-        sorted_timestamps = sorted(all_timestamps)
-        model_ids = list(model_data.keys())
+        stream = self._get_component_stream(
+            f"trading_status_{session_id}",
+            ComponentType.FILTERED_CARD_PUSH_NOTIFICATION,
+        )
+        total = self.notification_counts.get(session_id, 0)
+        new_count = total - (stream.cursor or 0)
+        if new_count <= 0:
+            return None
 
-        # Build data array with forward-fill strategy
-        # First row: ['Time', 'model1', 'model2', ...]
-        data_array = [["Time"] + model_ids]
+        if stream.needs_snapshot or new_count > len(cache):
+            logger.info(
+                f"Sending {len(cache)} cached notifications for session {session_id}"
+            )
+            response = stream.snapshot(
+                json.dumps([notif.model_dump() for notif in cache])
+            )
+        else:
+            new_notifications = islice(cache, len(cache) - new_count, None)
+            response = stream.append(
+                [notif.model_dump() for notif in new_notifications],
+                max_items=MAX_NOTIFICATION_CACHE_SIZE,
+            )
+        stream.cursor = total
+        return response
 
-        # Track last known value for each model (for forward-fill)
-        last_known_values = {
-            model_id: data["initial_capital"] for model_id, data in model_data.items()
-        }
+    def _get_portfolio_chart_update(self, session_id: str) -> Optional[StreamResponse]:
+        """
+        Get the portfolio chart update for snapshots taken since the previous
+        update
 
-        # Data rows: ['timestamp', value1, value2, ...]
-        for timestamp in sorted_timestamps:
-            timestamp_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
-            row = [timestamp_str]
-
-            for model_id in model_ids:
-                # Find value at this timestamp for this model
-                value_at_timestamp = None
-                for ts, val in model_data[model_id]["history"]:
-                    if ts == timestamp:
-                        value_at_timestamp = val
-                        break
-
-                # Update logic: use new value if found, otherwise forward-fill
-                if value_at_timestamp is not None:
-                    last_known_values[model_id] = value_at_timestamp
-                    row.append(value_at_timestamp)
-                else:
-                    # Use last known value (forward-fill)
-                    row.append(last_known_values[model_id])
+        Returns:
+            Snapshot or append delta (new rows) of the session chart, or None
+            if no instance recorded a new snapshot
+        """
+        if session_id not in self.trading_instances:
+            return None
 
-            data_array.append(row)
+        series, initial_values, _ = self._collect_session_portfolio_series(session_id)
+        last_ts = max(
+            (int(rows["ts"][-1]) for rows in series.values() if len(rows)),
+            default=None,
+        )
+        if last_ts is None:
+            return None
 
-        component_data = FilteredLineChartComponentData(
-            title=f"Portfolio Value History - Session {session_id[:8]}",
-            data=json.dumps(data_array),
-            create_time=datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S"),
+        stream = self._get_component_stream(
+            f"portfolio_chart_{session_id}", ComponentType.FILTERED_LINE_CHART
         )
+        models = list(series)
+        if stream.cursor == (models, last_ts):
+            return None
 
-        return component_data.model_dump_json()
+        if stream.needs_snapshot or stream.cursor is None or stream.cursor[0] != models:
+            chart_data = self._get_session_portfolio_chart_data(session_id)
+            if not chart_data:
+                return None
+            response = stream.snapshot(chart_data)
+        else:
+            rows = build_chart_rows(series, initial_values, after_ts=stream.cursor[1])
+            # Bounded like snapshots; the header row is never trimmed
+            response = stream.append(
+                rows[1:],
+                max_items=PORTFOLIO_CHART_MAX_POINTS + 1,
+                keep_head=1,
+                fields={
+                    "create_time": datetime.now(timezone.utc).strftime(
+                        "%Y-%m-%d %H:%M:%S"
+                    )
+                },
+            )
+        stream.cursor = (models, last_ts)
+        return response
 
     async def _handle_stop_command(
         self, session_id: str, query: str
@@ -1086,6 +1814,140 @@ class AutoTradingAgent(BaseAgent):
 
         logger.info(f"Status message: {status_message}")
 
+    async def _monitor_instances(
+        self, session_id: str, instance_ids: List[str], symbols: List[str]
+    ) -> AsyncGenerator[StreamResponse, None]:
+        """
+        Check the instances on every tick until all of them are stopped.
+
+        Args:
+            session_id: Session ID
+            instance_ids: Instances of the session to monitor
+            symbols: Symbols traded by the instances
+
+        Yields:
+            StreamResponse: Status and chart updates after each tick
+        """
+        # Checks run on wall-clock ticks, shortly after each bar closes
+        scheduler = TickScheduler(
+            DEFAULT_CHECK_INTERVAL,
+            jitter=session_jitter(session_id, TICK_MAX_JITTER),
+            policy=os.getenv("TRADING_TICK_POLICY", DEFAULT_TICK_POLICY),
+        )
+        self.tick_schedulers[session_id] = scheduler
+
+        # Create semaphore to limit concurrent instance processing
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_INSTANCE_CHECKS)
+
+        # Check if any instance is still active
+        while any(
+            self.trading_instances[session_id][inst_id]["active"]
+            for inst_id in instance_ids
+            if inst_id in self.trading_instances[session_id]
+        ):
+            try:
+                # Wait for the next tick; its bar close time is the unified
+                # timestamp aligning snapshots across instances and sessions
+                unified_timestamp = await scheduler.wait()
+                logger.info(
+                    f"Tick {unified_timestamp} "
+                    f"(lag {scheduler.last_lag:.2f}s, "
+                    f"{scheduler.skipped} skipped)"
+                )
+
+                # Overrun ticks (catch_up) only get portfolio snapshots; like
+                # restarts, worker-hosted instances do not backfill them
+                if scheduler.missed_ticks and not self.worker_pool:
+                    await self._backfill_missed_bars(
+                        session_id,
+                        [
+                            i
+                            for i in instance_ids
+                            if i in self.trading_instances[session_id]
+                            and self.trading_instances[session_id][i]["active"]
+                        ],
+                        scheduler.missed_ticks,
+                    )
+
+                if self.worker_pool:
+                    await self._publish_market_snapshots(symbols, unified_timestamp)
+
+                # Process all active instances concurrently using task pool
+                tasks = []
+                for instance_id in instance_ids:
+                    # Skip if instance was removed or is inactive
+                    if instance_id not in self.trading_instances[session_id]:
+                        continue
+
+                    instance = self.trading_instances[session_id][instance_id]
+                    if not instance["active"]:
+                        continue
+                    instance["last_tick"] = unified_timestamp
+
+                    # Create task for this instance with semaphore control and unified timestamp
+                    if self.worker_pool:
+                        check = self._process_trading_instance_in_worker(
+                            session_id, instance_id, unified_timestamp
+                        )
+                    else:
+                        check = self._process_trading_instance(
+                            session_id, instance_id, semaphore, unified_timestamp
+                        )
+                    task = asyncio.create_task(check)
+                    tasks.append(task)
+
+                # Wait for all instance tasks to complete (process concurrently)
+                if tasks:
+                    # Gather all tasks and handle any exceptions
+                    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+                    # Log any exceptions that occurred
+                    for i, result in enumerate(results):
+                        if isinstance(result, Exception):
+                            logger.error(f"Task {i} failed with exception: {result}")
+
+                # After processing all instances, send what changed in
+                # the status feed and the chart (snapshot or delta)
+                notification_update = self._get_notification_update(session_id)
+                if notification_update is not None:
+                    yield notification_update
+
+                chart_update = self._get_portfolio_chart_update(session_id)
+                if chart_update is not None:
+                    yield chart_update
+
+                # Save trading data to file for monitoring API
+                await self._persist_trading_state(session_id)
+
+            except Exception as e:
+                logger.error(f"Error during trading cycle: {e}")
+                yield streaming.message_chunk(
+                    f"⚠️ **Error during trading cycle**: {str(e)}\n"
+                    f"Continuing with next check...\n\n"
+                )
+
+        # Stopped instances are stored as inactive and not resumed, so their
+        # history files are no longer needed
+        await self._persist_trading_state(session_id)
+        self._remove_history_dirs(session_id, instance_ids)
+
+    def _remove_history_dirs(self, session_id: str, instance_ids: List[str]) -> None:
+        """
+        Delete the history files of stopped instances.
+
+        The files only serve to recover an instance after a restart or a
+        worker crash. Stopped instances are never resumed; their history
+        stays readable through the open memory maps and the trading state
+        store.
+        """
+        instances = self.trading_instances.get(session_id, {})
+        for instance_id in instance_ids:
+            instance = instances.get(instance_id)
+            if instance is None or instance["active"]:
+                continue
+            if instance.get("history_dir"):
+                shutil.rmtree(instance["history_dir"], ignore_errors=True)
+
     async def stream(
         self,
         query: str,
@@ -1107,6 +1969,8 @@ class AutoTradingAgent(BaseAgent):
         """
         # Track created instances for cleanup
         created_instances = []
+        # Whether the monitoring loop ended because the instances were stopped
+        stopped = False
 
         try:
             logger.info(
@@ -1174,11 +2038,24 @@ class AutoTradingAgent(BaseAgent):
                     agent_model=model_id,
                 )
 
-                # Initialize executor
-                executor = TradingExecutor(config)
+                # Initialize executor (history is kept on disk per instance).
+                # With worker processes, the worker owns the history files
+                # and this executor only mirrors the instance.
+                history_dir = os.path.join(
+                    os.getenv("TRADING_HISTORY_DIR", DEFAULT_TRADING_HISTORY_DIR),
+                    instance_id,
+                )
+                executor = TradingExecutor(
+                    config, history_dir=None if self.worker_pool else history_dir
+                )
 
-                # Initialize AI signal generator if enabled
-                ai_signal_generator = self._initialize_ai_signal_generator(config)
+                # Initialize AI signal generator if enabled (by the worker
+                # when the instance runs in one)
+                ai_signal_generator = (
+                    None
+                    if self.worker_pool
+                    else self._initialize_ai_signal_generator(config)
+                )
 
                 # Store instance
                 self.trading_instances[session_id][instance_id] = {
@@ -1191,6 +2068,7 @@ class AutoTradingAgent(BaseAgent):
                     "check_count": 0,
                     "last_check": None,
                     "decision_history": [],  # Store AI decision history for visualization
+                    "history_dir": history_dir,
                 }
 
                 created_instances.append(instance_id)
@@ -1212,6 +2090,10 @@ class AutoTradingAgent(BaseAgent):
 
                 yield streaming.message_chunk(config_message)
 
+            # Stream quotes and klines for the traded symbols (shared by all
+            # instances; REST polling remains the fallback)
+            ensure_market_stream(trading_request.crypto_symbols)
+
             # Summary message
             yield streaming.message_chunk(
                 f"**Session ID:** `{session_id[:8]}`\n"
@@ -1230,7 +2112,12 @@ class AutoTradingAgent(BaseAgent):
 
                 # Send initial portfolio snapshot - cache it
                 portfolio_value = executor.get_portfolio_value()
-                executor.snapshot_portfolio(unified_initial_timestamp)
+                if self.worker_pool:
+                    await self.worker_pool.add_instance(
+                        session_id, instance_id, instance, unified_initial_timestamp
+                    )
+                else:
+                    executor.snapshot_portfolio(unified_initial_timestamp)
 
                 initial_portfolio_msg = FilteredCardPushNotificationComponentData(
                     title=f"{config.agent_model} Portfolio",
@@ -1245,110 +2132,50 @@ class AutoTradingAgent(BaseAgent):
                 self._cache_notification(session_id, initial_portfolio_msg)
 
             # Save initial trading data to file
-            self._save_trading_data_to_file()
+            await self._persist_trading_state(session_id)
             
-            # Set check interval
-            check_interval = DEFAULT_CHECK_INTERVAL
-
-            # Create semaphore to limit concurrent instance processing (max 10)
-            semaphore = asyncio.Semaphore(10)
+            # This stream starts the session's components with full snapshots
+            self._reset_component_streams(session_id)
 
             # Main trading loop - monitor all instances in parallel
             yield streaming.message_chunk(
                 "📈 **Starting monitoring loop for all instances...**\n\n"
             )
 
-            # Check if any instance is still active
-            while any(
-                self.trading_instances[session_id][inst_id]["active"]
-                for inst_id in created_instances
-                if inst_id in self.trading_instances[session_id]
+            async for response in self._monitor_instances(
+                session_id, created_instances, trading_request.crypto_symbols
             ):
-                try:
-                    # Create unified timestamp for this iteration to align snapshots
-                    unified_timestamp = datetime.now()
-
-                    # Process all active instances concurrently using task pool
-                    tasks = []
-                    for instance_id in created_instances:
-                        # Skip if instance was removed or is inactive
-                        if instance_id not in self.trading_instances[session_id]:
-                            continue
-
-                        instance = self.trading_instances[session_id][instance_id]
-                        if not instance["active"]:
-                            continue
-
-                        # Create task for this instance with semaphore control and unified timestamp
-                        task = asyncio.create_task(
-                            self._process_trading_instance(
-                                session_id, instance_id, semaphore, unified_timestamp
-                            )
-                        )
-                        tasks.append(task)
-
-                    # Wait for all instance tasks to complete (process concurrently)
-                    if tasks:
-                        # Gather all tasks and handle any exceptions
-                        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                        # Log any exceptions that occurred
-                        for i, result in enumerate(results):
-                            if isinstance(result, Exception):
-                                logger.error(
-                                    f"Task {i} failed with exception: {result}"
-                                )
-
-                    # After processing all instances, send batched notifications
-                    cached_notifications = self._get_cached_notifications(session_id)
-                    if cached_notifications:
-                        logger.info(
-                            f"Sending {len(cached_notifications)} cached notifications for session {session_id}"
-                        )
-                        # Convert all cached notifications to a list of dicts for batch sending
-                        batch_data = [
-                            notif.model_dump() for notif in cached_notifications
-                        ]
-                        # Send as a single batch component - frontend will receive all historical data
-                        yield streaming.component_generator(
-                            json.dumps(batch_data),
-                            ComponentType.FILTERED_CARD_PUSH_NOTIFICATION,
-                            component_id=f"trading_status_{session_id}",
-                        )
-
-                    # Send chart data (not cached, sent separately)
-                    chart_data = self._get_session_portfolio_chart_data(session_id)
-                    if chart_data:
-                        yield streaming.component_generator(
-                            content=chart_data,
-                            component_type=ComponentType.FILTERED_LINE_CHART,
-                            component_id=f"portfolio_chart_{session_id}",
-                        )
-
-                    # Save trading data to file for monitoring API
-                    self._save_trading_data_to_file()
-                    
-                    # Wait for next check interval - only sleep once after processing all instances
-                    logger.info(f"Waiting {check_interval}s until next check...")
-                    await asyncio.sleep(check_interval)
-
-                except Exception as e:
-                    logger.error(f"Error during trading cycle: {e}")
-                    yield streaming.message_chunk(
-                        f"⚠️ **Error during trading cycle**: {str(e)}\n"
-                        f"Continuing with next check...\n\n"
-                    )
-                    await asyncio.sleep(check_interval)
+                yield response
+            stopped = True
 
         except Exception as e:
             logger.error(f"Critical error in stream method: {e}")
             yield streaming.failed(f"Critical error: {str(e)}")
         finally:
-            # Mark all created instances as inactive but keep data for history
-            if session_id in self.trading_instances:
+            # Instances run until they are stopped: when the stream ends
+            # otherwise (client disconnected, error), the instances still
+            # active keep running in the background, and the store keeps
+            # them active so they are resumed after a restart
+            instances = self.trading_instances.get(session_id, {})
+            running = [
+                instance_id
+                for instance_id in created_instances
+                if instance_id in instances and instances[instance_id]["active"]
+            ]
+            if running and not stopped:
+                logger.info(
+                    f"Stream of session {session_id} ended; "
+                    f"{len(running)} instances keep running in the background"
+                )
+                self._run_in_background(session_id, running, recover=False)
+            elif session_id in self.trading_instances:
+                # Mark all created instances as inactive but keep data for history
                 for instance_id in created_instances:
                     if instance_id in self.trading_instances[session_id]:
-                        self.trading_instances[session_id][instance_id]["active"] = (
-                            False
-                        )
+                        instance = self.trading_instances[session_id][instance_id]
+                        instance["active"] = False
+                        if self.worker_pool:
+                            await self.worker_pool.remove_instance(
+                                session_id, instance_id
+                            )
                         logger.info(f"Stopped instance: {instance_id}")
@@ -0,0 +1,472 @@
+"""Offline, event-driven backtests of the auto trading strategy.
+
+Stored klines are replayed through the live pipeline - technical signal,
+optional AI signal, ``PortfolioDecisionManager`` and ``TradingExecutor`` - on
+a simulated clock instead of wall-clock ``asyncio.sleep``. Indicators for
+every bar are precomputed with ``compute_indicator_columns`` and the
+rule-based signals are derived from them with NumPy, so a check where no
+signal can lead to a trade is skipped without building any objects. The AI
+path takes any object with ``AISignalGenerator``'s ``get_signal`` coroutine,
+e.g. ``RecordedSignals`` replaying signals captured by ``SignalRecorder``.
+
+Results carry the same metrics as ``/trading/leaderboard``; parameter sweeps
+run one backtest per combination in a process pool.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .indicators import compute_indicator_columns
+from .mark_price import MarkPriceOracle
+from .models import (
+    AutoTradingConfig,
+    TechnicalIndicators,
+    TradeAction,
+    TradeHistoryRecord,
+    TradeType,
+)
+from .performance_metrics import PERIODS_PER_YEAR, compute_metrics
+from .portfolio_decision_manager import AssetAnalysis, PortfolioDecisionManager
+from .timeseries import from_epoch_us, to_epoch_us
+from .trading_executor import TradingExecutor
+
+logger = logging.getLogger(__name__)
+
+# Rule-based signal codes (see SignalGenerator.generate_signal)
+HOLD, BUY_LONG, BUY_SHORT, SELL_LONG, SELL_SHORT = range(5)
+_SIGNALS = {
+    HOLD: (TradeAction.HOLD, TradeType.LONG),
+    BUY_LONG: (TradeAction.BUY, TradeType.LONG),
+    BUY_SHORT: (TradeAction.BUY, TradeType.SHORT),
+    SELL_LONG: (TradeAction.SELL, TradeType.LONG),
+    SELL_SHORT: (TradeAction.SELL, TradeType.SHORT),
+}
+
+# Closes passed to the AI signal as price history (as in live analysis)
+HISTORY_BARS = 20
+
+
+def compute_signal_codes(columns: Mapping[str, np.ndarray]) -> np.ndarray:
+    """Vectorized ``SignalGenerator.generate_signal`` over indicator columns."""
+    macd, signal, rsi = columns["macd"], columns["macd_signal"], columns["rsi"]
+    valid = ~(np.isnan(macd) | np.isnan(signal) | np.isnan(rsi))
+    bullish = macd > signal
+    bearish = macd < signal
+    oversold = rsi < 30
+    overbought = rsi > 70
+
+    codes = np.select(
+        [
+            bullish & oversold,
+            bearish & overbought,
+            bearish | overbought,
+            bullish | oversold,
+        ],
+        [BUY_LONG, BUY_SHORT, SELL_LONG, SELL_SHORT],
+        default=HOLD,
+    )
+    return np.where(valid, codes, HOLD).astype(np.int8)
+
+
+def _bar_times_us(frame: pd.DataFrame) -> np.ndarray:
+    index = frame.index
+    if "timestamp" in frame.columns:
+        index = frame["timestamp"]
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    return index.as_unit("us").asi8
+
+
+class _SymbolData:
+    """Precomputed closes, indicators and signals of one symbol."""
+
+    def __init__(self, symbol: str, frame: pd.DataFrame):
+        columns = {col.lower(): col for col in frame.columns}
+        if "close" not in columns:
+            raise ValueError(f"Klines for {symbol} have no close column")
+
+        times = _bar_times_us(frame)
+        order = np.argsort(times, kind="stable")
+        self.symbol = symbol
+        self.times = times[order]
+        self.close = frame[columns["close"]].to_numpy(np.float64)[order]
+        self.volume = (
+            frame[columns["volume"]].to_numpy(np.float64)[order]
+            if "volume" in columns
+            else np.zeros(len(self.close))
+        )
+        self.indicators = compute_indicator_columns(self.close)
+        self.signals = compute_signal_codes(self.indicators)
+
+    def build_indicators(self, i: int, timestamp) -> TechnicalIndicators:
+        """TechnicalIndicators of bar ``i``, as the live provider builds them."""
+        start = max(0, i + 1 - HISTORY_BARS)
+        values = {
+            name: None if math.isnan(column[i]) else float(column[i])
+            for name, column in self.indicators.items()
+        }
+        return TechnicalIndicators(
+            symbol=self.symbol,
+            timestamp=timestamp,
+            close_price=float(self.close[i]),
+            volume=float(self.volume[i]),
+            historical_prices=self.close[start : i + 1].tolist(),
+            historical_volumes=self.volume[start : i + 1].tolist(),
+            **values,
+        )
+
+
+class RecordedSignals:
+    """
+    AI signals keyed by symbol and check time, replayed in place of an LLM.
+
+    Implements ``AISignalGenerator.get_signal``, so it can be passed anywhere
+    a signal generator is expected. Checks without a recorded signal fall back
+    to the technical signal, like a failed LLM call does live.
+    """
+
+    def __init__(self):
+        self._signals: Dict[Tuple[str, int], Tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self._signals)
+
+    def add(self, symbol: str, timestamp, signal: Optional[Tuple]) -> None:
+        """Record the signal of a symbol at a check time (None: no signal)."""
+        if signal is not None:
+            self._signals[(symbol, to_epoch_us(timestamp))] = tuple(signal)
+
+    async def get_signal(
+        self, indicators: TechnicalIndicators, **kwargs
+    ) -> Optional[Tuple[TradeAction, TradeType, str, float, Optional[dict]]]:
+        return self._signals.get((indicators.symbol, to_epoch_us(indicators.timestamp)))
+
+    def save(self, path: str) -> None:
+        """Write the signals as JSON lines."""
+        with open(path, "w") as f:
+            for (symbol, ts), signal in sorted(self._signals.items()):
+                action, trade_type, reasoning, confidence, exit_plan = signal
+                record = {
+                    "symbol": symbol,
+                    "ts": ts,
+                    "action": action.value,
+                    "type": trade_type.value,
+                    "reasoning": reasoning,
+                    "confidence": confidence,
+                    "exit_plan": exit_plan,
+                }
+                f.write(json.dumps(record) + "\n")
+
+    @classmethod
+    def load(cls, path: str) -> "RecordedSignals":
+        """Read signals written by ``save``."""
+        recorded = cls()
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                recorded._signals[(record["symbol"], record["ts"])] = (
+                    TradeAction(record["action"]),
+                    TradeType(record["type"]),
+                    record["reasoning"],
+                    record["confidence"],
+                    record["exit_plan"],
+                )
+        return recorded
+
+
+class SignalRecorder:
+    """Wraps a signal generator and records every signal it returns."""
+
+    def __init__(self, generator, recorded: Optional[RecordedSignals] = None):
+        """
+        Initialize the recorder.
+
+        Args:
+            generator: Signal generator to call (e.g. an AISignalGenerator)
+            recorded: Where to record the signals (default: a new one)
+        """
+        self.generator = generator
+        self.recorded = recorded if recorded is not None else RecordedSignals()
+
+    @property
+    def llm_client(self):
+        return getattr(self.generator, "llm_client", None)
+
+    async def get_signal(self, indicators: TechnicalIndicators, **kwargs):
+        signal = await self.generator.get_signal(indicators, **kwargs)
+        self.recorded.add(indicators.symbol, indicators.timestamp, signal)
+        return signal
+
+
+@dataclass
+class BacktestResult:
+    """Outcome of one backtest run."""
+
+    initial_capital: float
+    timestamps: np.ndarray  # epoch microseconds of each check
+    portfolio_values: np.ndarray  # portfolio value after each check
+    trades: List[TradeHistoryRecord]
+    metrics: Dict[str, Any]
+    bars: int
+    checks: int
+    decisions: int  # checks that ran the portfolio decision
+    elapsed: float  # wall-clock seconds
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def final_value(self) -> float:
+        if not len(self.portfolio_values):
+            return self.initial_capital
+        return float(self.portfolio_values[-1])
+
+    def summary(self) -> Dict[str, Any]:
+        """Metrics in the shape of a ``/trading/leaderboard`` entry."""
+        pnl = self.final_value - self.initial_capital
+        return {
+            "params": self.params,
+            "initial_capital": round(self.initial_capital, 2),
+            "current_value": round(self.final_value, 2),
+            "pnl": round(pnl, 2),
+            "pnl_pct": round(pnl / self.initial_capital * 100, 2),
+            "sharpe_ratio": self.metrics["sharpe_ratio"],
+            "sortino_ratio": self.metrics["sortino_ratio"],
+            "calmar_ratio": self.metrics["calmar_ratio"],
+            "win_rate": self.metrics["win_rate"],
+            "profit_factor": self.metrics["profit_factor"],
+            "max_drawdown": self.metrics["max_drawdown"],
+            "total_trades": self.metrics["closed_trades"],
+        }
+
+
+class Backtester:
+    """
+    Replays klines through the trading pipeline on a simulated clock.
+
+    Each check runs at the first bar closing in a new ``check_interval``
+    window, sees every symbol as of its latest bar, executes the portfolio
+    decision at those closes and snapshots the portfolio value, like one
+    monitoring loop iteration of the live agent.
+    """
+
+    def __init__(
+        self,
+        klines: Mapping[str, pd.DataFrame],
+        config: AutoTradingConfig,
+        signal_source=None,
+        llm_client=None,
+        periods_per_year: int = PERIODS_PER_YEAR,
+    ):
+        """
+        Initialize the backtester.
+
+        Args:
+            klines: Symbol -> kline frame (bar times as index or ``timestamp``
+                    column; ``close`` and optionally ``volume`` columns)
+            config: Trading configuration (symbols without klines are skipped)
+            signal_source: AI signal generator (``get_signal`` coroutine),
+                           e.g. RecordedSignals; None uses technical signals
+            llm_client: Model for the portfolio decision (None: rule-based)
+            periods_per_year: Checks per year for annualized metrics
+        """
+        self.config = config
+        self.signal_source = signal_source
+        self.llm_client = llm_client
+        self.periods_per_year = periods_per_year
+
+        self.symbols = [
+            _SymbolData(symbol, klines[symbol])
+            for symbol in config.crypto_symbols
+            if symbol in klines and len(klines[symbol])
+        ]
+        if not self.symbols:
+            raise ValueError("No klines for any configured symbol")
+
+        self.bar_times = np.unique(np.concatenate([s.times for s in self.symbols]))
+        interval_us = int(config.check_interval * 1_000_000)
+        window = self.bar_times // interval_us
+        self.check_times = self.bar_times[np.diff(window, prepend=window[0] - 1) != 0]
+        # As-of join: each symbol's latest bar at every check (-1: none yet)
+        self.bar_index = np.stack(
+            [
+                np.searchsorted(s.times, self.check_times, side="right") - 1
+                for s in self.symbols
+            ]
+        )
+
+    async def run(self) -> BacktestResult:
+        """Run the backtest over all checks."""
+        started = time.perf_counter()
+
+        # Marks never expire on the simulated clock and are never fetched
+        mark_prices = MarkPriceOracle(fetch_price=lambda symbol: None, max_age=math.inf)
+        executor = TradingExecutor(self.config, mark_prices)
+        manager = PortfolioDecisionManager(self.config, self.llm_client)
+        rule_based = self.signal_source is None and self.llm_client is None
+
+        values = np.empty(len(self.check_times))
+        decisions = 0
+        for check, ts in enumerate(self.check_times.tolist()):
+            rows = self.bar_index[:, check]
+            for data, i in zip(self.symbols, rows.tolist()):
+                if i >= 0:
+                    mark_prices.update(data.symbol, data.close[i])
+
+            if not rule_based or self._may_trade(executor.positions, rows):
+                decisions += 1
+                await self._run_check(executor, manager, rows, from_epoch_us(ts))
+
+            values[check] = executor.get_portfolio_value()
+
+        trades = executor.get_trade_history()
+        pnls = [t.pnl for t in trades if t.action == "closed" and t.pnl is not None]
+        return BacktestResult(
+            initial_capital=self.config.initial_capital,
+            timestamps=self.check_times,
+            portfolio_values=values,
+            trades=trades,
+            metrics=compute_metrics(values, pnls, self.periods_per_year),
+            bars=len(self.bar_times),
+            checks=len(self.check_times),
+            decisions=decisions,
+            elapsed=time.perf_counter() - started,
+        )
+
+    def _may_trade(self, positions: Mapping[str, Any], rows: np.ndarray) -> bool:
+        """Whether the rule-based decision can select any trade at this check."""
+        for data, i in zip(self.symbols, rows.tolist()):
+            if i < 0:
+                continue
+            code = data.signals[i]
+            if data.symbol in positions:
+                if code in (SELL_LONG, SELL_SHORT):
+                    return True
+            elif code in (BUY_LONG, BUY_SHORT):
+                return True
+        return False
+
+    async def _run_check(
+        self,
+        executor: TradingExecutor,
+        manager: PortfolioDecisionManager,
+        rows: np.ndarray,
+        timestamp,
+    ) -> None:
+        manager.clear_analyses()
+        for data, i in zip(self.symbols, rows.tolist()):
+            if i < 0:
+                continue
+            indicators = data.build_indicators(i, timestamp)
+            technical_action, technical_trade_type = _SIGNALS[int(data.signals[i])]
+
+            ai_signal = None
+            if self.signal_source is not None:
+                ai_signal = await self.signal_source.get_signal(indicators)
+            ai_action, ai_trade_type, ai_reasoning, ai_confidence, _ = (
+                ai_signal or (None,) * 5
+            )
+
+            manager.add_asset_analysis(
+                AssetAnalysis(
+                    symbol=data.symbol,
+                    indicators=indicators,
+                    technical_action=technical_action,
+                    technical_trade_type=technical_trade_type,
+                    ai_action=ai_action,
+                    ai_trade_type=ai_trade_type,
+                    ai_reasoning=ai_reasoning,
+                    ai_confidence=ai_confidence,
+                )
+            )
+
+        decision = await manager.make_portfolio_decision(
+            current_positions=executor.positions,
+            available_cash=executor.get_current_capital(),
+            total_portfolio_value=executor.get_portfolio_value(),
+        )
+        for symbol, action, trade_type in decision.trades_to_execute:
+            analysis = manager.asset_analyses.get(symbol)
+            if analysis:
+                executor.execute_trade(
+                    symbol, action, trade_type, analysis.indicators, timestamp
+                )
+
+
+def run_backtest(
+    klines: Mapping[str, pd.DataFrame],
+    config: AutoTradingConfig,
+    signal_source=None,
+    llm_client=None,
+    periods_per_year: int = PERIODS_PER_YEAR,
+) -> BacktestResult:
+    """Run one backtest to completion (see ``Backtester``)."""
+    backtester = Backtester(klines, config, signal_source, llm_client, periods_per_year)
+    return asyncio.run(backtester.run())
+
+
+def _run_sweep_case(
+    klines: Mapping[str, pd.DataFrame],
+    config: Dict[str, Any],
+    params: Dict[str, Any],
+    signal_source,
+) -> Dict[str, Any]:
+    result = run_backtest(
+        klines, AutoTradingConfig(**{**config, **params}), signal_source
+    )
+    result.params = params
+    return result.summary()
+
+
+def run_parameter_sweep(
+    klines: Mapping[str, pd.DataFrame],
+    config: AutoTradingConfig,
+    param_grid: Mapping[str, Sequence[Any]],
+    signal_source=None,
+    max_workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Backtest every combination of configuration parameters in parallel.
+
+    Args:
+        klines: Symbol -> kline frame, shared by all runs
+        config: Base configuration
+        param_grid: Config field -> values to try (e.g. ``risk_per_trade``)
+        signal_source: Picklable AI signal source (e.g. RecordedSignals)
+        max_workers: Worker processes (default: one per CPU)
+
+    Returns:
+        One leaderboard-style summary per combination, best PnL first
+    """
+    names = list(param_grid)
+    cases = [
+        dict(zip(names, values))
+        for values in itertools.product(*(param_grid[name] for name in names))
+    ]
+    base = config.model_dump()
+
+    # Spawned workers: forking a process that runs threads (e.g. the server)
+    # can deadlock
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+        futures = [
+            pool.submit(_run_sweep_case, klines, base, params, signal_source)
+            for params in cases
+        ]
+        results = [future.result() for future in futures]
+
+    logger.info(f"Backtested {len(results)} parameter combinations")
+    results.sort(key=lambda r: r["pnl_pct"], reverse=True)
+    return results
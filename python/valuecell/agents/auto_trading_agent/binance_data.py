@@ -1,8 +1,9 @@
 """Binance API market data provider - for real-time cryptocurrency prices and historical data"""
 
+import asyncio
 import logging
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Optional, Tuple
 from urllib.parse import urlencode
 
 import pandas as pd
@@ -11,20 +12,34 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from .models import TechnicalIndicators
+from .rate_limiter import (
+    TokenBucketRateLimiter,
+    get_binance_rate_limiter,
+    request_weight,
+)
 
 logger = logging.getLogger(__name__)
 
-# Binance API 速率限制
-# 公开 API: 每分钟 1200 次请求，每秒 10 次请求
-BINANCE_RATE_LIMIT = {
-    "requests_per_minute": 1200,
-    "requests_per_second": 10,
-}
-
 # Binance API Base URL
 BINANCE_API_BASE = "https://api.binance.com"
 
 
+def to_binance_symbol(symbol: str) -> str:
+    """
+    Convert a trading symbol to Binance format
+
+    Args:
+        symbol: Original symbol (e.g., "BTC-USD", "BTCUSDT")
+
+    Returns:
+        Binance format (e.g., "BTCUSDT")
+    """
+    # Remove common suffixes
+    symbol = symbol.replace("-USD", "").replace("-USDT", "").replace("USDT", "")
+    # Add USDT suffix for Binance
+    return f"{symbol}USDT"
+
+
 class BinanceMarketDataProvider:
     """
     Binance API market data provider
@@ -33,32 +48,37 @@ class BinanceMarketDataProvider:
     - Real-time price fetching
     - Historical klines (candlestick) data
     - 24h ticker statistics
-    - Automatic rate limiting
+    - Automatic rate limiting (request weights, shared by all clients)
     - Symbol normalization
     """
 
-    def __init__(self, api_base: str = BINANCE_API_BASE):
+    def __init__(
+        self,
+        api_base: str = BINANCE_API_BASE,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+    ):
         """
         Initialize Binance market data provider
         
         Args:
             api_base: Binance API base URL (default: production API)
+            rate_limiter: Rate limiter (default: the process-wide limiter)
         """
         self.api_base = api_base.rstrip("/")
         
-        # Create session with retry strategy
+        # Create session with retry strategy (429/418 are handled by the
+        # rate limiter, which also holds back every other Binance client)
         self.session = requests.Session()
         retry_strategy = Retry(
             total=3,
             backoff_factor=0.3,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=[500, 502, 503, 504],
         )
         adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
-        # Rate limiting tracking (simple in-memory counter)
-        self._request_times: List[float] = []
+        self.rate_limiter = rate_limiter or get_binance_rate_limiter()
         
     def normalize_symbol(self, symbol: str) -> str:
         """
@@ -70,65 +90,67 @@ class BinanceMarketDataProvider:
         Returns:
             Binance format (e.g., "BTCUSDT")
         """
-        # Remove common suffixes
-        symbol = symbol.replace("-USD", "").replace("-USDT", "").replace("USDT", "")
-        # Add USDT suffix for Binance
-        return f"{symbol}USDT"
-    
-    def _check_rate_limit(self):
-        """Check and enforce rate limiting"""
-        import time
-        now = time.time()
-        
-        # Remove requests older than 1 minute
-        self._request_times = [t for t in self._request_times if now - t < 60]
-        
-        # Check per-minute limit
-        if len(self._request_times) >= BINANCE_RATE_LIMIT["requests_per_minute"]:
-            sleep_time = 60 - (now - self._request_times[0])
-            if sleep_time > 0:
-                logger.warning(f"Rate limit approaching, sleeping {sleep_time:.2f}s")
-                time.sleep(sleep_time)
-        
-        # Check per-second limit (last second)
-        recent_requests = [t for t in self._request_times if now - t < 1]
-        if len(recent_requests) >= BINANCE_RATE_LIMIT["requests_per_second"]:
-            sleep_time = 1.1 - (now - recent_requests[0])
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-        
-        # Record this request
-        self._request_times.append(now)
+        return to_binance_symbol(symbol)
     
-    def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
-        """
-        Make HTTP request to Binance API
-        
-        Args:
-            endpoint: API endpoint (e.g., "/api/v3/ticker/price")
-            params: Query parameters
-            
-        Returns:
-            JSON response as dictionary
-        """
-        self._check_rate_limit()
-        
-        url = f"{self.api_base}{endpoint}"
-        if params:
-            url += "?" + urlencode(params)
-        
+    def _send(self, url: str) -> Dict:
+        """Send a GET request and feed the response back to the rate limiter"""
         try:
             response = self.session.get(url, timeout=10)
+            self.rate_limiter.observe_headers(response.headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 429:
+            if e.response.status_code in (418, 429):
+                retry_after = e.response.headers.get("Retry-After", "60")
+                self.rate_limiter.block_for(
+                    float(retry_after) if retry_after.isdigit() else 60.0
+                )
                 logger.error(f"Binance rate limit exceeded: {e}")
                 raise Exception("Binance API rate limit exceeded")
             raise
         except Exception as e:
             logger.error(f"Binance API request failed: {e}")
             raise
+
+    def _build_url(self, endpoint: str, params: Optional[Dict] = None) -> str:
+        url = f"{self.api_base}{endpoint}"
+        if params:
+            url += "?" + urlencode(params)
+        return url
+
+    def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
+        """
+        Make HTTP request to Binance API
+        
+        Blocks the calling thread while rate limited; use
+        ``_make_request_async`` from the event loop.
+
+        Args:
+            endpoint: API endpoint (e.g., "/api/v3/ticker/price")
+            params: Query parameters
+            
+        Returns:
+            JSON response as dictionary
+        """
+        self.rate_limiter.acquire_sync(request_weight(endpoint, params))
+        return self._send(self._build_url(endpoint, params))
+
+    async def _make_request_async(
+        self, endpoint: str, params: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Make HTTP request to Binance API without blocking the event loop
+
+        Args:
+            endpoint: API endpoint (e.g., "/api/v3/ticker/price")
+            params: Query parameters
+
+        Returns:
+            JSON response as dictionary
+        """
+        await self.rate_limiter.acquire(request_weight(endpoint, params))
+        url = self._build_url(endpoint, params)
+        return await asyncio.to_thread(self._send, url)
     
     def get_current_price(self, symbol: str) -> Optional[float]:
         """
@@ -150,6 +172,24 @@ class BinanceMarketDataProvider:
         except Exception as e:
             logger.error(f"Failed to get current price for {symbol}: {e}")
             return None
+
+    async def get_current_price_async(self, symbol: str) -> Optional[float]:
+        """
+        Get current market price without blocking the event loop
+
+        Args:
+            symbol: Trading symbol (e.g., "BTC-USD")
+
+        Returns:
+            Current price or None if failed
+        """
+        try:
+            params = {"symbol": self.normalize_symbol(symbol)}
+            data = await self._make_request_async("/api/v3/ticker/price", params)
+            return float(data["price"])
+        except Exception as e:
+            logger.error(f"Failed to get current price for {symbol}: {e}")
+            return None
     
     def get_klines(
         self,
@@ -240,18 +280,42 @@ class BinanceMarketDataProvider:
             
             data = self._make_request(endpoint, params)
             
-            return {
-                "symbol": binance_symbol,
-                "price": float(data["lastPrice"]),
-                "open": float(data["openPrice"]),
-                "high": float(data["highPrice"]),
-                "low": float(data["lowPrice"]),
-                "volume": float(data["volume"]),
-                "quote_volume": float(data["quoteVolume"]),
-                "price_change": float(data["priceChange"]),
-                "price_change_percent": float(data["priceChangePercent"]),
-            }
+            return self._parse_24h_ticker(binance_symbol, data)
+        except Exception as e:
+            logger.error(f"Failed to get 24h ticker for {symbol}: {e}")
+            return None
+
+    async def get_24h_ticker_async(self, symbol: str) -> Optional[Dict]:
+        """
+        Get 24-hour ticker statistics without blocking the event loop
+
+        Args:
+            symbol: Trading symbol
+
+        Returns:
+            Dictionary with 24h stats or None if failed
+        """
+        try:
+            binance_symbol = self.normalize_symbol(symbol)
+            data = await self._make_request_async(
+                "/api/v3/ticker/24hr", {"symbol": binance_symbol}
+            )
+            return self._parse_24h_ticker(binance_symbol, data)
         except Exception as e:
             logger.error(f"Failed to get 24h ticker for {symbol}: {e}")
             return None
 
+    @staticmethod
+    def _parse_24h_ticker(binance_symbol: str, data: Dict) -> Dict:
+        return {
+            "symbol": binance_symbol,
+            "price": float(data["lastPrice"]),
+            "open": float(data["openPrice"]),
+            "high": float(data["highPrice"]),
+            "low": float(data["lowPrice"]),
+            "volume": float(data["volume"]),
+            "quote_volume": float(data["quoteVolume"]),
+            "price_change": float(data["priceChange"]),
+            "price_change_percent": float(data["priceChangePercent"]),
+        }
+
@@ -0,0 +1,73 @@
+"""Snapshot/delta sequencing for components re-sent after every check.
+
+The trading status feed and the portfolio chart only grow between checks.
+Instead of re-sending the whole component each time, a ComponentStream sends
+one full snapshot followed by append-only deltas, numbered with a sequence
+number per component_id. The server compacts the deltas into the stored item
+and the frontend applies them to the component it already shows, so the
+per-check payload depends on what changed, not on the session length. A
+fresh snapshot is sent every ``snapshot_interval`` deltas so a client that
+missed a delta (or a restarted server) resynchronizes.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from valuecell.core.agent.responses import streaming
+from valuecell.core.types import StreamResponse
+
+from .constants import COMPONENT_SNAPSHOT_INTERVAL
+
+
+class ComponentStream:
+    """Sequence of snapshot and append-delta updates for one component."""
+
+    def __init__(
+        self,
+        component_id: str,
+        component_type: str,
+        snapshot_interval: int = COMPONENT_SNAPSHOT_INTERVAL,
+    ):
+        self.component_id = component_id
+        self.component_type = component_type
+        self.snapshot_interval = snapshot_interval
+
+        self.seq = -1
+        self.deltas_since_snapshot = 0
+        # Position in the source data covered by the updates sent so far
+        self.cursor: Any = None
+
+    @property
+    def needs_snapshot(self) -> bool:
+        """Whether the next update has to be a full snapshot."""
+        return self.seq < 0 or self.deltas_since_snapshot >= self.snapshot_interval
+
+    def snapshot(self, content: str) -> StreamResponse:
+        """Send the full component content."""
+        self.seq += 1
+        self.deltas_since_snapshot = 0
+        return streaming.component_generator(
+            content=content,
+            component_type=self.component_type,
+            component_id=self.component_id,
+            seq=self.seq,
+        )
+
+    def append(
+        self,
+        items: List[Any],
+        max_items: Optional[int] = None,
+        fields: Optional[Dict[str, Any]] = None,
+        keep_head: int = 0,
+    ) -> StreamResponse:
+        """Send items appended to the component since the previous update."""
+        self.seq += 1
+        self.deltas_since_snapshot += 1
+        return streaming.component_delta(
+            items=items,
+            component_type=self.component_type,
+            component_id=self.component_id,
+            seq=self.seq,
+            max_items=max_items,
+            fields=fields,
+            keep_head=keep_head,
+        )
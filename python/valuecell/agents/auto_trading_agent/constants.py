@@ -4,6 +4,74 @@
 MAX_SYMBOLS = 10
 DEFAULT_CHECK_INTERVAL = 60  # 1 minute in seconds
 
+# Per-instance position/portfolio history files (override: TRADING_HISTORY_DIR),
+# removed once an instance is stopped
+DEFAULT_TRADING_HISTORY_DIR = "/tmp/valuecell_trading_history"
+# Longest symbol stored in history records and the shared market board (bytes)
+MAX_SYMBOL_LENGTH = 32
+
+# Trading state shared with the trading API (override: TRADING_STATE_DB)
+DEFAULT_TRADING_STATE_DB = "/tmp/valuecell_trading_state.db"
+
+# Per-check analysis concurrency
+SYMBOL_ANALYSIS_TIMEOUT = 45  # seconds allowed for one symbol's analysis
+MAX_CONCURRENT_LLM_CALLS_PER_MODEL = 4
+
+# AI signals are reused for near-identical market states this long (seconds)
+SIGNAL_CACHE_TTL = 300
+SIGNAL_CACHE_MAX_ENTRIES = 1024
+
+# Monitoring ticks fire this long after each bar closes, plus a per-session
+# jitter of up to TICK_MAX_JITTER (seconds). A check overrunning the next tick
+# either skips the missed ticks or records portfolio snapshots for them without
+# checking them (override: TRADING_TICK_POLICY, "skip" or "catch_up").
+TICK_CLOSE_OFFSET = 1.0
+TICK_MAX_JITTER = 5.0
+DEFAULT_TICK_POLICY = "skip"
+TICK_MAX_CATCH_UP = 3  # missed ticks recorded at most when catching up
+# Missed bars recorded at most for a resumed instance (the kline cache keeps
+# 1000 bars; older bars have no close to value positions at)
+BACKFILL_MAX_BARS = 1000
+
+# Trading instances checked concurrently per process
+MAX_CONCURRENT_INSTANCE_CHECKS = 10
+
+# Decision history entries kept per instance
+DECISION_HISTORY_LIMIT = 500
+
+# Worker processes hosting trading instances (override: TRADING_WORKER_PROCESSES;
+# 0 runs them in the agent process) and how they are sharded (override:
+# TRADING_WORKER_SHARD_BY, "session" or "instance")
+DEFAULT_WORKER_PROCESSES = 0
+DEFAULT_WORKER_SHARD_BY = "session"
+WORKER_MAX_RESTARTS = 5  # restarts of a crashed worker process
+MARKET_BOARD_CAPACITY = 256  # symbols shared with worker processes
+
+# Pre-trade exposure limits, as fractions of the instance's total cash
+MAX_GROSS_EXPOSURE_RATIO = 1.0  # long + short notional
+MAX_NET_EXPOSURE_RATIO = 1.0  # |long - short| notional
+MAX_SYMBOL_EXPOSURE_RATIO = 0.5
+MAX_BUCKET_EXPOSURE_RATIO = 0.75  # symbols of one correlation bucket
+
+# Symbols whose prices tend to move together share an exposure bucket; any
+# other symbol is a bucket of its own
+CORRELATION_BUCKETS = {
+    "BTC-USD": "majors",
+    "ETH-USD": "majors",
+    "SOL-USD": "layer1",
+    "ADA-USD": "layer1",
+    "AVAX-USD": "layer1",
+    "DOT-USD": "layer1",
+    "DOGE-USD": "meme",
+    "SHIB-USD": "meme",
+}
+
+# Portfolio chart sent after each check is downsampled to this many points
+PORTFOLIO_CHART_MAX_POINTS = 1000
+
+# Status/chart components are sent as deltas, with a full snapshot this often
+COMPONENT_SNAPSHOT_INTERVAL = 100
+
 # Default configuration values
 DEFAULT_INITIAL_CAPITAL = 100000
 DEFAULT_RISK_PER_TRADE = 0.02
@@ -6,15 +6,20 @@ allowing the AutoTradingAgent to trade on both paper (simulated) and live (real)
 Adapters:
 - ExchangeBase: Abstract base class defining the exchange interface
 - PaperTrading: Simulated trading (default)
+- MatchingEngine: Order-matching simulator behind PaperTrading
 - BinanceExchange: Live trading on Binance (requires API keys)
 """
 
 from .base_exchange import ExchangeBase, ExchangeType, OrderStatus
+from .matching_engine import Fill, MatchingEngine, OrderBook
 from .paper_trading import PaperTrading
 
 __all__ = [
     "ExchangeBase",
     "ExchangeType",
     "OrderStatus",
+    "Fill",
+    "MatchingEngine",
+    "OrderBook",
     "PaperTrading",
 ]
@@ -54,6 +54,7 @@ class Order:
         self.status = OrderStatus.PENDING
         self.filled_quantity = 0.0
         self.filled_price = 0.0
+        self.fee = 0.0
         self.created_at = datetime.now()
         self.updated_at = datetime.now()
 
@@ -69,6 +70,7 @@ class Order:
             "status": self.status.value,
             "filled_quantity": self.filled_quantity,
             "filled_price": self.filled_price,
+            "fee": self.fee,
             "created_at": self.created_at.isoformat(),
         }
 
@@ -9,6 +9,8 @@ WARNING: Real money trading - handle with care!
 import logging
 from typing import Any, Dict, List, Optional
 
+from ..binance_data import BINANCE_API_BASE, BinanceMarketDataProvider
+from ..market_stream import get_market_stream, ws_connect
 from .base_exchange import ExchangeBase, ExchangeType, Order, OrderStatus
 
 logger = logging.getLogger(__name__)
@@ -47,6 +49,11 @@ class BinanceExchange(ExchangeBase):
         self.api_secret = api_secret
         self.testnet = testnet
 
+        # Public market data; shares the process-wide request weight limiter
+        self.market_data = BinanceMarketDataProvider(
+            "https://testnet.binance.vision" if testnet else BINANCE_API_BASE
+        )
+
         # TODO: Initialize Binance client
         # self.client = BinanceClientAsync(api_key, api_secret)
         # if testnet:
@@ -146,37 +153,29 @@ class BinanceExchange(ExchangeBase):
         """
         Get current market price from Binance.
 
-        TODO: Implementation
-        - Query latest price from Binance
-        - Handle rate limits
-        - Cache results if needed
+        Requests go through the shared rate limiter without blocking the
+        event loop.
 
         Args:
             symbol: Trading symbol (e.g., "BTCUSDT")
 
         Returns:
-            Current price
+            Current price (0.0 if unavailable)
         """
-        logger.info(f"[TODO] Fetching price for {symbol} from Binance...")
-        return 0.0  # Placeholder
+        price = await self.market_data.get_current_price_async(symbol)
+        return price if price is not None else 0.0
 
     async def get_24h_ticker(self, symbol: str) -> Dict[str, Any]:
         """
         Get 24-hour ticker data from Binance.
 
-        TODO: Implementation
-        - Query Binance 24h ticker
-        - Parse response
-        - Calculate changes
-
         Args:
             symbol: Trading symbol
 
         Returns:
-            Ticker data dictionary
+            Ticker data dictionary (empty if unavailable)
         """
-        logger.info(f"[TODO] Fetching 24h ticker for {symbol} from Binance...")
-        return {}  # Placeholder
+        return await self.market_data.get_24h_ticker_async(symbol) or {}
 
     # ============ Order Management ============
 
@@ -476,11 +475,8 @@ class BinanceExchange(ExchangeBase):
         """
         Subscribe to real-time ticker updates via WebSocket.
 
-        TODO: Future implementation
-        - Connect to Binance WebSocket
-        - Subscribe to ticker stream
-        - Call callback on each update
-        - Handle reconnection
+        Uses the shared market stream, which handles reconnection and
+        backfill. The callback runs on the stream thread with a ``Quote``.
 
         Args:
             symbol: Trading symbol
@@ -489,17 +485,19 @@ class BinanceExchange(ExchangeBase):
         Returns:
             True if subscription successful
         """
-        logger.info(f"[TODO] Subscribing to ticker updates for {symbol}...")
-        return False
+        if ws_connect is None:
+            logger.warning("websockets is not installed; cannot subscribe")
+            return False
+        logger.info(f"Subscribing to ticker updates for {symbol}...")
+        get_market_stream().add_ticker_listener(symbol, callback)
+        return True
 
     async def subscribe_to_trades(self, symbol: str, callback) -> bool:
         """
         Subscribe to real-time trade updates via WebSocket.
 
-        TODO: Future implementation
-        - Connect to Binance WebSocket
-        - Subscribe to trades stream
-        - Call callback on each trade
+        The callback runs on the stream thread with a trade dict
+        (symbol, price, quantity, trade_time, is_buyer_maker).
 
         Args:
             symbol: Trading symbol
@@ -508,8 +506,12 @@ class BinanceExchange(ExchangeBase):
         Returns:
             True if subscription successful
         """
-        logger.info(f"[TODO] Subscribing to trade updates for {symbol}...")
-        return False
+        if ws_connect is None:
+            logger.warning("websockets is not installed; cannot subscribe")
+            return False
+        logger.info(f"Subscribing to trade updates for {symbol}...")
+        get_market_stream().add_trade_listener(symbol, callback)
+        return True
 
     # ============ Error Handling ============
 
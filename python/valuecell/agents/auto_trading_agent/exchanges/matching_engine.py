@@ -0,0 +1,404 @@
+"""Order-matching simulator used by paper trading.
+
+Orders are matched against L1/L2 order book snapshots fed from recorded or
+live depth instead of filling instantly at the requested price:
+
+- Orders reach the book after an injected latency (fixed plus seeded random
+  jitter) and see the book as of their arrival.
+- Market orders walk the opposite side level by level and may fill partially
+  when the book is thin; the unfilled remainder expires.
+- Limit orders that cross take liquidity; the rest joins the queue at its
+  price behind the quantity already displayed there. Later snapshots advance
+  the queue by the quantity that left the level, and a price that trades
+  through the level fills the order.
+- Taker fills pay the taker fee, resting (maker) fills the maker fee.
+- Liquidity taken from a snapshot stays consumed until the next snapshot.
+
+Open orders are indexed per symbol. With a seed the simulation is fully
+deterministic.
+"""
+
+import heapq
+import itertools
+import logging
+import math
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .base_exchange import Order, OrderStatus
+
+logger = logging.getLogger(__name__)
+
+# Binance spot default (VIP 0) fees
+DEFAULT_FEE_TIER = {"maker": 0.001, "taker": 0.001}
+
+OPEN_STATUSES = (OrderStatus.PENDING, OrderStatus.PARTIALLY_FILLED)
+
+
+@dataclass(frozen=True)
+class Fill:
+    """A single execution of (part of) an order."""
+
+    order_id: str
+    symbol: str
+    side: str
+    price: float
+    quantity: float
+    fee: float
+    liquidity: str  # "maker" or "taker"
+    timestamp: float  # epoch seconds
+
+
+class OrderBook:
+    """
+    Depth snapshot of one symbol: bids best (highest) first, asks best
+    (lowest) first, each level a mutable ``[price, quantity]``.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        bids: Iterable[Sequence[float]],
+        asks: Iterable[Sequence[float]],
+        timestamp: float,
+        synthetic: bool = False,
+    ):
+        self.symbol = symbol
+        self.bids = sorted(
+            ([float(p), float(q)] for p, q in bids if q > 0), key=lambda lv: -lv[0]
+        )
+        self.asks = sorted(
+            ([float(p), float(q)] for p, q in asks if q > 0), key=lambda lv: lv[0]
+        )
+        self.timestamp = timestamp
+        # Built around a reference price (unlimited depth, no latency)
+        self.synthetic = synthetic
+
+    @classmethod
+    def around(
+        cls, symbol: str, price: float, spread_bps: float, timestamp: float
+    ) -> "OrderBook":
+        """L1 book with unlimited depth around a reference price."""
+        half_spread = price * spread_bps / 20_000
+        return cls(
+            symbol,
+            [(price - half_spread, math.inf)],
+            [(price + half_spread, math.inf)],
+            timestamp,
+            synthetic=True,
+        )
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        return self.bids[0][0] if self.bids else None
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        return self.asks[0][0] if self.asks else None
+
+    @property
+    def mid_price(self) -> Optional[float]:
+        if self.bids and self.asks:
+            return (self.bids[0][0] + self.asks[0][0]) / 2
+        return self.best_bid or self.best_ask
+
+    def side(self, order_side: str) -> List[List[float]]:
+        """Levels an order of ``order_side`` rests on."""
+        return self.bids if order_side == "buy" else self.asks
+
+    def opposite(self, order_side: str) -> List[List[float]]:
+        """Levels an order of ``order_side`` takes liquidity from."""
+        return self.asks if order_side == "buy" else self.bids
+
+    def quantity_at(self, order_side: str, price: float) -> float:
+        for level_price, quantity in self.side(order_side):
+            if level_price == price:
+                return quantity
+        return 0.0
+
+
+def _crosses(side: str, limit: Optional[float], level_price: float) -> bool:
+    if limit is None:
+        return True
+    return level_price <= limit if side == "buy" else level_price >= limit
+
+
+def _behind(side: str, book: OrderBook, price: float) -> bool:
+    """Whether the book's best price on ``side`` moved past ``price``."""
+    best = book.best_bid if side == "buy" else book.best_ask
+    if best is None:
+        return False
+    return best < price if side == "buy" else best > price
+
+
+class MatchingEngine:
+    """Matches orders against depth snapshots on a simulated clock."""
+
+    def __init__(
+        self,
+        fee_tier: Optional[Dict[str, float]] = None,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        seed: Optional[int] = None,
+        on_fill: Optional[Callable[[Order, Fill], None]] = None,
+        on_close: Optional[Callable[[Order], None]] = None,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            fee_tier: Maker/taker fee rates (default: DEFAULT_FEE_TIER)
+            latency: Seconds between submitting an order and it reaching the book
+            latency_jitter: Upper bound of extra uniform random latency (seconds)
+            seed: Seed of the latency jitter
+            on_fill: Called with every fill (e.g. to update balances)
+            on_close: Called when an order leaves the open orders
+        """
+        self.fee_tier = dict(fee_tier or DEFAULT_FEE_TIER)
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self._rng = random.Random(seed)
+        self._on_fill = on_fill
+        self._on_close = on_close
+
+        self.now = 0.0
+        self.books: Dict[str, OrderBook] = {}
+        # symbol -> order_id -> open order, in time priority
+        self._open: Dict[str, Dict[str, Order]] = {}
+        self._queue_ahead: Dict[str, float] = {}
+        self._resting: Dict[str, bool] = {}
+        self._in_flight: List[Tuple[float, int, Order]] = []
+        self._sequence = itertools.count()
+
+    # ============ Orders ============
+
+    def submit(self, order: Order, timestamp: Optional[float] = None) -> List[Fill]:
+        """
+        Submit an order; it reaches the book after the injected latency.
+
+        Orders on a synthetic book (no depth feed) are matched immediately.
+
+        Returns:
+            Fills produced right away
+        """
+        if timestamp is not None:
+            self.now = max(self.now, timestamp)
+        self._open.setdefault(order.symbol, {})[order.order_id] = order
+
+        book = self.books.get(order.symbol)
+        delay = self.latency
+        if self.latency_jitter:
+            delay += self._rng.uniform(0.0, self.latency_jitter)
+        if (book is not None and book.synthetic) or delay <= 0:
+            return self._arrive(order, self.now)
+
+        heapq.heappush(self._in_flight, (self.now + delay, next(self._sequence), order))
+        return []
+
+    def cancel(self, order: Order) -> bool:
+        """Cancel an open order (in flight or resting)."""
+        if order.order_id not in self._open.get(order.symbol, {}):
+            return False
+        order.status = OrderStatus.CANCELLED
+        self._close(order)
+        return True
+
+    def get_open_orders(self, symbol: Optional[str] = None) -> List[Order]:
+        """Open orders of one symbol (or all), oldest first."""
+        if symbol is not None:
+            return list(self._open.get(symbol, {}).values())
+        return [o for orders in self._open.values() for o in orders.values()]
+
+    def get_order_queue_position(self, order_id: str) -> Optional[float]:
+        """Quantity queued ahead of a resting limit order."""
+        return self._queue_ahead.get(order_id)
+
+    # ============ Market data ============
+
+    def set_reference_price(
+        self, symbol: str, price: float, spread_bps: float = 0.0
+    ) -> List[Fill]:
+        """
+        Quote a symbol without a depth feed around a reference price.
+
+        Resting limit orders are matched against the new quote, so they fill
+        once the reference price reaches them.
+
+        Returns:
+            Fills produced by the new quote
+        """
+        book = self.books.get(symbol)
+        if book is not None and not book.synthetic:
+            return []
+        book = OrderBook.around(symbol, price, spread_bps, self.now)
+        self.books[symbol] = book
+        fills: List[Fill] = []
+        for order in list(self._open.get(symbol, {}).values()):
+            if self._resting.get(order.order_id):
+                fills.extend(self._match_resting(order, None, book))
+        return fills
+
+    def update_book(
+        self,
+        symbol: str,
+        bids: Iterable[Sequence[float]],
+        asks: Iterable[Sequence[float]],
+        timestamp: float,
+    ) -> List[Fill]:
+        """
+        Apply a depth snapshot (L1: one level per side).
+
+        Orders arriving before the snapshot are matched against the previous
+        book first; resting orders are then matched against the new one.
+
+        Returns:
+            Fills produced by the snapshot
+        """
+        fills = self.advance(timestamp)
+        previous = self.books.get(symbol)
+        book = OrderBook(symbol, bids, asks, timestamp)
+        self.books[symbol] = book
+        for order in list(self._open.get(symbol, {}).values()):
+            if self._resting.get(order.order_id):
+                fills.extend(self._match_resting(order, previous, book))
+        return fills
+
+    def advance(self, timestamp: float) -> List[Fill]:
+        """Move the clock forward, delivering orders that arrive by then."""
+        fills: List[Fill] = []
+        while self._in_flight and self._in_flight[0][0] <= timestamp:
+            arrival, _, order = heapq.heappop(self._in_flight)
+            if order.status in OPEN_STATUSES:
+                fills.extend(self._arrive(order, arrival))
+        self.now = max(self.now, timestamp)
+        return fills
+
+    # ============ Matching ============
+
+    def _arrive(self, order: Order, timestamp: float) -> List[Fill]:
+        if order.order_id not in self._open.get(order.symbol, {}):
+            return []
+        book = self.books.get(order.symbol)
+        if book is None:
+            order.status = OrderStatus.REJECTED
+            logger.warning(
+                f"Order {order.order_id} rejected: no book for {order.symbol}"
+            )
+            self._close(order)
+            return []
+
+        limit = None if order.order_type == "market" else order.price
+        fills = self._take(order, book, limit, timestamp)
+
+        if order.filled_quantity >= order.quantity:
+            self._close(order)
+        elif limit is None:
+            # Market remainder beyond the visible depth expires
+            order.status = OrderStatus.EXPIRED
+            self._close(order)
+        else:
+            self._resting[order.order_id] = True
+            self._queue_ahead[order.order_id] = book.quantity_at(order.side, limit)
+        return fills
+
+    def _take(
+        self,
+        order: Order,
+        book: OrderBook,
+        limit: Optional[float],
+        timestamp: float,
+    ) -> List[Fill]:
+        """Take liquidity from the opposite side up to ``limit``."""
+        fills = []
+        for level in book.opposite(order.side):
+            remaining = order.quantity - order.filled_quantity
+            if remaining <= 0 or not _crosses(order.side, limit, level[0]):
+                break
+            quantity = min(remaining, level[1])
+            level[1] -= quantity
+            fills.append(self._fill(order, level[0], quantity, "taker", timestamp))
+        book.opposite(order.side)[:] = [
+            lv for lv in book.opposite(order.side) if lv[1] > 0
+        ]
+        return fills
+
+    def _match_resting(
+        self, order: Order, previous: Optional[OrderBook], book: OrderBook
+    ) -> List[Fill]:
+        price = order.price
+        remaining = order.quantity - order.filled_quantity
+        opposite_best = book.best_ask if order.side == "buy" else book.best_bid
+
+        if _behind(order.side, book, price):
+            # Our level traded through
+            quantity = remaining
+        elif opposite_best is not None and _crosses(order.side, price, opposite_best):
+            # The other side moved onto our price: fill against it as maker
+            quantity = 0.0
+            for level in book.opposite(order.side):
+                if not _crosses(order.side, price, level[0]):
+                    break
+                taken = min(remaining - quantity, level[1])
+                level[1] -= taken
+                quantity += taken
+                if quantity >= remaining:
+                    break
+        elif book.synthetic:
+            # No queue to work through on a quote of unlimited depth
+            quantity = 0.0
+        else:
+            before = previous.quantity_at(order.side, price) if previous else 0.0
+            traded = max(before - book.quantity_at(order.side, price), 0.0)
+            ahead = self._queue_ahead.get(order.order_id, 0.0) - traded
+            self._queue_ahead[order.order_id] = max(ahead, 0.0)
+            quantity = min(-ahead, remaining) if ahead < 0 else 0.0
+
+        if quantity <= 0:
+            return []
+        fill = self._fill(order, price, quantity, "maker", book.timestamp)
+        if order.filled_quantity >= order.quantity:
+            self._close(order)
+        return [fill]
+
+    def _fill(
+        self,
+        order: Order,
+        price: float,
+        quantity: float,
+        liquidity: str,
+        timestamp: float,
+    ) -> Fill:
+        fee = price * quantity * self.fee_tier.get(liquidity, 0.0)
+        total = order.filled_quantity + quantity
+        order.filled_price = (
+            order.filled_price * order.filled_quantity + price * quantity
+        ) / total
+        order.filled_quantity = total
+        order.fee += fee
+        order.status = (
+            OrderStatus.FILLED
+            if total >= order.quantity
+            else OrderStatus.PARTIALLY_FILLED
+        )
+
+        fill = Fill(
+            order.order_id,
+            order.symbol,
+            order.side,
+            price,
+            quantity,
+            fee,
+            liquidity,
+            timestamp,
+        )
+        if self._on_fill:
+            self._on_fill(order, fill)
+        return fill
+
+    def _close(self, order: Order) -> None:
+        self._open.get(order.symbol, {}).pop(order.order_id, None)
+        self._queue_ahead.pop(order.order_id, None)
+        self._resting.pop(order.order_id, None)
+        if self._on_close:
+            self._on_close(order)
@@ -1,29 +1,55 @@
 """Paper trading (simulated) exchange adapter"""
 
+import itertools
 import logging
-import uuid
-from typing import Any, Dict, List, Optional
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence
 
 import yfinance as yf
 
 from .base_exchange import ExchangeBase, ExchangeType, Order, OrderStatus
+from .matching_engine import Fill, MatchingEngine
 
 logger = logging.getLogger(__name__)
 
+# Closed orders kept for get_order_history/get_order_status
+DEFAULT_ORDER_HISTORY_LIMIT = 1000
+
 
 class PaperTrading(ExchangeBase):
     """
     Simulated trading on paper (no real money, no real orders).
 
     Used for backtesting and strategy development without risking real capital.
+    Orders go through a MatchingEngine: they are matched against the depth
+    fed with ``update_book`` (or an L1 quote around the current price for
+    symbols without depth), after the configured latency, paying maker/taker
+    fees, and may fill partially.
     """
 
-    def __init__(self, initial_balance: float = 100000.0):
+    def __init__(
+        self,
+        initial_balance: float = 100000.0,
+        fee_tier: Optional[Dict[str, float]] = None,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        spread_bps: float = 0.0,
+        seed: Optional[int] = None,
+        order_history_limit: int = DEFAULT_ORDER_HISTORY_LIMIT,
+    ):
         """
         Initialize paper trading exchange.
 
         Args:
             initial_balance: Starting capital for simulated trading
+            fee_tier: Maker/taker fee rates (default: Binance spot VIP 0)
+            latency: Seconds before an order reaches a depth-fed book
+            latency_jitter: Upper bound of extra random latency (seconds)
+            spread_bps: Spread quoted for symbols without depth data
+            seed: Seed making latency jitter reproducible
+            order_history_limit: Closed orders kept in the order history
         """
         super().__init__(ExchangeType.PAPER)
         self.initial_balance = initial_balance
@@ -31,6 +57,25 @@ class PaperTrading(ExchangeBase):
         self.positions: Dict[str, Dict[str, Any]] = {}  # {symbol: position_data}
         self.is_connected = True
 
+        self.fee_tier = fee_tier
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.spread_bps = spread_bps
+        self.seed = seed
+        self.order_history: Deque[Order] = deque(maxlen=order_history_limit)
+        self._order_ids = itertools.count(1)
+        self.engine = self._create_engine()
+
+    def _create_engine(self) -> MatchingEngine:
+        return MatchingEngine(
+            fee_tier=self.fee_tier,
+            latency=self.latency,
+            latency_jitter=self.latency_jitter,
+            seed=self.seed,
+            on_fill=self._apply_fill,
+            on_close=self._record_closed_order,
+        )
+
     # ============ Connection Management ============
 
     async def connect(self) -> bool:
@@ -89,7 +134,9 @@ class PaperTrading(ExchangeBase):
 
     async def get_current_price(self, symbol: str) -> float:
         """
-        Get current simulated price from yfinance.
+        Get current simulated price: the book mid price for symbols with
+        depth data, otherwise the latest yfinance close (which also requotes
+        the symbol, matching its resting orders).
 
         Args:
             symbol: Trading symbol in exchange format
@@ -97,6 +144,10 @@ class PaperTrading(ExchangeBase):
         Returns:
             Current price
         """
+        book = self.engine.books.get(symbol)
+        if book is not None and not book.synthetic and book.mid_price:
+            return book.mid_price
+
         try:
             # Convert exchange format back to ticker format
             ticker_symbol = self._denormalize_symbol(symbol)
@@ -105,11 +156,16 @@ class PaperTrading(ExchangeBase):
             if data.empty:
                 logger.warning(f"No price data for {symbol}")
                 return 0.0
-            return float(data["Close"].iloc[-1])
+            price = float(data["Close"].iloc[-1])
         except Exception as e:
             logger.error(f"Failed to get price for {symbol}: {e}")
             return 0.0
 
+        # Requote symbols without depth so resting orders see the new price
+        if book is not None and price > 0:
+            self.engine.set_reference_price(symbol, price, self.spread_bps)
+        return price
+
     async def get_24h_ticker(self, symbol: str) -> Dict[str, Any]:
         """
         Get 24-hour ticker data.
@@ -144,6 +200,30 @@ class PaperTrading(ExchangeBase):
             logger.error(f"Failed to get 24h ticker for {symbol}: {e}")
             return {}
 
+    # ============ Market Depth ============
+
+    def update_book(
+        self,
+        symbol: str,
+        bids: Iterable[Sequence[float]],
+        asks: Iterable[Sequence[float]],
+        timestamp: Optional[datetime] = None,
+    ) -> List[Fill]:
+        """
+        Feed a recorded or live depth snapshot to the matching engine.
+
+        Args:
+            symbol: Trading symbol in exchange format
+            bids: ``(price, quantity)`` levels (a single level for L1)
+            asks: ``(price, quantity)`` levels (a single level for L1)
+            timestamp: Snapshot time (default: now); drives the simulated clock
+
+        Returns:
+            Fills of open orders matched by the snapshot
+        """
+        ts = timestamp.timestamp() if timestamp else time.time()
+        return self.engine.update_book(symbol, bids, asks, ts)
+
     # ============ Order Management ============
 
     async def place_order(
@@ -169,10 +249,18 @@ class PaperTrading(ExchangeBase):
         Returns:
             Order object
         """
-        order_id = str(uuid.uuid4())[:8]
+        order_id = f"{next(self._order_ids):08d}"
+
+        # Symbols without depth data are quoted around the current price
+        # (market orders may pass the price they were decided at)
+        book = self.engine.books.get(symbol)
+        if book is None or book.synthetic:
+            reference = price if price and order_type == "market" else None
+            reference = reference or await self.get_current_price(symbol)
+            if reference and reference > 0:
+                self.engine.set_reference_price(symbol, reference, self.spread_bps)
 
-        # Get current price if market order
-        if price is None or order_type == "market":
+        if price is None:
             price = await self.get_current_price(symbol)
 
         order = Order(
@@ -183,14 +271,12 @@ class PaperTrading(ExchangeBase):
             price=price,
             order_type=order_type,
         )
-
-        # Immediately fill market orders
-        if order_type == "market":
-            await self._fill_order(order)
-
         self.orders[order_id] = order
+        self.engine.submit(order)
+
         logger.info(
-            f"Order placed: {order_id} - {side} {quantity} {symbol} @ ${price:.2f}"
+            f"Order placed: {order_id} - {side} {quantity} {symbol} @ ${price:.2f} "
+            f"({order.status.value}, filled {order.filled_quantity})"
         )
         return order
 
@@ -205,8 +291,8 @@ class PaperTrading(ExchangeBase):
         Returns:
             True if successful
         """
-        if order_id in self.orders:
-            self.orders[order_id].status = OrderStatus.CANCELLED
+        order = self.orders.get(order_id)
+        if order is not None and self.engine.cancel(order):
             logger.info(f"Order cancelled: {order_id}")
             return True
         return False
@@ -228,7 +314,7 @@ class PaperTrading(ExchangeBase):
 
     async def get_open_orders(self, symbol: Optional[str] = None) -> List[Order]:
         """
-        Get open orders.
+        Get open orders (from the engine's per-symbol index).
 
         Args:
             symbol: Optional symbol filter
@@ -236,14 +322,7 @@ class PaperTrading(ExchangeBase):
         Returns:
             List of open orders
         """
-        open_orders = [
-            o
-            for o in self.orders.values()
-            if o.status in [OrderStatus.PENDING, OrderStatus.PARTIALLY_FILLED]
-        ]
-        if symbol:
-            open_orders = [o for o in open_orders if o.symbol == symbol]
-        return open_orders
+        return self.engine.get_open_orders(symbol or None)
 
     async def get_order_history(
         self, symbol: Optional[str] = None, limit: int = 100
@@ -258,7 +337,7 @@ class PaperTrading(ExchangeBase):
         Returns:
             Order history
         """
-        history = self.order_history
+        history = list(self.order_history)
         if symbol:
             history = [o for o in history if o.symbol == symbol]
         return history[-limit:]
@@ -320,7 +399,7 @@ class PaperTrading(ExchangeBase):
         if price is None:
             price = await self.get_current_price(symbol)
 
-        notional = quantity * price
+        notional = self._worst_case_cost(symbol, quantity, price)
 
         # Check balance
         if notional > self.balance:
@@ -372,6 +451,27 @@ class PaperTrading(ExchangeBase):
         order = await self.place_order(symbol, "sell", quantity, price, "market")
         return order
 
+    def _worst_case_cost(self, symbol: str, quantity: float, price: float) -> float:
+        """
+        Cash a market buy may spend: the visible asks walked for depth-fed
+        symbols, otherwise the ask quoted around ``price``, plus taker fees.
+        """
+        cost = quantity * price * (1 + self.spread_bps / 20_000)
+        book = self.engine.books.get(symbol)
+        if book is not None and not book.synthetic:
+            walked, remaining = 0.0, quantity
+            for level_price, level_quantity in book.asks:
+                filled = min(remaining, level_quantity)
+                walked += filled * level_price
+                remaining -= filled
+                if remaining <= 0:
+                    break
+            # Depth beyond the visible asks is priced at the worst level
+            if remaining > 0 and book.asks:
+                walked += remaining * book.asks[-1][0]
+            cost = max(walked, quantity * price)
+        return cost * (1 + self.engine.fee_tier.get("taker", 0.0))
+
     # ============ Utilities ============
 
     def normalize_symbol(self, symbol: str) -> str:
@@ -400,12 +500,12 @@ class PaperTrading(ExchangeBase):
 
     async def get_fee_tier(self) -> Dict[str, float]:
         """
-        Paper trading has no fees.
+        Get the simulated maker/taker fee rates.
 
         Returns:
             Fee dictionary
         """
-        return {"maker": 0.0, "taker": 0.0}
+        return dict(self.engine.fee_tier)
 
     async def get_trading_limits(self, symbol: str) -> Dict[str, float]:
         """
@@ -426,65 +526,46 @@ class PaperTrading(ExchangeBase):
 
     # ============ Private Methods ============
 
-    async def _fill_order(self, order: Order) -> bool:
-        """
-        Fill an order (update balance, positions).
+    def _apply_fill(self, order: Order, fill: Fill) -> None:
+        """Update balance and positions for a fill."""
+        notional = fill.quantity * fill.price
+        position = self.positions.get(order.symbol)
+
+        if order.side == "buy":
+            self.balance -= notional + fill.fee
+            if position is None:
+                self.positions[order.symbol] = {
+                    "quantity": fill.quantity,
+                    "entry_price": fill.price,
+                    "entry_time": order.created_at,
+                }
+            else:
+                # Average the entry price
+                total_quantity = position["quantity"] + fill.quantity
+                position["entry_price"] = (
+                    position["entry_price"] * position["quantity"] + notional
+                ) / total_quantity
+                position["quantity"] = total_quantity
+
+        elif order.side == "sell":
+            self.balance += notional - fill.fee
+            if position is not None:
+                position["quantity"] -= fill.quantity
+                if position["quantity"] <= 0:
+                    del self.positions[order.symbol]
 
-        Args:
-            order: Order to fill
-
-        Returns:
-            True if filled successfully
-        """
-        try:
-            if order.side == "buy":
-                notional = order.quantity * order.price
-                self.balance -= notional
-
-                # Update position
-                if order.symbol in self.positions:
-                    self.positions[order.symbol]["quantity"] += order.quantity
-                    # Update entry price (average)
-                    old_notional = self.positions[order.symbol]["entry_price"] * (
-                        self.positions[order.symbol]["quantity"] - order.quantity
-                    )
-                    total_notional = old_notional + notional
-                    total_quantity = self.positions[order.symbol]["quantity"]
-                    self.positions[order.symbol]["entry_price"] = (
-                        total_notional / total_quantity
-                    )
-                else:
-                    self.positions[order.symbol] = {
-                        "quantity": order.quantity,
-                        "entry_price": order.price,
-                        "entry_time": order.created_at,
-                    }
-
-                order.filled_quantity = order.quantity
-                order.filled_price = order.price
-                order.status = OrderStatus.FILLED
-
-            elif order.side == "sell":
-                notional = order.quantity * order.price
-                self.balance += notional
-
-                # Update position
-                if order.symbol in self.positions:
-                    self.positions[order.symbol]["quantity"] -= order.quantity
-                    if self.positions[order.symbol]["quantity"] <= 0:
-                        del self.positions[order.symbol]
-
-                order.filled_quantity = order.quantity
-                order.filled_price = order.price
-                order.status = OrderStatus.FILLED
-
-            self.order_history.append(order)
-            logger.info(f"Order filled: {order.order_id} - {order.status.value}")
-            return True
+        logger.info(
+            f"Order filled: {order.order_id} - {fill.quantity} @ ${fill.price:.2f} "
+            f"({fill.liquidity}, fee ${fill.fee:.4f}, {order.status.value})"
+        )
 
-        except Exception as e:
-            logger.error(f"Failed to fill order: {e}")
-            return False
+    def _record_closed_order(self, order: Order) -> None:
+        """Move a closed order to the bounded order history."""
+        maxlen = self.order_history.maxlen
+        if maxlen and len(self.order_history) == maxlen:
+            evicted = self.order_history[0]
+            self.orders.pop(evicted.order_id, None)
+        self.order_history.append(order)
 
     async def reset(self, initial_balance: float):
         """
@@ -498,4 +579,6 @@ class PaperTrading(ExchangeBase):
         self.positions.clear()
         self.orders.clear()
         self.order_history.clear()
+        self._order_ids = itertools.count(1)
+        self.engine = self._create_engine()
         logger.info(f"Paper trading reset with balance: ${initial_balance:,.2f}")
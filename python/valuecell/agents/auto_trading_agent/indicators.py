@@ -0,0 +1,246 @@
+"""Streaming technical indicators with O(1) work per bar.
+
+Each indicator keeps only the state needed to fold in the next close price, so
+a cached series can be advanced by one or two new bars instead of recomputing
+over the whole history. ``preview`` evaluates the indicators for a bar that is
+still forming (the latest, not yet closed kline) without committing it.
+``compute_indicator_columns`` evaluates the same indicators for every bar of a
+stored series at once (e.g. for backtests).
+"""
+
+import copy
+import math
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class EMA:
+    """Exponential moving average, matching ``ewm(span=n, adjust=False)``."""
+
+    def __init__(self, span: int):
+        self.alpha = 2.0 / (span + 1)
+        self.value: Optional[float] = None
+
+    def update(self, x: float) -> float:
+        if self.value is None:
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+class WilderRSI:
+    """Relative Strength Index with Wilder's smoothing.
+
+    The first average gain/loss is the simple mean of ``period`` price changes;
+    later averages use ``(prev * (period - 1) + current) / period``.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close: Optional[float] = None
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.count = 0
+
+    def update(self, close: float) -> Optional[float]:
+        if self.prev_close is None:
+            self.prev_close = close
+            return None
+
+        change = close - self.prev_close
+        self.prev_close = close
+        gain = max(change, 0.0)
+        loss = max(-change, 0.0)
+        self.count += 1
+
+        if self.count <= self.period:
+            # Accumulate the seed averages
+            self.avg_gain += gain / self.period
+            self.avg_loss += loss / self.period
+            if self.count < self.period:
+                return None
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+        return self.value
+
+    @property
+    def value(self) -> Optional[float]:
+        if self.count < self.period:
+            return None
+        if self.avg_loss == 0:
+            # No losses in the window: maximum strength
+            return 100.0
+        rs = self.avg_gain / self.avg_loss
+        return 100.0 - 100.0 / (1.0 + rs)
+
+
+class RollingStats:
+    """Rolling mean and sample standard deviation over a fixed window.
+
+    Running sums make each update O(1); they are recomputed from the window
+    every ``resync_every`` updates to stop floating-point drift.
+    """
+
+    def __init__(self, window: int = 20, resync_every: int = 1000):
+        self.window = window
+        self.resync_every = resync_every
+        self.values: Deque[float] = deque(maxlen=window)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self._updates = 0
+
+    def update(self, x: float) -> None:
+        if len(self.values) == self.window:
+            old = self.values[0]
+            self.total -= old
+            self.total_sq -= old * old
+        self.values.append(x)
+        self.total += x
+        self.total_sq += x * x
+
+        self._updates += 1
+        if self._updates % self.resync_every == 0:
+            self.total = math.fsum(self.values)
+            self.total_sq = math.fsum(v * v for v in self.values)
+
+    @property
+    def mean(self) -> Optional[float]:
+        if len(self.values) < self.window:
+            return None
+        return self.total / self.window
+
+    @property
+    def std(self) -> Optional[float]:
+        if len(self.values) < self.window:
+            return None
+        n = self.window
+        variance = (self.total_sq - self.total * self.total / n) / (n - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+class IndicatorEngine:
+    """Incremental EMA/MACD/RSI/Bollinger state for one price series."""
+
+    def __init__(
+        self,
+        rsi_period: int = 14,
+        bb_period: int = 20,
+        bb_std_dev: float = 2.0,
+    ):
+        self.ema_12 = EMA(12)
+        self.ema_26 = EMA(26)
+        self.ema_50 = EMA(50)
+        self.macd_signal = EMA(9)
+        self.rsi = WilderRSI(rsi_period)
+        self.bollinger = RollingStats(bb_period)
+        self.bb_std_dev = bb_std_dev
+        self.count = 0
+
+    def update(self, close: float) -> None:
+        """Fold a closed bar into the indicator state."""
+        ema_12 = self.ema_12.update(close)
+        ema_26 = self.ema_26.update(close)
+        self.ema_50.update(close)
+        self.macd_signal.update(ema_12 - ema_26)
+        self.rsi.update(close)
+        self.bollinger.update(close)
+        self.count += 1
+
+    def values(self) -> Dict[str, Optional[float]]:
+        """Current indicator values (None where there is not enough data)."""
+        if self.count == 0:
+            return {}
+
+        macd = self.ema_12.value - self.ema_26.value
+        signal = self.macd_signal.value
+        bb_middle = self.bollinger.mean
+        bb_std = self.bollinger.std
+        has_bands = bb_middle is not None and bb_std is not None
+
+        return {
+            "ema_12": self.ema_12.value,
+            "ema_26": self.ema_26.value,
+            "ema_50": self.ema_50.value,
+            "macd": macd,
+            "macd_signal": signal,
+            "macd_histogram": macd - signal,
+            "rsi": self.rsi.value,
+            "bb_middle": bb_middle,
+            "bb_upper": bb_middle + bb_std * self.bb_std_dev if has_bands else None,
+            "bb_lower": bb_middle - bb_std * self.bb_std_dev if has_bands else None,
+        }
+
+    def preview(self, close: float) -> Dict[str, Optional[float]]:
+        """Indicator values as if ``close`` were appended, without committing it."""
+        engine = copy.deepcopy(self)
+        engine.update(close)
+        return engine.values()
+
+
+def compute_indicator_columns(
+    closes,
+    rsi_period: int = 14,
+    bb_period: int = 20,
+    bb_std_dev: float = 2.0,
+) -> Dict[str, np.ndarray]:
+    """
+    Indicator values after every bar of a close price series, vectorized.
+
+    Matches feeding the closes one by one to ``IndicatorEngine.update`` and
+    reading ``values()`` after each; NaN marks bars without enough data.
+
+    Args:
+        closes: Close prices, oldest first
+        rsi_period: RSI period
+        bb_period: Bollinger Bands window
+        bb_std_dev: Bollinger Bands width in standard deviations
+
+    Returns:
+        Indicator name -> array with one value per bar
+    """
+    close = pd.Series(np.asarray(closes, dtype=np.float64))
+
+    ema_12 = close.ewm(span=12, adjust=False).mean()
+    ema_26 = close.ewm(span=26, adjust=False).mean()
+    ema_50 = close.ewm(span=50, adjust=False).mean()
+    macd = ema_12 - ema_26
+    macd_signal = macd.ewm(span=9, adjust=False).mean()
+
+    # Wilder's smoothing is an EWM with alpha=1/period seeded with the simple
+    # mean of the first ``period`` changes
+    rsi = np.full(len(close), np.nan)
+    if len(close) > rsi_period:
+        change = close.diff().to_numpy()[1:]
+        averages = []
+        for moves in (np.maximum(change, 0.0), np.maximum(-change, 0.0)):
+            seeded = np.concatenate(([moves[:rsi_period].mean()], moves[rsi_period:]))
+            averages.append(
+                pd.Series(seeded).ewm(alpha=1.0 / rsi_period, adjust=False).mean()
+            )
+        avg_gain, avg_loss = (avg.to_numpy() for avg in averages)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+        rsi[rsi_period:] = np.where(avg_loss == 0, 100.0, values)
+
+    rolling = close.rolling(bb_period)
+    bb_middle = rolling.mean()
+    bb_std = rolling.std(ddof=1)
+
+    return {
+        "ema_12": ema_12.to_numpy(),
+        "ema_26": ema_26.to_numpy(),
+        "ema_50": ema_50.to_numpy(),
+        "macd": macd.to_numpy(),
+        "macd_signal": macd_signal.to_numpy(),
+        "macd_histogram": (macd - macd_signal).to_numpy(),
+        "rsi": rsi,
+        "bb_middle": bb_middle.to_numpy(),
+        "bb_upper": (bb_middle + bb_std * bb_std_dev).to_numpy(),
+        "bb_lower": (bb_middle - bb_std * bb_std_dev).to_numpy(),
+    }
@@ -0,0 +1,178 @@
+"""Incremental kline cache - keeps recent bars per (symbol, interval) in memory.
+
+The latest kline returned by an exchange is usually still forming. The series
+keeps it as the last bar of the ring buffer without folding it into the
+indicator state; it is replaced when a newer version of the same bar arrives
+and committed once a later bar opens.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .indicators import IndicatorEngine
+
+logger = logging.getLogger(__name__)
+
+# Bar length in milliseconds for supported kline intervals
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 3 * 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1h": 60 * 60_000,
+    "2h": 2 * 60 * 60_000,
+    "4h": 4 * 60 * 60_000,
+    "1d": 24 * 60 * 60_000,
+}
+
+
+@dataclass(frozen=True)
+class Bar:
+    """A single OHLCV bar keyed by its open time (epoch milliseconds)."""
+
+    open_time: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+def bars_from_dataframe(df: Optional[pd.DataFrame]) -> List[Bar]:
+    """Convert a kline DataFrame (Binance or yfinance columns) to bars.
+
+    The DataFrame index must hold the bar open times.
+    """
+    if df is None or df.empty:
+        return []
+
+    columns = {col.lower(): col for col in df.columns}
+    required = ["open", "high", "low", "close", "volume"]
+    if any(name not in columns for name in required):
+        logger.warning(f"Kline frame is missing columns: {list(df.columns)}")
+        return []
+
+    frame = df[[columns[name] for name in required]].dropna()
+    index = pd.DatetimeIndex(frame.index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    open_times = index.as_unit("ns").asi8 // 1_000_000
+
+    return [
+        Bar(int(ts), float(o), float(h), float(lo), float(c), float(v))
+        for ts, (o, h, lo, c, v) in zip(open_times, frame.itertuples(index=False))
+    ]
+
+
+class KlineSeries:
+    """Ring buffer of bars plus streaming indicator state for one series."""
+
+    def __init__(self, symbol: str, interval: str, max_bars: int = 1000):
+        self.symbol = symbol
+        self.interval = interval
+        self.interval_ms = INTERVAL_MS.get(interval, 60_000)
+        self.max_bars = max_bars
+
+        self.bars: Deque[Bar] = deque(maxlen=max_bars)
+        self.engine = IndicatorEngine()
+        self.updated_at: Optional[float] = None
+        # Data source the bars came from (series are never mixed across sources)
+        self.source: Optional[str] = None
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.bars)
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        return self.bars[-1].open_time if self.bars else None
+
+    def reset(self) -> None:
+        """Drop all bars and indicator state."""
+        self.bars.clear()
+        self.engine = IndicatorEngine()
+        self.updated_at = None
+        self.source = None
+
+    def is_fresh(self, ttl_seconds: float) -> bool:
+        """Return True if the series was refreshed within ``ttl_seconds``."""
+        return (
+            self.updated_at is not None
+            and time.monotonic() - self.updated_at < ttl_seconds
+        )
+
+    def needs_reseed(self, now_ms: Optional[int] = None) -> bool:
+        """Return True if an incremental fetch cannot close the gap."""
+        if not self.bars:
+            return True
+        now_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+        missing = (now_ms - self.bars[-1].open_time) // self.interval_ms
+        return missing >= self.max_bars
+
+    def merge(self, bars: Iterable[Bar]) -> int:
+        """Merge bars sorted by open time into the series.
+
+        Bars older than the last held bar are ignored, a bar with the same
+        open time replaces the (forming) last bar, and newer bars are appended.
+
+        Returns:
+            Number of new bars appended
+        """
+        appended = 0
+        for bar in bars:
+            last = self.bars[-1] if self.bars else None
+            if last is not None and bar.open_time < last.open_time:
+                continue
+            if last is not None and bar.open_time == last.open_time:
+                self.bars[-1] = bar
+                continue
+            if last is not None:
+                # The previous last bar is now closed
+                self.engine.update(last.close)
+            self.bars.append(bar)
+            appended += 1
+
+        self.updated_at = time.monotonic()
+        return appended
+
+    def tail(self, n: int) -> List[Bar]:
+        """The most recent ``n`` bars, oldest first."""
+        return list(itertools.islice(reversed(self.bars), n))[::-1]
+
+    def latest_indicators(self) -> Dict[str, Optional[float]]:
+        """Indicator values including the latest (possibly forming) bar."""
+        if not self.bars:
+            return {}
+        return self.engine.preview(self.bars[-1].close)
+
+
+class KlineCache:
+    """Registry of kline series keyed by (symbol, interval)."""
+
+    def __init__(self, max_bars: int = 1000):
+        self.max_bars = max_bars
+        self._series: Dict[tuple, KlineSeries] = {}
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, interval: str) -> KlineSeries:
+        """Get (or create) the series for a symbol and interval."""
+        key = (symbol, interval)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = KlineSeries(symbol, interval, self.max_bars)
+                self._series[key] = series
+            return series
+
+    def clear(self) -> None:
+        """Drop all cached series."""
+        with self._lock:
+            self._series.clear()
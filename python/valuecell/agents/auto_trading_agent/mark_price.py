@@ -0,0 +1,163 @@
+"""Mark prices used to value open positions.
+
+Valuations used to download a day of minute bars from yfinance for every open
+position, on every portfolio query. The oracle instead serves the close price
+of the market snapshot the signals were computed from, published once per
+monitoring tick, so valuing a portfolio within a tick needs no network call.
+Symbols without a fresh mark fall back to a price fetcher (streamed quote,
+Binance, then yfinance) whose result is cached the same way.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional
+
+from .constants import DEFAULT_CHECK_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MarkPrice:
+    """A mark price and when (and for which tick) it was taken."""
+
+    symbol: str
+    price: float
+    tick: Optional[datetime]
+    updated_at: float  # time.monotonic()
+    source: str
+
+
+def _default_fetch_price(symbol: str) -> Optional[float]:
+    # Same provider (and kline/quote cache) as the signal generation
+    from .technical_analysis import TechnicalAnalyzer
+
+    return TechnicalAnalyzer._market_data_provider.get_current_price(symbol)
+
+
+class MarkPriceOracle:
+    """Per-tick cache of mark prices shared by all trading instances."""
+
+    def __init__(
+        self,
+        fetch_price: Optional[Callable[[str], Optional[float]]] = None,
+        max_age: float = DEFAULT_CHECK_INTERVAL,
+    ):
+        """
+        Initialize the oracle.
+
+        Args:
+            fetch_price: Fallback price fetcher for symbols without a fresh mark
+            max_age: Seconds a mark stays valid (one monitoring interval)
+        """
+        self._fetch_price = fetch_price or _default_fetch_price
+        self.max_age = max_age
+        self._marks: Dict[str, MarkPrice] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.fetches = 0
+
+    def update(
+        self,
+        symbol: str,
+        price: float,
+        tick: Optional[datetime] = None,
+        source: str = "snapshot",
+    ) -> None:
+        """
+        Publish the mark price of a symbol for a monitoring tick.
+
+        Marks from an older tick never replace a newer one.
+        """
+        if price is None or price <= 0:
+            return
+        mark = MarkPrice(symbol, float(price), tick, time.monotonic(), source)
+        with self._lock:
+            current = self._marks.get(symbol)
+            if (
+                current is not None
+                and tick is not None
+                and current.tick is not None
+                and current.tick > tick
+            ):
+                return
+            self._marks[symbol] = mark
+
+    def get_mark(self, symbol: str) -> Optional[MarkPrice]:
+        """Get the latest mark of a symbol, fresh or not."""
+        with self._lock:
+            return self._marks.get(symbol)
+
+    def get_price(self, symbol: str) -> Optional[float]:
+        """
+        Get the mark price of a symbol.
+
+        Args:
+            symbol: Trading symbol
+
+        Returns:
+            Fresh mark price; the last known mark if fetching fails; None if
+            the symbol was never priced
+        """
+        mark = self.get_mark(symbol)
+        if mark is not None and time.monotonic() - mark.updated_at < self.max_age:
+            self.hits += 1
+            return mark.price
+
+        self.fetches += 1
+        try:
+            price = self._fetch_price(symbol)
+        except Exception as e:
+            logger.warning(f"Failed to fetch mark price for {symbol}: {e}")
+            price = None
+
+        if price is not None and price > 0:
+            self.update(symbol, price, mark.tick if mark else None, source="fetch")
+            return float(price)
+
+        if mark is not None:
+            logger.debug(f"Using stale mark price for {symbol}")
+            return mark.price
+        return None
+
+    def get_prices(self, symbols: Iterable[str]) -> Dict[str, float]:
+        """Get mark prices for several symbols (symbols without one are omitted)."""
+        prices = {}
+        for symbol in symbols:
+            price = self.get_price(symbol)
+            if price is not None:
+                prices[symbol] = price
+        return prices
+
+    def clear(self) -> None:
+        with self._lock:
+            self._marks.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return cache counters."""
+        return {"symbols": len(self._marks), "hits": self.hits, "fetches": self.fetches}
+
+
+# Global instance
+_mark_price_oracle: Optional[MarkPriceOracle] = None
+_oracle_lock = threading.Lock()
+
+
+def get_mark_price_oracle() -> MarkPriceOracle:
+    """Get the process-wide mark price oracle."""
+    global _mark_price_oracle
+    with _oracle_lock:
+        if _mark_price_oracle is None:
+            _mark_price_oracle = MarkPriceOracle()
+        return _mark_price_oracle
+
+
+def reset_mark_price_oracle() -> None:
+    """Drop the global oracle (mainly for tests)."""
+    global _mark_price_oracle
+    with _oracle_lock:
+        _mark_price_oracle = None
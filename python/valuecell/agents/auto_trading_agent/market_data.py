@@ -2,13 +2,15 @@
 
 import logging
 import os
+import time
 from datetime import datetime, timezone
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
-import pandas as pd
 import yfinance as yf
 
 from .binance_data import BinanceMarketDataProvider
+from .kline_cache import Bar, KlineSeries, bars_from_dataframe
+from .market_stream import MarketDataStore
 from .models import TechnicalIndicators
 
 logger = logging.getLogger(__name__)
@@ -28,17 +30,22 @@ class MarketDataProvider:
         self,
         cache_ttl_seconds: int = 60,
         preferred_source: Optional[str] = None,
+        store: Optional[MarketDataStore] = None,
     ):
         """
         Initialize market data provider with optional caching.
 
         Args:
-            cache_ttl_seconds: Time to live for cached data
+            cache_ttl_seconds: Seconds a cached kline series is reused before
+                               fetching the bars that arrived since
             preferred_source: Preferred data source ("binance" or "yfinance")
                              If None, uses environment variable or defaults to "binance"
+            store: Quote/bar store shared with the WebSocket feed
+                   (a private store is used if omitted)
         """
         self.cache_ttl_seconds = cache_ttl_seconds
-        self._cache: Dict[str, tuple] = {}  # {symbol: (data, timestamp)}
+        self.store = store if store is not None else MarketDataStore()
+        self._cache = self.store.klines  # {(symbol, interval): KlineSeries}
         
         # Determine preferred source
         if preferred_source is None:
@@ -60,6 +67,11 @@ class MarketDataProvider:
         Returns:
             Current price or None if fetch fails
         """
+        # Streamed quote, if the WebSocket feed has a fresh one
+        price = self.store.get_price(symbol)
+        if price is not None:
+            return price
+
         # Try Binance first (if preferred)
         if self.preferred_source == "binance":
             try:
@@ -88,9 +100,14 @@ class MarketDataProvider:
         Calculate all technical indicators for a symbol.
         Tries Binance first, falls back to yfinance if needed.
 
+        Bars are cached per (symbol, interval). The first call downloads the
+        full history; later calls only fetch bars newer than the last cached
+        one and advance the indicators incrementally.
+
         Args:
             symbol: Trading symbol
-            period: Data period (default: 5 days for intraday trading)
+            period: Data period used for the initial yfinance download
+                    (default: 5 days for intraday trading)
             interval: Data interval (default: 1 minute)
                      For Binance: "1m", "5m", "15m", "1h", "1d", etc.
                      For yfinance: "1m", "5m", "15m", "1h", "1d", etc.
@@ -98,126 +115,141 @@ class MarketDataProvider:
         Returns:
             TechnicalIndicators object or None if calculation fails
         """
-        df = None
-        
+        series = self._cache.get(symbol, interval)
+        with series.lock:
+            if not series.is_fresh(self.cache_ttl_seconds):
+                self._refresh_series(series, period)
+
+            if len(series) < 50:
+                logger.warning(f"Insufficient data for {symbol}: {len(series)} bars")
+                return None
+
+            return self._build_indicators(series)
+
+    def get_bar_closes(
+        self, symbol: str, since: datetime, interval: str = "1m", period: str = "5d"
+    ) -> List[Tuple[datetime, float]]:
+        """
+        Close prices of the cached bars that closed after a point in time.
+
+        Args:
+            symbol: Trading symbol
+            since: Only bars closing after this time (naive: local time)
+            interval: Data interval
+            period: Data period used if the series has to be downloaded
+
+        Returns:
+            (close time, close price) of the closed bars, oldest first; bars
+            older than the cached history are not included
+        """
+        series = self._cache.get(symbol, interval)
+        with series.lock:
+            if not series.is_fresh(self.cache_ttl_seconds):
+                self._refresh_series(series, period)
+            bars = list(series.bars)
+
+        # The last bar may still be forming
+        now_ms = int(time.time() * 1000)
+        since_ms = int(since.timestamp() * 1000)
+        closes = []
+        for bar in bars:
+            close_ms = bar.open_time + series.interval_ms
+            if since_ms < close_ms <= now_ms:
+                closes.append((datetime.fromtimestamp(close_ms / 1000), bar.close))
+        return closes
+
+    def _refresh_series(self, series: KlineSeries, period: str) -> None:
+        """Fetch the bars missing from a cached series and merge them."""
+        symbol, interval = series.symbol, series.interval
+        reseed = series.needs_reseed()
+
         # Try Binance first (if preferred)
         if self.preferred_source == "binance":
-            try:
-                # Map period to limit (approx)
-                # For 5d with 1m: 5 * 24 * 60 = 7200 bars (too many)
-                # Binance max is 1000, so we request last 1000 bars
-                limit = 1000
-                
-                # Map interval
-                binance_interval = interval  # Same format: "1m", "5m", etc.
-                
-                df = self.binance_provider.get_klines(
-                    symbol=symbol,
-                    interval=binance_interval,
-                    limit=limit,
-                )
-                
-                if df is not None and len(df) >= 50:
-                    logger.debug(f"Got {len(df)} bars from Binance for {symbol}")
-                else:
-                    df = None
-                    
-            except Exception as e:
-                logger.warning(f"Binance klines failed for {symbol}, trying yfinance: {e}")
-                df = None
-        
+            bars = self._fetch_binance_bars(
+                series, reseed or series.source != "binance"
+            )
+            if bars is not None:
+                self._merge_bars(series, "binance", bars)
+                return
+
         # Fallback to yfinance
-        if df is None:
-            try:
-                ticker = yf.Ticker(symbol)
+        reseed = reseed or series.source != "yfinance"
+        try:
+            ticker = yf.Ticker(symbol)
+            if reseed:
                 df = ticker.history(period=period, interval=interval)
-            except Exception as e:
-                logger.error(f"Failed to fetch data from yfinance for {symbol}: {e}")
-                return None
-
-        if df is None or df.empty or len(df) < 50:
-            logger.warning(f"Insufficient data for {symbol}: {len(df) if df is not None else 0} bars")
-            return None
+            else:
+                start = datetime.fromtimestamp(
+                    series.last_open_time / 1000, tz=timezone.utc
+                )
+                df = ticker.history(start=start, interval=interval)
+        except Exception as e:
+            logger.error(f"Failed to fetch data from yfinance for {symbol}: {e}")
+            return
 
-        # Calculate all indicators
-        self._calculate_moving_averages(df)
-        self._calculate_macd(df)
-        self._calculate_rsi(df)
-        self._calculate_bollinger_bands(df)
+        bars = bars_from_dataframe(df)
+        if reseed:
+            series.reset()
+        self._merge_bars(series, "yfinance", bars)
 
-        # Get latest values
-        return self._extract_latest_indicators(df, symbol)
+    def _fetch_binance_bars(
+        self, series: KlineSeries, reseed: bool
+    ) -> Optional[List[Bar]]:
+        """Fetch new Binance bars for a series (all of them when reseeding).
 
-    @staticmethod
-    def _calculate_moving_averages(df: pd.DataFrame):
-        """Calculate exponential moving averages"""
-        df["ema_12"] = df["Close"].ewm(span=12, adjust=False).mean()
-        df["ema_26"] = df["Close"].ewm(span=26, adjust=False).mean()
-        df["ema_50"] = df["Close"].ewm(span=50, adjust=False).mean()
+        Returns:
+            Bars to merge, or None if Binance could not serve the series
+        """
+        symbol = series.symbol
+        try:
+            # Binance returns at most 1000 bars per request
+            df = self.binance_provider.get_klines(
+                symbol=symbol,
+                interval=series.interval,
+                limit=1000,
+                start_time=None if reseed else series.last_open_time,
+            )
+        except Exception as e:
+            logger.warning(f"Binance klines failed for {symbol}, trying yfinance: {e}")
+            return None
 
-    @staticmethod
-    def _calculate_macd(df: pd.DataFrame):
-        """Calculate MACD and signal line"""
-        df["ema_12"] = df["Close"].ewm(span=12, adjust=False).mean()
-        df["ema_26"] = df["Close"].ewm(span=26, adjust=False).mean()
-        df["macd"] = df["ema_12"] - df["ema_26"]
-        df["macd_signal"] = df["macd"].ewm(span=9, adjust=False).mean()
-        df["macd_histogram"] = df["macd"] - df["macd_signal"]
+        if df is None:
+            return None
 
-    @staticmethod
-    def _calculate_rsi(df: pd.DataFrame, period: int = 14):
-        """Calculate Relative Strength Index"""
-        delta = df["Close"].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        # Avoid division by zero: if loss is 0, RSI = 100 (maximum strength)
-        rs = gain / loss.replace(0, float("inf"))
-        df["rsi"] = 100 - (100 / (1 + rs))
+        bars = bars_from_dataframe(df)
+        if reseed:
+            if len(bars) < 50:
+                return None
+            series.reset()
+        return bars
 
     @staticmethod
-    def _calculate_bollinger_bands(
-        df: pd.DataFrame, period: int = 20, std_dev: float = 2
-    ):
-        """Calculate Bollinger Bands"""
-        df["bb_middle"] = df["Close"].rolling(window=period).mean()
-        bb_std = df["Close"].rolling(window=period).std()
-        df["bb_upper"] = df["bb_middle"] + (bb_std * std_dev)
-        df["bb_lower"] = df["bb_middle"] - (bb_std * std_dev)
+    def _merge_bars(series: KlineSeries, source: str, bars: List[Bar]) -> None:
+        """Merge freshly fetched bars into a series and record their source."""
+        appended = series.merge(bars)
+        series.source = source
+        logger.debug(
+            f"Fetched {len(bars)} bars from {source} for {series.symbol} "
+            f"({appended} new, {len(series)} cached)"
+        )
 
     @staticmethod
-    def _extract_latest_indicators(
-        df: pd.DataFrame, symbol: str
-    ) -> TechnicalIndicators:
-        """Extract latest indicator values from dataframe"""
-        latest = df.iloc[-1]
-
-        def safe_float(value):
-            """Safely convert to float, handling NaN"""
-            return float(value) if pd.notna(value) else None
+    def _build_indicators(series: KlineSeries) -> TechnicalIndicators:
+        """Build the latest indicator snapshot from a cached series"""
+        latest = series.bars[-1]
 
-        # Extract historical prices and volumes (last 20 bars)
+        # Historical prices and volumes (last 20 bars)
         # Ordered from oldest to newest (important for LLM understanding!)
-        hist_len = min(20, len(df))
-        historical_prices = df["Close"].tail(hist_len).tolist()
-        historical_volumes = df["Volume"].tail(hist_len).tolist()
+        history = series.tail(20)
 
         return TechnicalIndicators(
-            symbol=symbol,
+            symbol=series.symbol,
             timestamp=datetime.now(timezone.utc),
-            close_price=float(latest["Close"]),
-            volume=float(latest["Volume"]),
-            historical_prices=historical_prices,
-            historical_volumes=historical_volumes,
-            macd=safe_float(latest.get("macd")),
-            macd_signal=safe_float(latest.get("macd_signal")),
-            macd_histogram=safe_float(latest.get("macd_histogram")),
-            rsi=safe_float(latest.get("rsi")),
-            ema_12=safe_float(latest.get("ema_12")),
-            ema_26=safe_float(latest.get("ema_26")),
-            ema_50=safe_float(latest.get("ema_50")),
-            bb_upper=safe_float(latest.get("bb_upper")),
-            bb_middle=safe_float(latest.get("bb_middle")),
-            bb_lower=safe_float(latest.get("bb_lower")),
+            close_price=latest.close,
+            volume=latest.volume,
+            historical_prices=[bar.close for bar in history],
+            historical_volumes=[bar.volume for bar in history],
+            **series.latest_indicators(),
         )
 
 
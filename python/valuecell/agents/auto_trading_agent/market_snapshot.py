@@ -0,0 +1,104 @@
+"""Shared per-tick market snapshots for all trading instances in a process.
+
+When several models trade the same symbols, every instance processed for the
+same monitoring tick asks for the same indicators. The snapshot service fetches
+and computes each (symbol, tick) once and hands the same immutable
+``TechnicalIndicators`` object to every caller, so instances also agree on the
+prices they trade against.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from .models import TechnicalIndicators
+
+logger = logging.getLogger(__name__)
+
+
+class MarketSnapshotService:
+    """Coalesce indicator calculations per (symbol, tick)."""
+
+    def __init__(
+        self,
+        calculate_indicators: Callable[[str], Optional[TechnicalIndicators]],
+        max_ticks: int = 4,
+    ):
+        """
+        Initialize the snapshot service.
+
+        Args:
+            calculate_indicators: Blocking function computing a symbol's
+                                  indicators (run in a worker thread)
+            max_ticks: Number of recent ticks whose snapshots are retained
+        """
+        self._calculate_indicators = calculate_indicators
+        self.max_ticks = max_ticks
+        # {tick: {symbol: Task}}
+        self._snapshots: "OrderedDict[datetime, Dict[str, asyncio.Task]]" = (
+            OrderedDict()
+        )
+        self.fetches = 0
+        self.shared = 0
+
+    async def get_indicators(
+        self, symbol: str, tick: Optional[datetime] = None
+    ) -> Optional[TechnicalIndicators]:
+        """
+        Get the indicators snapshot of a symbol for a monitoring tick.
+
+        The first caller for a (symbol, tick) starts the calculation; concurrent
+        and later callers for the same tick await the same result. Cancelling
+        one caller (e.g. on a per-symbol timeout) does not cancel the shared
+        calculation.
+
+        Args:
+            symbol: Trading symbol
+            tick: Monitoring tick timestamp; None disables sharing
+
+        Returns:
+            TechnicalIndicators snapshot or None if there is not enough data
+        """
+        if tick is None:
+            self.fetches += 1
+            return await asyncio.to_thread(self._calculate_indicators, symbol)
+
+        tasks = self._snapshots.get(tick)
+        if tasks is None:
+            tasks = {}
+            self._snapshots[tick] = tasks
+            while len(self._snapshots) > self.max_ticks:
+                self._snapshots.popitem(last=False)
+
+        task = tasks.get(symbol)
+        if task is None:
+            self.fetches += 1
+            task = asyncio.ensure_future(
+                asyncio.to_thread(self._calculate_indicators, symbol)
+            )
+            # Failed calculations are not shared with later callers
+            task.add_done_callback(
+                lambda t: tasks.pop(symbol, None)
+                if not t.cancelled() and t.exception() is not None
+                else None
+            )
+            tasks[symbol] = task
+        else:
+            self.shared += 1
+            logger.debug(f"Reusing {symbol} market snapshot for tick {tick}")
+
+        return await asyncio.shield(task)
+
+    def clear(self) -> None:
+        """Drop all retained snapshots."""
+        self._snapshots.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return fetch and sharing counters."""
+        return {
+            "ticks": len(self._snapshots),
+            "fetches": self.fetches,
+            "shared": self.shared,
+        }
@@ -0,0 +1,532 @@
+"""Binance WebSocket market-data feed and in-memory quote/bar store.
+
+``BinanceMarketStream`` keeps one combined-stream connection open for the
+subscribed symbols (``<symbol>@kline_<interval>`` and ``<symbol>@miniTicker``,
+plus ``<symbol>@trade`` for symbols with trade listeners) and publishes every
+update into a ``MarketDataStore``. Readers - ``MarketDataProvider``,
+``PositionManager`` and the trading API - look prices and bars up in the store
+and only fall back to REST when the stream has nothing fresh.
+
+The feed runs its own event loop in a daemon thread so synchronous and async
+callers in different loops can share it. It reconnects with exponential
+backoff, resubscribes every stream on reconnect and backfills kline gaps over
+REST before consuming new messages.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+try:
+    from websockets.asyncio.client import connect as ws_connect
+    from websockets.exceptions import WebSocketException
+except ImportError:
+    ws_connect = None
+    WebSocketException = Exception
+
+from .binance_data import BinanceMarketDataProvider, to_binance_symbol
+from .kline_cache import Bar, KlineCache, KlineSeries, bars_from_dataframe
+
+logger = logging.getLogger(__name__)
+
+# Binance combined-stream WebSocket endpoint
+BINANCE_WS_BASE = "wss://stream.binance.com:9443"
+
+# Quotes older than this are treated as stale by default (seconds)
+QUOTE_MAX_AGE = 5.0
+
+# Minimum bars a series needs before it is considered seeded
+MIN_SEEDED_BARS = 50
+
+
+@dataclass(frozen=True)
+class Quote:
+    """Latest rolling 24h ticker for a symbol."""
+
+    symbol: str
+    price: float
+    open: float
+    high: float
+    low: float
+    volume: float
+    event_time: int  # exchange event time (epoch milliseconds)
+    received_at: float  # local time.time() when the update arrived
+
+    @property
+    def change_pct(self) -> float:
+        return (self.price - self.open) / self.open * 100 if self.open else 0.0
+
+
+class MarketDataStore:
+    """Thread-safe latest-quote store plus the shared kline cache."""
+
+    def __init__(self, klines: Optional[KlineCache] = None):
+        self.klines = klines if klines is not None else KlineCache()
+        self._quotes: Dict[str, Quote] = {}
+        self._lock = threading.Lock()
+
+    def update_quote(self, quote: Quote) -> None:
+        with self._lock:
+            self._quotes[quote.symbol] = quote
+
+    def get_quote(
+        self, symbol: str, max_age: Optional[float] = QUOTE_MAX_AGE
+    ) -> Optional[Quote]:
+        """Get the latest quote, or None if missing or older than ``max_age``."""
+        with self._lock:
+            quote = self._quotes.get(to_binance_symbol(symbol))
+        if quote is None:
+            return None
+        if max_age is not None and time.time() - quote.received_at > max_age:
+            return None
+        return quote
+
+    def get_price(
+        self, symbol: str, max_age: Optional[float] = QUOTE_MAX_AGE
+    ) -> Optional[float]:
+        """Get the latest price, or None if there is no fresh quote."""
+        quote = self.get_quote(symbol, max_age)
+        return quote.price if quote else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._quotes.clear()
+        self.klines.clear()
+
+
+class BinanceMarketStream:
+    """Combined kline/miniTicker WebSocket feed publishing into a store."""
+
+    def __init__(
+        self,
+        store: MarketDataStore,
+        interval: str = "1m",
+        ws_base: str = BINANCE_WS_BASE,
+        rest_provider: Optional[BinanceMarketDataProvider] = None,
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+    ):
+        """
+        Initialize the feed (call ``subscribe`` to start streaming).
+
+        Args:
+            store: Store receiving quotes and bars
+            interval: Kline interval to stream
+            ws_base: WebSocket base URL
+            rest_provider: REST provider used to seed and backfill bars
+            reconnect_delay: Initial reconnect backoff in seconds
+            max_reconnect_delay: Maximum reconnect backoff in seconds
+        """
+        self.store = store
+        self.interval = interval
+        self.ws_base = ws_base.rstrip("/")
+        self.rest = rest_provider or BinanceMarketDataProvider()
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        # Binance symbol (lowercase) -> symbols as requested by callers
+        self._symbols: Dict[str, Set[str]] = {}
+        # Binance symbol (uppercase) -> trade callbacks
+        self._trade_listeners: Dict[str, List[Callable[[Dict[str, Any]], None]]] = {}
+        self._ticker_listeners: Dict[str, List[Callable[[Quote], None]]] = {}
+        self._lock = threading.Lock()
+
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ws = None
+        self._stopping = threading.Event()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._request_id = 0
+        self.connected = threading.Event()
+
+        self.messages = 0
+        self.reconnects = 0
+        self.backfilled_bars = 0
+        self.last_message_at: Optional[float] = None
+
+    # ============ Subscriptions ============
+
+    def _streams_for(self, binance_symbol: str) -> List[str]:
+        streams = [
+            f"{binance_symbol}@kline_{self.interval}",
+            f"{binance_symbol}@miniTicker",
+        ]
+        if binance_symbol.upper() in self._trade_listeners:
+            streams.append(f"{binance_symbol}@trade")
+        return streams
+
+    def streams(self) -> List[str]:
+        """All stream names for the current subscriptions."""
+        with self._lock:
+            return [
+                stream
+                for binance_symbol in sorted(self._symbols)
+                for stream in self._streams_for(binance_symbol)
+            ]
+
+    def subscribe(self, symbols: Iterable[str]) -> None:
+        """Subscribe to kline and ticker streams, starting the feed if needed."""
+        added = []
+        backfill = []
+        with self._lock:
+            for symbol in symbols:
+                binance_symbol = to_binance_symbol(symbol).lower()
+                if binance_symbol not in self._symbols:
+                    self._symbols[binance_symbol] = set()
+                    added.append(binance_symbol)
+                if symbol not in self._symbols[binance_symbol]:
+                    self._symbols[binance_symbol].add(symbol)
+                    backfill.append(binance_symbol)
+            streams = [s for b in added for s in self._streams_for(b)]
+
+        self.start()
+        if streams or backfill:
+            self._send_subscribe(streams, backfill)
+
+    def add_ticker_listener(
+        self, symbol: str, callback: Callable[[Quote], None]
+    ) -> None:
+        """Call ``callback`` (on the feed thread) for every ticker update."""
+        key = to_binance_symbol(symbol)
+        with self._lock:
+            self._ticker_listeners.setdefault(key, []).append(callback)
+        self.subscribe([symbol])
+
+    def add_trade_listener(
+        self, symbol: str, callback: Callable[[Dict[str, Any]], None]
+    ) -> None:
+        """Call ``callback`` (on the feed thread) for every public trade."""
+        key = to_binance_symbol(symbol)
+        with self._lock:
+            new_stream = key not in self._trade_listeners
+            self._trade_listeners.setdefault(key, []).append(callback)
+        self.subscribe([symbol])
+        if new_stream:
+            self._send_subscribe([f"{key.lower()}@trade"], [])
+
+    def _send_subscribe(self, streams: List[str], backfill: List[str]) -> None:
+        """Subscribe new streams on the live connection (if any)."""
+        loop = self._loop
+        if loop is None or not loop.is_running():
+            return
+
+        async def _subscribe():
+            if self._wakeup is not None:
+                self._wakeup.set()
+            ws = self._ws
+            if ws is None:
+                # Not connected; the next connection subscribes and backfills
+                return
+            if streams:
+                self._request_id += 1
+                await ws.send(
+                    json.dumps(
+                        {
+                            "method": "SUBSCRIBE",
+                            "params": streams,
+                            "id": self._request_id,
+                        }
+                    )
+                )
+            for binance_symbol in dict.fromkeys(backfill):
+                await asyncio.to_thread(self._backfill, binance_symbol)
+
+        asyncio.run_coroutine_threadsafe(_subscribe(), loop)
+
+    # ============ Lifecycle ============
+
+    def start(self) -> None:
+        """
+        Start the feed thread (no-op if already running).
+
+        Does not wait for the thread: subscriptions made before its event
+        loop runs are picked up by the first connection, so this is safe to
+        call from an event loop.
+        """
+        if ws_connect is None:
+            logger.warning("websockets is not installed; market stream disabled")
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run_loop,
+                name="binance-market-stream",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Close the connection and stop the feed thread."""
+        self._stopping.set()
+        loop = self._loop
+        if loop is not None and loop.is_running():
+
+            async def _close():
+                if self._wakeup is not None:
+                    self._wakeup.set()
+                if self._ws is not None:
+                    await self._ws.close()
+
+            asyncio.run_coroutine_threadsafe(_close(), loop)
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+        self._thread = None
+
+    def is_live(self, max_age: float = QUOTE_MAX_AGE) -> bool:
+        """Return True if the feed is connected and received data recently."""
+        return (
+            self.connected.is_set()
+            and self.last_message_at is not None
+            and time.time() - self.last_message_at <= max_age
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return connection counters."""
+        return {
+            "connected": self.connected.is_set(),
+            "symbols": len(self._symbols),
+            "messages": self.messages,
+            "reconnects": self.reconnects,
+            "backfilled_bars": self.backfilled_bars,
+            "last_message_at": self.last_message_at,
+        }
+
+    def _run_loop(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._wakeup = asyncio.Event()
+        # Set last: _send_subscribe only uses a loop with a wakeup event
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._run())
+        finally:
+            self._loop = None
+            loop.close()
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+        while not self._stopping.is_set():
+            streams = self.streams()
+            if not streams:
+                # Nothing to stream yet; wait for a subscription
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            url = f"{self.ws_base}/stream?streams={'/'.join(streams)}"
+            try:
+                async with ws_connect(url, open_timeout=10) as ws:
+                    self._ws = ws
+                    self.connected.set()
+                    logger.info(f"Market stream connected ({len(streams)} streams)")
+
+                    # Streams added while the connection was being opened
+                    missing = [s for s in self.streams() if s not in streams]
+                    if missing:
+                        self._request_id += 1
+                        await ws.send(
+                            json.dumps(
+                                {
+                                    "method": "SUBSCRIBE",
+                                    "params": missing,
+                                    "id": self._request_id,
+                                }
+                            )
+                        )
+
+                    # Seed or backfill bars missed while disconnected
+                    for binance_symbol in self._symbols_snapshot():
+                        await asyncio.to_thread(self._backfill, binance_symbol)
+
+                    async for raw in ws:
+                        delay = self.reconnect_delay
+                        self._handle_message(raw)
+            except (OSError, asyncio.TimeoutError, WebSocketException) as e:
+                logger.warning(f"Market stream disconnected: {e}")
+            except Exception as e:
+                logger.error(f"Market stream failed: {e}")
+            finally:
+                self._ws = None
+                self.connected.clear()
+
+            if self._stopping.is_set():
+                break
+            self.reconnects += 1
+            logger.info(f"Reconnecting market stream in {delay:.1f}s")
+            # Back off, but wake up early when stopped
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _symbols_snapshot(self) -> List[str]:
+        with self._lock:
+            return list(self._symbols)
+
+    def _series_for(self, binance_symbol: str) -> List[KlineSeries]:
+        with self._lock:
+            symbols = list(self._symbols.get(binance_symbol, ()))
+        return [self.store.klines.get(symbol, self.interval) for symbol in symbols]
+
+    # ============ Backfill ============
+
+    def _backfill(self, binance_symbol: str) -> None:
+        """Fetch bars missed since the last cached one over REST.
+
+        Empty or non-Binance series are reseeded with a full history download.
+        """
+        for series in self._series_for(binance_symbol):
+            with series.lock:
+                reseed = (
+                    series.source != "binance"
+                    or len(series) < MIN_SEEDED_BARS
+                    or series.needs_reseed()
+                )
+                df = self.rest.get_klines(
+                    symbol=series.symbol,
+                    interval=self.interval,
+                    limit=1000,
+                    start_time=None if reseed else series.last_open_time,
+                )
+                if df is None:
+                    logger.warning(f"Kline backfill failed for {series.symbol}")
+                    continue
+                bars = bars_from_dataframe(df)
+                if reseed:
+                    series.reset()
+                series.merge(bars)
+                series.source = "binance"
+                self.backfilled_bars += len(bars)
+                logger.debug(f"Backfilled {len(bars)} bars for {series.symbol}")
+
+    # ============ Message handling ============
+
+    def _handle_message(self, raw: Any) -> None:
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError):
+            logger.debug(f"Ignoring non-JSON stream message: {raw!r}")
+            return
+
+        data = message.get("data") if isinstance(message, dict) else None
+        if not isinstance(data, dict):
+            # Subscription acknowledgements ({"result": null, "id": n})
+            return
+
+        self.messages += 1
+        self.last_message_at = time.time()
+        event = data.get("e")
+        try:
+            if event == "kline":
+                self._handle_kline(data)
+            elif event == "24hrMiniTicker":
+                self._handle_ticker(data)
+            elif event == "trade":
+                self._handle_trade(data)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Malformed {event} event: {e}")
+
+    def _handle_kline(self, data: Dict[str, Any]) -> None:
+        k = data["k"]
+        bar = Bar(
+            int(k["t"]),
+            float(k["o"]),
+            float(k["h"]),
+            float(k["l"]),
+            float(k["c"]),
+            float(k["v"]),
+        )
+        for series in self._series_for(data["s"].lower()):
+            with series.lock:
+                # Unseeded series are filled by the backfill first
+                if series.source == "binance" and len(series) > 0:
+                    series.merge([bar])
+
+    def _handle_ticker(self, data: Dict[str, Any]) -> None:
+        quote = Quote(
+            symbol=data["s"],
+            price=float(data["c"]),
+            open=float(data["o"]),
+            high=float(data["h"]),
+            low=float(data["l"]),
+            volume=float(data["v"]),
+            event_time=int(data["E"]),
+            received_at=time.time(),
+        )
+        self.store.update_quote(quote)
+        for callback in self._ticker_listeners.get(quote.symbol, ()):
+            try:
+                callback(quote)
+            except Exception as e:
+                logger.warning(f"Ticker listener failed for {quote.symbol}: {e}")
+
+    def _handle_trade(self, data: Dict[str, Any]) -> None:
+        trade = {
+            "symbol": data["s"],
+            "price": float(data["p"]),
+            "quantity": float(data["q"]),
+            "trade_time": int(data["T"]),
+            "is_buyer_maker": bool(data.get("m")),
+        }
+        for callback in self._trade_listeners.get(trade["symbol"], ()):
+            try:
+                callback(trade)
+            except Exception as e:
+                logger.warning(f"Trade listener failed for {trade['symbol']}: {e}")
+
+
+# Global instances
+_market_data_store: Optional[MarketDataStore] = None
+_market_stream: Optional[BinanceMarketStream] = None
+_globals_lock = threading.Lock()
+
+
+def get_market_data_store() -> MarketDataStore:
+    """Get the process-wide market data store."""
+    global _market_data_store
+    with _globals_lock:
+        if _market_data_store is None:
+            _market_data_store = MarketDataStore()
+        return _market_data_store
+
+
+def get_market_stream() -> BinanceMarketStream:
+    """Get the process-wide Binance market stream (not started until used)."""
+    global _market_stream
+    store = get_market_data_store()
+    with _globals_lock:
+        if _market_stream is None:
+            _market_stream = BinanceMarketStream(
+                store, ws_base=os.getenv("BINANCE_WS_BASE", BINANCE_WS_BASE)
+            )
+        return _market_stream
+
+
+def ensure_market_stream(symbols: Iterable[str]) -> Optional[BinanceMarketStream]:
+    """Stream the given symbols unless disabled via TRADING_MARKET_STREAM=false."""
+    if os.getenv("TRADING_MARKET_STREAM", "true").lower() in ("false", "0", "no"):
+        return None
+    if ws_connect is None:
+        return None
+    stream = get_market_stream()
+    stream.subscribe(symbols)
+    return stream
+
+
+def reset_market_stream() -> None:
+    """Stop the global stream and drop the global store (mainly for tests)."""
+    global _market_data_store, _market_stream
+    with _globals_lock:
+        stream, _market_stream = _market_stream, None
+        _market_data_store = None
+    if stream is not None:
+        stream.stop()
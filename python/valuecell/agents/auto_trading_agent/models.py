@@ -11,7 +11,9 @@ from .constants import (
     DEFAULT_INITIAL_CAPITAL,
     DEFAULT_MAX_POSITIONS,
     DEFAULT_RISK_PER_TRADE,
+    MAX_SYMBOL_LENGTH,
     MAX_SYMBOLS,
+    SIGNAL_CACHE_TTL,
 )
 
 
@@ -78,6 +80,12 @@ class TradingRequest(BaseModel):
             raise ValueError("At least one crypto symbol is required")
         if len(v) > MAX_SYMBOLS:
             raise ValueError(f"Maximum {MAX_SYMBOLS} symbols allowed")
+        # History records store symbols in fixed-size fields
+        for s in v:
+            if len(s.encode()) > MAX_SYMBOL_LENGTH:
+                raise ValueError(
+                    f"Symbol {s!r} is longer than {MAX_SYMBOL_LENGTH} bytes"
+                )
         # Normalize symbols to uppercase
         return [s.upper() for s in v]
     
@@ -126,6 +134,15 @@ class AutoTradingConfig(BaseModel):
         default=None,
         description="OpenRouter API key for AI model access",
     )
+    signal_cache_ttl: int = Field(
+        default=SIGNAL_CACHE_TTL,
+        description="Seconds an AI signal is reused for a near-identical market state (0 disables)",
+        ge=0,
+    )
+    batch_ai_signals: bool = Field(
+        default=True,
+        description="Request all symbols' AI signals with the portfolio decision in one LLM call",
+    )
 
     @field_validator("crypto_symbols")
     @classmethod
@@ -134,6 +151,12 @@ class AutoTradingConfig(BaseModel):
             raise ValueError("At least one crypto symbol is required")
         if len(v) > MAX_SYMBOLS:
             raise ValueError(f"Maximum {MAX_SYMBOLS} symbols allowed")
+        # History records store symbols in fixed-size fields
+        for s in v:
+            if len(s.encode()) > MAX_SYMBOL_LENGTH:
+                raise ValueError(
+                    f"Symbol {s!r} is longer than {MAX_SYMBOL_LENGTH} bytes"
+                )
         # Normalize symbols to uppercase
         return [s.upper() for s in v]
 
@@ -202,6 +225,12 @@ class TechnicalIndicators(BaseModel):
     bb_middle: Optional[float] = None
     bb_lower: Optional[float] = None
 
+    class Config:
+        """Pydantic config"""
+
+        # Snapshots are shared by every instance trading the symbol
+        frozen = True
+
 
 class TradeHistoryRecord(BaseModel):
     """Single trade execution history record"""
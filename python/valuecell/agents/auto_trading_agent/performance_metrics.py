@@ -0,0 +1,256 @@
+"""Vectorized, incrementally updated performance metrics for trading instances.
+
+Metrics are computed with NumPy over columns of portfolio values and closed
+trade PnLs. ``RunningMetrics`` keeps the sufficient statistics of an
+instance's whole history (running mean/variance of returns, downside sum of
+squares, running peak and max drawdown, trade wins/losses), so new snapshots
+are folded in without revisiting old ones. ``MetricsEngine`` caches one
+``RunningMetrics`` per instance keyed by the instance's history version and
+only reads rows newer than its cursors from the trading state store, so a
+leaderboard over unchanged instances costs O(instances).
+"""
+
+import asyncio
+import logging
+import math
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Returns are per check; annualize assuming one check per minute
+PERIODS_PER_YEAR = 252 * 24 * 60
+
+
+class RunningMetrics:
+    """Sufficient statistics of a portfolio value series and its trades."""
+
+    def __init__(self, periods_per_year: int = PERIODS_PER_YEAR):
+        self.periods_per_year = periods_per_year
+
+        self.value_count = 0
+        self.first_value: Optional[float] = None
+        self.last_value: Optional[float] = None
+        self.peak = -math.inf
+        self.max_drawdown = 0.0
+
+        # Welford/Chan running moments of the per-check returns
+        self.return_count = 0
+        self.return_mean = 0.0
+        self.return_m2 = 0.0
+        self.downside_sq_sum = 0.0
+
+        self.closed_trades = 0
+        self.winning_trades = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+
+    def update(
+        self,
+        values: Sequence[float] = (),
+        trade_pnls: Sequence[float] = (),
+    ) -> None:
+        """
+        Fold new portfolio values and closed-trade PnLs into the statistics.
+
+        Args:
+            values: Portfolio values newer than any seen so far, oldest first
+            trade_pnls: PnLs of closed trades not seen so far
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if len(values):
+            self._add_values(values)
+
+        pnls = np.asarray(trade_pnls, dtype=np.float64)
+        if len(pnls):
+            self.closed_trades += len(pnls)
+            self.winning_trades += int(np.count_nonzero(pnls > 0))
+            self.gross_profit += float(pnls[pnls > 0].sum())
+            self.gross_loss += float(-pnls[pnls < 0].sum())
+
+    def _add_values(self, values: np.ndarray) -> None:
+        if self.last_value is None:
+            self.first_value = float(values[0])
+            prev, curr = values[:-1], values[1:]
+        else:
+            prev = np.concatenate(([self.last_value], values[:-1]))
+            curr = values
+
+        valid = prev > 0
+        returns = (curr[valid] - prev[valid]) / prev[valid]
+        if len(returns):
+            # Chan et al. parallel update of count/mean/M2
+            n_a, n_b = self.return_count, len(returns)
+            mean_b = float(returns.mean())
+            m2_b = float(((returns - mean_b) ** 2).sum())
+            n = n_a + n_b
+            delta = mean_b - self.return_mean
+            self.return_mean += delta * n_b / n
+            self.return_m2 += m2_b + delta * delta * n_a * n_b / n
+            self.return_count = n
+            self.downside_sq_sum += float((np.minimum(returns, 0.0) ** 2).sum())
+
+        peaks = np.maximum(np.maximum.accumulate(values), self.peak)
+        drawdowns = np.divide(
+            peaks - values, peaks, out=np.zeros_like(values), where=peaks > 0
+        )
+        self.max_drawdown = max(self.max_drawdown, float(drawdowns.max()))
+        self.peak = float(peaks[-1])
+        self.last_value = float(values[-1])
+        self.value_count += len(values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Current metrics (percentages and ratios rounded to 2 decimals)."""
+        annualizer = math.sqrt(self.periods_per_year)
+        std = (
+            math.sqrt(self.return_m2 / (self.return_count - 1))
+            if self.return_count > 1
+            else 0.0
+        )
+        downside = (
+            math.sqrt(self.downside_sq_sum / self.return_count)
+            if self.return_count
+            else 0.0
+        )
+        annual_return = self.return_mean * self.periods_per_year
+
+        total_return = 0.0
+        if self.first_value and self.last_value is not None:
+            total_return = (self.last_value / self.first_value - 1) * 100
+
+        return {
+            "snapshots": self.value_count,
+            "total_return_pct": round(total_return, 2),
+            "sharpe_ratio": round(self.return_mean / std * annualizer, 2)
+            if std > 0
+            else 0.0,
+            "sortino_ratio": round(self.return_mean / downside * annualizer, 2)
+            if downside > 0
+            else 0.0,
+            "max_drawdown": round(self.max_drawdown * 100, 2),
+            "calmar_ratio": round(annual_return / self.max_drawdown, 2)
+            if self.max_drawdown > 0
+            else 0.0,
+            "closed_trades": self.closed_trades,
+            "win_rate": round(self.winning_trades / self.closed_trades * 100, 2)
+            if self.closed_trades
+            else 0.0,
+            # None when there are no losing trades (unbounded)
+            "profit_factor": round(self.gross_profit / self.gross_loss, 2)
+            if self.gross_loss > 0
+            else (None if self.gross_profit > 0 else 0.0),
+        }
+
+
+def compute_metrics(
+    values: Sequence[float],
+    trade_pnls: Sequence[float] = (),
+    periods_per_year: int = PERIODS_PER_YEAR,
+) -> Dict[str, Any]:
+    """Compute the metrics of a whole series in one pass."""
+    metrics = RunningMetrics(periods_per_year)
+    metrics.update(values, trade_pnls)
+    return metrics.to_dict()
+
+
+class _CacheEntry:
+    __slots__ = ("version", "metrics", "last_ts_us", "last_trade_seq", "result")
+
+    def __init__(self, periods_per_year: int):
+        self.version: Optional[Tuple] = None
+        self.metrics = RunningMetrics(periods_per_year)
+        self.last_ts_us: Optional[int] = None
+        self.last_trade_seq = -1
+        self.result: Dict[str, Any] = {}
+
+
+class MetricsEngine:
+    """Per-instance metrics cache fed incrementally from the trading store."""
+
+    def __init__(self, periods_per_year: int = PERIODS_PER_YEAR):
+        self.periods_per_year = periods_per_year
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._lock: Optional[asyncio.Lock] = None  # lazy to avoid loop-binding
+
+        self.hits = 0
+        self.updates = 0
+
+    @staticmethod
+    def history_version(instance: Dict[str, Any]) -> Tuple:
+        """Version of an instance's history, from its summary row."""
+        return (
+            instance.get("updated_at"),
+            instance.get("check_count"),
+            instance.get("trade_count"),
+        )
+
+    async def get_metrics(self, store, instance: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Get the metrics of an instance, reading only rows added since the
+        previous call.
+
+        Args:
+            store: TradingStateStore holding the instance's history
+            instance: Summary row from ``store.list_instances()``
+
+        Returns:
+            Metrics dictionary (see ``RunningMetrics.to_dict``)
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        instance_id = instance["instance_id"]
+        version = self.history_version(instance)
+        async with self._lock:
+            entry = self._entries.get(instance_id)
+            if entry is not None and entry.version == version:
+                self.hits += 1
+                return entry.result
+            if entry is None:
+                entry = self._entries[instance_id] = _CacheEntry(self.periods_per_year)
+
+            values = await store.get_portfolio_values(instance_id, entry.last_ts_us)
+            pnls = await store.get_closed_trade_pnls(instance_id, entry.last_trade_seq)
+            entry.metrics.update([v for _, v in values], [p for _, p in pnls])
+            if values:
+                entry.last_ts_us = values[-1][0]
+            if pnls:
+                entry.last_trade_seq = pnls[-1][0]
+
+            entry.version = version
+            entry.result = entry.metrics.to_dict()
+            self.updates += 1
+            return entry.result
+
+    def discard(self, instance_id: str) -> None:
+        self._entries.pop(instance_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return cache counters."""
+        return {
+            "instances": len(self._entries),
+            "hits": self.hits,
+            "updates": self.updates,
+        }
+
+
+# Global instance
+_metrics_engine: Optional[MetricsEngine] = None
+
+
+def get_metrics_engine() -> MetricsEngine:
+    """Get the process-wide metrics engine."""
+    global _metrics_engine
+    if _metrics_engine is None:
+        _metrics_engine = MetricsEngine()
+    return _metrics_engine
+
+
+def reset_metrics_engine() -> None:
+    """Drop the global engine (mainly for tests)."""
+    global _metrics_engine
+    _metrics_engine = None
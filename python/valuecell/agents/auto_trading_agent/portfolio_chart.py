@@ -0,0 +1,85 @@
+"""Multi-model portfolio value chart built with a vectorized as-of join.
+
+Each model's portfolio history is a ``ts``-sorted array of
+PORTFOLIO_HISTORY_DTYPE rows. The chart's time axis is the union of all
+snapshot times (optionally downsampled), and each model's column holds its
+value as of each time: ``np.searchsorted`` finds the latest snapshot at or
+before every time in one pass, which forward-fills gaps. Times before a
+model's first snapshot show its initial capital.
+"""
+
+from typing import Any, List, Mapping, Optional
+
+import numpy as np
+
+from .timeseries import from_epoch_us
+
+CHART_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def merge_series(parts: List[np.ndarray]) -> np.ndarray:
+    """Merge several ``ts``-sorted series (e.g. one model's instances)."""
+    parts = [part for part in parts if len(part)]
+    if not parts:
+        return np.empty(0, dtype=[("ts", "<i8"), ("total_value", "<f8")])
+    if len(parts) == 1:
+        return parts[0]
+    merged = np.concatenate(parts)
+    return merged[np.argsort(merged["ts"], kind="stable")]
+
+
+def build_chart_rows(
+    series: Mapping[str, np.ndarray],
+    initial_values: Mapping[str, float],
+    max_points: Optional[int] = None,
+    after_ts: Optional[int] = None,
+) -> List[List[Any]]:
+    """
+    Build ``[["Time", model...], [time, value...], ...]`` chart rows.
+
+    Args:
+        series: Model id -> ``ts``-sorted rows with ``ts`` (epoch
+                microseconds) and ``total_value`` fields
+        initial_values: Model id -> value shown before its first snapshot
+        max_points: Downsample the time axis to at most this many rows
+                    (the newest time is always kept); None/0 keeps all
+        after_ts: Only include times after this one (epoch microseconds),
+                  e.g. to extend a chart that was already sent
+
+    Returns:
+        Header row followed by one row per time; empty if there is no data
+    """
+    non_empty = [rows for rows in series.values() if len(rows)]
+    if not non_empty:
+        return []
+
+    times = np.unique(np.concatenate([rows["ts"] for rows in non_empty]))
+    if after_ts is not None:
+        times = times[times > after_ts]
+    if max_points and len(times) > max_points:
+        step = -(-len(times) // max_points)
+        times = times[::-step][::-1]
+
+    models = list(series)
+    columns = []
+    for model in models:
+        rows = series[model]
+        if not len(rows):
+            columns.append(np.full(len(times), float(initial_values[model])))
+            continue
+        idx = np.searchsorted(rows["ts"], times, side="right") - 1
+        values = rows["total_value"][np.maximum(idx, 0)]
+        columns.append(np.where(idx >= 0, values, float(initial_values[model])))
+
+    sample = non_empty[0]
+    tz_aware = (
+        bool(sample["tz_aware"][-1]) if "tz_aware" in sample.dtype.names else True
+    )
+    labels = [
+        from_epoch_us(ts, tz_aware).strftime(CHART_TIME_FORMAT) for ts in times.tolist()
+    ]
+
+    chart_rows: List[List[Any]] = [["Time"] + models]
+    for label, values in zip(labels, np.column_stack(columns).tolist()):
+        chart_rows.append([label] + values)
+    return chart_rows
@@ -1,8 +1,10 @@
 """Portfolio-level decision manager using AI for coordinated multi-asset trading decisions"""
 
+import asyncio
+import contextlib
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from agno.agent import Agent
 from pydantic import BaseModel, Field
@@ -14,6 +16,8 @@ from .models import (
     TradeAction,
     TradeType,
 )
+from .signal_cache import portfolio_cache_key, signal_cache_key
+from .technical_analysis import describe_position
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +49,21 @@ class AssetAnalysis:
         self.recommended_action = ai_action or technical_action
         self.recommended_trade_type = ai_trade_type or technical_trade_type
 
+    def set_ai_signal(
+        self,
+        ai_action: TradeAction,
+        ai_trade_type: TradeType,
+        ai_reasoning: Optional[str] = None,
+        ai_confidence: Optional[float] = None,
+    ):
+        """Attach an AI signal obtained after the technical analysis"""
+        self.ai_action = ai_action
+        self.ai_trade_type = ai_trade_type
+        self.ai_reasoning = ai_reasoning
+        self.ai_confidence = ai_confidence
+        self.recommended_action = ai_action
+        self.recommended_trade_type = ai_trade_type
+
     @property
     def current_price(self) -> float:
         """Get current price from indicators"""
@@ -118,6 +137,36 @@ class PortfolioDecisionSchema(BaseModel):
     )
 
 
+class ExitPlan(BaseModel):
+    """Exit plan for a position opened on a signal"""
+
+    profit_target_pct: Optional[float] = Field(None, description="Take profit (%)")
+    stop_loss_pct: Optional[float] = Field(None, description="Stop loss (%)")
+    invalidation_condition: Optional[str] = Field(
+        None, description="Condition that invalidates the trade idea"
+    )
+
+
+class SymbolSignal(BaseModel):
+    """AI signal for one symbol"""
+
+    symbol: str = Field(..., description="Trading symbol")
+    action: str = Field(..., description="BUY, SELL, or HOLD")
+    trade_type: str = Field(..., description="LONG or SHORT")
+    confidence: float = Field(..., description="Confidence 0-100")
+    reasoning: str = Field(..., description="Brief reasoning (1-2 sentences)")
+    exit_plan: Optional[ExitPlan] = Field(None, description="Exit plan for BUY")
+
+
+class BatchedDecisionSchema(PortfolioDecisionSchema):
+    """Per-symbol signals and the portfolio decision from a single request"""
+
+    symbol_signals: List[SymbolSignal] = Field(
+        default_factory=list,
+        description="One signal for every analyzed symbol",
+    )
+
+
 class PortfolioDecision:
     """Portfolio-level trading decision"""
 
@@ -228,6 +277,188 @@ class PortfolioDecisionManager:
 
         return decision
 
+    async def make_batched_decision(
+        self,
+        current_positions: Dict[str, Position],
+        available_cash: float,
+        total_portfolio_value: float,
+        signal_generator=None,
+        llm_semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> Tuple[PortfolioDecision, Dict[str, Optional[Dict[str, Any]]]]:
+        """
+        Get every symbol's AI signal and the portfolio decision in one request.
+
+        The analyses only need the technical signal; the AI signals from the
+        response are attached to them. Symbols whose signal is missing or
+        cannot be parsed fall back to a per-symbol request. If the batched
+        request fails altogether, every symbol falls back and the decision
+        is made by ``make_portfolio_decision``. Responses are reused from the
+        signal generator's cache for a near-identical portfolio state.
+
+        Args:
+            current_positions: Current open positions
+            available_cash: Available cash for trading
+            total_portfolio_value: Total portfolio value
+            signal_generator: Per-symbol AI signal generator for fallbacks
+                              (its signal cache also holds batched responses)
+            llm_semaphore: Semaphore limiting concurrent calls to the model
+
+        Returns:
+            Tuple of (portfolio decision, exit plan per symbol with an AI signal)
+        """
+        if not self.asset_analyses:
+            decision = PortfolioDecision()
+            decision.reasoning = "No asset analyses available"
+            return decision, {}
+
+        portfolio_metrics = self._calculate_portfolio_metrics(
+            current_positions, available_cash, total_portfolio_value
+        )
+
+        batch = None
+        if self.llm_client:
+            prompt = self._build_batched_prompt(
+                current_positions,
+                portfolio_metrics,
+                available_cash,
+                total_portfolio_value,
+            )
+            cache = getattr(signal_generator, "cache", None)
+
+            async def request() -> BatchedDecisionSchema:
+                async with llm_semaphore or contextlib.nullcontext():
+                    if cache is not None:
+                        signal_generator.llm_calls += 1
+                    return await self._request_batched_decision(prompt)
+
+            try:
+                if cache is None:
+                    batch = await request()
+                else:
+                    key = self._batched_cache_key(
+                        current_positions, available_cash, total_portfolio_value
+                    )
+                    batch = await cache.get_or_request(key, request)
+            except Exception as e:
+                logger.error(f"Batched AI decision failed: {e}")
+
+        exit_plans = self._apply_symbol_signals(batch.symbol_signals) if batch else {}
+        missing = [symbol for symbol in self.asset_analyses if symbol not in exit_plans]
+        if missing and signal_generator is not None:
+            logger.info(f"Requesting per-symbol AI signals for {missing}")
+            exit_plans.update(
+                await self._request_symbol_signals(
+                    missing, current_positions, signal_generator, llm_semaphore
+                )
+            )
+
+        if batch is None:
+            decision = await self.make_portfolio_decision(
+                current_positions, available_cash, total_portfolio_value
+            )
+        else:
+            decision = self._convert_ai_decision(batch, current_positions)
+        return decision, exit_plans
+
+    def _batched_cache_key(
+        self,
+        current_positions: Dict[str, Position],
+        available_cash: float,
+        total_portfolio_value: float,
+    ) -> Tuple:
+        """Signal cache key of the batched request for the current state"""
+        symbol_keys = []
+        for symbol, analysis in self.asset_analyses.items():
+            position = current_positions.get(symbol)
+            symbol_keys.append(
+                signal_cache_key(
+                    analysis.indicators,
+                    describe_position(position, analysis.current_price)
+                    if position is not None
+                    else None,
+                )
+            )
+        return portfolio_cache_key(
+            symbol_keys, current_positions, available_cash, total_portfolio_value
+        )
+
+    async def _request_batched_decision(self, prompt: str) -> BatchedDecisionSchema:
+        """Send the batched prompt with structured output"""
+        agent = Agent(
+            model=self.llm_client,
+            output_schema=BatchedDecisionSchema,
+            markdown=False,
+        )
+        response = await agent.arun(prompt)
+        if not isinstance(response.content, BatchedDecisionSchema):
+            raise ValueError("Response does not match BatchedDecisionSchema")
+
+        logger.info(
+            f"Batched AI Decision: {len(response.content.symbol_signals)} signals, "
+            f"Trades: {len(response.content.recommended_trades)}"
+        )
+        return response.content
+
+    def _apply_symbol_signals(
+        self, signals: List[SymbolSignal]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Attach parsed signals to the analyses; returns exit plans by symbol"""
+        exit_plans = {}
+        for signal in signals:
+            analysis = self.asset_analyses.get(signal.symbol.upper())
+            if analysis is None:
+                continue
+            try:
+                action = TradeAction(signal.action.lower())
+                trade_type = TradeType(signal.trade_type.lower())
+            except ValueError:
+                logger.warning(f"Unparseable batched signal for {signal.symbol}")
+                continue
+            analysis.set_ai_signal(
+                action, trade_type, signal.reasoning, float(signal.confidence)
+            )
+            exit_plans[analysis.symbol] = (
+                signal.exit_plan.model_dump() if signal.exit_plan else None
+            )
+        return exit_plans
+
+    async def _request_symbol_signals(
+        self,
+        symbols: List[str],
+        current_positions: Dict[str, Position],
+        signal_generator,
+        llm_semaphore: Optional[asyncio.Semaphore],
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Per-symbol AI signals for symbols the batch did not cover"""
+
+        async def request(symbol: str):
+            analysis = self.asset_analyses[symbol]
+            position = current_positions.get(symbol)
+            current_position = (
+                describe_position(position, analysis.current_price)
+                if position is not None
+                else None
+            )
+            async with llm_semaphore or contextlib.nullcontext():
+                return await signal_generator.get_signal(
+                    analysis.indicators, current_position=current_position
+                )
+
+        results = await asyncio.gather(
+            *(request(symbol) for symbol in symbols), return_exceptions=True
+        )
+
+        exit_plans = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception) or result is None:
+                continue
+            action, trade_type, reasoning, confidence, exit_plan = result
+            self.asset_analyses[symbol].set_ai_signal(
+                action, trade_type, reasoning, confidence
+            )
+            exit_plans[symbol] = exit_plan
+        return exit_plans
+
     async def _get_ai_portfolio_decision(
         self,
         current_positions: Dict[str, Position],
@@ -483,6 +714,41 @@ class PortfolioDecisionManager:
 
         return "\n".join(prompt_parts)
 
+    def _build_batched_prompt(
+        self,
+        current_positions: Dict[str, Position],
+        portfolio_metrics: Dict,
+        available_cash: float,
+        total_portfolio_value: float,
+    ) -> str:
+        """Portfolio prompt extended with price history and per-symbol signals"""
+        prompt_parts = [
+            self._build_portfolio_analysis_prompt(
+                current_positions,
+                portfolio_metrics,
+                available_cash,
+                total_portfolio_value,
+            ),
+            "=== RECENT CLOSES (OLDEST TO NEWEST) ===",
+        ]
+        for symbol, analysis in self.asset_analyses.items():
+            prices = (analysis.indicators.historical_prices or [])[-20:]
+            prompt_parts.append(f"{symbol}: {', '.join(f'{p:.2f}' for p in prices)}")
+
+        prompt_parts.extend(
+            [
+                "",
+                "=== PER-SYMBOL SIGNALS ===",
+                "Also provide symbol_signals with exactly one entry for every symbol in ASSET ANALYSES:",
+                "  * symbol, action (BUY/SELL/HOLD), trade_type (LONG/SHORT), confidence (0-100)",
+                "  * reasoning: 1-2 sentences",
+                "  * exit_plan for BUY: profit_target_pct, stop_loss_pct, invalidation_condition",
+                "recommended_trades must be consistent with symbol_signals.",
+                "",
+            ]
+        )
+        return "\n".join(prompt_parts)
+
     def _convert_ai_decision(
         self,
         ai_decision: PortfolioDecisionSchema,
@@ -1,11 +1,14 @@
 """Position and cash management module - from a trader's perspective"""
 
 import logging
+import os
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
-import yfinance as yf
+import numpy as np
 
+from .constants import MAX_SYMBOL_LENGTH
+from .mark_price import MarkPriceOracle, get_mark_price_oracle
 from .models import (
     CashManagement,
     PortfolioValueSnapshot,
@@ -13,9 +16,38 @@ from .models import (
     PositionHistorySnapshot,
     TradeType,
 )
+from .risk_engine import RiskEngine, RiskLimits
+from .timeseries import TimeSeriesStore, from_epoch_us, to_epoch_us
 
 logger = logging.getLogger(__name__)
 
+# Columnar record layouts of the history stores
+PORTFOLIO_HISTORY_DTYPE = np.dtype(
+    [
+        ("ts", "<i8"),
+        ("tz_aware", "?"),
+        ("total_value", "<f8"),
+        ("cash", "<f8"),
+        ("cash_in_trades", "<f8"),
+        ("positions_value", "<f8"),
+        ("positions_count", "<i4"),
+        ("total_pnl", "<f8"),
+    ]
+)
+POSITION_HISTORY_DTYPE = np.dtype(
+    [
+        ("ts", "<i8"),
+        ("tz_aware", "?"),
+        ("symbol", f"S{MAX_SYMBOL_LENGTH}"),
+        ("trade_type", "S8"),
+        ("quantity", "<f8"),
+        ("entry_price", "<f8"),
+        ("current_price", "<f8"),
+        ("unrealized_pnl", "<f8"),
+        ("notional", "<f8"),
+    ]
+)
+
 
 class PositionManager:
     """
@@ -28,14 +60,27 @@ class PositionManager:
     4. "How much total capital is deployed?"
     """
 
-    def __init__(self, initial_capital: float):
+    def __init__(
+        self,
+        initial_capital: float,
+        mark_prices: Optional[MarkPriceOracle] = None,
+        history_dir: Optional[str] = None,
+        risk_limits: Optional[RiskLimits] = None,
+    ):
         """
         Initialize position manager with initial capital.
 
         Args:
             initial_capital: Total capital available for trading
+            mark_prices: Mark price oracle (default: the process-wide oracle)
+            history_dir: Directory of the history segment files; existing
+                         history there is recovered (None keeps a bounded
+                         in-memory history)
+            risk_limits: Exposure limits of pre-trade checks (default:
+                         RiskLimits())
         """
         self.initial_capital = initial_capital
+        self.mark_prices = mark_prices or get_mark_price_oracle()
 
         # Current state
         self._positions: Dict[str, Position] = {}  # symbol -> Position
@@ -45,10 +90,18 @@ class PositionManager:
             available_cash=initial_capital,
             cash_in_trades=0.0,
         )
+        # Exposure aggregates, updated as positions open and close
+        self.risk_engine = RiskEngine(risk_limits)
 
-        # Historical snapshots for analysis
-        self._position_history: list[PositionHistorySnapshot] = []
-        self._portfolio_history: list[PortfolioValueSnapshot] = []
+        # Historical snapshots for analysis (append-only columnar stores)
+        self._position_history = TimeSeriesStore(
+            POSITION_HISTORY_DTYPE,
+            os.path.join(history_dir, "positions.ts") if history_dir else None,
+        )
+        self._portfolio_history = TimeSeriesStore(
+            PORTFOLIO_HISTORY_DTYPE,
+            os.path.join(history_dir, "portfolio.ts") if history_dir else None,
+        )
 
     # ============ Cash Management Section ============
 
@@ -121,6 +174,7 @@ class PositionManager:
             return False
 
         self._positions[symbol] = position
+        self.risk_engine.on_open(position)
         logger.info(f"Opened {position.trade_type.value} position on {symbol}")
         return True
 
@@ -139,6 +193,7 @@ class PositionManager:
             return None
 
         position = self._positions.pop(symbol)
+        self.risk_engine.on_close(symbol)
         logger.info(f"Closed {position.trade_type.value} position on {symbol}")
         return position
 
@@ -154,6 +209,10 @@ class PositionManager:
         """Get number of current open positions"""
         return len(self._positions)
 
+    def get_exposure(self) -> Dict[str, Any]:
+        """Get exposure aggregates, relative to the total cash"""
+        return self.risk_engine.get_exposure(self._cash_management.total_cash)
+
     # ============ Portfolio Valuation Section ============
 
     def calculate_position_pnl(self, position: Position, current_price: float) -> float:
@@ -174,10 +233,35 @@ class PositionManager:
             # Short: profit when price goes down
             return (position.entry_price - current_price) * abs(position.quantity)
 
-    def calculate_portfolio_value(self) -> Tuple[float, float, float]:
+    def get_mark_price(self, symbol: str) -> float:
+        """
+        Get the mark price used to value a position.
+
+        Raises:
+            ValueError: If no price is available for the symbol
+        """
+        price = self.mark_prices.get_price(symbol)
+        if price is None:
+            raise ValueError(f"No mark price available for {symbol}")
+        return price
+
+    def _valuation_price(
+        self, symbol: str, prices: Optional[Dict[str, float]]
+    ) -> float:
+        if prices and symbol in prices:
+            return prices[symbol]
+        return self.get_mark_price(symbol)
+
+    def calculate_portfolio_value(
+        self, prices: Optional[Dict[str, float]] = None
+    ) -> Tuple[float, float, float]:
         """
         Calculate total portfolio value with breakdown.
 
+        Args:
+            prices: Prices to value positions at instead of the mark prices
+                    (e.g. the closes of a past bar)
+
         Returns:
             Tuple of (total_value, positions_value, total_pnl)
         """
@@ -187,10 +271,7 @@ class PositionManager:
 
         for symbol, position in self._positions.items():
             try:
-                ticker = yf.Ticker(symbol)
-                current_price = ticker.history(period="1d", interval="1m")[
-                    "Close"
-                ].iloc[-1]
+                current_price = self._valuation_price(symbol, prices)
 
                 # Calculate unrealized P&L
                 pnl = self.calculate_position_pnl(position, current_price)
@@ -242,69 +323,170 @@ class PositionManager:
 
     # ============ History Tracking Section ============
 
-    def snapshot_positions(self, timestamp: datetime):
+    def snapshot_positions(
+        self, timestamp: datetime, prices: Optional[Dict[str, float]] = None
+    ):
         """
         Take a snapshot of all positions at a point in time.
 
         Args:
             timestamp: Snapshot timestamp
+            prices: Prices to value positions at instead of the mark prices
         """
         for symbol, position in self._positions.items():
             try:
-                ticker = yf.Ticker(symbol)
-                current_price = ticker.history(period="1d", interval="1m")[
-                    "Close"
-                ].iloc[-1]
+                current_price = self._valuation_price(symbol, prices)
 
                 unrealized_pnl = self.calculate_position_pnl(position, current_price)
 
-                snapshot = PositionHistorySnapshot(
-                    timestamp=timestamp,
-                    symbol=symbol,
-                    quantity=position.quantity,
-                    entry_price=position.entry_price,
-                    current_price=current_price,
-                    trade_type=position.trade_type.value,
-                    unrealized_pnl=unrealized_pnl,
-                    notional=position.notional,
+                self._position_history.append(
+                    (
+                        to_epoch_us(timestamp),
+                        timestamp.tzinfo is not None,
+                        symbol.encode(),
+                        position.trade_type.value.encode(),
+                        position.quantity,
+                        position.entry_price,
+                        current_price,
+                        unrealized_pnl,
+                        position.notional,
+                    )
                 )
-                self._position_history.append(snapshot)
 
             except Exception as e:
                 logger.warning(f"Failed to snapshot position for {symbol}: {e}")
 
-    def snapshot_portfolio(self, timestamp: datetime):
+    def snapshot_portfolio(
+        self, timestamp: datetime, prices: Optional[Dict[str, float]] = None
+    ):
         """
         Take a snapshot of the entire portfolio.
 
         Args:
             timestamp: Snapshot timestamp
+            prices: Prices to value positions at instead of the mark prices
         """
-        total_value, positions_value, total_pnl = self.calculate_portfolio_value()
+        total_value, positions_value, total_pnl = self.calculate_portfolio_value(prices)
+
+        self._portfolio_history.append(
+            (
+                to_epoch_us(timestamp),
+                timestamp.tzinfo is not None,
+                total_value,
+                self._cash_management.available_cash,
+                self._cash_management.cash_in_trades,
+                positions_value,
+                self.get_positions_count(),
+                total_pnl,
+            )
+        )
 
-        snapshot = PortfolioValueSnapshot(
-            timestamp=timestamp,
-            total_value=total_value,
-            cash=self._cash_management.available_cash,
-            cash_in_trades=self._cash_management.cash_in_trades,
-            positions_value=positions_value,
-            positions_count=self.get_positions_count(),
-            total_pnl=total_pnl,
+    def get_position_history(
+        self, limit: Optional[int] = None
+    ) -> list[PositionHistorySnapshot]:
+        """Get position history snapshots (the most recent ``limit`` if given)"""
+        rows = (
+            self._position_history.rows
+            if limit is None
+            else self._position_history.tail(limit)
+        )
+        return [
+            PositionHistorySnapshot(
+                timestamp=from_epoch_us(row["ts"], bool(row["tz_aware"])),
+                symbol=row["symbol"].decode(),
+                quantity=float(row["quantity"]),
+                entry_price=float(row["entry_price"]),
+                current_price=float(row["current_price"]),
+                trade_type=row["trade_type"].decode(),
+                unrealized_pnl=float(row["unrealized_pnl"]),
+                notional=float(row["notional"]),
+            )
+            for row in rows
+        ]
+
+    def get_portfolio_history(
+        self, limit: Optional[int] = None
+    ) -> list[PortfolioValueSnapshot]:
+        """Get portfolio history snapshots (the most recent ``limit`` if given)"""
+        rows = (
+            self._portfolio_history.rows
+            if limit is None
+            else self._portfolio_history.tail(limit)
+        )
+        return [
+            PortfolioValueSnapshot(
+                timestamp=from_epoch_us(row["ts"], bool(row["tz_aware"])),
+                total_value=float(row["total_value"]),
+                cash=float(row["cash"]),
+                cash_in_trades=float(row["cash_in_trades"]),
+                positions_value=float(row["positions_value"]),
+                positions_count=int(row["positions_count"]),
+                total_pnl=float(row["total_pnl"]),
+            )
+            for row in rows
+        ]
+
+    def get_portfolio_series(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        max_points: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Get portfolio history as a structured array view (no copy).
+
+        Args:
+            start: Earliest snapshot time (inclusive)
+            end: Latest snapshot time (inclusive)
+            max_points: Downsample to at most this many rows
+
+        Returns:
+            Rows of PORTFOLIO_HISTORY_DTYPE (``ts`` in epoch microseconds)
+        """
+        if max_points:
+            return self._portfolio_history.downsample(max_points, start, end)
+        return self._portfolio_history.window(start, end)
+
+    def get_history_counts(self) -> Tuple[int, int]:
+        """Position and portfolio snapshots taken so far"""
+        return self._position_history.total, self._portfolio_history.total
+
+    def get_history_since(
+        self, position_count: int, portfolio_count: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Copies of the position/portfolio snapshots taken after the given counts"""
+        return (
+            self._position_history.since(position_count).copy(),
+            self._portfolio_history.since(portfolio_count).copy(),
         )
-        self._portfolio_history.append(snapshot)
 
-    def get_position_history(self) -> list[PositionHistorySnapshot]:
-        """Get all position history snapshots"""
-        return self._position_history.copy()
+    def append_history(self, position_rows: np.ndarray, portfolio_rows: np.ndarray):
+        """Append snapshot rows taken elsewhere (e.g. in a worker process)"""
+        self._position_history.extend(position_rows)
+        self._portfolio_history.extend(portfolio_rows)
+
+    def restore_state(self, cash: CashManagement, positions: Dict[str, Position]):
+        """
+        Replace cash and open positions, e.g. with a recovered or synced state.
+
+        Args:
+            cash: Cash management state
+            positions: Open positions by symbol
+        """
+        self._cash_management = cash.model_copy()
+        self._positions = dict(positions)
+        self.risk_engine.rebuild(self._positions.values())
 
-    def get_portfolio_history(self) -> list[PortfolioValueSnapshot]:
-        """Get all portfolio history snapshots"""
-        return self._portfolio_history.copy()
+    def flush_history(self):
+        """Write history stores to disk (no-op for in-memory history)"""
+        self._position_history.flush()
+        self._portfolio_history.flush()
 
     def reset(self, initial_capital: float):
         """Reset to initial state"""
         self.initial_capital = initial_capital
         self._positions.clear()
+        self.risk_engine.clear()
         self._cash_management = CashManagement(
             total_cash=initial_capital,
             initial_cash=initial_capital,
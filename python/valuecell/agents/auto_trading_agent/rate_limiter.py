@@ -0,0 +1,264 @@
+"""Process-wide, weight-aware rate limiting for the Binance REST API.
+
+Binance limits each IP by request *weight* per minute rather than by request
+count, and reports the weight already used in the current window in the
+``X-MBX-USED-WEIGHT-1M`` response header. All Binance clients in the process
+share one token bucket so their combined traffic stays under the limit.
+
+The bucket hands out reservations: ``reserve`` deducts the weight immediately
+(the balance may go negative) and returns how long the caller has to wait.
+The lock is only held for that bookkeeping, so waiting never blocks other
+callers, and ``acquire`` waits with ``asyncio.sleep`` instead of blocking the
+event loop.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Binance spot REQUEST_WEIGHT limit per IP and minute
+BINANCE_WEIGHT_LIMIT_PER_MINUTE = 6000
+
+# Request weights of the public/market endpoints we use (see the Binance spot
+# API docs). Endpoints whose weight depends on the parameters are handled in
+# ``request_weight``.
+BINANCE_REQUEST_WEIGHTS = {
+    "/api/v3/ping": 1,
+    "/api/v3/time": 1,
+    "/api/v3/exchangeInfo": 20,
+    "/api/v3/trades": 25,
+    "/api/v3/klines": 2,
+    "/api/v3/avgPrice": 2,
+    "/api/v3/account": 20,
+    "/api/v3/order": 4,
+    "/api/v3/myTrades": 20,
+}
+DEFAULT_REQUEST_WEIGHT = 1
+
+USED_WEIGHT_HEADERS = ("X-MBX-USED-WEIGHT-1M", "X-MBX-USED-WEIGHT")
+
+
+def request_weight(endpoint: str, params: Optional[Mapping[str, Any]] = None) -> int:
+    """
+    Get the Binance request weight of an endpoint call
+
+    Args:
+        endpoint: API endpoint (e.g., "/api/v3/ticker/24hr")
+        params: Query parameters
+
+    Returns:
+        Request weight
+    """
+    params = params or {}
+
+    if endpoint == "/api/v3/ticker/24hr":
+        if "symbol" in params:
+            return 2
+        if "symbols" in params:
+            count = len(str(params["symbols"]).split(","))
+            return 2 if count <= 20 else 40 if count <= 100 else 80
+        return 80
+    if endpoint in ("/api/v3/ticker/price", "/api/v3/ticker/bookTicker"):
+        return 2 if "symbol" in params else 4
+    if endpoint == "/api/v3/depth":
+        limit = int(params.get("limit", 100))
+        if limit <= 100:
+            return 5
+        if limit <= 500:
+            return 25
+        return 50 if limit <= 1000 else 250
+    if endpoint == "/api/v3/openOrders":
+        return 6 if "symbol" in params else 80
+
+    return BINANCE_REQUEST_WEIGHTS.get(endpoint, DEFAULT_REQUEST_WEIGHT)
+
+
+class TokenBucketRateLimiter:
+    """Thread-safe token bucket refilled continuously in request weight."""
+
+    def __init__(
+        self,
+        weight_per_minute: int = BINANCE_WEIGHT_LIMIT_PER_MINUTE,
+        safety_margin: float = 0.9,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            weight_per_minute: Exchange weight limit per minute
+            safety_margin: Fraction of the limit we allow ourselves to use
+            burst: Bucket capacity (defaults to 10% of the per-minute budget)
+            clock: Monotonic clock in seconds
+        """
+        self.weight_per_minute = weight_per_minute
+        self.budget_per_minute = weight_per_minute * safety_margin
+        self.rate = self.budget_per_minute / 60.0  # tokens per second
+        self.capacity = burst if burst is not None else self.budget_per_minute / 10
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._blocked_until = 0.0
+        # (time, weight) of reservations in the last minute, for utilization
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._window_weight = 0
+
+        self.requests = 0
+        self.weight_consumed = 0
+        self.throttled_requests = 0
+        self.total_wait_seconds = 0.0
+        self.header_corrections = 0
+        self.server_used_weight: Optional[int] = None
+        self._server_used_at: Optional[float] = None
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def _trim_window(self, now: float) -> None:
+        while self._window and now - self._window[0][0] >= 60:
+            self._window_weight -= self._window.popleft()[1]
+
+    def reserve(self, weight: int = 1) -> float:
+        """
+        Reserve ``weight`` tokens
+
+        Returns:
+            Seconds the caller must wait before sending the request
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= weight
+
+            wait = max(0.0, -self._tokens / self.rate, self._blocked_until - now)
+
+            self._window.append((now, weight))
+            self._window_weight += weight
+            self._trim_window(now)
+            self.requests += 1
+            self.weight_consumed += weight
+            if wait > 0:
+                self.throttled_requests += 1
+                self.total_wait_seconds += wait
+            return wait
+
+    async def acquire(self, weight: int = 1) -> float:
+        """Wait (without blocking the event loop) until ``weight`` is available."""
+        wait = self.reserve(weight)
+        if wait > 0:
+            logger.debug(f"Binance rate limit: waiting {wait:.2f}s")
+            await asyncio.sleep(wait)
+        return wait
+
+    def acquire_sync(self, weight: int = 1) -> float:
+        """Blocking variant of ``acquire`` for worker threads."""
+        wait = self.reserve(weight)
+        if wait > 0:
+            logger.debug(f"Binance rate limit: waiting {wait:.2f}s")
+            time.sleep(wait)
+        return wait
+
+    def observe_used_weight(self, used_weight: int) -> None:
+        """
+        Correct the bucket with the weight Binance reports as used
+
+        Other processes on the same IP (or requests we did not account for)
+        count against the same limit, so the balance is lowered to whatever
+        budget the exchange says is left in the current minute.
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self.server_used_weight = used_weight
+            self._server_used_at = now
+
+            remaining = self.budget_per_minute - used_weight
+            if remaining < self._tokens:
+                self._tokens = remaining
+                self.header_corrections += 1
+                if remaining < 0:
+                    logger.warning(
+                        f"Binance used weight {used_weight} exceeds the "
+                        f"budget of {self.budget_per_minute:.0f}/min"
+                    )
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """Read the used weight from Binance response headers, if present."""
+        for name in USED_WEIGHT_HEADERS:
+            value = headers.get(name)
+            if value is None:
+                continue
+            try:
+                self.observe_used_weight(int(value))
+            except ValueError:
+                logger.debug(f"Ignoring malformed {name} header: {value!r}")
+            return
+
+    def block_for(self, seconds: float) -> None:
+        """Stop handing out tokens for ``seconds`` (after a 429/418 response)."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._blocked_until = max(self._blocked_until, now + seconds)
+            self._tokens = min(self._tokens, 0.0)
+        logger.warning(f"Binance requests paused for {seconds:.1f}s")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return utilization and throttling metrics."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._trim_window(now)
+            server_fresh = (
+                self._server_used_at is not None and now - self._server_used_at < 60
+            )
+            return {
+                "weight_limit_per_minute": self.weight_per_minute,
+                "budget_per_minute": self.budget_per_minute,
+                "capacity": self.capacity,
+                "available_tokens": self._tokens,
+                "weight_last_minute": self._window_weight,
+                "utilization": self._window_weight / self.weight_per_minute,
+                "server_used_weight": self.server_used_weight if server_fresh else None,
+                "server_utilization": self.server_used_weight / self.weight_per_minute
+                if server_fresh
+                else None,
+                "requests": self.requests,
+                "weight_consumed": self.weight_consumed,
+                "throttled_requests": self.throttled_requests,
+                "total_wait_seconds": self.total_wait_seconds,
+                "header_corrections": self.header_corrections,
+                "blocked_for_seconds": max(0.0, self._blocked_until - now),
+            }
+
+
+# Global instance shared by all Binance clients
+_binance_rate_limiter: Optional[TokenBucketRateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_binance_rate_limiter() -> TokenBucketRateLimiter:
+    """Get the process-wide Binance rate limiter."""
+    global _binance_rate_limiter
+    with _limiter_lock:
+        if _binance_rate_limiter is None:
+            _binance_rate_limiter = TokenBucketRateLimiter()
+        return _binance_rate_limiter
+
+
+def reset_binance_rate_limiter() -> None:
+    """Drop the global rate limiter (mainly for tests)."""
+    global _binance_rate_limiter
+    with _limiter_lock:
+        _binance_rate_limiter = None
@@ -0,0 +1,270 @@
+"""Pre-trade risk checks on incrementally maintained exposure aggregates.
+
+Position limits used to be checked by counting and summing the open positions
+for every candidate trade, and the agent summed the position notionals again
+wherever it reported exposure. ``RiskEngine`` keeps the aggregates up to date
+as positions open and close: gross and net notional, notional per symbol, per
+direction and per correlation bucket, and the cash deployed (at risk) in open
+positions. Reading them is O(1), and a whole batch of candidate trades is
+validated against the limits in one vectorized pass.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .constants import (
+    CORRELATION_BUCKETS,
+    DEFAULT_MAX_POSITIONS,
+    MAX_BUCKET_EXPOSURE_RATIO,
+    MAX_GROSS_EXPOSURE_RATIO,
+    MAX_NET_EXPOSURE_RATIO,
+    MAX_SYMBOL_EXPOSURE_RATIO,
+)
+from .models import Position, TradeAction, TradeType
+
+logger = logging.getLogger(__name__)
+
+# (symbol, action, trade type, notional); the notional of a close is ignored
+CandidateTrade = Tuple[str, TradeAction, TradeType, float]
+
+
+@dataclass
+class RiskLimits:
+    """Exposure limits; the ratios are fractions of the total cash"""
+
+    max_positions: int = DEFAULT_MAX_POSITIONS
+    max_gross_exposure: float = MAX_GROSS_EXPOSURE_RATIO
+    max_net_exposure: float = MAX_NET_EXPOSURE_RATIO
+    max_symbol_exposure: float = MAX_SYMBOL_EXPOSURE_RATIO
+    max_bucket_exposure: float = MAX_BUCKET_EXPOSURE_RATIO
+
+
+class RiskEngine:
+    """Exposure aggregates of a portfolio and pre-trade limit checks."""
+
+    def __init__(
+        self,
+        limits: Optional[RiskLimits] = None,
+        buckets: Optional[Mapping[str, str]] = None,
+    ):
+        """
+        Initialize the engine with no open positions.
+
+        Args:
+            limits: Exposure limits (default: RiskLimits())
+            buckets: Correlation bucket of each symbol; unlisted symbols are a
+                     bucket of their own (default: CORRELATION_BUCKETS)
+        """
+        self.limits = limits or RiskLimits()
+        self._buckets = CORRELATION_BUCKETS if buckets is None else buckets
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget all positions"""
+        # symbol -> (trade type, notional)
+        self._positions: Dict[str, Tuple[TradeType, float]] = {}
+        self.gross = 0.0
+        self.net = 0.0
+        self._direction_notional = {TradeType.LONG: 0.0, TradeType.SHORT: 0.0}
+        self._direction_count = {TradeType.LONG: 0, TradeType.SHORT: 0}
+        self._bucket_notional: Dict[str, float] = {}
+        self._bucket_count: Dict[str, int] = {}
+
+    def bucket(self, symbol: str) -> str:
+        """Correlation bucket of a symbol"""
+        return self._buckets.get(symbol, symbol)
+
+    # ============ Aggregates ============
+
+    def _apply(self, symbol: str, trade_type: TradeType, notional: float, sign: int):
+        signed = notional if trade_type == TradeType.LONG else -notional
+        self.gross += sign * notional
+        self.net += sign * signed
+        self._direction_notional[trade_type] += sign * notional
+        self._direction_count[trade_type] += sign
+        bucket = self.bucket(symbol)
+        positions = self._bucket_count.get(bucket, 0) + sign
+        if positions:
+            self._bucket_count[bucket] = positions
+            self._bucket_notional[bucket] = (
+                self._bucket_notional.get(bucket, 0.0) + sign * notional
+            )
+        else:
+            # No float residue once a bucket has no positions left
+            self._bucket_count.pop(bucket, None)
+            self._bucket_notional.pop(bucket, None)
+
+    def on_open(self, position: Position) -> None:
+        """Account for an opened position"""
+        if position.symbol in self._positions:
+            self.on_close(position.symbol)
+        self._positions[position.symbol] = (position.trade_type, position.notional)
+        self._apply(position.symbol, position.trade_type, position.notional, 1)
+
+    def on_close(self, symbol: str) -> None:
+        """Account for a closed position"""
+        entry = self._positions.get(symbol)
+        if entry is None:
+            return
+        self._apply(symbol, entry[0], entry[1], -1)
+        del self._positions[symbol]
+        if not self._positions:
+            # Same for the totals once the portfolio is flat
+            self.clear()
+
+    def rebuild(self, positions: Iterable[Position]) -> None:
+        """Recompute the aggregates from scratch (e.g. after a state restore)"""
+        self.clear()
+        for position in positions:
+            self.on_open(position)
+
+    @property
+    def position_count(self) -> int:
+        return len(self._positions)
+
+    def get_symbol_exposure(self, symbol: str) -> float:
+        """Signed notional of a symbol (negative when short)"""
+        entry = self._positions.get(symbol)
+        if entry is None:
+            return 0.0
+        return entry[1] if entry[0] == TradeType.LONG else -entry[1]
+
+    def get_exposure(self, total_cash: float) -> Dict[str, Any]:
+        """
+        Current exposure aggregates.
+
+        Args:
+            total_cash: Total cash the exposure ratios are relative to
+
+        Returns:
+            Dictionary of the aggregates (notional amounts and ratios)
+        """
+
+        def ratio(amount: float) -> float:
+            return amount / total_cash if total_cash > 0 else 0.0
+
+        return {
+            "position_count": self.position_count,
+            "gross_exposure": self.gross,
+            "net_exposure": self.net,
+            "gross_exposure_ratio": ratio(self.gross),
+            "net_exposure_ratio": ratio(self.net),
+            "cash_at_risk": self.gross,
+            "cash_at_risk_ratio": ratio(self.gross),
+            "long": {
+                "count": self._direction_count[TradeType.LONG],
+                "notional": self._direction_notional[TradeType.LONG],
+            },
+            "short": {
+                "count": self._direction_count[TradeType.SHORT],
+                "notional": self._direction_notional[TradeType.SHORT],
+            },
+            "by_symbol": {s: self.get_symbol_exposure(s) for s in self._positions},
+            "by_bucket": dict(self._bucket_notional),
+        }
+
+    # ============ Pre-trade Checks ============
+
+    def check_trades(
+        self, candidates: Sequence[CandidateTrade], total_cash: float
+    ) -> List[Optional[str]]:
+        """
+        Validate a batch of candidate trades against the limits.
+
+        Candidates are taken in order, as they would be executed: closes ahead
+        of an open free up its limits. Opens ahead of a candidate count against
+        its limits if they passed the per-trade checks, even when they are
+        rejected by a cumulative limit themselves, so an approved batch never
+        exceeds a limit.
+
+        Args:
+            candidates: Trades to validate
+            total_cash: Total cash the exposure limits are relative to
+
+        Returns:
+            For each candidate, None if it is approved or the rejection reason
+        """
+        count = len(candidates)
+        if not count:
+            return []
+        limits = self.limits
+        symbols = [c[0] for c in candidates]
+        opens = np.array([c[1] == TradeAction.BUY for c in candidates])
+        closes = np.array([c[1] == TradeAction.SELL for c in candidates])
+        longs = np.array([c[2] == TradeType.LONG for c in candidates])
+        held = [self._positions.get(s) for s in symbols]
+        is_held = np.array([h is not None for h in held])
+        held_matches = np.array(
+            [h is not None and h[0] == c[2] for h, c in zip(held, candidates)]
+        )
+        notional = np.where(
+            opens,
+            np.array([float(c[3]) for c in candidates]),
+            np.array([h[1] if h is not None else 0.0 for h in held]),
+        )
+        _, first = np.unique(symbols, return_index=True)
+        repeated = np.ones(count, dtype=bool)
+        repeated[first] = False
+
+        reasons: List[Optional[str]] = [None] * count
+        approved = np.ones(count, dtype=bool)
+
+        def reject(mask: np.ndarray, reason: str) -> None:
+            for i in np.flatnonzero(approved & mask):
+                reasons[i] = reason
+            approved[mask] = False
+
+        # Per-trade checks
+        reject(~(opens | closes), "not a trade")
+        reject(repeated, "duplicate trade for the symbol")
+        reject(opens & is_held, "position already open")
+        reject(closes & ~held_matches, "no matching position to close")
+        reject(
+            opens & (notional > limits.max_symbol_exposure * total_cash),
+            f"symbol exposure above {limits.max_symbol_exposure:.0%}",
+        )
+
+        # Cumulative checks over the trades ahead that passed the above
+        sign = np.where(opens, 1.0, -1.0) * approved
+        gross_delta = sign * notional
+        net_delta = gross_delta * np.where(longs, 1.0, -1.0)
+        positions_after = self.position_count + np.cumsum(sign)
+        gross_after = self.gross + np.cumsum(gross_delta)
+        net_after = self.net + np.cumsum(net_delta)
+
+        codes_by_bucket: Dict[str, int] = {}
+        codes = np.array(
+            [
+                codes_by_bucket.setdefault(self.bucket(s), len(codes_by_bucket))
+                for s in symbols
+            ]
+        )
+        start = np.array([self._bucket_notional.get(b, 0.0) for b in codes_by_bucket])
+        deltas = np.zeros((count, len(codes_by_bucket)))
+        deltas[np.arange(count), codes] = gross_delta
+        bucket_after = (start + np.cumsum(deltas, axis=0))[np.arange(count), codes]
+
+        reject(
+            opens & (positions_after > limits.max_positions),
+            f"max positions reached ({limits.max_positions})",
+        )
+        reject(
+            opens & (gross_after > limits.max_gross_exposure * total_cash),
+            f"gross exposure above {limits.max_gross_exposure:.0%}",
+        )
+        reject(
+            opens & (np.abs(net_after) > limits.max_net_exposure * total_cash),
+            f"net exposure above {limits.max_net_exposure:.0%}",
+        )
+        reject(
+            opens & (bucket_after > limits.max_bucket_exposure * total_cash),
+            f"correlation bucket exposure above {limits.max_bucket_exposure:.0%}",
+        )
+
+        for symbol, reason in zip(symbols, reasons):
+            if reason is not None:
+                logger.info(f"Risk check rejected trade on {symbol}: {reason}")
+        return reasons
@@ -0,0 +1,247 @@
+"""Market snapshots shared with worker processes through shared memory.
+
+When trading instances run in worker processes, the coordinator still
+computes each symbol's indicators once per monitoring tick and publishes them
+to a ``SharedMarketBoard``: a fixed-size array of records in a
+``multiprocessing.shared_memory`` block, one slot per symbol. Workers read the
+records in place instead of fetching market data and recomputing indicators
+themselves, and ``SharedMarketSnapshots`` serves them through the same
+``get_indicators(symbol, tick)`` interface as ``MarketSnapshotService``.
+
+Sessions tick independently, so a worker may read a slot while the
+coordinator rewrites it for another session's tick. Each record is guarded by
+a sequence number (a seqlock): the writer makes it odd while writing and even
+again once done, and readers retry until they copied a record whose sequence
+was even and unchanged around the copy. When every slot is taken, the slot
+with the oldest tick is reused.
+"""
+
+import logging
+import math
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+
+import numpy as np
+
+from .constants import MAX_SYMBOL_LENGTH
+from .models import TechnicalIndicators
+from .timeseries import from_epoch_us, to_epoch_us
+
+logger = logging.getLogger(__name__)
+
+HISTORY_LENGTH = 50
+INDICATOR_FIELDS = (
+    "macd",
+    "macd_signal",
+    "macd_histogram",
+    "rsi",
+    "ema_12",
+    "ema_26",
+    "ema_50",
+    "bb_upper",
+    "bb_middle",
+    "bb_lower",
+)
+
+# One record per symbol; missing indicators are stored as NaN
+SNAPSHOT_DTYPE = np.dtype(
+    [
+        ("sequence", "<u8"),
+        ("symbol", f"S{MAX_SYMBOL_LENGTH}"),
+        ("tick", "<i8"),
+        ("timestamp", "<i8"),
+        ("tz_aware", "?"),
+        ("close_price", "<f8"),
+        ("volume", "<f8"),
+        *[(name, "<f8") for name in INDICATOR_FIELDS],
+        ("prices_count", "<i4"),
+        ("historical_prices", "<f8", (HISTORY_LENGTH,)),
+        ("volumes_count", "<i4"),
+        ("historical_volumes", "<f8", (HISTORY_LENGTH,)),
+    ]
+)
+
+# Records with this tick hold a failed calculation
+_NO_DATA = -1
+
+# Attempts at copying a record while the coordinator keeps rewriting it
+_READ_ATTEMPTS = 100
+
+
+class SharedMarketBoard:
+    """Per-symbol indicator snapshots in a shared memory block."""
+
+    def __init__(self, capacity: int, name: Optional[str] = None):
+        """
+        Create a board, or attach to an existing one by name.
+
+        Args:
+            capacity: Number of symbol slots
+            name: Name of the shared memory block to attach to (None creates one)
+        """
+        self.capacity = capacity
+        self._owner = name is None
+        self._shm = shared_memory.SharedMemory(
+            name=name,
+            create=self._owner,
+            size=capacity * SNAPSHOT_DTYPE.itemsize,
+        )
+        self._records = np.ndarray((capacity,), SNAPSHOT_DTYPE, buffer=self._shm.buf)
+        if self._owner:
+            self._records[:] = np.zeros(capacity, SNAPSHOT_DTYPE)
+        self._slots: Dict[str, int] = {}
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def _slot(self, symbol: str, create: bool) -> Optional[int]:
+        slot = self._slots.get(symbol)
+        if slot is not None:
+            return slot
+        matches = np.flatnonzero(self._records["symbol"] == symbol.encode())
+        if len(matches):
+            slot = int(matches[0])
+        elif create:
+            free = np.flatnonzero(self._records["symbol"] == b"")
+            if len(free):
+                slot = int(free[0])
+            else:
+                # Full: reuse the least recently published symbol's slot
+                slot = int(np.argmin(self._records["tick"]))
+                evicted = self._records[slot]["symbol"].decode()
+                self._slots.pop(evicted, None)
+                logger.info(f"Market board is full, reusing the slot of {evicted}")
+        else:
+            return None
+        self._slots[symbol] = slot
+        return slot
+
+    def _copy(self, slot: int) -> Optional[np.void]:
+        """Copy a record, or None if it kept being rewritten."""
+        for _ in range(_READ_ATTEMPTS):
+            sequence = int(self._records[slot]["sequence"])
+            if sequence % 2:
+                continue
+            record = self._records[slot].copy()
+            if int(self._records[slot]["sequence"]) == sequence:
+                return record
+        return None
+
+    def publish(
+        self,
+        symbol: str,
+        tick: datetime,
+        indicators: Optional[TechnicalIndicators],
+    ) -> None:
+        """
+        Publish a symbol's snapshot for a tick (coordinator only).
+
+        Args:
+            symbol: Trading symbol
+            tick: Monitoring tick
+            indicators: Snapshot, or None if there is not enough data
+        """
+        record = self._records[self._slot(symbol, create=True)]
+        # Odd while writing: readers retry instead of copying a torn record
+        record["sequence"] += 1
+        record["symbol"] = symbol.encode()
+        if indicators is None:
+            record["tick"] = _NO_DATA
+            record["sequence"] += 1
+            return
+
+        record["timestamp"] = to_epoch_us(indicators.timestamp)
+        record["tz_aware"] = indicators.timestamp.tzinfo is not None
+        record["close_price"] = indicators.close_price
+        record["volume"] = indicators.volume
+        for name in INDICATOR_FIELDS:
+            value = getattr(indicators, name)
+            record[name] = math.nan if value is None else value
+        for field, values in (
+            ("prices", indicators.historical_prices),
+            ("volumes", indicators.historical_volumes),
+        ):
+            values = (values or [])[-HISTORY_LENGTH:]
+            record[f"{field}_count"] = len(values)
+            record[f"historical_{field}"][: len(values)] = values
+        record["tick"] = to_epoch_us(tick)
+        record["sequence"] += 1
+
+    def read(self, symbol: str, tick: datetime) -> Optional[TechnicalIndicators]:
+        """
+        Read a symbol's snapshot for a tick.
+
+        Returns:
+            TechnicalIndicators, or None if the tick's snapshot of the symbol
+            was not published or has no data
+        """
+        slot = self._slot(symbol, create=False)
+        record = self._copy(slot) if slot is not None else None
+        if record is not None and record["symbol"] != symbol.encode():
+            # The slot was reused for another symbol; look the symbol up again
+            self._slots.pop(symbol, None)
+            slot = self._slot(symbol, create=False)
+            record = self._copy(slot) if slot is not None else None
+        if record is None or record["symbol"] != symbol.encode():
+            return None
+        if int(record["tick"]) != to_epoch_us(tick):
+            return None
+
+        def optional_list(field: str) -> Optional[list]:
+            count = int(record[f"{field}_count"])
+            return record[f"historical_{field}"][:count].tolist() if count else None
+
+        return TechnicalIndicators(
+            symbol=symbol,
+            timestamp=from_epoch_us(record["timestamp"], bool(record["tz_aware"])),
+            close_price=float(record["close_price"]),
+            volume=float(record["volume"]),
+            historical_prices=optional_list("prices"),
+            historical_volumes=optional_list("volumes"),
+            **{
+                name: None if math.isnan(record[name]) else float(record[name])
+                for name in INDICATOR_FIELDS
+            },
+        )
+
+    def close(self) -> None:
+        """Detach from the block; the creating side also frees it."""
+        self._records = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+class SharedMarketSnapshots:
+    """``MarketSnapshotService`` counterpart reading a ``SharedMarketBoard``."""
+
+    def __init__(self, board: SharedMarketBoard):
+        self.board = board
+        self.reads = 0
+        self.misses = 0
+
+    async def get_indicators(
+        self, symbol: str, tick: Optional[datetime] = None
+    ) -> Optional[TechnicalIndicators]:
+        """
+        Get the indicators the coordinator published for a tick.
+
+        Returns:
+            TechnicalIndicators snapshot or None if none was published
+        """
+        indicators = self.board.read(symbol, tick) if tick is not None else None
+        if indicators is None:
+            self.misses += 1
+            logger.warning(f"No shared market snapshot of {symbol} for tick {tick}")
+        else:
+            self.reads += 1
+        return indicators
+
+    def clear(self) -> None:
+        pass
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return read counters."""
+        return {"reads": self.reads, "misses": self.misses}
@@ -0,0 +1,234 @@
+"""Decision cache for AI trading signals.
+
+In flat markets consecutive checks present the model with practically the
+same picture. The signal cache keys each decision on the indicators quantized
+to tolerance buckets (price, RSI, MACD relative to price, trend and Bollinger
+position) plus the symbol's position state, and reuses a decision for the same
+key within a freshness window instead of sending another prompt. Concurrent
+requests for the same key (e.g. instances of one model reacting to the same
+tick) share a single in-flight LLM call. Batched decisions (every symbol's
+signal plus the portfolio decision in one request) are cached the same way,
+keyed on all the symbols' keys plus the portfolio's cash state.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Optional,
+    Tuple,
+)
+
+from .constants import SIGNAL_CACHE_MAX_ENTRIES, SIGNAL_CACHE_TTL
+from .models import TechnicalIndicators
+
+logger = logging.getLogger(__name__)
+
+# Quantization steps: relative price change, RSI points, MACD and MACD
+# histogram as a fraction of price, and position within the Bollinger Bands
+PRICE_STEP = 0.001
+RSI_STEP = 2.0
+MACD_STEP = 0.0002
+BAND_STEP = 0.1
+# Available cash as a fraction of the portfolio value (batched decisions)
+CASH_STEP = 0.05
+
+
+def _bucket(value: Optional[float], step: float) -> Optional[int]:
+    if value is None or not math.isfinite(value):
+        return None
+    return int(math.floor(value / step + 0.5))
+
+
+def _sign(value: Optional[float]) -> int:
+    if value is None:
+        return 0
+    return (value > 0) - (value < 0)
+
+
+def signal_cache_key(
+    indicators: TechnicalIndicators,
+    current_position: Optional[Dict[str, Any]] = None,
+) -> Tuple:
+    """
+    Key of a market state for the signal cache.
+
+    Args:
+        indicators: Technical indicators the signal would be based on
+        current_position: Open position of the symbol, if any
+
+    Returns:
+        Hashable key; near-identical states map to the same key
+    """
+    close = indicators.close_price
+
+    def relative(value: Optional[float]) -> Optional[float]:
+        return value / close if value is not None and close else None
+
+    band_position = None
+    if indicators.bb_upper is not None and indicators.bb_lower is not None:
+        width = indicators.bb_upper - indicators.bb_lower
+        if width > 0:
+            band_position = (close - indicators.bb_lower) / width
+
+    trend = None
+    if indicators.ema_12 is not None and indicators.ema_26 is not None:
+        trend = (
+            _sign(indicators.ema_12 - indicators.ema_26),
+            _sign(close - indicators.ema_50) if indicators.ema_50 else 0,
+        )
+
+    position = None
+    if current_position:
+        position = str(current_position.get("trade_type", "long")).lower()
+
+    return (
+        indicators.symbol,
+        _bucket(math.log(close), math.log1p(PRICE_STEP)) if close > 0 else None,
+        _bucket(indicators.rsi, RSI_STEP),
+        _bucket(relative(indicators.macd), MACD_STEP),
+        _bucket(relative(indicators.macd_histogram), MACD_STEP),
+        _sign(indicators.macd_histogram),
+        trend,
+        _bucket(band_position, BAND_STEP),
+        position,
+    )
+
+
+def portfolio_cache_key(
+    symbol_keys: Iterable[Tuple],
+    held_symbols: Iterable[str],
+    available_cash: float,
+    total_value: float,
+) -> Tuple:
+    """
+    Key of a portfolio state for the batched decision cache.
+
+    Args:
+        symbol_keys: ``signal_cache_key`` of every analyzed symbol
+        held_symbols: Symbols with an open position
+        available_cash: Cash available for new positions
+        total_value: Total portfolio value
+
+    Returns:
+        Hashable key; near-identical portfolio states map to the same key
+    """
+    cash_ratio = available_cash / total_value if total_value > 0 else None
+    return (
+        "portfolio",
+        tuple(sorted(symbol_keys, key=lambda key: key[0])),
+        tuple(sorted(held_symbols)),
+        _bucket(cash_ratio, CASH_STEP),
+    )
+
+
+class SignalCache:
+    """TTL/LRU cache of AI signals with in-flight request deduplication."""
+
+    def __init__(
+        self,
+        ttl: float = SIGNAL_CACHE_TTL,
+        max_entries: int = SIGNAL_CACHE_MAX_ENTRIES,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a decision is reused for the same market state
+            max_entries: Maximum number of cached decisions
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+
+        self.hits = 0
+        self.shared = 0
+        self.misses = 0
+
+    async def get_or_request(
+        self, key: Hashable, request: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Return the fresh decision for ``key`` or request it once.
+
+        Failed requests (None or an exception) are not cached.
+
+        Args:
+            key: Key from ``signal_cache_key``
+            request: Coroutine function performing the LLM call
+
+        Returns:
+            The decision
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if time.monotonic() - stored_at < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.shared += 1
+            return await asyncio.shield(future)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await request()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Followers get the error; nobody may be waiting on it
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            if value is not None:
+                self._store(key, value)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached decisions."""
+        self._entries.clear()
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.shared + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered without a new LLM call."""
+        return (self.hits + self.shared) / self.lookups if self.lookups else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache counters."""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "shared": self.shared,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+        }
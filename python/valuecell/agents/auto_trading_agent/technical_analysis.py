@@ -2,12 +2,16 @@
 
 import json
 import logging
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 
 from agno.agent import Agent
 
+from .constants import SIGNAL_CACHE_TTL
 from .market_data import MarketDataProvider, SignalGenerator
-from .models import TechnicalIndicators, TradeAction, TradeType
+from .market_stream import get_market_data_store
+from .models import Position, TechnicalIndicators, TradeAction, TradeType
+from .signal_cache import SignalCache, signal_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +23,7 @@ class TechnicalAnalyzer:
     Now delegates to MarketDataProvider internally.
     """
 
-    _market_data_provider = MarketDataProvider()
+    _market_data_provider = MarketDataProvider(store=get_market_data_store())
 
     @staticmethod
     def calculate_indicators(
@@ -40,6 +44,25 @@ class TechnicalAnalyzer:
             symbol, period, interval
         )
 
+    @staticmethod
+    def get_bar_closes(
+        symbol: str, since: datetime, interval: str = "1m"
+    ) -> List[Tuple[datetime, float]]:
+        """
+        Close prices of the bars that closed after a point in time.
+
+        Args:
+            symbol: Trading symbol
+            since: Only bars closing after this time
+            interval: Data interval
+
+        Returns:
+            (close time, close price) pairs, oldest first
+        """
+        return TechnicalAnalyzer._market_data_provider.get_bar_closes(
+            symbol, since, interval
+        )
+
     @staticmethod
     def generate_signal(
         indicators: TechnicalIndicators,
@@ -56,17 +79,58 @@ class TechnicalAnalyzer:
         return SignalGenerator.generate_signal(indicators)
 
 
+def describe_position(position: Position, current_price: float) -> dict:
+    """
+    Position info for signal prompts (and the signal cache key).
+
+    Args:
+        position: Open position
+        current_price: Price the position is valued at
+
+    Returns:
+        Dictionary with trade_type, entry_price, quantity and unrealized_pnl
+    """
+    if position.trade_type == TradeType.LONG:
+        pnl = current_price - position.entry_price
+    else:
+        pnl = position.entry_price - current_price
+    return {
+        "trade_type": position.trade_type.value,
+        "entry_price": position.entry_price,
+        "quantity": abs(position.quantity),
+        "unrealized_pnl": pnl * abs(position.quantity),
+    }
+
+
 class AISignalGenerator:
     """AI-enhanced signal generation using LLM"""
 
-    def __init__(self, llm_client):
+    def __init__(self, llm_client, cache_ttl: float = SIGNAL_CACHE_TTL):
         """
         Initialize AI signal generator
 
         Args:
             llm_client: OpenRouter client instance
+            cache_ttl: Seconds a signal is reused for a near-identical market
+                       state (0 disables the cache)
         """
         self.llm_client = llm_client
+        self.cache = SignalCache(cache_ttl) if cache_ttl > 0 else None
+        self._agent: Optional[Agent] = None
+        self.llm_calls = 0
+
+    @property
+    def agent(self) -> Agent:
+        """Agent for the model, created once and reused for every prompt"""
+        if self._agent is None:
+            self._agent = Agent(model=self.llm_client, markdown=False)
+        return self._agent
+
+    def get_cache_stats(self) -> Optional[dict]:
+        """Signal cache counters plus LLM calls made (None if disabled)"""
+        if self.cache is None:
+            return None
+        return {**self.cache.get_stats(), "llm_calls": self.llm_calls}
 
     async def get_signal(
         self,
@@ -79,6 +143,9 @@ class AISignalGenerator:
         """
         Get AI-enhanced trading signal with Alpha Arena-style comprehensive analysis
 
+        A near-identical market state with the same position state seen
+        within the cache window reuses the previous decision.
+
         Args:
             indicators: Technical indicators for analysis
             available_cash: Available cash for new positions
@@ -92,6 +159,29 @@ class AISignalGenerator:
         if not self.llm_client:
             return None
 
+        def request():
+            return self._request_signal(
+                indicators,
+                available_cash,
+                current_position,
+                portfolio_value,
+                sharpe_ratio,
+            )
+
+        if self.cache is None:
+            return await request()
+        key = signal_cache_key(indicators, current_position)
+        return await self.cache.get_or_request(key, request)
+
+    async def _request_signal(
+        self,
+        indicators: TechnicalIndicators,
+        available_cash: Optional[float],
+        current_position: Optional[dict],
+        portfolio_value: Optional[float],
+        sharpe_ratio: Optional[float],
+    ) -> Optional[tuple[TradeAction, TradeType, str, float, Optional[dict]]]:
+        """Prompt the model for a signal"""
         try:
             # Build historical price section (Alpha Arena style!)
             hist_prices_str = ""
@@ -182,8 +272,8 @@ Based on the above data, provide a structured trading decision with:
   }}
 }}"""
 
-            agent = Agent(model=self.llm_client, markdown=False)
-            response = await agent.arun(prompt)
+            self.llm_calls += 1
+            response = await self.agent.arun(prompt)
 
             # Parse response
             content = response.content.strip()
@@ -0,0 +1,152 @@
+"""Tests for the offline backtester and vectorized indicators."""
+
+import numpy as np
+import pandas as pd
+
+from valuecell.agents.auto_trading_agent.backtest import (
+    _SIGNALS,
+    Backtester,
+    RecordedSignals,
+    compute_signal_codes,
+    run_backtest,
+    run_parameter_sweep,
+)
+from valuecell.agents.auto_trading_agent.indicators import (
+    IndicatorEngine,
+    compute_indicator_columns,
+)
+from valuecell.agents.auto_trading_agent.market_data import SignalGenerator
+from valuecell.agents.auto_trading_agent.models import (
+    AutoTradingConfig,
+    TechnicalIndicators,
+    TradeAction,
+    TradeType,
+)
+from valuecell.agents.auto_trading_agent.performance_metrics import compute_metrics
+from valuecell.agents.auto_trading_agent.timeseries import from_epoch_us
+
+SYMBOLS = ["BTC-USD", "ETH-USD"]
+
+
+def _klines(count: int = 2000, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2025-01-01", periods=count, freq="1min")
+    return {
+        symbol: pd.DataFrame(
+            {
+                "close": 100 * np.exp(np.cumsum(rng.normal(0, 0.003, count))),
+                "volume": np.full(count, 5.0),
+            },
+            index=index,
+        )
+        for symbol in SYMBOLS
+    }
+
+
+def _config(**kwargs):
+    return AutoTradingConfig(
+        initial_capital=10_000, crypto_symbols=SYMBOLS, agent_model="test", **kwargs
+    )
+
+
+def test_vectorized_indicators_match_streaming_engine():
+    closes = _klines()["BTC-USD"]["close"].to_numpy()
+    columns = compute_indicator_columns(closes)
+    codes = compute_signal_codes(columns)
+
+    engine = IndicatorEngine()
+    for i, close in enumerate(closes[:300]):
+        engine.update(close)
+        values = engine.values()
+        for name, value in values.items():
+            if value is None:
+                assert np.isnan(columns[name][i])
+            else:
+                assert np.isclose(columns[name][i], value, rtol=1e-9)
+
+        indicators = TechnicalIndicators(
+            symbol="BTC-USD",
+            timestamp=pd.Timestamp("2025-01-01", tz="UTC"),
+            close_price=close,
+            volume=1.0,
+            **values,
+        )
+        assert _SIGNALS[int(codes[i])] == SignalGenerator.generate_signal(indicators)
+
+
+def test_rule_based_backtest_uses_simulated_clock():
+    klines = _klines()
+    # ETH starts later; checks before its first bar only see BTC
+    klines["ETH-USD"] = klines["ETH-USD"].iloc[100:]
+
+    result = run_backtest(klines, _config(check_interval=300))
+
+    assert result.bars == 2000
+    assert result.checks == 400
+    assert 0 < result.decisions < result.checks
+    assert result.trades
+
+    # Trades carry the simulated check times and prices of that bar
+    check_times = {from_epoch_us(ts) for ts in result.timestamps.tolist()}
+    for trade in result.trades:
+        assert trade.timestamp in check_times
+        bar = klines[trade.symbol]["close"].asof(trade.timestamp.replace(tzinfo=None))
+        assert trade.price == bar
+
+    pnls = [t.pnl for t in result.trades if t.action == "closed"]
+    assert result.metrics == compute_metrics(result.portfolio_values, pnls)
+    summary = result.summary()
+    assert summary["total_trades"] == len(pnls)
+    assert summary["current_value"] == round(result.portfolio_values[-1], 2)
+
+
+def test_skipping_idle_checks_does_not_change_the_result():
+    klines = _klines(count=600)
+
+    fast = run_backtest(klines, _config())
+    # A signal source that never answers forces the full pipeline every check
+    full = run_backtest(klines, _config(), signal_source=RecordedSignals())
+
+    assert full.decisions == full.checks > fast.decisions
+    np.testing.assert_allclose(fast.portfolio_values, full.portfolio_values)
+    assert [t.timestamp for t in fast.trades] == [t.timestamp for t in full.trades]
+
+
+def test_recorded_ai_signals_drive_decisions(tmp_path):
+    klines = _klines(count=50)
+    backtester = Backtester(klines, _config(), signal_source=None)
+    entry, exit_ = backtester.check_times[10], backtester.check_times[20]
+
+    recorded = RecordedSignals()
+    recorded.add(
+        "BTC-USD",
+        from_epoch_us(entry),
+        (TradeAction.BUY, TradeType.LONG, "breakout", 80.0, None),
+    )
+    recorded.add(
+        "BTC-USD",
+        from_epoch_us(exit_),
+        (TradeAction.SELL, TradeType.LONG, "take profit", 70.0, None),
+    )
+    path = str(tmp_path / "signals.jsonl")
+    recorded.save(path)
+
+    result = run_backtest(klines, _config(), signal_source=RecordedSignals.load(path))
+
+    btc = [t for t in result.trades if t.symbol == "BTC-USD"]
+    assert [t.action for t in btc][:1] == ["opened"]
+    assert btc[0].timestamp == from_epoch_us(entry)
+
+
+def test_parameter_sweep_runs_each_combination():
+    klines = _klines(count=500)
+    results = run_parameter_sweep(
+        klines, _config(), {"risk_per_trade": [0.01, 0.05]}, max_workers=2
+    )
+
+    assert sorted(r["params"]["risk_per_trade"] for r in results) == [0.01, 0.05]
+    expected = run_backtest(klines, _config(risk_per_trade=0.05)).summary()
+    (swept,) = [r for r in results if r["params"]["risk_per_trade"] == 0.05]
+    assert {k: v for k, v in swept.items() if k != "params"} == {
+        k: v for k, v in expected.items() if k != "params"
+    }
@@ -0,0 +1,215 @@
+"""Tests for batched multi-symbol AI signal requests."""
+
+import asyncio
+from datetime import datetime, timezone
+
+from valuecell.agents.auto_trading_agent.models import (
+    AutoTradingConfig,
+    Position,
+    TechnicalIndicators,
+    TradeAction,
+    TradeType,
+)
+from valuecell.agents.auto_trading_agent.portfolio_decision_manager import (
+    AssetAnalysis,
+    BatchedDecisionSchema,
+    ExitPlan,
+    PortfolioDecisionManager,
+    SymbolSignal,
+    TradeDecision,
+)
+from valuecell.agents.auto_trading_agent.signal_cache import SignalCache
+
+SYMBOLS = ["BTC-USD", "ETH-USD", "SOL-USD"]
+
+
+class _FakeSignalGenerator:
+    def __init__(self, cache=None):
+        self.requests = []
+        self.cache = cache
+        self.llm_calls = 0
+
+    async def get_signal(self, indicators, **kwargs):
+        self.requests.append((indicators.symbol, kwargs.get("current_position")))
+        return TradeAction.SELL, TradeType.LONG, "fallback", 55.0, None
+
+
+def _manager(batch):
+    manager = PortfolioDecisionManager(
+        AutoTradingConfig(
+            initial_capital=10_000, crypto_symbols=SYMBOLS, agent_model="test"
+        ),
+        llm_client=object(),
+    )
+    manager.batch_requests = 0
+
+    async def request(prompt):
+        manager.batch_requests += 1
+        manager.last_prompt = prompt
+        if isinstance(batch, Exception):
+            raise batch
+        return batch
+
+    manager._request_batched_decision = request
+    for symbol in SYMBOLS:
+        manager.add_asset_analysis(
+            AssetAnalysis(
+                symbol=symbol,
+                indicators=TechnicalIndicators(
+                    symbol=symbol,
+                    timestamp=datetime.now(timezone.utc),
+                    close_price=100.0,
+                    volume=1.0,
+                    historical_prices=[98.0, 99.0, 100.0],
+                ),
+                technical_action=TradeAction.HOLD,
+                technical_trade_type=TradeType.LONG,
+            )
+        )
+    return manager
+
+
+def _batch(signals):
+    return BatchedDecisionSchema(
+        overall_market_sentiment="BULLISH",
+        portfolio_risk_assessment="LOW",
+        recommended_trades=[
+            TradeDecision(
+                symbol="BTC-USD",
+                action="BUY",
+                trade_type="LONG",
+                priority=80,
+                reasoning="breakout",
+            )
+        ],
+        portfolio_strategy="BALANCED",
+        risk_warnings=[],
+        reasoning="one request",
+        symbol_signals=signals,
+    )
+
+
+def test_one_request_covers_every_symbol():
+    manager = _manager(
+        _batch(
+            [
+                SymbolSignal(
+                    symbol=symbol,
+                    action="BUY",
+                    trade_type="LONG",
+                    confidence=70,
+                    reasoning="trend",
+                    exit_plan=ExitPlan(profit_target_pct=2.0, stop_loss_pct=1.0),
+                )
+                for symbol in SYMBOLS
+            ]
+        )
+    )
+    generator = _FakeSignalGenerator()
+
+    decision, exit_plans = asyncio.run(
+        manager.make_batched_decision({}, 10_000, 10_000, generator)
+    )
+
+    assert manager.batch_requests == 1
+    assert generator.requests == []
+    assert "BTC-USD: 98.00, 99.00, 100.00" in manager.last_prompt
+    assert all(a.ai_action == TradeAction.BUY for a in manager.asset_analyses.values())
+    assert exit_plans["ETH-USD"]["profit_target_pct"] == 2.0
+    assert decision.trades_to_execute == [("BTC-USD", TradeAction.BUY, TradeType.LONG)]
+
+
+def test_only_unparseable_symbols_fall_back():
+    manager = _manager(
+        _batch(
+            [
+                SymbolSignal(
+                    symbol="btc-usd",
+                    action="BUY",
+                    trade_type="LONG",
+                    confidence=70,
+                    reasoning="trend",
+                ),
+                SymbolSignal(
+                    symbol="ETH-USD",
+                    action="MAYBE",
+                    trade_type="LONG",
+                    confidence=10,
+                    reasoning="?",
+                ),
+            ]
+        )
+    )
+    generator = _FakeSignalGenerator()
+    position = Position(
+        symbol="SOL-USD",
+        entry_price=90.0,
+        quantity=2.0,
+        entry_time=datetime.now(timezone.utc),
+        trade_type=TradeType.LONG,
+        notional=180.0,
+    )
+
+    _, exit_plans = asyncio.run(
+        manager.make_batched_decision(
+            {"SOL-USD": position}, 10_000, 10_180, generator, asyncio.Semaphore(1)
+        )
+    )
+
+    assert [symbol for symbol, _ in generator.requests] == ["ETH-USD", "SOL-USD"]
+    assert generator.requests[1][1]["unrealized_pnl"] == 20.0
+    assert manager.asset_analyses["BTC-USD"].recommended_action == TradeAction.BUY
+    assert manager.asset_analyses["ETH-USD"].ai_reasoning == "fallback"
+    assert set(exit_plans) == set(SYMBOLS)
+
+
+def test_failed_batch_falls_back_to_separate_requests():
+    manager = _manager(RuntimeError("timeout"))
+    generator = _FakeSignalGenerator()
+
+    async def portfolio_decision(*args):
+        raise RuntimeError("unavailable")
+
+    manager._get_ai_portfolio_decision = portfolio_decision
+
+    decision, _ = asyncio.run(
+        manager.make_batched_decision({}, 10_000, 10_000, generator)
+    )
+
+    assert len(generator.requests) == len(SYMBOLS)
+    # Rule-based decision on the fallback signals (nothing to sell)
+    assert decision.trades_to_execute == []
+
+
+def test_batched_responses_are_cached():
+    signals = [
+        SymbolSignal(
+            symbol=symbol,
+            action="HOLD",
+            trade_type="LONG",
+            confidence=50,
+            reasoning="flat",
+        )
+        for symbol in SYMBOLS
+    ]
+    generator = _FakeSignalGenerator(SignalCache(ttl=300))
+    position = Position(
+        symbol="SOL-USD",
+        entry_price=90.0,
+        quantity=2.0,
+        entry_time=datetime.now(timezone.utc),
+        trade_type=TradeType.LONG,
+        notional=180.0,
+    )
+
+    def decide(positions, cash):
+        manager = _manager(_batch(signals))
+        asyncio.run(manager.make_batched_decision(positions, cash, 10_000, generator))
+        return manager.batch_requests
+
+    # The same market and portfolio state is answered from the cache
+    assert [decide({}, 10_000), decide({}, 9_990)] == [1, 0]
+    # A different position state is not
+    assert decide({"SOL-USD": position}, 9_820) == 1
+    assert generator.llm_calls == 2
+    assert generator.cache.get_stats()["hits"] == 1
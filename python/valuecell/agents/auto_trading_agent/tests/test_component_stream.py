@@ -0,0 +1,144 @@
+"""Tests for snapshot/delta streaming of the trading status and chart."""
+
+import json
+from collections import deque
+from datetime import datetime, timedelta
+
+from valuecell.agents.auto_trading_agent.agent import AutoTradingAgent
+from valuecell.agents.auto_trading_agent.constants import PORTFOLIO_CHART_MAX_POINTS
+from valuecell.agents.auto_trading_agent.mark_price import MarkPriceOracle
+from valuecell.agents.auto_trading_agent.models import AutoTradingConfig
+from valuecell.agents.auto_trading_agent.trading_executor import TradingExecutor
+from valuecell.core.event.buffer import ResponseBuffer
+from valuecell.core.event.factory import ResponseFactory
+from valuecell.core.types import FilteredCardPushNotificationComponentData
+
+T0 = datetime(2025, 10, 21, 10, 0)
+
+
+def _agent() -> AutoTradingAgent:
+    trading_agent = AutoTradingAgent.__new__(AutoTradingAgent)
+    trading_agent.trading_instances = {}
+    trading_agent.notification_cache = {}
+    trading_agent.notification_counts = {}
+    trading_agent._component_streams = {}
+    trading_agent._chart_cache = {}
+    return trading_agent
+
+
+def _notification(i: int) -> FilteredCardPushNotificationComponentData:
+    return FilteredCardPushNotificationComponentData(
+        title=f"Check {i}",
+        data=f"check {i}",
+        filters=["model-a"],
+        table_title="Status",
+        create_time="2025-10-21 10:00:00",
+    )
+
+
+def _persist(buffer: ResponseBuffer, response):
+    """Route an agent response through the server factory and buffer."""
+    routed = ResponseFactory().component_generator(
+        conversation_id="conv-1",
+        thread_id="thread-1",
+        task_id="task-1",
+        content=response.content,
+        component_type=response.metadata["component_type"],
+        component_id=response.metadata["component_id"],
+        seq=response.metadata["component_seq"],
+        delta=response.metadata.get("component_delta"),
+    )
+    (item,) = buffer.ingest(routed)
+    return item
+
+
+def test_notifications_are_sent_as_deltas():
+    trading_agent = _agent()
+    buffer = ResponseBuffer()
+
+    trading_agent._cache_notification("s1", _notification(0))
+    trading_agent._cache_notification("s1", _notification(1))
+    snapshot = trading_agent._get_notification_update("s1")
+    assert snapshot.metadata["component_seq"] == 0
+    assert "component_delta" not in snapshot.metadata
+    assert len(json.loads(snapshot.content)) == 2
+    _persist(buffer, snapshot)
+
+    assert trading_agent._get_notification_update("s1") is None
+
+    sizes = []
+    for i in range(2, 12):
+        trading_agent._cache_notification("s1", _notification(i))
+        delta = trading_agent._get_notification_update("s1")
+        assert delta.metadata["component_delta"] == "append"
+        assert [n["title"] for n in json.loads(delta.content)["items"]] == [
+            f"Check {i}"
+        ]
+        sizes.append(len(delta.content))
+        item = _persist(buffer, delta)
+
+    # Constant payload per check; the stored item is the full feed
+    assert max(sizes) - min(sizes) <= 2  # "Check 9" vs "Check 10"
+    assert [n["title"] for n in json.loads(item.payload.content)] == [
+        f"Check {i}" for i in range(12)
+    ]
+
+
+def test_notification_feed_resyncs_with_periodic_snapshots():
+    trading_agent = _agent()
+    trading_agent.notification_cache["s1"] = deque(maxlen=3)
+    trading_agent._cache_notification("s1", _notification(0))
+    trading_agent._get_notification_update("s1")
+    trading_agent._component_streams["trading_status_s1"].snapshot_interval = 2
+
+    kinds = []
+    for i in range(1, 6):
+        trading_agent._cache_notification("s1", _notification(i))
+        update = trading_agent._get_notification_update("s1")
+        kinds.append(update.metadata.get("component_delta"))
+    assert kinds == ["append", "append", None, "append", "append"]
+    assert len(json.loads(update.content)["items"]) == 1
+
+
+def test_portfolio_chart_is_sent_as_appended_rows():
+    trading_agent = _agent()
+    buffer = ResponseBuffer()
+    config = AutoTradingConfig(
+        initial_capital=1000, crypto_symbols=["BTC-USD"], agent_model="model-a"
+    )
+    executor = TradingExecutor(
+        config, mark_prices=MarkPriceOracle(fetch_price=lambda symbol: None)
+    )
+    trading_agent.trading_instances["s1"] = {
+        "inst-1": {"executor": executor, "config": config}
+    }
+
+    assert trading_agent._get_portfolio_chart_update("s1") is None
+    executor.snapshot_portfolio(T0)
+    snapshot = trading_agent._get_portfolio_chart_update("s1")
+    assert "component_delta" not in snapshot.metadata
+    _persist(buffer, snapshot)
+    assert trading_agent._get_portfolio_chart_update("s1") is None
+
+    for minute in range(1, 4):
+        executor.snapshot_portfolio(T0 + timedelta(minutes=minute))
+        delta = trading_agent._get_portfolio_chart_update("s1")
+        assert delta.metadata["component_delta"] == "append"
+        assert json.loads(delta.content)["items"] == [
+            [(T0 + timedelta(minutes=minute)).strftime("%Y-%m-%d %H:%M:%S"), 1000.0]
+        ]
+        # Bounded like snapshots, keeping the header row
+        change = json.loads(delta.content)
+        assert (change["max_items"], change["keep_head"]) == (
+            PORTFOLIO_CHART_MAX_POINTS + 1,
+            1,
+        )
+        item = _persist(buffer, delta)
+
+    # The compacted chart matches a freshly built one
+    stored = json.loads(json.loads(item.payload.content)["data"])
+    fresh = json.loads(
+        json.loads(trading_agent._get_session_portfolio_chart_data("s1"))["data"]
+    )
+    assert stored == fresh
+    assert len(stored) == 5
@@ -0,0 +1,85 @@
+"""Tests for the mark price oracle and position valuations."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from valuecell.agents.auto_trading_agent.mark_price import MarkPriceOracle
+from valuecell.agents.auto_trading_agent.models import Position, TradeType
+from valuecell.agents.auto_trading_agent.position_manager import PositionManager
+
+
+class _Fetcher:
+    def __init__(self, price=None):
+        self.price = price
+        self.calls = []
+
+    def __call__(self, symbol):
+        self.calls.append(symbol)
+        if isinstance(self.price, Exception):
+            raise self.price
+        return self.price
+
+
+def _manager(oracle: MarkPriceOracle) -> PositionManager:
+    manager = PositionManager(10_000, mark_prices=oracle)
+    manager.open_position(
+        "BTC-USD",
+        Position(
+            symbol="BTC-USD",
+            entry_price=100.0,
+            quantity=10.0,
+            entry_time=datetime.now(timezone.utc),
+            trade_type=TradeType.LONG,
+            notional=1_000.0,
+        ),
+    )
+    return manager
+
+
+def test_valuations_use_published_marks_without_fetching():
+    fetcher = _Fetcher(999.0)
+    oracle = MarkPriceOracle(fetch_price=fetcher)
+    manager = _manager(oracle)
+    oracle.update("BTC-USD", 110.0, datetime.now())
+
+    total_value, positions_value, total_pnl = manager.calculate_portfolio_value()
+    manager.get_portfolio_summary()
+    now = datetime.now()
+    manager.snapshot_positions(now)
+    manager.snapshot_portfolio(now)
+
+    assert fetcher.calls == []
+    assert positions_value == pytest.approx(1_100.0)
+    assert total_pnl == pytest.approx(100.0)
+    assert manager.get_position_history()[-1].current_price == 110.0
+    assert oracle.get_stats()["hits"] >= 4
+
+
+def test_missing_mark_is_fetched_once_and_cached():
+    fetcher = _Fetcher(120.0)
+    oracle = MarkPriceOracle(fetch_price=fetcher)
+    manager = _manager(oracle)
+
+    for _ in range(3):
+        manager.calculate_portfolio_value()
+    assert fetcher.calls == ["BTC-USD"]
+    assert oracle.get_mark("BTC-USD").source == "fetch"
+
+
+def test_older_tick_does_not_replace_newer_mark():
+    oracle = MarkPriceOracle(fetch_price=_Fetcher())
+    tick = datetime.now()
+    oracle.update("ETH-USD", 50.0, tick)
+    oracle.update("ETH-USD", 40.0, tick - timedelta(minutes=1))
+    assert oracle.get_price("ETH-USD") == 50.0
+
+
+def test_stale_mark_is_used_when_fetch_fails():
+    fetcher = _Fetcher(RuntimeError("offline"))
+    oracle = MarkPriceOracle(fetch_price=fetcher, max_age=0)
+    oracle.update("ETH-USD", 50.0)
+
+    assert oracle.get_price("ETH-USD") == 50.0
+    assert oracle.get_price("SOL-USD") is None
+    assert fetcher.calls == ["ETH-USD", "SOL-USD"]
@@ -0,0 +1,110 @@
+"""Tests for the incremental kline cache and streaming indicators."""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from valuecell.agents.auto_trading_agent.indicators import IndicatorEngine
+from valuecell.agents.auto_trading_agent.market_data import MarketDataProvider
+
+
+def _klines(start: int, count: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, start + count))[start:]
+    # Bars end at the current minute so the cache never needs a reseed
+    first_minute = int(time.time() // 60) - 1200
+    index = pd.to_datetime(
+        (np.arange(start, start + count) + first_minute) * 60_000, unit="ms"
+    )
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": np.full(count, 10.0),
+        },
+        index=index,
+    )
+
+
+class _FakeBinance:
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self.requests = []
+
+    def get_klines(
+        self, symbol, interval="1m", limit=500, start_time=None, end_time=None
+    ):
+        df = self.frame
+        if start_time:
+            open_ms = df.index.as_unit("ns").asi8 // 1_000_000
+            df = df[open_ms >= start_time]
+            df = df.head(limit)
+        else:
+            df = df.tail(limit)
+        self.requests.append((start_time, len(df)))
+        return df
+
+
+def test_streaming_indicators_match_full_recompute():
+    close = _klines(0, 300)["close"]
+    engine = IndicatorEngine()
+    for price in close.iloc[:-1]:
+        engine.update(price)
+    values = engine.preview(close.iloc[-1])
+
+    ema_12 = close.ewm(span=12, adjust=False).mean()
+    ema_26 = close.ewm(span=26, adjust=False).mean()
+    macd = ema_12 - ema_26
+    signal = macd.ewm(span=9, adjust=False).mean()
+    middle = close.rolling(20).mean().iloc[-1]
+    std = close.rolling(20).std().iloc[-1]
+
+    assert values["ema_12"] == pytest.approx(ema_12.iloc[-1])
+    assert values["ema_50"] == pytest.approx(
+        close.ewm(span=50, adjust=False).mean().iloc[-1]
+    )
+    assert values["macd_signal"] == pytest.approx(signal.iloc[-1])
+    assert values["bb_middle"] == pytest.approx(middle)
+    assert values["bb_upper"] == pytest.approx(middle + 2 * std)
+
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False).mean()
+    # Wilder seeds with a simple average; the difference decays away
+    assert values["rsi"] == pytest.approx(
+        100 - 100 / (1 + gain.iloc[-1] / loss.iloc[-1]), abs=1e-6
+    )
+
+
+def test_calculate_indicators_fetches_only_new_bars():
+    frame = _klines(0, 1200)
+    provider = MarketDataProvider(cache_ttl_seconds=0, preferred_source="binance")
+    fake = _FakeBinance(frame.iloc[:1000])
+    provider.binance_provider = fake
+
+    first = provider.calculate_indicators("BTC-USD")
+    assert fake.requests == [(None, 1000)]
+
+    # Two more bars arrive and the forming bar is revised
+    fake.frame = frame.iloc[:1002].copy()
+    fake.frame.iloc[999, fake.frame.columns.get_loc("close")] += 5
+    second = provider.calculate_indicators("BTC-USD")
+
+    start_time, fetched = fake.requests[-1]
+    assert start_time is not None and fetched == 3
+    assert second.close_price == pytest.approx(frame["close"].iloc[1001])
+    assert second.historical_prices[-1] == second.close_price
+    assert len(second.historical_prices) == 20
+    assert second.ema_12 != first.ema_12
+
+    # Same values as recomputing from scratch over the retained bars
+    fresh = MarketDataProvider(cache_ttl_seconds=0, preferred_source="binance")
+    fresh.binance_provider = _FakeBinance(fake.frame)
+    expected = fresh.calculate_indicators("BTC-USD")
+    assert second.ema_26 == pytest.approx(expected.ema_26)
+    assert second.rsi == pytest.approx(expected.rsi)
+    assert second.bb_lower == pytest.approx(expected.bb_lower)
@@ -0,0 +1,146 @@
+"""Tests for the Binance WebSocket market stream against a local server."""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from valuecell.agents.auto_trading_agent.market_stream import (
+    BinanceMarketStream,
+    MarketDataStore,
+)
+
+from .test_market_data import _FakeBinance, _klines
+
+pytest.importorskip("websockets")
+from websockets.asyncio.server import serve  # noqa: E402
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def _kline_event(open_time: int, close: float) -> str:
+    data = {
+        "e": "kline",
+        "E": open_time + 1000,
+        "s": "BTCUSDT",
+        "k": {
+            "t": open_time,
+            "o": str(close),
+            "h": str(close + 1),
+            "l": str(close - 1),
+            "c": str(close),
+            "v": "5",
+        },
+    }
+    return json.dumps({"stream": "btcusdt@kline_1m", "data": data})
+
+
+def _ticker_event(price: float) -> str:
+    data = {
+        "e": "24hrMiniTicker",
+        "E": int(time.time() * 1000),
+        "s": "BTCUSDT",
+        "c": str(price),
+        "o": "100",
+        "h": str(price + 5),
+        "l": "95",
+        "v": "1000",
+    }
+    return json.dumps({"stream": "btcusdt@miniTicker", "data": data})
+
+
+class _LocalBinance:
+    """Combined-stream server: drops the first connection after one update."""
+
+    def __init__(self, next_open_time: int):
+        self.next_open_time = next_open_time
+        self.paths = []
+        self.port = None
+        self._ready = threading.Event()
+        self._loop = None
+        self._stop = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    async def _handler(self, ws):
+        self.paths.append(ws.request.path)
+        if len(self.paths) == 1:
+            await ws.send(_kline_event(self.next_open_time, 123.0))
+            await ws.send(_ticker_event(110.0))
+            await ws.close()
+            return
+        await ws.send(_ticker_event(200.0))
+        await ws.wait_closed()
+
+    def _run(self):
+        async def main():
+            self._loop = asyncio.get_running_loop()
+            self._stop = asyncio.Event()
+            async with serve(self._handler, "127.0.0.1", 0) as server:
+                self.port = server.sockets[0].getsockname()[1]
+                self._ready.set()
+                await self._stop.wait()
+
+        asyncio.run(main())
+
+    def __enter__(self):
+        self._thread.start()
+        assert self._ready.wait(5)
+        return self
+
+    def __exit__(self, *exc):
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join(5)
+
+
+def test_stream_updates_store_and_backfills_after_reconnect():
+    frame = _klines(0, 300)
+    rest = _FakeBinance(frame)
+    last_open = int(frame.index[-1].value // 1_000_000)
+    next_open = last_open + 60_000
+
+    with _LocalBinance(next_open) as server:
+        store = MarketDataStore()
+        stream = BinanceMarketStream(
+            store,
+            ws_base=f"ws://127.0.0.1:{server.port}",
+            rest_provider=rest,
+            reconnect_delay=0.05,
+        )
+        try:
+            stream.subscribe(["BTC-USD"])
+
+            # Live quote from the second connection after the reconnect
+            assert _wait_for(lambda: store.get_price("BTC-USD") == 200.0)
+            quote = store.get_quote("BTC-USD")
+            assert quote.change_pct == pytest.approx(100.0)
+            assert stream.reconnects >= 1
+
+            # Both connections request the subscribed streams
+            assert len(server.paths) >= 2
+            for path in server.paths[:2]:
+                assert "btcusdt@kline_1m" in path
+                assert "btcusdt@miniTicker" in path
+
+            # First connection seeds the series, the reconnect only backfills
+            # from the last streamed bar
+            assert rest.requests[0][0] is None
+            assert rest.requests[1][0] == next_open
+
+            series = store.klines.get("BTC-USD", "1m")
+            assert series.source == "binance"
+            assert series.last_open_time == next_open
+            assert series.bars[-1].close == 123.0
+            assert len(series) == 301
+        finally:
+            stream.stop()
+
+    assert not stream.connected.is_set()
@@ -0,0 +1,144 @@
+"""Tests for the paper trading matching engine."""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from valuecell.agents.auto_trading_agent.exchanges import (
+    MatchingEngine,
+    OrderStatus,
+    PaperTrading,
+)
+from valuecell.agents.auto_trading_agent.exchanges.base_exchange import Order
+
+FEES = {"maker": 0.0002, "taker": 0.001}
+
+
+def _at(seconds: float) -> datetime:
+    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+
+def _order(order_id, side, quantity, price=None, order_type="limit"):
+    return Order(order_id, "BTCUSDT", side, quantity, price, order_type)
+
+
+def test_market_order_walks_the_book_and_expires_the_rest():
+    exchange = PaperTrading(initial_balance=10_000, fee_tier=FEES)
+    exchange.update_book("BTCUSDT", [(99.0, 5.0)], [(100.0, 1.0), (101.0, 2.0)], _at(1))
+
+    order = asyncio.run(exchange.place_order("BTCUSDT", "buy", 4.0, None, "market"))
+
+    assert order.status == OrderStatus.EXPIRED
+    assert order.filled_quantity == 3.0
+    assert order.filled_price == pytest.approx((100.0 + 2 * 101.0) / 3)
+    assert order.fee == pytest.approx(302.0 * FEES["taker"])
+    assert exchange.balance == pytest.approx(10_000 - 302.0 - order.fee)
+    assert exchange.positions["BTCUSDT"]["quantity"] == 3.0
+
+    # Taken liquidity stays consumed until the next snapshot
+    again = asyncio.run(exchange.place_order("BTCUSDT", "buy", 1.0, None, "market"))
+    assert again.filled_quantity == 0.0
+
+
+def test_limit_order_queues_behind_displayed_quantity():
+    engine = MatchingEngine(fee_tier=FEES)
+    engine.update_book("BTCUSDT", [(99.0, 3.0)], [(100.0, 1.0)], 1.0)
+
+    order = _order("a", "buy", 2.0, 99.0)
+    assert engine.submit(order) == []
+    assert engine.get_order_queue_position("a") == 3.0
+    assert engine.get_open_orders("BTCUSDT") == [order]
+    assert engine.get_open_orders("ETHUSDT") == []
+
+    # Quantity joining behind us does not move the queue; quantity leaving
+    # the level does, and what exceeds the queue ahead fills us as maker
+    assert engine.update_book("BTCUSDT", [(99.0, 5.0)], [(100.0, 1.0)], 2.0) == []
+    (fill,) = engine.update_book("BTCUSDT", [(99.0, 1.5)], [(100.0, 1.0)], 3.0)
+    assert (fill.quantity, fill.price, fill.liquidity) == (0.5, 99.0, "maker")
+    assert fill.fee == pytest.approx(0.5 * 99.0 * FEES["maker"])
+    assert order.status == OrderStatus.PARTIALLY_FILLED
+
+    # The price trades through our level: the rest fills
+    (fill,) = engine.update_book("BTCUSDT", [(98.0, 1.0)], [(98.5, 1.0)], 4.0)
+    assert fill.quantity == 1.5
+    assert order.status == OrderStatus.FILLED
+    assert engine.get_open_orders() == []
+
+
+def test_latency_is_seeded_and_orders_see_the_book_at_arrival():
+    def run():
+        engine = MatchingEngine(latency=0.5, latency_jitter=1.0, seed=7)
+        engine.update_book("BTCUSDT", [(99.0, 1.0)], [(100.0, 1.0)], 0.0)
+        fills = []
+        for i in range(5):
+            engine.submit(_order(str(i), "buy", 0.1, None, "market"), float(i))
+            # The ask moves every second; each order fills at the book it meets
+            fills += engine.update_book(
+                "BTCUSDT", [(99.0 + i, 1.0)], [(100.0 + i + 1, 1.0)], i + 1.0
+            )
+        fills += engine.advance(10.0)
+        return [(f.order_id, f.price, f.timestamp) for f in fills]
+
+    first = run()
+    assert first == run()
+    assert len(first) == 5
+    assert all(ts > int(order_id) + 0.5 for order_id, _, ts in first)
+
+
+def test_cancel_and_bounded_history():
+    exchange = PaperTrading(initial_balance=1_000, fee_tier=FEES, order_history_limit=2)
+    exchange.update_book("BTCUSDT", [(99.0, 5.0)], [(100.0, 5.0)], _at(1))
+
+    async def main():
+        limit = await exchange.place_order("BTCUSDT", "buy", 1.0, 90.0)
+        open_orders = await exchange.get_open_orders("BTCUSDT")
+        cancelled = await exchange.cancel_order("BTCUSDT", limit.order_id)
+        for _ in range(2):
+            await exchange.execute_buy("BTCUSDT", 1.0)
+        return limit, open_orders, cancelled
+
+    limit, open_orders, cancelled = asyncio.run(main())
+
+    assert open_orders == [limit] and cancelled
+    assert limit.status == OrderStatus.CANCELLED
+    # The cancelled order was evicted by the two fills
+    assert len(exchange.order_history) == 2
+    assert limit.order_id not in exchange.orders
+    assert exchange.balance == pytest.approx(1_000 - 2 * 100.0 * (1 + FEES["taker"]))
+    assert exchange.positions["BTCUSDT"]["quantity"] == 2.0
+
+
+def test_symbols_without_depth_are_quoted_at_the_decision_price():
+    exchange = PaperTrading(initial_balance=1_000, fee_tier=FEES, spread_bps=10)
+
+    order = asyncio.run(exchange.execute_buy("BTCUSDT", 1.0, 100.0))
+
+    assert order.status == OrderStatus.FILLED
+    assert order.filled_price == pytest.approx(100.05)
+
+
+def test_reference_price_updates_match_resting_orders():
+    engine = MatchingEngine(fee_tier=FEES)
+    engine.set_reference_price("BTCUSDT", 100.0)
+    order = _order("1", "buy", 1.0, 99.0)
+    engine.submit(order)
+    assert order.status == OrderStatus.PENDING
+
+    assert engine.set_reference_price("BTCUSDT", 99.5) == []
+    fills = engine.set_reference_price("BTCUSDT", 98.0)
+
+    assert [(f.price, f.liquidity) for f in fills] == [(99.0, "maker")]
+    assert order.status == OrderStatus.FILLED
+    assert engine.get_open_orders() == []
+
+
+def test_buys_are_checked_against_the_worst_case_fill():
+    exchange = PaperTrading(initial_balance=1_000, fee_tier=FEES, spread_bps=100)
+
+    # Each buy fits at 100 but not at the asks it would fill at
+    assert asyncio.run(exchange.execute_buy("BTCUSDT", 9.95, 100.0)) is None
+
+    exchange.update_book("BTCUSDT", [(99.0, 5.0)], [(100.0, 1.0), (110.0, 9.0)])
+    assert asyncio.run(exchange.execute_buy("BTCUSDT", 9.5, 100.0)) is None
+    assert asyncio.run(exchange.execute_buy("BTCUSDT", 1.0, 100.0)) is not None
@@ -0,0 +1,107 @@
+"""Tests for the incremental performance metrics engine."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from valuecell.agents.auto_trading_agent.performance_metrics import (
+    MetricsEngine,
+    RunningMetrics,
+    compute_metrics,
+)
+from valuecell.agents.auto_trading_agent.trading_store import (
+    InstanceUpdate,
+    TradingStateStore,
+)
+
+
+def test_metrics_match_reference_formulas():
+    values = [100.0, 110.0, 99.0, 105.0, 120.0, 90.0]
+    metrics = compute_metrics(values, [10.0, -5.0, 20.0], periods_per_year=1)
+
+    returns = np.diff(values) / np.array(values[:-1])
+    downside = np.sqrt((np.minimum(returns, 0) ** 2).mean())
+    assert metrics["sharpe_ratio"] == round(returns.mean() / returns.std(ddof=1), 2)
+    assert metrics["sortino_ratio"] == round(returns.mean() / downside, 2)
+    assert metrics["max_drawdown"] == 25.0
+    assert metrics["calmar_ratio"] == round(returns.mean() / 0.25, 2)
+    assert metrics["total_return_pct"] == -10.0
+    assert metrics["win_rate"] == pytest.approx(66.67)
+    assert metrics["profit_factor"] == 6.0
+
+
+def test_incremental_updates_match_batch():
+    rng = np.random.default_rng(7)
+    values = 1000 * np.cumprod(1 + rng.normal(0, 0.01, 500))
+    pnls = rng.normal(0, 5, 40)
+
+    running = RunningMetrics()
+    for value_chunk, pnl_chunk in zip(
+        np.array_split(values, 13), np.array_split(pnls, 13)
+    ):
+        running.update(value_chunk, pnl_chunk)
+    batch = RunningMetrics()
+    batch.update(values, pnls)
+
+    assert running.return_count == batch.return_count == 499
+    assert running.return_mean == pytest.approx(batch.return_mean)
+    assert running.return_m2 == pytest.approx(batch.return_m2)
+    assert running.max_drawdown == pytest.approx(batch.max_drawdown)
+    assert running.closed_trades == batch.closed_trades
+    assert running.to_dict() == batch.to_dict()
+
+
+def _update(check, trades=()):
+    return InstanceUpdate(
+        instance_id="inst-1",
+        session_id="session-1",
+        agent_model="model-a",
+        config={},
+        created_at="2025-01-01T00:00:00",
+        active=True,
+        initial_capital=100.0,
+        total_value=100.0 + check,
+        positions_value=0.0,
+        total_pnl=float(check),
+        available_cash=100.0,
+        check_count=check,
+        updated_at=f"2025-01-01T00:0{check}:00",
+        portfolio_rows=[(check, "", 100.0 + check * (-1) ** check, 0, 0, 0, 0)],
+        trades=list(trades),
+    )
+
+
+def _trade(pnl):
+    return {
+        "timestamp": "",
+        "symbol": "BTC-USD",
+        "action": "closed",
+        "trade_type": "long",
+        "price": 1.0,
+        "quantity": 1.0,
+        "notional": 1.0,
+        "pnl": pnl,
+    }
+
+
+def test_engine_caches_by_version_and_reads_only_new_rows(tmp_path):
+    store = TradingStateStore(str(tmp_path / "state.db"))
+    engine = MetricsEngine()
+
+    async def main():
+        results = []
+        for check in range(1, 4):
+            await store.save_updates([_update(check, [(check, _trade(check - 2.0))])])
+            (instance,) = await store.list_instances()
+            results.append(await engine.get_metrics(store, instance))
+            # Unchanged history is served from the cache
+            results.append(await engine.get_metrics(store, instance))
+        return results
+
+    results = asyncio.run(main())
+    assert engine.get_stats() == {"instances": 1, "hits": 3, "updates": 3}
+
+    values = [100.0 + c * (-1) ** c for c in range(1, 4)]
+    assert results[-1] == compute_metrics(values, [-1.0, 0.0, 1.0])
+    assert results[-1]["closed_trades"] == 3
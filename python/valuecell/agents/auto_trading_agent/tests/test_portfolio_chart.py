@@ -0,0 +1,105 @@
+"""Tests for the multi-model portfolio chart builder."""
+
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from valuecell.agents.auto_trading_agent.agent import AutoTradingAgent
+from valuecell.agents.auto_trading_agent.mark_price import MarkPriceOracle
+from valuecell.agents.auto_trading_agent.models import AutoTradingConfig
+from valuecell.agents.auto_trading_agent.portfolio_chart import (
+    build_chart_rows,
+    merge_series,
+)
+from valuecell.agents.auto_trading_agent.position_manager import (
+    PORTFOLIO_HISTORY_DTYPE,
+)
+from valuecell.agents.auto_trading_agent.timeseries import to_epoch_us
+from valuecell.agents.auto_trading_agent.trading_executor import TradingExecutor
+
+T0 = datetime(2025, 10, 21, 10, 0, tzinfo=timezone.utc)
+
+
+def _series(points):
+    rows = np.zeros(len(points), dtype=PORTFOLIO_HISTORY_DTYPE)
+    rows["ts"] = [to_epoch_us(T0 + timedelta(minutes=m)) for m, _ in points]
+    rows["tz_aware"] = True
+    rows["total_value"] = [v for _, v in points]
+    return rows
+
+
+def test_values_are_joined_as_of_each_timestamp():
+    rows = build_chart_rows(
+        {
+            "model-a": _series([(0, 100.0), (2, 102.0)]),
+            "model-b": _series([(1, 51.0), (2, 52.0), (3, 53.0)]),
+            "model-c": _series([]),
+        },
+        {"model-a": 100.0, "model-b": 50.0, "model-c": 10.0},
+    )
+
+    assert rows == [
+        ["Time", "model-a", "model-b", "model-c"],
+        ["2025-10-21 10:00:00", 100.0, 50.0, 10.0],
+        ["2025-10-21 10:01:00", 100.0, 51.0, 10.0],
+        ["2025-10-21 10:02:00", 102.0, 52.0, 10.0],
+        ["2025-10-21 10:03:00", 102.0, 53.0, 10.0],
+    ]
+    assert build_chart_rows({"model-c": _series([])}, {"model-c": 10.0}) == []
+
+
+def test_downsampling_keeps_the_newest_point():
+    minutes = 24 * 60
+    series = {
+        f"model-{i}": _series([(m, 1000.0 + i + m) for m in range(i, minutes, 1 + i)])
+        for i in range(5)
+    }
+    initial = {model: 1000.0 for model in series}
+
+    started = time.perf_counter()
+    rows = build_chart_rows(series, initial, max_points=500)
+    elapsed = time.perf_counter() - started
+
+    assert len(rows) - 1 <= 500
+    assert rows[-1][0] == "2025-10-22 09:59:00"
+    assert rows[-1][1] == 1000.0 + minutes - 1
+    assert elapsed < 0.5
+
+
+def test_merge_series_orders_rows_by_time():
+    merged = merge_series([_series([(0, 1.0), (2, 3.0)]), _series([(1, 2.0)])])
+    assert merged["total_value"].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_session_chart_is_cached_until_a_new_snapshot(tmp_path):
+    trading_agent = AutoTradingAgent.__new__(AutoTradingAgent)
+    trading_agent._chart_cache = {}
+    trading_agent.trading_instances = {"session-1": {}}
+    oracle = MarkPriceOracle(fetch_price=lambda symbol: None)
+    for i, model in enumerate(["model-a", "model-b"]):
+        config = AutoTradingConfig(
+            initial_capital=1000 * (i + 1),
+            crypto_symbols=["BTC-USD"],
+            agent_model=model,
+        )
+        executor = TradingExecutor(config, mark_prices=oracle)
+        executor.snapshot_portfolio(T0 + timedelta(minutes=i))
+        trading_agent.trading_instances["session-1"][f"inst-{i}"] = {
+            "executor": executor,
+            "config": config,
+        }
+
+    chart = trading_agent._get_session_portfolio_chart_data("session-1")
+    assert trading_agent._get_session_portfolio_chart_data("session-1") is chart
+    assert json.loads(json.loads(chart)["data"]) == [
+        ["Time", "model-a", "model-b"],
+        ["2025-10-21 10:00:00", 1000.0, 2000.0],
+        ["2025-10-21 10:01:00", 1000.0, 2000.0],
+    ]
+
+    executor.snapshot_portfolio(T0 + timedelta(minutes=2))
+    updated = trading_agent._get_session_portfolio_chart_data("session-1")
+    assert updated is not chart
+    assert len(json.loads(json.loads(updated)["data"])) == 4
@@ -0,0 +1,134 @@
+"""Tests for the weight-aware Binance rate limiter."""
+
+import asyncio
+import time
+
+import pytest
+
+from valuecell.agents.auto_trading_agent.binance_data import (
+    BinanceMarketDataProvider,
+)
+from valuecell.agents.auto_trading_agent.rate_limiter import (
+    TokenBucketRateLimiter,
+    request_weight,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_request_weights():
+    assert request_weight("/api/v3/klines", {"symbol": "BTCUSDT"}) == 2
+    assert request_weight("/api/v3/ticker/24hr", {"symbol": "BTCUSDT"}) == 2
+    assert request_weight("/api/v3/ticker/24hr") == 80
+    assert request_weight("/api/v3/ticker/price") == 4
+    assert request_weight("/api/v3/depth", {"limit": 500}) == 25
+    assert request_weight("/api/v3/unknown") == 1
+
+
+def test_reservations_wait_for_refill():
+    clock = _Clock()
+    # 60 weight/min at 100%: one token per second, burst of 5
+    limiter = TokenBucketRateLimiter(60, safety_margin=1.0, burst=5, clock=clock)
+
+    assert limiter.reserve(5) == 0
+    assert limiter.reserve(2) == pytest.approx(2.0)
+    # Later callers queue behind earlier reservations
+    assert limiter.reserve(1) == pytest.approx(3.0)
+
+    clock.now += 3
+    assert limiter.reserve(1) == pytest.approx(1.0)
+
+    metrics = limiter.get_metrics()
+    assert metrics["requests"] == 4
+    assert metrics["weight_consumed"] == 9
+    assert metrics["throttled_requests"] == 3
+    assert metrics["utilization"] == pytest.approx(9 / 60)
+
+
+def test_used_weight_header_corrects_the_bucket():
+    clock = _Clock()
+    limiter = TokenBucketRateLimiter(600, safety_margin=1.0, burst=60, clock=clock)
+
+    # Another process on the same IP already used most of the minute's budget
+    limiter.observe_headers({"X-MBX-USED-WEIGHT-1M": "590"})
+    assert limiter.reserve(20) == pytest.approx(1.0)
+    assert limiter.get_metrics()["server_used_weight"] == 590
+    assert limiter.header_corrections == 1
+
+    # A reading leaving more budget than we hold does not add tokens
+    limiter.observe_headers({"X-MBX-USED-WEIGHT": "10"})
+    assert limiter.header_corrections == 1
+
+
+def test_block_for_pauses_requests():
+    clock = _Clock()
+    limiter = TokenBucketRateLimiter(600, safety_margin=1.0, burst=60, clock=clock)
+    limiter.block_for(30)
+    assert limiter.reserve(1) == pytest.approx(30.0)
+
+
+def test_async_acquire_does_not_block_the_event_loop():
+    limiter = TokenBucketRateLimiter(600, safety_margin=1.0, burst=1)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        await limiter.acquire(1)
+        started = time.monotonic()
+        waited = await limiter.acquire(3)  # 10 tokens/s: ~0.3s
+        elapsed = time.monotonic() - started
+        task.cancel()
+        return waited, elapsed, ticks
+
+    waited, elapsed, ticks = asyncio.run(main())
+    assert waited == pytest.approx(0.3, abs=0.05)
+    assert elapsed >= 0.25
+    assert ticks >= 10
+
+
+class _Response:
+    def __init__(self, headers):
+        self.headers = headers
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"symbol": "BTCUSDT", "price": "100.5"}
+
+
+class _Session:
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, timeout=None):
+        self.urls.append(url)
+        return _Response({"X-MBX-USED-WEIGHT-1M": "42"})
+
+
+def test_provider_charges_request_weight_and_reads_headers():
+    limiter = TokenBucketRateLimiter()
+    provider = BinanceMarketDataProvider(rate_limiter=limiter)
+    provider.session = _Session()
+
+    assert provider.get_current_price("BTC-USD") == 100.5
+    assert asyncio.run(provider.get_current_price_async("ETH-USD")) == 100.5
+
+    metrics = limiter.get_metrics()
+    assert metrics["requests"] == 2
+    assert metrics["weight_consumed"] == 4
+    assert metrics["server_used_weight"] == 42
+    assert provider.session.urls[1].endswith("symbol=ETHUSDT")
@@ -0,0 +1,258 @@
+"""Tests for resuming trading instances after an agent restart."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from valuecell.agents.auto_trading_agent import agent as agent_module
+from valuecell.agents.auto_trading_agent import mark_price
+from valuecell.agents.auto_trading_agent.agent import AutoTradingAgent
+from valuecell.agents.auto_trading_agent.models import (
+    AutoTradingConfig,
+    TechnicalIndicators,
+    TradeAction,
+    TradeType,
+    TradingRequest,
+)
+from valuecell.agents.auto_trading_agent.technical_analysis import TechnicalAnalyzer
+from valuecell.agents.auto_trading_agent.timeseries import from_epoch_us
+from valuecell.agents.auto_trading_agent.trading_executor import TradingExecutor
+from valuecell.agents.auto_trading_agent.trading_store import TradingStateStore
+
+TICK = datetime(2025, 1, 1, 12, 0)
+
+
+@pytest.fixture(autouse=True)
+def _mark_prices(monkeypatch):
+    oracle = mark_price.MarkPriceOracle(fetch_price=lambda symbol: 100.0)
+    monkeypatch.setattr(mark_price, "_mark_price_oracle", oracle)
+
+
+def _agent(db_path):
+    agent = AutoTradingAgent.__new__(AutoTradingAgent)
+    agent._init_trading_state()
+    agent.trading_store = TradingStateStore(db_path)
+    resumed = []
+
+    async def run_resumed_session(session_id, instance_ids, recover=True):
+        resumed.append((session_id, instance_ids))
+
+    agent._run_resumed_session = run_resumed_session
+    return agent, resumed
+
+
+def _instance(instance_id, symbol="BTC-USD", price=100.0):
+    config = AutoTradingConfig(
+        initial_capital=10_000,
+        crypto_symbols=[symbol],
+        agent_model="test",
+        use_ai_signals=False,
+        openrouter_api_key="secret",
+    )
+    executor = TradingExecutor(config)
+    indicators = TechnicalIndicators(
+        symbol=symbol,
+        timestamp=datetime.now(timezone.utc),
+        close_price=price,
+        volume=1.0,
+    )
+    executor.execute_trade(symbol, TradeAction.BUY, TradeType.LONG, indicators)
+    return {
+        "instance_id": instance_id,
+        "config": config,
+        "executor": executor,
+        "ai_signal_generator": None,
+        "active": True,
+        "created_at": TICK,
+        "check_count": 3,
+        "last_check": TICK,
+        "last_tick": TICK,
+        "decision_history": [],
+        "history_dir": None,
+    }
+
+
+def test_instances_resume_from_their_checkpoints(tmp_path):
+    db_path = str(tmp_path / "state.db")
+    agent, _ = _agent(db_path)
+    agent.trading_instances = {
+        "session-1": {"inst-1": _instance("inst-1"), "inst-2": _instance("inst-2")},
+        "session-2": {"inst-3": _instance("inst-3")},
+    }
+    agent.trading_instances["session-1"]["inst-2"]["active"] = False
+    asyncio.run(agent._persist_trading_state())
+
+    restarted, resumed = _agent(db_path)
+    assert asyncio.run(restarted.resume_instances()) == 2
+    assert sorted(resumed) == [("session-1", ["inst-1"]), ("session-2", ["inst-3"])]
+
+    original = agent.trading_instances["session-1"]["inst-1"]
+    instance = restarted.trading_instances["session-1"]["inst-1"]
+    executor = instance["executor"]
+    assert executor.get_state()[0] == original["executor"].get_state()[0]
+    assert executor.positions == original["executor"].positions
+    assert executor.get_trade_history() == original["executor"].get_trade_history()
+    assert executor.get_exposure()["position_count"] == 1
+    assert (instance["check_count"], instance["last_tick"]) == (3, TICK)
+    # API keys are not checkpointed
+    assert instance["config"].openrouter_api_key is None
+
+    # Nothing is saved again until the instance changes
+    update, _ = restarted._collect_instance_update("session-1", "inst-1", instance)
+    assert update.checkpoint_state is None
+    assert update.trades == []
+
+
+def test_sessions_persist_only_their_own_instances(tmp_path):
+    agent, _ = _agent(str(tmp_path / "state.db"))
+    agent.trading_instances = {
+        "session-1": {"inst-1": _instance("inst-1")},
+        "session-2": {"inst-2": _instance("inst-2")},
+    }
+
+    asyncio.run(agent._persist_trading_state("session-1"))
+
+    stored = asyncio.run(agent.trading_store.list_instances())
+    assert [i["instance_id"] for i in stored] == ["inst-1"]
+
+
+def test_instances_losing_their_api_key_are_not_resumed(tmp_path, monkeypatch):
+    monkeypatch.delenv("OPENROUTER_API_KEY", raising=False)
+    db_path = str(tmp_path / "state.db")
+    agent, _ = _agent(db_path)
+    instance = _instance("inst-1")
+    instance["config"].use_ai_signals = True
+    agent.trading_instances = {"session-1": {"inst-1": instance}}
+    asyncio.run(agent._persist_trading_state())
+
+    restarted, resumed = _agent(db_path)
+    assert asyncio.run(restarted.resume_instances()) == 0
+    assert resumed == []
+    # It is stopped instead of trading without its AI signals
+    (stored,) = asyncio.run(restarted.trading_store.list_instances())
+    assert not stored["active"]
+
+
+def test_hundreds_of_instances_resume_within_a_second(tmp_path):
+    db_path = str(tmp_path / "state.db")
+    agent, _ = _agent(db_path)
+    agent.trading_instances = {
+        f"session-{s}": {f"inst-{s}-{i}": _instance(f"inst-{s}-{i}") for i in range(30)}
+        for s in range(10)
+    }
+    asyncio.run(agent._persist_trading_state())
+
+    restarted, _ = _agent(db_path)
+    started = time.perf_counter()
+    assert asyncio.run(restarted.resume_instances()) == 300
+    assert time.perf_counter() - started < 1.0
+
+
+def test_missed_bars_are_backfilled_at_their_closes(tmp_path, monkeypatch):
+    agent, _ = _agent(str(tmp_path / "state.db"))
+    instance = _instance("inst-1", price=100.0)
+    instance["last_tick"] = datetime.now().replace(second=0, microsecond=0)
+    instance["last_tick"] -= timedelta(minutes=5)
+    start = instance["last_tick"]
+    agent.trading_instances = {"session-1": {"inst-1": instance}}
+
+    def get_bar_closes(symbol, since):
+        # The cache does not reach back to minute 1; no bar closed at minute 3
+        closes = {2: 110.0, 4: 90.0}
+        return [(since + timedelta(minutes=m), c) for m, c in closes.items()]
+
+    monkeypatch.setattr(TechnicalAnalyzer, "get_bar_closes", get_bar_closes)
+    backfilled = asyncio.run(agent._backfill_missed_bars("session-1", ["inst-1"]))
+
+    series = instance["executor"].get_portfolio_series()
+    assert backfilled == len(series) >= 3
+    quantity = instance["executor"].positions["BTC-USD"].quantity
+    cash = instance["executor"].current_capital
+    assert series["total_value"][:3] == pytest.approx(
+        [cash + quantity * price for price in (110.0, 110.0, 90.0)]
+    )
+    # Skipped rather than valued at the current price
+    assert from_epoch_us(series["ts"][0], False) == start + timedelta(minutes=2)
+    assert instance["last_tick"] > datetime.now() - timedelta(minutes=1)
+
+
+def test_stopped_instances_drop_their_history_files(tmp_path):
+    agent, _ = _agent(str(tmp_path / "state.db"))
+    instances = {"inst-1": _instance("inst-1"), "inst-2": _instance("inst-2")}
+    for instance_id, instance in instances.items():
+        instance["history_dir"] = str(tmp_path / instance_id)
+        (tmp_path / instance_id).mkdir()
+    instances["inst-1"]["active"] = False
+    agent.trading_instances = {"session-1": instances}
+
+    agent._remove_history_dirs("session-1", ["inst-1", "inst-2"])
+
+    assert not (tmp_path / "inst-1").exists()
+    assert (tmp_path / "inst-2").exists()
+
+
+def test_overrun_ticks_only_get_snapshots(tmp_path, monkeypatch):
+    agent, _ = _agent(str(tmp_path / "state.db"))
+    instance = _instance("inst-1", price=100.0)
+    start = datetime(2025, 1, 1, 12, 0)
+    instance["last_tick"] = start
+    agent.trading_instances = {"session-1": {"inst-1": instance}}
+    monkeypatch.setattr(
+        TechnicalAnalyzer,
+        "get_bar_closes",
+        lambda symbol, since: [
+            (since + timedelta(minutes=m), 100.0 + m) for m in range(5)
+        ],
+    )
+    ticks = [start + timedelta(minutes=2), start + timedelta(minutes=3)]
+    trades = len(instance["executor"].get_trade_history())
+
+    assert asyncio.run(agent._backfill_missed_bars("session-1", ["inst-1"], ticks)) == 2
+
+    series = instance["executor"].get_portfolio_series()
+    assert [from_epoch_us(ts, False) for ts in series["ts"]] == ticks
+    assert len(instance["executor"].get_trade_history()) == trades
+    assert instance["last_tick"] == ticks[-1]
+
+
+@pytest.mark.parametrize("stop", [False, True])
+def test_interrupted_streams_leave_instances_running(tmp_path, monkeypatch, stop):
+    monkeypatch.setenv("TRADING_HISTORY_DIR", str(tmp_path / "history"))
+    monkeypatch.setattr(agent_module, "ensure_market_stream", lambda symbols: None)
+    agent, background = _agent(str(tmp_path / "state.db"))
+
+    async def parse_trading_request(query):
+        return TradingRequest(
+            crypto_symbols=["BTC-USD"], initial_capital=1000, agent_models=["test"]
+        )
+
+    async def monitor_instances(session_id, instance_ids, symbols):
+        if stop:
+            for instance_id in instance_ids:
+                agent.trading_instances[session_id][instance_id]["active"] = False
+            return
+        yield "tick"
+        await asyncio.Event().wait()
+
+    agent._parse_trading_request = parse_trading_request
+    agent._monitor_instances = monitor_instances
+
+    async def main():
+        stream = agent.stream("trade bitcoin", "session-1", "task-1")
+        async for response in stream:
+            if response == "tick":
+                # The client disconnects
+                await stream.aclose()
+        return await agent.trading_store.list_instances()
+
+    (stored,) = asyncio.run(main())
+    (instance,) = agent.trading_instances["session-1"].values()
+    if stop:
+        assert background == []
+        assert not instance["active"]
+    else:
+        # The instances keep running (and stay active in the store)
+        assert background == [("session-1", [instance["instance_id"]])]
+        assert instance["active"] and stored["active"]
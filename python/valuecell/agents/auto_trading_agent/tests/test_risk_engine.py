@@ -0,0 +1,135 @@
+"""Tests for the incremental exposure aggregates and pre-trade checks."""
+
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+from valuecell.agents.auto_trading_agent.models import (
+    AutoTradingConfig,
+    CashManagement,
+    Position,
+    TechnicalIndicators,
+    TradeAction,
+    TradeType,
+)
+from valuecell.agents.auto_trading_agent.risk_engine import RiskEngine, RiskLimits
+from valuecell.agents.auto_trading_agent.trading_executor import TradingExecutor
+
+BUY, SELL = TradeAction.BUY, TradeAction.SELL
+LONG, SHORT = TradeType.LONG, TradeType.SHORT
+BUCKETS = {"BTC-USD": "majors", "ETH-USD": "majors"}
+
+
+def _position(symbol, trade_type=LONG, notional=1_000.0):
+    return Position(
+        symbol=symbol,
+        entry_price=100.0,
+        quantity=notional / 100.0,
+        entry_time=datetime.now(timezone.utc),
+        trade_type=trade_type,
+        notional=notional,
+    )
+
+
+def test_aggregates_match_a_full_rescan():
+    rng = random.Random(3)
+    engine = RiskEngine(buckets=BUCKETS)
+    positions = {}
+    for _ in range(2_000):
+        symbol = rng.choice(["BTC-USD", "ETH-USD", "SOL-USD", "DOGE-USD"])
+        if symbol in positions and rng.random() < 0.6:
+            del positions[symbol]
+            engine.on_close(symbol)
+        else:
+            position = _position(
+                symbol, rng.choice([LONG, SHORT]), round(rng.uniform(10, 500), 2)
+            )
+            positions[symbol] = position
+            engine.on_open(position)
+
+    signed = {
+        s: p.notional if p.trade_type == LONG else -p.notional
+        for s, p in positions.items()
+    }
+    exposure = engine.get_exposure(10_000)
+    assert exposure["position_count"] == len(positions)
+    assert exposure["gross_exposure"] == pytest.approx(
+        sum(p.notional for p in positions.values())
+    )
+    assert exposure["net_exposure"] == pytest.approx(sum(signed.values()))
+    assert exposure["by_symbol"] == pytest.approx(signed)
+    assert exposure["short"]["count"] == sum(
+        p.trade_type == SHORT for p in positions.values()
+    )
+    majors = [p.notional for s, p in positions.items() if s in BUCKETS]
+    assert exposure["by_bucket"].get("majors", 0.0) == pytest.approx(sum(majors))
+
+    engine.rebuild([])
+    assert engine.get_exposure(10_000)["by_bucket"] == {}
+    assert engine.gross == 0.0
+
+
+def test_batch_check_applies_limits_in_execution_order():
+    engine = RiskEngine(
+        RiskLimits(max_positions=3, max_bucket_exposure=0.3), buckets=BUCKETS
+    )
+    engine.on_open(_position("BTC-USD", notional=2_000.0))
+    engine.on_open(_position("SOL-USD", SHORT, notional=1_000.0))
+
+    reasons = engine.check_trades(
+        [
+            ("ETH-USD", BUY, LONG, 1_500.0),  # majors bucket: 3500 > 3000
+            ("DOT-USD", SELL, LONG, 0.0),  # not held
+            ("SOL-USD", SELL, SHORT, 0.0),  # frees a slot
+            ("ADA-USD", BUY, LONG, 6_000.0),  # above the 50% symbol limit
+            ("ADA-USD", BUY, LONG, 500.0),  # duplicate of the above
+            ("DOGE-USD", BUY, SHORT, 500.0),
+            ("AVAX-USD", BUY, LONG, 500.0),  # 4th position
+        ],
+        total_cash=10_000,
+    )
+
+    assert reasons[0].startswith("correlation bucket exposure")
+    assert reasons[1] == "no matching position to close"
+    assert reasons[2] is None
+    assert reasons[3].startswith("symbol exposure")
+    assert reasons[4] == "duplicate trade for the symbol"
+    assert reasons[5] is None
+    assert reasons[6] == "max positions reached (3)"
+    # Checks do not change the aggregates
+    assert engine.position_count == 2
+
+
+def test_executor_keeps_the_aggregates_in_sync():
+    config = AutoTradingConfig(
+        initial_capital=10_000,
+        crypto_symbols=["BTC-USD"],
+        agent_model="test",
+        risk_per_trade=0.6,
+        max_positions=2,
+    )
+    executor = TradingExecutor(config)
+    indicators = TechnicalIndicators(
+        symbol="BTC-USD",
+        timestamp=datetime.now(timezone.utc),
+        close_price=100.0,
+        volume=1.0,
+    )
+
+    # 60% of the cash is above the 50% single-symbol limit
+    assert executor.execute_trade("BTC-USD", BUY, LONG, indicators) is None
+    assert executor.check_trades([("BTC-USD", BUY, LONG)])[0].startswith("symbol")
+
+    executor.restore_state(
+        CashManagement(
+            total_cash=10_000,
+            initial_cash=10_000,
+            available_cash=9_000,
+            cash_in_trades=1_000,
+        ),
+        {"BTC-USD": _position("BTC-USD")},
+    )
+    assert executor.get_exposure()["gross_exposure_ratio"] == pytest.approx(0.1)
+    assert executor.execute_trade("BTC-USD", SELL, LONG, indicators) is not None
+    assert executor.get_exposure()["position_count"] == 0
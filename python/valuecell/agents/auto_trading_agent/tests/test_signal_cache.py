@@ -0,0 +1,98 @@
+"""Tests for the AI signal decision cache."""
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from valuecell.agents.auto_trading_agent.models import (
+    TechnicalIndicators,
+    TradeAction,
+)
+from valuecell.agents.auto_trading_agent.signal_cache import signal_cache_key
+from valuecell.agents.auto_trading_agent.technical_analysis import AISignalGenerator
+
+
+def _indicators(close=100.0, rsi=50.0, macd=0.1):
+    return TechnicalIndicators(
+        symbol="BTC-USD",
+        timestamp=datetime.now(timezone.utc),
+        close_price=close,
+        volume=1.0,
+        macd=macd,
+        macd_signal=0.05,
+        macd_histogram=macd - 0.05,
+        rsi=rsi,
+        ema_12=100.0,
+        ema_26=99.0,
+        ema_50=98.0,
+        bb_upper=102.0,
+        bb_middle=100.0,
+        bb_lower=98.0,
+    )
+
+
+class _FakeAgent:
+    def __init__(self, content='{"action": "BUY", "type": "LONG", "reasoning": "up"}'):
+        self.content = content
+        self.calls = 0
+
+    async def arun(self, prompt):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(content=self.content)
+
+
+def _generator(agent, cache_ttl=300):
+    generator = AISignalGenerator(llm_client=object(), cache_ttl=cache_ttl)
+    generator._agent = agent
+    return generator
+
+
+def test_near_identical_states_share_a_key():
+    base = signal_cache_key(_indicators())
+
+    assert signal_cache_key(_indicators(close=99.99, rsi=50.4, macd=0.101)) == base
+    assert signal_cache_key(_indicators(rsi=56.0)) != base
+    assert signal_cache_key(_indicators(close=101.0)) != base
+    assert signal_cache_key(_indicators(), {"trade_type": "long"}) != base
+
+
+def test_signals_are_reused_within_the_freshness_window():
+    agent = _FakeAgent()
+    generator = _generator(agent)
+
+    async def main():
+        first = await generator.get_signal(_indicators())
+        # Concurrent identical requests share one call; the flat market reuses it
+        rest = await asyncio.gather(
+            *(generator.get_signal(_indicators(rsi=50.2)) for _ in range(3))
+        )
+        moved = await generator.get_signal(_indicators(rsi=70.0))
+        return first, rest, moved
+
+    first, rest, moved = asyncio.run(main())
+
+    assert first[0] == TradeAction.BUY
+    assert all(signal == first for signal in rest)
+    assert moved is not None
+    assert agent.calls == 2
+    stats = generator.get_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["llm_calls"]) == (3, 2, 2)
+    assert stats["hit_rate"] == 0.6
+
+
+def test_failures_are_not_cached_and_cache_can_be_disabled():
+    agent = _FakeAgent(content="not json")
+    generator = _generator(agent)
+
+    async def twice(gen):
+        return [await gen.get_signal(_indicators()) for _ in range(2)]
+
+    assert asyncio.run(twice(generator)) == [None, None]
+    assert agent.calls == 2
+
+    agent = _FakeAgent()
+    uncached = _generator(agent, cache_ttl=0)
+    asyncio.run(twice(uncached))
+    assert agent.calls == 2
+    assert uncached.get_cache_stats() is None
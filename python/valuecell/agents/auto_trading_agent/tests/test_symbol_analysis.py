@@ -0,0 +1,128 @@
+"""Tests for concurrent per-symbol analysis."""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from valuecell.agents.auto_trading_agent import agent as agent_module
+from valuecell.agents.auto_trading_agent.agent import AutoTradingAgent
+from valuecell.agents.auto_trading_agent.mark_price import MarkPriceOracle
+from valuecell.agents.auto_trading_agent.market_snapshot import (
+    MarketSnapshotService,
+)
+from valuecell.agents.auto_trading_agent.models import (
+    TechnicalIndicators,
+    TradeAction,
+    TradeType,
+)
+
+
+def _indicators(symbol: str) -> TechnicalIndicators:
+    return TechnicalIndicators(
+        symbol=symbol,
+        timestamp=datetime.now(timezone.utc),
+        close_price=100.0,
+        volume=1.0,
+        macd=1.0,
+        macd_signal=0.5,
+        rsi=50.0,
+    )
+
+
+class _FakeAISignalGenerator:
+    llm_client = object()
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def get_signal(self, indicators, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.05)
+        self.active -= 1
+        return (TradeAction.BUY, TradeType.LONG, "test", 80.0, None)
+
+
+def test_symbols_are_analyzed_concurrently():
+    def slow_indicators(symbol, period="5d", interval="1m"):
+        time.sleep(0.2)  # blocking I/O
+        return _indicators(symbol)
+
+    trading_agent = AutoTradingAgent.__new__(AutoTradingAgent)
+    trading_agent._llm_semaphores = {}
+    trading_agent.market_snapshots = MarketSnapshotService(slow_indicators)
+    trading_agent.mark_prices = MarkPriceOracle(fetch_price=lambda symbol: None)
+    generator = _FakeAISignalGenerator()
+
+    async def run():
+        semaphore = trading_agent._get_llm_semaphore("model-a")
+        assert semaphore is trading_agent._get_llm_semaphore("model-a")
+        return await asyncio.gather(
+            *(
+                trading_agent._analyze_symbol(f"S{i}-USD", generator, semaphore)
+                for i in range(8)
+            )
+        )
+
+    started = time.monotonic()
+    results = asyncio.run(run())
+    elapsed = time.monotonic() - started
+
+    assert len(results) == 8
+    assert all(analysis.ai_action == TradeAction.BUY for analysis, _ in results)
+    # Eight 0.2 s blocking fetches would take 1.6 s sequentially
+    assert elapsed < 1.0
+    assert generator.peak <= agent_module.MAX_CONCURRENT_LLM_CALLS_PER_MODEL
+
+
+def test_instances_share_one_snapshot_per_tick():
+    calls = []
+
+    def indicators(symbol):
+        calls.append(symbol)
+        time.sleep(0.05)
+        return _indicators(symbol)
+
+    service = MarketSnapshotService(indicators, max_ticks=2)
+    tick = datetime(2024, 1, 1, 12, 0)
+
+    async def run():
+        # Three model instances analyzing two symbols on the same tick
+        return await asyncio.gather(
+            *(
+                service.get_indicators(symbol, tick)
+                for _ in range(3)
+                for symbol in ("BTC-USD", "ETH-USD")
+            )
+        )
+
+    results = asyncio.run(run())
+
+    assert sorted(calls) == ["BTC-USD", "ETH-USD"]
+    assert results[0] is results[2] is results[4]
+    assert service.get_stats() == {"ticks": 1, "fetches": 2, "shared": 4}
+
+
+def test_failed_snapshot_is_retried():
+    attempts = []
+
+    def flaky(symbol):
+        attempts.append(symbol)
+        if len(attempts) == 1:
+            raise ConnectionError("exchange unavailable")
+        return _indicators(symbol)
+
+    service = MarketSnapshotService(flaky)
+    tick = datetime(2024, 1, 1, 12, 0)
+
+    async def run():
+        try:
+            await service.get_indicators("BTC-USD", tick)
+        except ConnectionError:
+            pass
+        await asyncio.sleep(0)
+        return await service.get_indicators("BTC-USD", tick)
+
+    assert asyncio.run(run()).symbol == "BTC-USD"
+    assert len(attempts) == 2
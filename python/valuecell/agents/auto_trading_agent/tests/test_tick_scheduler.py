@@ -0,0 +1,98 @@
+"""Tests for the wall-clock aligned tick scheduler."""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from valuecell.agents.auto_trading_agent.tick_scheduler import (
+    CATCH_UP,
+    TickScheduler,
+    session_jitter,
+)
+
+# 2025-01-01 00:00:00 UTC
+BASE = 1_735_689_600.0
+
+
+class _Clock:
+    def __init__(self, now):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _scheduler(clock, **kwargs):
+    kwargs.setdefault("offset", 1.0)
+    return TickScheduler(60, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def _ticks(scheduler, count, check_seconds, clock):
+    async def main():
+        ticks = []
+        for _ in range(count):
+            ticks.append((await scheduler.wait()).timestamp() - BASE)
+            clock.now += check_seconds
+        return ticks
+
+    return asyncio.run(main())
+
+
+def test_ticks_stay_on_bar_boundaries_despite_slow_checks():
+    clock = _Clock(BASE + 12.3)
+    scheduler = _scheduler(clock, jitter=2.0)
+
+    assert _ticks(scheduler, 4, 25.0, clock) == [60, 120, 180, 240]
+    # Every tick fired one second plus the jitter after its bar closed
+    assert clock.sleeps[0] == pytest.approx(60 + 3 - 12.3)
+    assert clock.sleeps[1:] == pytest.approx([35.0] * 3)
+    assert scheduler.get_stats()["max_lag"] == 0.0
+
+
+def test_overruns_skip_to_the_latest_closed_bar():
+    clock = _Clock(BASE + 30)
+    scheduler = _scheduler(clock)
+
+    assert _ticks(scheduler, 3, 150.0, clock) == [60, 180, 360]
+    stats = scheduler.get_stats()
+    assert stats["skipped"] == 3
+    assert stats["max_lag"] == pytest.approx(30.0)
+
+
+def test_overruns_hand_missed_ticks_over_for_bookkeeping():
+    clock = _Clock(BASE + 30)
+    scheduler = _scheduler(clock, policy=CATCH_UP, max_catch_up=2)
+
+    # A 250s check misses three ticks before the latest closed bar, which is
+    # checked right away; the two most recent missed ticks are handed over
+    assert _ticks(scheduler, 1, 250.0, clock) == [60]
+    assert _ticks(scheduler, 1, 1.0, clock) == [300]
+    assert [t.timestamp() - BASE for t in scheduler.missed_ticks] == [180, 240]
+    assert _ticks(scheduler, 1, 1.0, clock) == [360]
+    assert scheduler.missed_ticks == []
+    stats = scheduler.get_stats()
+    assert (stats["skipped"], stats["caught_up"]) == (1, 2)
+
+
+def test_session_jitter_is_stable_and_bounded():
+    jitters = [session_jitter(f"session-{i}", 5.0) for i in range(100)]
+
+    assert jitters[0] == session_jitter("session-0", 5.0)
+    assert all(0 <= j < 5.0 for j in jitters)
+    assert len(set(jitters)) > 90
+    assert session_jitter("session-0", 0) == 0.0
+    with pytest.raises(ValueError):
+        TickScheduler(60, policy="later")
+
+
+def test_ticks_are_local_datetimes():
+    clock = _Clock(BASE)
+    tick = asyncio.run(_scheduler(clock).wait())
+
+    assert tick == datetime.fromtimestamp(BASE)
@@ -0,0 +1,129 @@
+"""Tests for the append-only time-series store and position history."""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from valuecell.agents.auto_trading_agent.mark_price import MarkPriceOracle
+from valuecell.agents.auto_trading_agent.models import (
+    AutoTradingConfig,
+    Position,
+    TradeType,
+)
+from valuecell.agents.auto_trading_agent.position_manager import (
+    PORTFOLIO_HISTORY_DTYPE,
+    PositionManager,
+)
+from valuecell.agents.auto_trading_agent.timeseries import (
+    TimeSeriesStore,
+    from_epoch_us,
+    to_epoch_us,
+)
+
+DTYPE = np.dtype([("ts", "<i8"), ("value", "<f8")])
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _fill(store: TimeSeriesStore, count: int) -> None:
+    for i in range(count):
+        store.append((to_epoch_us(START + timedelta(minutes=i)), float(i)))
+
+
+def test_epoch_round_trip_keeps_naive_and_aware_times():
+    aware = datetime(2025, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+    naive = datetime(2025, 3, 1, 12, 30, 15, 654321)
+    assert from_epoch_us(to_epoch_us(aware)) == aware
+    assert from_epoch_us(to_epoch_us(naive), tz_aware=False) == naive
+
+
+def test_reads_are_views_of_the_buffer():
+    store = TimeSeriesStore(DTYPE, grow_rows=16)
+    _fill(store, 100)
+
+    rows = store.rows
+    assert len(rows) == 100
+    assert np.shares_memory(store.tail(10), rows)
+
+    window = store.window(START + timedelta(minutes=10), START + timedelta(minutes=19))
+    assert window["value"].tolist() == [float(i) for i in range(10, 20)]
+    assert np.shares_memory(window, rows)
+
+    sampled = store.downsample(10)
+    assert len(sampled) <= 10
+    assert sampled["value"][-1] == 99.0
+    assert np.shares_memory(sampled, rows)
+
+
+def test_in_memory_store_stays_bounded():
+    store = TimeSeriesStore(DTYPE, grow_rows=64, max_memory_rows=1000)
+    _fill(store, 10_000)
+
+    assert len(store) <= 1000
+    assert store.dropped == 10_000 - len(store)
+    assert store.rows["value"][-1] == 9999.0
+
+
+def test_values_longer_than_their_field_are_rejected():
+    store = TimeSeriesStore(np.dtype([("ts", "<i8"), ("symbol", "S4")]))
+    store.append((0, b"BTC"))
+
+    with pytest.raises(ValueError):
+        store.append((1, b"BTCUSD"))
+    assert store.rows["symbol"].tolist() == [b"BTC"]
+    with pytest.raises(ValueError):
+        AutoTradingConfig(initial_capital=1000, crypto_symbols=["X" * 33 + "-USD"])
+
+
+def test_file_store_recovers_rows_after_reopen(tmp_path):
+    path = str(tmp_path / "series.ts")
+    store = TimeSeriesStore(DTYPE, path, grow_rows=16)
+    _fill(store, 50)
+    view = store.tail(5)
+    _fill(store, 10)  # grows the mapping; earlier views stay valid
+    assert view["value"].tolist() == [45.0, 46.0, 47.0, 48.0, 49.0]
+    store.close()
+
+    reopened = TimeSeriesStore(DTYPE, path, grow_rows=16)
+    assert len(reopened) == 60
+    assert reopened.rows["value"][-1] == 9.0
+
+    with pytest.raises(ValueError):
+        TimeSeriesStore(PORTFOLIO_HISTORY_DTYPE, path)
+
+
+def test_position_manager_history_survives_restart(tmp_path):
+    oracle = MarkPriceOracle(fetch_price=lambda symbol: None)
+    oracle.update("BTC-USD", 110.0)
+    manager = PositionManager(10_000, oracle, history_dir=str(tmp_path))
+    manager.open_position(
+        "BTC-USD",
+        Position(
+            symbol="BTC-USD",
+            entry_price=100.0,
+            quantity=10.0,
+            entry_time=START,
+            trade_type=TradeType.LONG,
+            notional=1_000.0,
+        ),
+    )
+    for i in range(3):
+        timestamp = datetime.now() + timedelta(minutes=i)
+        manager.snapshot_positions(timestamp)
+        manager.snapshot_portfolio(timestamp)
+    manager.flush_history()
+
+    restarted = PositionManager(10_000, oracle, history_dir=str(tmp_path))
+    history = restarted.get_portfolio_history()
+    assert len(history) == 3
+    assert history[-1].positions_value == pytest.approx(1_100.0)
+    assert history[-1].timestamp.tzinfo is None
+    assert len(restarted.get_portfolio_history(limit=2)) == 2
+
+    positions = restarted.get_position_history()
+    assert [p.symbol for p in positions] == ["BTC-USD"] * 3
+    assert positions[0].current_price == 110.0
+    assert positions[0].trade_type == "long"
+
+    series = restarted.get_portfolio_series(max_points=2)
+    assert series["total_value"][-1] == pytest.approx(history[-1].total_value)
@@ -0,0 +1,143 @@
+"""Tests for the incremental trade recorder statistics."""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from valuecell.agents.auto_trading_agent.models import TradeHistoryRecord
+from valuecell.agents.auto_trading_agent.trade_recorder import TradeRecorder
+
+START = datetime(2025, 1, 1)
+
+
+def _trade(minute, symbol, action, trade_type="long", pnl=None):
+    return TradeHistoryRecord(
+        timestamp=START + timedelta(minutes=minute),
+        symbol=symbol,
+        action=action,
+        trade_type=trade_type,
+        price=100.0,
+        quantity=1.0,
+        notional=100.0,
+        pnl=pnl,
+        portfolio_value_after=10_000.0,
+        cash_after=10_000.0,
+    )
+
+
+def _history(count=400, seed=5):
+    rng = random.Random(seed)
+    trades = []
+    for i in range(count):
+        symbol = rng.choice(["BTC-USD", "ETH-USD", "SOL-USD"])
+        closed = i % 2 == 1
+        trades.append(
+            _trade(
+                i * 17,
+                symbol,
+                "closed" if closed else "opened",
+                rng.choice(["long", "short"]),
+                round(rng.uniform(-50, 50), 2) if closed else None,
+            )
+        )
+    return trades
+
+
+def test_statistics_match_a_full_rescan():
+    trades = _history()
+    recorder = TradeRecorder()
+    for trade in trades:
+        recorder.record_trade(trade)
+
+    closed = [t.pnl for t in trades if t.pnl is not None]
+    wins = [p for p in closed if p > 0]
+    losses = [p for p in closed if p < 0]
+    stats = recorder.get_trade_statistics()
+    assert stats["total_trades"] == len(closed)
+    assert stats["win_rate"] == pytest.approx(len(wins) / len(closed) * 100)
+    assert stats["total_pnl"] == pytest.approx(sum(closed))
+    assert stats["average_loss"] == pytest.approx(sum(losses) / len(losses))
+    assert (stats["largest_win"], stats["largest_loss"]) == (max(wins), min(losses))
+    assert stats["profit_factor"] == pytest.approx(sum(wins) / abs(sum(losses)))
+
+    eth = [t.pnl for t in trades if t.symbol == "ETH-USD" and t.pnl is not None]
+    eth_stats = recorder.get_symbol_statistics("ETH-USD")
+    assert eth_stats["total_trades"] == len(eth)
+    assert eth_stats["average_pnl_per_trade"] == pytest.approx(sum(eth) / len(eth))
+    assert recorder.get_symbol_statistics("DOGE-USD") == {
+        "symbol": "DOGE-USD",
+        "trades": 0,
+    }
+
+    daily = recorder.get_daily_statistics()
+    assert sum(day["trades"] for day in daily.values()) == len(trades)
+    day = trades[0].timestamp.strftime("%Y-%m-%d")
+    assert daily[day]["pnl"] == pytest.approx(
+        sum(
+            t.pnl
+            for t in trades
+            if t.pnl is not None and t.timestamp.strftime("%Y-%m-%d") == day
+        )
+    )
+
+    shorts = [t.pnl for t in trades if t.trade_type == "short" and t.pnl is not None]
+    breakdown = recorder.get_trade_breakdown_by_type()
+    assert breakdown["SHORT"]["trades"] == len(shorts)
+    assert breakdown["SHORT"]["total_pnl"] == pytest.approx(sum(shorts))
+    assert recorder.get_trades_by_symbol("ETH-USD") == [
+        t for t in trades if t.symbol == "ETH-USD"
+    ]
+
+    recorder.reset()
+    assert recorder.get_trade_statistics()["total_trades"] == 0
+    assert recorder.get_daily_statistics() == {}
+
+
+def test_holding_times_match_closes_with_the_oldest_open_lot():
+    recorder = TradeRecorder()
+    for trade in [
+        _trade(0, "BTC-USD", "opened"),
+        _trade(5, "ETH-USD", "opened"),
+        _trade(10, "BTC-USD", "opened"),
+        _trade(30, "BTC-USD", "closed", pnl=1.0),
+        _trade(35, "ETH-USD", "closed", pnl=-1.0),
+        _trade(40, "SOL-USD", "closed", pnl=2.0),
+    ]:
+        recorder.record_trade(trade)
+
+    stats = recorder.get_holding_time_statistics()
+    assert stats["total_positions"] == 2
+    assert stats["min_holding_time"] == timedelta(minutes=30)
+    assert stats["max_holding_time"] == timedelta(minutes=30)
+
+
+def test_million_trades_statistics_reads_are_constant_time():
+    # 1000 distinct records, recorded over and over
+    templates = [
+        _trade(
+            i,
+            f"S{i // 2 % 20}",
+            "closed" if i % 2 else "opened",
+            pnl=float(i % 7 - 3) if i % 2 else None,
+        )
+        for i in range(1000)
+    ]
+
+    recorder = TradeRecorder()
+    for i in range(1_000_000):
+        recorder.record_trade(templates[i % 1000])
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        stats = recorder.get_trade_statistics()
+        recorder.get_symbol_statistics("S1")
+        recorder.get_daily_statistics()
+        recorder.get_trade_breakdown_by_type()
+        holding = recorder.get_holding_time_statistics()
+    elapsed = time.perf_counter() - started
+
+    assert stats["total_trades"] == 500_000
+    assert holding["total_positions"] == 500_000
+    assert elapsed < 0.5
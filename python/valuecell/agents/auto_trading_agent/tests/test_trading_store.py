@@ -0,0 +1,141 @@
+"""Tests for the SQLite trading state store."""
+
+import asyncio
+import sqlite3
+
+from valuecell.agents.auto_trading_agent.trading_store import (
+    InstanceUpdate,
+    TradingStateStore,
+)
+
+
+def _trade(symbol, action, pnl=None):
+    return {
+        "timestamp": "2025-01-01T00:00:00",
+        "symbol": symbol,
+        "action": action,
+        "trade_type": "long",
+        "price": 100.0,
+        "quantity": 1.0,
+        "notional": 100.0,
+        "pnl": pnl,
+    }
+
+
+def _update(check, **kwargs):
+    defaults = dict(
+        instance_id="inst-1",
+        session_id="session-1",
+        agent_model="model-a",
+        config={"agent_model": "model-a", "crypto_symbols": ["BTC-USD"]},
+        created_at="2025-01-01T00:00:00",
+        active=True,
+        initial_capital=1000.0,
+        total_value=1000.0 + check,
+        positions_value=0.0,
+        total_pnl=float(check),
+        available_cash=1000.0,
+        check_count=check,
+        updated_at=f"2025-01-01T00:0{check}:00",
+        portfolio_rows=[
+            (check, f"2025-01-01T00:0{check}:00", 1000.0 + check, 1000.0, 0, check, 0)
+        ],
+        decisions=[{"check_number": check, "timestamp": None, "actions": []}],
+    )
+    defaults.update(kwargs)
+    return InstanceUpdate(**defaults)
+
+
+def test_updates_are_appended_incrementally(tmp_path):
+    db_path = str(tmp_path / "state.db")
+    store = TradingStateStore(db_path)
+
+    async def main():
+        await store.save_updates(
+            [
+                _update(
+                    1,
+                    trades=[(0, _trade("BTC-USD", "opened"))],
+                    positions=[{"symbol": "BTC-USD"}, {"symbol": "ETH-USD"}],
+                )
+            ]
+        )
+        await store.save_updates(
+            [
+                _update(
+                    2,
+                    trades=[
+                        (1, _trade("BTC-USD", "closed", 5.0)),
+                        (2, _trade("ETH-USD", "closed", -1.0)),
+                    ],
+                    positions=[{"symbol": "ETH-USD"}],
+                )
+            ]
+        )
+        return (
+            await store.list_instances(),
+            await store.get_portfolio_history("inst-1", limit=1),
+            await store.get_trades("inst-1", action="closed"),
+            await store.get_positions("inst-1"),
+            await store.get_decisions("inst-1"),
+            await store.get_decision("inst-1", 1),
+            await store.get_instance("missing"),
+        )
+
+    instances, history, closed, positions, decisions, first, missing = asyncio.run(
+        main()
+    )
+
+    (instance,) = instances
+    assert instance["config"]["crypto_symbols"] == ["BTC-USD"]
+    assert instance["total_value"] == 1002.0
+    assert instance["check_count"] == 2
+    assert instance["trade_count"] == 3
+    assert instance["closed_trade_count"] == 2
+    assert instance["winning_trade_count"] == 1
+
+    assert [row["total_value"] for row in history] == [1002.0]
+    assert [t["pnl"] for t in closed] == [5.0, -1.0]
+    assert positions == [{"symbol": "ETH-USD"}]
+    assert [d["check_number"] for d in decisions] == [2, 1]
+    assert first["check_number"] == 1
+    assert missing is None
+
+    with sqlite3.connect(db_path) as db:
+        assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_checkpoints_resume_active_instances_only(tmp_path):
+    store = TradingStateStore(str(tmp_path / "state.db"))
+    state = {"cash": {"total_cash": 1000.0}, "positions": []}
+
+    async def main():
+        await store.save_updates(
+            [
+                _update(
+                    1,
+                    trades=[(0, _trade("BTC-USD", "opened"))],
+                    checkpoint_state=state,
+                    checkpoint_cursor={"trades": 1, "last_tick": "a"},
+                ),
+                _update(
+                    1,
+                    instance_id="inst-2",
+                    active=False,
+                    checkpoint_state=state,
+                    checkpoint_cursor={"trades": 0},
+                ),
+            ]
+        )
+        # An unchanged state is not sent again; the cursor always is
+        await store.save_updates(
+            [_update(2, checkpoint_cursor={"trades": 1, "last_tick": "b"})]
+        )
+        return await store.load_checkpoints()
+
+    (checkpoint,) = asyncio.run(main())
+    assert checkpoint["instance_id"] == "inst-1"
+    assert checkpoint["check_count"] == 2
+    assert checkpoint["state"] == state
+    assert checkpoint["cursor"] == {"trades": 1, "last_tick": "b"}
+    assert [t["symbol"] for t in checkpoint["trades"]] == ["BTC-USD"]
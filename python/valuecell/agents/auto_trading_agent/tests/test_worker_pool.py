@@ -0,0 +1,180 @@
+"""Tests for trading instances hosted in worker processes."""
+
+import asyncio
+import os
+import signal
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from valuecell.agents.auto_trading_agent.models import (
+    AutoTradingConfig,
+    CashManagement,
+    TechnicalIndicators,
+)
+from valuecell.agents.auto_trading_agent.shared_market import SharedMarketBoard
+from valuecell.agents.auto_trading_agent.trading_executor import TradingExecutor
+from valuecell.agents.auto_trading_agent.worker_pool import (
+    InstanceSync,
+    TradingWorkerPool,
+    apply_sync,
+)
+
+TICK = datetime(2025, 1, 1, 12, 0)
+
+
+def _indicators(close=100.0, rsi=50.0):
+    return TechnicalIndicators(
+        symbol="BTC-USD",
+        timestamp=datetime(2025, 1, 1, 11, 59, tzinfo=timezone.utc),
+        close_price=close,
+        volume=12.5,
+        rsi=rsi,
+        ema_12=100.0,
+        historical_prices=[float(p) for p in range(50)],
+        historical_volumes=None,
+    )
+
+
+def test_board_round_trip():
+    board = SharedMarketBoard(4)
+    try:
+        board.publish("BTC-USD", TICK, _indicators())
+        board.publish("ETH-USD", TICK, None)
+
+        reader = SharedMarketBoard(4, name=board.name)
+        read = reader.read("BTC-USD", TICK)
+        assert read == _indicators()
+        assert read.macd is None
+        assert reader.read("ETH-USD", TICK) is None
+        assert reader.read("BTC-USD", TICK + timedelta(minutes=1)) is None
+        assert reader.read("SOL-USD", TICK) is None
+
+        # A later tick replaces the symbol's record in place
+        board.publish("BTC-USD", TICK + timedelta(minutes=1), _indicators(rsi=70.0))
+        assert reader.read("BTC-USD", TICK + timedelta(minutes=1)).rsi == 70.0
+        reader.close()
+    finally:
+        board.close()
+
+
+def test_board_reuses_the_oldest_slot_when_full():
+    board = SharedMarketBoard(2)
+    reader = SharedMarketBoard(2, name=board.name)
+    try:
+        board.publish("BTC-USD", TICK, _indicators())
+        board.publish("ETH-USD", TICK + timedelta(minutes=1), _indicators())
+        assert reader.read("BTC-USD", TICK) is not None
+
+        board.publish("SOL-USD", TICK + timedelta(minutes=2), _indicators(rsi=70.0))
+
+        assert reader.read("BTC-USD", TICK) is None
+        assert reader.read("SOL-USD", TICK + timedelta(minutes=2)).rsi == 70.0
+        assert reader.read("ETH-USD", TICK + timedelta(minutes=1)) is not None
+    finally:
+        reader.close()
+        board.close()
+
+
+def test_board_readers_skip_records_being_written():
+    board = SharedMarketBoard(1)
+    try:
+        board.publish("BTC-USD", TICK, _indicators())
+        record = board._records[0]
+        record["sequence"] += 1  # a write in progress
+
+        assert board.read("BTC-USD", TICK) is None
+
+        record["sequence"] += 1
+        assert board.read("BTC-USD", TICK) == _indicators()
+    finally:
+        board.close()
+
+
+def _mirror(tmp_path, instance_id="inst-1"):
+    config = AutoTradingConfig(
+        initial_capital=10_000,
+        crypto_symbols=["BTC-USD"],
+        agent_model="test",
+        use_ai_signals=False,
+    )
+    return {
+        "instance_id": instance_id,
+        "config": config,
+        "executor": TradingExecutor(config),
+        "ai_signal_generator": None,
+        "active": True,
+        "created_at": TICK,
+        "check_count": 0,
+        "last_check": None,
+        "decision_history": [],
+        "history_dir": str(tmp_path / instance_id),
+    }
+
+
+def _pool(mirrors, notifications):
+    def on_sync(session_id, instance_id, sync: InstanceSync):
+        apply_sync(mirrors[instance_id], sync)
+        notifications.extend(sync.notifications)
+
+    return TradingWorkerPool(1, on_sync, max_restarts=1)
+
+
+def test_instances_run_in_a_worker(tmp_path):
+    mirror = _mirror(tmp_path)
+    notifications = []
+    pool = _pool({"inst-1": mirror}, notifications)
+
+    async def main():
+        await pool.add_instance("session", "inst-1", mirror, TICK)
+        pool.publish("BTC-USD", TICK, _indicators())
+        await pool.check("session", "inst-1", TICK)
+
+    try:
+        asyncio.run(main())
+    finally:
+        pool.shutdown()
+
+    executor = mirror["executor"]
+    assert len(mirror["decision_history"]) == 1
+    assert mirror["check_count"] == mirror["decision_history"][0]["check_number"]
+    assert executor.get_history_counts()[1] == 2
+    assert executor.get_portfolio_value() == pytest.approx(10_000)
+    assert notifications
+    # The worker kept the instance's history files
+    assert os.listdir(tmp_path / "inst-1")
+    assert pool.get_stats()["instances"] == [1]
+
+
+def test_crashed_worker_is_restored_from_the_mirror(tmp_path):
+    mirror = _mirror(tmp_path)
+    pool = _pool({"inst-1": mirror}, [])
+
+    async def main():
+        await pool.add_instance("session", "inst-1", mirror, TICK)
+        executor = mirror["executor"]
+        _, positions = executor.get_state()
+        executor.restore_state(
+            CashManagement(total_cash=7_500, initial_cash=10_000, available_cash=7_500),
+            positions,
+        )
+
+        crashed = pool._workers[0]
+        os.kill(crashed.process.pid, signal.SIGKILL)
+        for _ in range(600):
+            worker = pool._workers[0]
+            if worker is not crashed and worker.ready.is_set():
+                break
+            await asyncio.sleep(0.05)
+
+        pool.publish("BTC-USD", TICK, None)
+        await pool.check("session", "inst-1", TICK)
+
+    try:
+        asyncio.run(main())
+    finally:
+        pool.shutdown()
+
+    assert pool.restarts == [1]
+    assert mirror["check_count"] > 0
+    assert mirror["executor"].get_state()[0].total_cash == 7_500
@@ -0,0 +1,155 @@
+"""Wall-clock aligned monitoring ticks.
+
+Sleeping a fixed interval after each check makes the real period the check
+duration plus the interval, so checks drift further behind the market the
+slower they get. ``TickScheduler`` instead fires on bar boundaries: a tick is
+the close time of a bar (a multiple of the interval since the epoch), and it
+fires a small offset after that close so the bar is final when indicators are
+computed.
+
+Every session checks the same ticks, so per-tick market snapshots are shared
+between them; a per-session jitter only spreads out when each session fires,
+to smooth the load on upstream market data providers.
+
+When a check overruns into the next bar, both policies run the latest closed
+tick right away. ``skip`` drops the missed ticks, while ``catch_up`` hands the
+most recent of them (at most ``max_catch_up``) over in ``missed_ticks`` for
+bookkeeping only: their bars are over, so checking and trading on them would
+act on today's market data under an old timestamp.
+"""
+
+import asyncio
+import logging
+import math
+import time
+import zlib
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .constants import TICK_CLOSE_OFFSET, TICK_MAX_CATCH_UP
+
+logger = logging.getLogger(__name__)
+
+SKIP = "skip"
+CATCH_UP = "catch_up"
+
+
+def session_jitter(key: str, max_jitter: float) -> float:
+    """
+    Stable jitter of a session, in [0, max_jitter) seconds.
+
+    Args:
+        key: Session identifier
+        max_jitter: Upper bound of the jitter in seconds
+    """
+    if max_jitter <= 0:
+        return 0.0
+    return zlib.crc32(key.encode()) / 2**32 * max_jitter
+
+
+class TickScheduler:
+    """Schedule monitoring ticks on wall-clock bar boundaries."""
+
+    def __init__(
+        self,
+        interval: float,
+        offset: float = TICK_CLOSE_OFFSET,
+        jitter: float = 0.0,
+        policy: str = SKIP,
+        max_catch_up: int = TICK_MAX_CATCH_UP,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            interval: Bar length in seconds
+            offset: Seconds after a bar closes before its tick fires
+            jitter: Extra delay of this scheduler's ticks in seconds
+            policy: "skip" or "catch_up" when a check overruns the next tick
+            max_catch_up: Missed ticks kept for bookkeeping at most with "catch_up"
+            clock: Current epoch time in seconds
+            sleep: Coroutine function sleeping for a number of seconds
+        """
+        if interval <= 0:
+            raise ValueError("Tick interval must be positive")
+        if policy not in (SKIP, CATCH_UP):
+            raise ValueError(f"Unknown tick overrun policy: {policy}")
+        self.interval = interval
+        self.delay = offset + jitter
+        self.policy = policy
+        self.max_catch_up = max_catch_up
+        self._clock = clock
+        self._sleep = sleep
+
+        # Epoch seconds of the last tick returned
+        self._last: Optional[float] = None
+        # Missed ticks before the last tick returned, oldest first (catch_up)
+        self.missed_ticks: List[datetime] = []
+        self.ticks = 0
+        self.skipped = 0
+        self.caught_up = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._total_lag = 0.0
+
+    def _bar_close(self, now: float) -> float:
+        """Close time of the latest bar that closed at or before ``now``"""
+        return math.floor(now / self.interval) * self.interval
+
+    async def wait(self) -> datetime:
+        """
+        Wait for the next tick.
+
+        Returns:
+            The tick: close time of the bar to check (local naive datetime)
+        """
+        now = self._clock()
+        latest = self._bar_close(now - self.delay)
+        self.missed_ticks = []
+        if self._last is None or latest <= self._last:
+            # Nothing due yet: wait for the next bar to close
+            tick = latest + self.interval
+        else:
+            tick = latest
+            missed = round((latest - self._last) / self.interval) - 1
+            if self.policy == CATCH_UP and missed > 0:
+                # The most recent missed ticks, dropping ticks beyond the backlog
+                kept = min(missed, self.max_catch_up)
+                self.missed_ticks = [
+                    datetime.fromtimestamp(latest - k * self.interval)
+                    for k in range(kept, 0, -1)
+                ]
+                self.skipped += missed - kept
+                self.caught_up += kept
+            else:
+                self.skipped += missed
+            if missed > 0:
+                logger.warning(
+                    f"Check overran {missed} tick(s) of {self.interval}s "
+                    f"({self.policy})"
+                )
+
+        fire_at = tick + self.delay
+        if fire_at > now:
+            await self._sleep(fire_at - now)
+
+        lag = max(self._clock() - fire_at, 0.0)
+        self._last = tick
+        self.ticks += 1
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self._total_lag += lag
+        return datetime.fromtimestamp(tick)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return tick counters and lag (seconds past each tick's fire time)"""
+        return {
+            "ticks": self.ticks,
+            "skipped": self.skipped,
+            "caught_up": self.caught_up,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+            "average_lag": self._total_lag / self.ticks if self.ticks else 0.0,
+        }
@@ -0,0 +1,270 @@
+"""Append-only columnar time-series store backed by NumPy.
+
+Rows are fixed-size NumPy records with an int64 ``ts`` column (epoch
+microseconds) and are appended in time order. Reads return views of the
+underlying buffer (no copies): the full series, the last N rows, a time window
+found by binary search, or a strided (downsampled) window for charts.
+
+With a ``path`` the buffer is a memory-mapped segment file: appends write
+straight to the page cache, the row count lives in the file header, and
+reopening the file recovers every row. Resident memory stays flat because the
+OS pages the mapping in and out. Without a path the rows live in memory and
+only the most recent ``max_memory_rows`` are retained.
+"""
+
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"VCTSDB01"
+_HEADER_SIZE = 64
+# Header layout, as uint64 words: [magic, itemsize, row count, ...reserved]
+_HEADER_ITEMSIZE = 1
+_HEADER_COUNT = 2
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_epoch_us(timestamp: datetime) -> int:
+    """Convert a datetime (naive = local time) to epoch microseconds."""
+    if timestamp.tzinfo is None:
+        return round(timestamp.timestamp() * 1_000_000)
+    return (timestamp - _EPOCH) // timedelta(microseconds=1)
+
+
+def from_epoch_us(value: int, tz_aware: bool = True) -> datetime:
+    """Convert epoch microseconds back to a UTC or naive local datetime."""
+    value = int(value)
+    if tz_aware:
+        return _EPOCH + timedelta(microseconds=value)
+    seconds, micros = divmod(value, 1_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=micros)
+
+
+class TimeSeriesStore:
+    """Append-only series of fixed-dtype records ordered by ``ts``."""
+
+    def __init__(
+        self,
+        dtype: np.dtype,
+        path: Optional[str] = None,
+        grow_rows: int = 4096,
+        max_memory_rows: int = 100_000,
+    ):
+        """
+        Initialize the store, recovering existing rows from ``path``.
+
+        Args:
+            dtype: Structured record dtype; must contain an int64 ``ts`` field
+            path: Segment file; None keeps the rows in memory only
+            grow_rows: Rows added to the buffer each time it fills up
+            max_memory_rows: Rows retained by an in-memory store
+
+        Raises:
+            ValueError: If the dtype has no ``ts`` field or the file was
+                        written with a different record layout
+        """
+        self.dtype = np.dtype(dtype)
+        if "ts" not in (self.dtype.names or ()):
+            raise ValueError("Time series dtype needs a 'ts' field")
+        # (index, size) of fixed-size bytes fields, which numpy would truncate
+        self._bytes_fields = [
+            (index, self.dtype[name].itemsize)
+            for index, name in enumerate(self.dtype.names)
+            if self.dtype[name].kind == "S"
+        ]
+        self.path = path
+        self.grow_rows = grow_rows
+        self.max_memory_rows = max(max_memory_rows, 2)
+
+        self._len = 0
+        self._header: Optional[np.memmap] = None
+        # Rows evicted from an in-memory store
+        self.dropped = 0
+
+        if path is None:
+            self._data = np.empty(min(grow_rows, self.max_memory_rows), self.dtype)
+        else:
+            self._open(path)
+
+    # ============ Storage ============
+
+    def _open(self, path: str) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        itemsize = self.dtype.itemsize
+        rows = 0
+
+        if os.path.exists(path) and os.path.getsize(path) >= _HEADER_SIZE:
+            with open(path, "rb") as f:
+                header = f.read(_HEADER_SIZE)
+            if header[:8] != _MAGIC:
+                raise ValueError(f"{path} is not a time series file")
+            words = np.frombuffer(header, dtype="<u8")
+            if int(words[_HEADER_ITEMSIZE]) != itemsize:
+                raise ValueError(f"{path} was written with a different layout")
+            # Never trust a count beyond the data actually on disk
+            on_disk = (os.path.getsize(path) - _HEADER_SIZE) // itemsize
+            rows = min(int(words[_HEADER_COUNT]), on_disk)
+        else:
+            header = bytearray(_HEADER_SIZE)
+            header[:8] = _MAGIC
+            np.frombuffer(header, dtype="<u8")[_HEADER_ITEMSIZE] = itemsize
+            with open(path, "wb") as f:
+                f.write(header)
+
+        capacity = max(-(-rows // self.grow_rows), 1) * self.grow_rows
+        self._map(capacity)
+        self._header = np.memmap(path, dtype="<u8", mode="r+", shape=(8,))
+        self._len = rows
+        if rows:
+            logger.info(f"Recovered {rows} rows from {path}")
+
+    def _map(self, capacity: int) -> None:
+        size = _HEADER_SIZE + capacity * self.dtype.itemsize
+        with open(self.path, "r+b") as f:
+            f.truncate(size)
+        self._data = np.memmap(
+            self.path,
+            dtype=self.dtype,
+            mode="r+",
+            offset=_HEADER_SIZE,
+            shape=(capacity,),
+        )
+
+    def _grow(self) -> None:
+        capacity = len(self._data)
+        if self.path is not None:
+            # Earlier views keep the old mapping; the file only grows
+            self._data.flush()
+            self._map(capacity + self.grow_rows)
+            return
+
+        if capacity < self.max_memory_rows:
+            new_capacity = min(capacity * 2, self.max_memory_rows)
+            keep = self._len
+        else:
+            # Evict the oldest half; a new buffer leaves earlier views intact
+            new_capacity = capacity
+            keep = self.max_memory_rows // 2
+            self.dropped += self._len - keep
+        data = np.empty(new_capacity, self.dtype)
+        data[:keep] = self._data[self._len - keep : self._len]
+        self._data = data
+        self._len = keep
+
+    # ============ Writes ============
+
+    def append(self, row: Sequence) -> None:
+        """
+        Append one record (amortized O(1)).
+
+        Args:
+            row: Field values in dtype order
+
+        Raises:
+            ValueError: If a bytes value is longer than its field
+        """
+        for index, size in self._bytes_fields:
+            if len(row[index]) > size:
+                raise ValueError(
+                    f"{row[index]!r} does not fit field "
+                    f"{self.dtype.names[index]!r} ({size} bytes)"
+                )
+        if self._len == len(self._data):
+            self._grow()
+        self._data[self._len] = tuple(row)
+        self._len += 1
+        if self._header is not None:
+            self._header[_HEADER_COUNT] = self._len
+
+    def extend(self, rows: np.ndarray) -> None:
+        """
+        Append several records at once.
+
+        Args:
+            rows: Records of the store's dtype, in time order
+        """
+        # Evicting makes room for at least max_memory_rows // 2 rows
+        step = max(min(self.grow_rows, self.max_memory_rows // 2), 1)
+        for start in range(0, len(rows), step):
+            chunk = rows[start : start + step]
+            while self._len + len(chunk) > len(self._data):
+                self._grow()
+            self._data[self._len : self._len + len(chunk)] = chunk
+            self._len += len(chunk)
+        if self._header is not None:
+            self._header[_HEADER_COUNT] = self._len
+
+    def flush(self) -> None:
+        """Write dirty pages of a file-backed store to disk."""
+        if self.path is not None:
+            self._data.flush()
+            self._header.flush()
+
+    def clear(self) -> None:
+        """Drop all rows (the file keeps its allocated size)."""
+        self._len = 0
+        self.dropped = 0
+        if self._header is not None:
+            self._header[_HEADER_COUNT] = 0
+
+    def close(self) -> None:
+        self.flush()
+
+    # ============ Reads (views, no copies) ============
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def rows(self) -> np.ndarray:
+        """All retained rows."""
+        return self._data[: self._len]
+
+    @property
+    def total(self) -> int:
+        """Rows appended so far, including rows evicted from memory."""
+        return self._len + self.dropped
+
+    def since(self, total: int) -> np.ndarray:
+        """Retained rows appended after the first ``total`` rows."""
+        return self._data[max(total - self.dropped, 0) : self._len]
+
+    def tail(self, n: int) -> np.ndarray:
+        """The most recent ``n`` rows."""
+        return self._data[max(self._len - n, 0) : self._len]
+
+    def window(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> np.ndarray:
+        """Rows with ``start <= ts <= end`` (either bound may be open)."""
+        ts = self._data["ts"][: self._len]
+        lo = 0 if start is None else int(np.searchsorted(ts, to_epoch_us(start)))
+        hi = (
+            self._len
+            if end is None
+            else int(np.searchsorted(ts, to_epoch_us(end), side="right"))
+        )
+        return self._data[lo:hi]
+
+    def downsample(
+        self,
+        max_points: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> np.ndarray:
+        """
+        Every k-th row of a window so at most ``max_points`` rows remain.
+
+        The stride is anchored on the newest row, which is always included.
+        """
+        rows = self.window(start, end)
+        if max_points <= 0 or len(rows) <= max_points:
+            return rows
+        step = -(-len(rows) // max_points)
+        return rows[::-step][::-1]
@@ -1,14 +1,58 @@
 """Trade recording and history management - from a trader's perspective"""
 
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List
+from collections import defaultdict, deque
+from datetime import date, datetime, timedelta
+from typing import Deque, Dict, Iterable, List, Optional
 
 from .models import TradeHistoryRecord
 
 logger = logging.getLogger(__name__)
 
 
+class _PnlAggregate:
+    """Running win/loss aggregates of closed trades"""
+
+    __slots__ = (
+        "closed",
+        "wins",
+        "losses",
+        "total_pnl",
+        "total_wins",
+        "total_losses",
+        "largest_win",
+        "largest_loss",
+    )
+
+    def __init__(self):
+        self.closed = 0
+        self.wins = 0
+        self.losses = 0
+        self.total_pnl = 0.0
+        self.total_wins = 0.0
+        self.total_losses = 0.0
+        self.largest_win = 0.0
+        self.largest_loss = 0.0
+
+    def add(self, pnl: float):
+        self.closed += 1
+        self.total_pnl += pnl
+        if pnl > 0:
+            self.wins += 1
+            self.total_wins += pnl
+            if pnl > self.largest_win:
+                self.largest_win = pnl
+        elif pnl < 0:
+            self.losses += 1
+            self.total_losses += pnl
+            if pnl < self.largest_loss:
+                self.largest_loss = pnl
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.closed * 100 if self.closed else 0
+
+
 class TradeRecorder:
     """
     Records and analyzes all trading activity.
@@ -18,11 +62,28 @@ class TradeRecorder:
     2. "What's my win rate?"
     3. "What's my average win/loss?"
     4. "Which symbols are most profitable?"
+
+    Statistics are aggregated as trades are recorded (overall, per symbol,
+    per day and per trade type, plus FIFO open lots for holding times), so
+    reading them does not rescan the history.
     """
 
     def __init__(self):
         """Initialize trade recorder"""
         self._trades: List[TradeHistoryRecord] = []
+        self._trades_by_symbol: Dict[str, List[TradeHistoryRecord]] = defaultdict(list)
+        self._totals = _PnlAggregate()
+        self._by_symbol: Dict[str, _PnlAggregate] = defaultdict(_PnlAggregate)
+        self._by_type: Dict[str, _PnlAggregate] = defaultdict(_PnlAggregate)
+        self._daily: Dict[date, Dict] = {}
+
+        # Open lots per symbol (entry times, oldest first) and holding times
+        # of the positions closed so far
+        self._open_lots: Dict[str, Deque[datetime]] = defaultdict(deque)
+        self._holding_count = 0
+        self._holding_total = timedelta(0)
+        self._holding_min: Optional[timedelta] = None
+        self._holding_max: Optional[timedelta] = None
 
     def record_trade(self, trade_record: TradeHistoryRecord):
         """
@@ -31,23 +92,76 @@ class TradeRecorder:
         Args:
             trade_record: TradeHistoryRecord to record
         """
-        self._trades.append(trade_record)
+        self._add(trade_record)
         logger.info(
             f"Recorded {trade_record.action} {trade_record.trade_type} on "
             f"{trade_record.symbol} at ${trade_record.price:.2f}"
         )
 
+    def load_trades(self, trade_records: Iterable[TradeHistoryRecord]):
+        """
+        Record trades executed elsewhere (e.g. restored or synced history).
+
+        Args:
+            trade_records: TradeHistoryRecords in execution order
+        """
+        for trade_record in trade_records:
+            self._add(trade_record)
+
+    def _add(self, trade_record: TradeHistoryRecord):
+        self._trades.append(trade_record)
+        self._trades_by_symbol[trade_record.symbol].append(trade_record)
+
+        pnl = trade_record.pnl
+        day = trade_record.timestamp.date()
+        daily = self._daily.get(day)
+        if daily is None:
+            daily = self._daily[day] = {"trades": 0, "pnl": 0, "wins": 0, "losses": 0}
+        daily["trades"] += 1
+        if pnl is not None:
+            self._totals.add(pnl)
+            self._by_symbol[trade_record.symbol].add(pnl)
+            self._by_type[trade_record.trade_type.upper()].add(pnl)
+            daily["pnl"] += pnl
+            if pnl > 0:
+                daily["wins"] += 1
+            else:
+                daily["losses"] += 1
+
+        if trade_record.action == "opened":
+            self._open_lots[trade_record.symbol].append(trade_record.timestamp)
+        elif trade_record.action == "closed" and self._open_lots[trade_record.symbol]:
+            self._add_holding_time(
+                trade_record.timestamp - self._open_lots[trade_record.symbol].popleft()
+            )
+
+    def _add_holding_time(self, holding_time: timedelta):
+        self._holding_count += 1
+        self._holding_total += holding_time
+        if self._holding_min is None or holding_time < self._holding_min:
+            self._holding_min = holding_time
+        if self._holding_max is None or holding_time > self._holding_max:
+            self._holding_max = holding_time
+
     def get_all_trades(self) -> List[TradeHistoryRecord]:
         """Get all recorded trades"""
         return self._trades.copy()
 
+    def get_trade_count(self) -> int:
+        """Get the number of recorded trades"""
+        return len(self._trades)
+
+    def get_trades_since(self, offset: int) -> List[TradeHistoryRecord]:
+        """Get trades recorded after the first ``offset`` trades"""
+        return self._trades[offset:]
+
     def get_recent_trades(self, limit: int = 10) -> List[TradeHistoryRecord]:
         """Get most recent N trades"""
         return self._trades[-limit:] if self._trades else []
 
     def get_trades_by_symbol(self, symbol: str) -> List[TradeHistoryRecord]:
         """Get all trades for a specific symbol"""
-        return [t for t in self._trades if t.symbol == symbol]
+        return list(self._trades_by_symbol.get(symbol, ()))
 
     def get_trades_by_action(self, action: str) -> List[TradeHistoryRecord]:
         """Get all trades of a specific action (opened/closed)"""
@@ -68,24 +182,8 @@ class TradeRecorder:
         Returns:
             Dictionary with various statistics
         """
-        if not self._trades:
-            return {
-                "total_trades": 0,
-                "win_trades": 0,
-                "loss_trades": 0,
-                "win_rate": 0,
-                "total_pnl": 0,
-                "average_win": 0,
-                "average_loss": 0,
-                "largest_win": 0,
-                "largest_loss": 0,
-                "profit_factor": 0,
-            }
-
-        # Calculate closed trades (those with P&L)
-        closed_trades = [t for t in self._trades if t.pnl is not None]
-
-        if not closed_trades:
+        totals = self._totals
+        if not totals.closed:
             return {
                 "total_trades": len(self._trades),
                 "win_trades": 0,
@@ -99,28 +197,21 @@ class TradeRecorder:
                 "profit_factor": 0,
             }
 
-        winning_trades = [t for t in closed_trades if t.pnl > 0]
-        losing_trades = [t for t in closed_trades if t.pnl < 0]
-
-        total_pnl = sum(t.pnl for t in closed_trades)
-        total_wins = sum(t.pnl for t in winning_trades) if winning_trades else 0
-        total_losses = sum(t.pnl for t in losing_trades) if losing_trades else 0
-
         return {
-            "total_trades": len(closed_trades),
-            "win_trades": len(winning_trades),
-            "loss_trades": len(losing_trades),
-            "win_rate": (len(winning_trades) / len(closed_trades) * 100)
-            if closed_trades
+            "total_trades": totals.closed,
+            "win_trades": totals.wins,
+            "loss_trades": totals.losses,
+            "win_rate": totals.win_rate,
+            "total_pnl": totals.total_pnl,
+            "average_win": (totals.total_wins / totals.wins) if totals.wins else 0,
+            "average_loss": (totals.total_losses / totals.losses)
+            if totals.losses
             else 0,
-            "total_pnl": total_pnl,
-            "average_win": (total_wins / len(winning_trades)) if winning_trades else 0,
-            "average_loss": (total_losses / len(losing_trades)) if losing_trades else 0,
-            "largest_win": max(t.pnl for t in winning_trades) if winning_trades else 0,
-            "largest_loss": min(t.pnl for t in losing_trades) if losing_trades else 0,
-            "profit_factor": (total_wins / abs(total_losses))
-            if total_losses != 0
-            else (1.0 if total_wins > 0 else 0),
+            "largest_win": totals.largest_win,
+            "largest_loss": totals.largest_loss,
+            "profit_factor": (totals.total_wins / abs(totals.total_losses))
+            if totals.total_losses != 0
+            else (1.0 if totals.total_wins > 0 else 0),
         }
 
     def get_symbol_statistics(self, symbol: str) -> Dict:
@@ -133,29 +224,24 @@ class TradeRecorder:
         Returns:
             Statistics dictionary for that symbol
         """
-        symbol_trades = self.get_trades_by_symbol(symbol)
+        symbol_trades = self._trades_by_symbol.get(symbol)
         if not symbol_trades:
             return {"symbol": symbol, "trades": 0}
 
-        closed_trades = [t for t in symbol_trades if t.pnl is not None]
-        if not closed_trades:
+        stats = self._by_symbol.get(symbol)
+        if stats is None:
             return {"symbol": symbol, "trades": len(symbol_trades), "closed": 0}
 
-        winning_trades = [t for t in closed_trades if t.pnl > 0]
-        losing_trades = [t for t in closed_trades if t.pnl < 0]
-
-        total_pnl = sum(t.pnl for t in closed_trades)
-
         return {
             "symbol": symbol,
-            "total_trades": len(closed_trades),
-            "win_trades": len(winning_trades),
-            "loss_trades": len(losing_trades),
-            "win_rate": (len(winning_trades) / len(closed_trades) * 100),
-            "total_pnl": total_pnl,
-            "average_pnl_per_trade": total_pnl / len(closed_trades),
-            "largest_win": max(t.pnl for t in winning_trades) if winning_trades else 0,
-            "largest_loss": min(t.pnl for t in losing_trades) if losing_trades else 0,
+            "total_trades": stats.closed,
+            "win_trades": stats.wins,
+            "loss_trades": stats.losses,
+            "win_rate": stats.win_rate,
+            "total_pnl": stats.total_pnl,
+            "average_pnl_per_trade": stats.total_pnl / stats.closed,
+            "largest_win": stats.largest_win,
+            "largest_loss": stats.largest_loss,
         }
 
     def get_daily_statistics(self) -> Dict[str, Dict]:
@@ -165,68 +251,29 @@ class TradeRecorder:
         Returns:
             Dictionary mapping dates to daily statistics
         """
-        daily_stats = {}
-
-        for trade in self._trades:
-            date_key = trade.timestamp.strftime("%Y-%m-%d")
-            if date_key not in daily_stats:
-                daily_stats[date_key] = {
-                    "trades": 0,
-                    "pnl": 0,
-                    "wins": 0,
-                    "losses": 0,
-                }
-
-            daily_stats[date_key]["trades"] += 1
-            if trade.pnl is not None:
-                daily_stats[date_key]["pnl"] += trade.pnl
-                if trade.pnl > 0:
-                    daily_stats[date_key]["wins"] += 1
-                else:
-                    daily_stats[date_key]["losses"] += 1
-
-        return daily_stats
+        return {day.isoformat(): dict(stats) for day, stats in self._daily.items()}
 
     def get_holding_time_statistics(self) -> Dict:
         """
         Get statistics about holding times.
 
+        Closes are matched with the oldest open lot of the same symbol.
+
         Returns:
             Statistics about position holding duration
         """
-        # Match opens and closes for each symbol
-        holding_times = []
-
-        for symbol in set(t.symbol for t in self._trades):
-            symbol_trades = sorted(
-                self.get_trades_by_symbol(symbol), key=lambda t: t.timestamp
-            )
-
-            for i in range(0, len(symbol_trades) - 1, 2):
-                if (
-                    i + 1 < len(symbol_trades)
-                    and symbol_trades[i].action == "opened"
-                    and symbol_trades[i + 1].action == "closed"
-                ):
-                    holding_time = (
-                        symbol_trades[i + 1].timestamp - symbol_trades[i].timestamp
-                    )
-                    holding_times.append(holding_time)
-
-        if not holding_times:
+        if not self._holding_count:
             return {
                 "avg_holding_time": timedelta(0),
                 "min_holding_time": timedelta(0),
                 "max_holding_time": timedelta(0),
             }
 
-        total_holding = sum(holding_times, timedelta())
-
         return {
-            "total_positions": len(holding_times),
-            "avg_holding_time": total_holding / len(holding_times),
-            "min_holding_time": min(holding_times),
-            "max_holding_time": max(holding_times),
+            "total_positions": self._holding_count,
+            "avg_holding_time": self._holding_total / self._holding_count,
+            "min_holding_time": self._holding_min,
+            "max_holding_time": self._holding_max,
         }
 
     # ============ Trade Analysis Section ============
@@ -250,16 +297,10 @@ class TradeRecorder:
         Returns:
             Statistics for each trade type
         """
-        closed_trades = [t for t in self._trades if t.pnl is not None]
-
-        breakdown = {"LONG": {}, "SHORT": {}}
-
+        breakdown = {}
         for trade_type in ["LONG", "SHORT"]:
-            type_trades = [
-                t for t in closed_trades if t.trade_type.upper() == trade_type
-            ]
-
-            if not type_trades:
+            stats = self._by_type.get(trade_type)
+            if stats is None:
                 breakdown[trade_type] = {
                     "trades": 0,
                     "wins": 0,
@@ -267,20 +308,17 @@ class TradeRecorder:
                     "total_pnl": 0,
                 }
             else:
-                winning = [t for t in type_trades if t.pnl > 0]
-                losing = [t for t in type_trades if t.pnl < 0]
-
                 breakdown[trade_type] = {
-                    "trades": len(type_trades),
-                    "wins": len(winning),
-                    "losses": len(losing),
-                    "win_rate": (len(winning) / len(type_trades) * 100),
-                    "total_pnl": sum(t.pnl for t in type_trades),
-                    "average_pnl": sum(t.pnl for t in type_trades) / len(type_trades),
+                    "trades": stats.closed,
+                    "wins": stats.wins,
+                    "losses": stats.losses,
+                    "win_rate": stats.win_rate,
+                    "total_pnl": stats.total_pnl,
+                    "average_pnl": stats.total_pnl / stats.closed,
                 }
 
         return breakdown
 
     def reset(self):
         """Clear all trade history"""
-        self._trades.clear()
+        self.__init__()
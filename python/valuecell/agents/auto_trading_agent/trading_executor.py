@@ -2,10 +2,14 @@
 
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
+import numpy as np
+
+from .mark_price import MarkPriceOracle
 from .models import (
     AutoTradingConfig,
+    CashManagement,
     PortfolioValueSnapshot,
     Position,
     PositionHistorySnapshot,
@@ -15,6 +19,7 @@ from .models import (
     TradeType,
 )
 from .position_manager import PositionManager
+from .risk_engine import RiskLimits
 from .trade_recorder import TradeRecorder
 
 logger = logging.getLogger(__name__)
@@ -30,18 +35,30 @@ class TradingExecutor:
     - Cash management (via PositionManager)
     """
 
-    def __init__(self, config: AutoTradingConfig):
+    def __init__(
+        self,
+        config: AutoTradingConfig,
+        mark_prices: Optional[MarkPriceOracle] = None,
+        history_dir: Optional[str] = None,
+    ):
         """
         Initialize trading executor.
 
         Args:
             config: Auto trading configuration
+            mark_prices: Mark price oracle (default: the process-wide oracle)
+            history_dir: Directory persisting position/portfolio history
         """
         self.config = config
         self.initial_capital = config.initial_capital
 
         # Use specialized modules
-        self._position_manager = PositionManager(config.initial_capital)
+        self._position_manager = PositionManager(
+            config.initial_capital,
+            mark_prices,
+            history_dir,
+            RiskLimits(max_positions=config.max_positions),
+        )
         self._trade_recorder = TradeRecorder()
 
     def execute_trade(
@@ -50,6 +67,7 @@ class TradingExecutor:
         action: TradeAction,
         trade_type: TradeType,
         indicators: TechnicalIndicators,
+        timestamp: Optional[datetime] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Execute a trade (open or close position).
@@ -59,13 +77,15 @@ class TradingExecutor:
             action: Trade action (buy/sell)
             trade_type: Trade type (long/short)
             indicators: Current technical indicators
+            timestamp: Execution time (default: now; backtests pass the
+                       simulated time)
 
         Returns:
             Trade execution details or None if execution failed
         """
         try:
             current_price = indicators.close_price
-            timestamp = datetime.now(timezone.utc)
+            timestamp = timestamp or datetime.now(timezone.utc)
 
             if action == TradeAction.BUY:
                 return self._execute_buy(symbol, trade_type, current_price, timestamp)
@@ -91,17 +111,18 @@ class TradingExecutor:
             logger.info(f"Position already exists for {symbol}, skipping")
             return None
 
-        # Check max positions limit
-        if self._position_manager.get_positions_count() >= self.config.max_positions:
-            logger.info(f"Max positions reached ({self.config.max_positions})")
-            return None
-
         # Calculate position size
         available_cash = self._position_manager.get_available_cash()
         risk_amount = available_cash * self.config.risk_per_trade
         quantity = risk_amount / current_price
         notional = quantity * current_price
 
+        # Check position and exposure limits
+        reason = self.check_trades([(symbol, TradeAction.BUY, trade_type)], notional)[0]
+        if reason is not None:
+            logger.info(f"Not opening {symbol}: {reason}")
+            return None
+
         # Check if we have enough cash
         if notional > available_cash:
             logger.warning(
@@ -204,6 +225,40 @@ class TradingExecutor:
             "timestamp": timestamp,
         }
 
+    # ============ Risk Checks ============
+
+    def check_trades(
+        self,
+        trades: Sequence[Tuple[str, TradeAction, TradeType]],
+        notional: Optional[float] = None,
+    ) -> List[Optional[str]]:
+        """
+        Validate candidate trades against position and exposure limits.
+
+        Args:
+            trades: (symbol, action, trade type) in execution order
+            notional: Size of the opens (default: the size a buy would get
+                      now, an upper bound for later buys of the batch)
+
+        Returns:
+            For each trade, None if it is approved or the rejection reason
+        """
+        if notional is None:
+            notional = (
+                self._position_manager.get_available_cash() * self.config.risk_per_trade
+            )
+        return self._position_manager.risk_engine.check_trades(
+            [
+                (symbol, action, trade_type, notional)
+                for symbol, action, trade_type in trades
+            ],
+            self._position_manager.get_cash_status().total_cash,
+        )
+
+    def get_exposure(self) -> Dict[str, Any]:
+        """Get exposure aggregates (gross/net, per symbol, direction, bucket)"""
+        return self._position_manager.get_exposure()
+
     # ============ Portfolio Queries ============
 
     def get_portfolio_value(self) -> float:
@@ -211,6 +266,10 @@ class TradingExecutor:
         total_value, _, _ = self._position_manager.calculate_portfolio_value()
         return total_value
 
+    def get_mark_price(self, symbol: str) -> Optional[float]:
+        """Get the mark price used to value positions (None if unavailable)"""
+        return self._position_manager.mark_prices.get_price(symbol)
+
     def get_portfolio_summary(self) -> Dict:
         """Get complete portfolio summary"""
         return self._position_manager.get_portfolio_summary()
@@ -231,25 +290,88 @@ class TradingExecutor:
 
     # ============ History Management ============
 
-    def snapshot_positions(self, timestamp: datetime):
-        """Take a snapshot of all positions"""
-        self._position_manager.snapshot_positions(timestamp)
+    def snapshot_positions(
+        self, timestamp: datetime, prices: Optional[Dict[str, float]] = None
+    ):
+        """Take a snapshot of all positions (at the given prices, if any)"""
+        self._position_manager.snapshot_positions(timestamp, prices)
 
-    def snapshot_portfolio(self, timestamp: datetime):
-        """Take a snapshot of portfolio value"""
-        self._position_manager.snapshot_portfolio(timestamp)
+    def snapshot_portfolio(
+        self, timestamp: datetime, prices: Optional[Dict[str, float]] = None
+    ):
+        """Take a snapshot of portfolio value (at the given prices, if any)"""
+        self._position_manager.snapshot_portfolio(timestamp, prices)
+        self._position_manager.flush_history()
 
     def get_trade_history(self) -> List[TradeHistoryRecord]:
         """Get all trade history"""
         return self._trade_recorder.get_all_trades()
 
-    def get_position_history(self) -> List[PositionHistorySnapshot]:
-        """Get all position snapshots"""
-        return self._position_manager.get_position_history()
+    def get_trades_since(self, offset: int) -> List[TradeHistoryRecord]:
+        """Get trades recorded after the first ``offset`` trades"""
+        return self._trade_recorder.get_trades_since(offset)
+
+    def get_position_history(
+        self, limit: Optional[int] = None
+    ) -> List[PositionHistorySnapshot]:
+        """Get position snapshots (the most recent ``limit`` if given)"""
+        return self._position_manager.get_position_history(limit)
+
+    def get_portfolio_history(
+        self, limit: Optional[int] = None
+    ) -> List[PortfolioValueSnapshot]:
+        """Get portfolio snapshots (the most recent ``limit`` if given)"""
+        return self._position_manager.get_portfolio_history(limit)
+
+    def get_portfolio_series(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        max_points: Optional[int] = None,
+    ) -> np.ndarray:
+        """Get portfolio history as a (optionally downsampled) array view"""
+        return self._position_manager.get_portfolio_series(start, end, max_points)
+
+    # ============ State Transfer ============
+
+    def get_state(self) -> Tuple[CashManagement, Dict[str, Position]]:
+        """Get cash and open positions (e.g. to checkpoint the executor)"""
+        return self._position_manager.get_cash_status(), self.positions
+
+    def restore_state(
+        self,
+        cash: CashManagement,
+        positions: Dict[str, Position],
+        trades: Iterable[TradeHistoryRecord] = (),
+    ):
+        """
+        Replace cash and positions and add trades recorded elsewhere.
+
+        Args:
+            cash: Cash management state
+            positions: Open positions by symbol
+            trades: Trades to add to the trade history
+        """
+        self._position_manager.restore_state(cash, positions)
+        self._trade_recorder.load_trades(trades)
+
+    def get_history_counts(self) -> Tuple[int, int, int]:
+        """Position snapshots, portfolio snapshots and trades recorded so far"""
+        position_count, portfolio_count = self._position_manager.get_history_counts()
+        return position_count, portfolio_count, self._trade_recorder.get_trade_count()
+
+    def get_history_since(
+        self, position_count: int, portfolio_count: int, trade_count: int
+    ) -> Tuple[np.ndarray, np.ndarray, List[TradeHistoryRecord]]:
+        """Snapshots and trades recorded after the given counts"""
+        position_rows, portfolio_rows = self._position_manager.get_history_since(
+            position_count, portfolio_count
+        )
+        return position_rows, portfolio_rows, self.get_trades_since(trade_count)
 
-    def get_portfolio_history(self) -> List[PortfolioValueSnapshot]:
-        """Get all portfolio snapshots"""
-        return self._position_manager.get_portfolio_history()
+    def append_history(self, position_rows: np.ndarray, portfolio_rows: np.ndarray):
+        """Append position/portfolio snapshot rows taken elsewhere"""
+        self._position_manager.append_history(position_rows, portfolio_rows)
 
     # ============ Statistics ============
 
@@ -0,0 +1,537 @@
+"""SQLite-backed trading state shared by the agent and the trading API.
+
+The agent appends what changed during each check (new portfolio snapshots,
+trades and decisions, plus the current positions and a summary row per
+instance) in a single transaction. The same transaction checkpoints what is
+needed to resume the instance after a restart: its state (config, cash and
+open positions, rewritten only when it changed) and its cursor (last tick and
+the history saved so far). The API queries only what an endpoint needs
+through indexes keyed by instance_id, so request latency does not grow with
+the number of instances or the length of their history. The database runs in
+WAL mode so API reads never block the agent's writes.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import aiosqlite
+
+from .constants import DEFAULT_TRADING_STATE_DB
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS trading_instances (
+        instance_id TEXT PRIMARY KEY,
+        session_id TEXT NOT NULL,
+        agent_model TEXT,
+        config TEXT NOT NULL,
+        created_at TEXT,
+        active INTEGER NOT NULL DEFAULT 1,
+        initial_capital REAL NOT NULL DEFAULT 0,
+        total_value REAL,
+        positions_value REAL,
+        total_pnl REAL,
+        available_cash REAL,
+        check_count INTEGER NOT NULL DEFAULT 0,
+        trade_count INTEGER NOT NULL DEFAULT 0,
+        closed_trade_count INTEGER NOT NULL DEFAULT 0,
+        winning_trade_count INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS portfolio_snapshots (
+        instance_id TEXT NOT NULL,
+        ts_us INTEGER NOT NULL,
+        timestamp TEXT NOT NULL,
+        total_value REAL NOT NULL,
+        cash REAL NOT NULL,
+        positions_value REAL NOT NULL,
+        total_pnl REAL NOT NULL,
+        positions_count INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS idx_portfolio_instance_ts
+    ON portfolio_snapshots (instance_id, ts_us)
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS trades (
+        instance_id TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        timestamp TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        action TEXT NOT NULL,
+        trade_type TEXT NOT NULL,
+        price REAL NOT NULL,
+        quantity REAL NOT NULL,
+        notional REAL NOT NULL,
+        pnl REAL,
+        portfolio_value_after REAL,
+        cash_after REAL,
+        PRIMARY KEY (instance_id, seq)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS open_positions (
+        instance_id TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (instance_id, symbol)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS decisions (
+        instance_id TEXT NOT NULL,
+        check_number INTEGER NOT NULL,
+        timestamp TEXT,
+        data TEXT NOT NULL,
+        PRIMARY KEY (instance_id, check_number)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS instance_checkpoints (
+        instance_id TEXT PRIMARY KEY,
+        session_id TEXT NOT NULL,
+        state TEXT,
+        cursor TEXT NOT NULL,
+        updated_at TEXT
+    )
+    """,
+]
+
+_INSTANCE_COLUMNS = (
+    "instance_id, session_id, agent_model, config, created_at, active, "
+    "initial_capital, total_value, positions_value, total_pnl, available_cash, "
+    "check_count, trade_count, closed_trade_count, winning_trade_count, updated_at"
+)
+
+
+@dataclass
+class InstanceUpdate:
+    """What changed for one trading instance since the previous save."""
+
+    instance_id: str
+    session_id: str
+    agent_model: Optional[str]
+    config: Dict[str, Any]
+    created_at: Optional[str]
+    active: bool
+    initial_capital: float
+    total_value: float
+    positions_value: float
+    total_pnl: float
+    available_cash: float
+    check_count: int
+    updated_at: str
+    # (ts_us, timestamp, total_value, cash, positions_value, total_pnl,
+    #  positions_count) rows newer than the last saved snapshot
+    portfolio_rows: List[Tuple] = field(default_factory=list)
+    # (seq, trade dict) for trades not saved yet
+    trades: List[Tuple[int, Dict[str, Any]]] = field(default_factory=list)
+    # Decision entries (JSON-ready dicts with a check_number) not saved yet
+    decisions: List[Dict[str, Any]] = field(default_factory=list)
+    # Current open positions (replace the previous set)
+    positions: List[Dict[str, Any]] = field(default_factory=list)
+    # Resume checkpoint: state is None when unchanged since the last save,
+    # cursor is None for instances that are not checkpointed
+    checkpoint_state: Optional[Dict[str, Any]] = None
+    checkpoint_cursor: Optional[Dict[str, Any]] = None
+
+
+class TradingStateStore:
+    """Async SQLite (WAL) store for trading instances and their history."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._initialized = False
+        self._init_lock = None  # lazy to avoid loop-binding in __init__
+
+    async def _ensure_initialized(self) -> None:
+        if self._initialized:
+            return
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        async with self._init_lock:
+            if self._initialized:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            async with aiosqlite.connect(self.db_path) as db:
+                # WAL is persistent: readers no longer block the writer
+                await db.execute("PRAGMA journal_mode=WAL")
+                for statement in _SCHEMA:
+                    await db.execute(statement)
+                await db.commit()
+            self._initialized = True
+
+    def _connect(self) -> aiosqlite.Connection:
+        return aiosqlite.connect(self.db_path, timeout=10)
+
+    # ============ Writes ============
+
+    async def save_updates(self, updates: Sequence[InstanceUpdate]) -> None:
+        """Persist the changes of one check for all instances atomically."""
+        await self._ensure_initialized()
+        async with self._connect() as db:
+            await db.execute("PRAGMA synchronous=NORMAL")
+            for update in updates:
+                await self._save_update(db, update)
+            await db.commit()
+
+    async def deactivate_instances(self, instance_ids: Sequence[str]) -> None:
+        """Mark instances inactive (e.g. instances that cannot be resumed)."""
+        if not instance_ids:
+            return
+        await self._ensure_initialized()
+        async with self._connect() as db:
+            await db.executemany(
+                "UPDATE trading_instances SET active = 0 WHERE instance_id = ?",
+                [(instance_id,) for instance_id in instance_ids],
+            )
+            await db.commit()
+
+    @staticmethod
+    async def _save_update(db: aiosqlite.Connection, update: InstanceUpdate) -> None:
+        closed = [t for _, t in update.trades if t.get("action") == "closed"]
+        wins = [t for t in closed if (t.get("pnl") or 0) > 0]
+
+        await db.execute(
+            f"""
+            INSERT INTO trading_instances ({_INSTANCE_COLUMNS})
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(instance_id) DO UPDATE SET
+                active = excluded.active,
+                total_value = excluded.total_value,
+                positions_value = excluded.positions_value,
+                total_pnl = excluded.total_pnl,
+                available_cash = excluded.available_cash,
+                check_count = excluded.check_count,
+                trade_count = trade_count + excluded.trade_count,
+                closed_trade_count = closed_trade_count + excluded.closed_trade_count,
+                winning_trade_count = winning_trade_count + excluded.winning_trade_count,
+                updated_at = excluded.updated_at
+            """,
+            (
+                update.instance_id,
+                update.session_id,
+                update.agent_model,
+                json.dumps(update.config),
+                update.created_at,
+                int(update.active),
+                update.initial_capital,
+                update.total_value,
+                update.positions_value,
+                update.total_pnl,
+                update.available_cash,
+                update.check_count,
+                len(update.trades),
+                len(closed),
+                len(wins),
+                update.updated_at,
+            ),
+        )
+
+        if update.portfolio_rows:
+            await db.executemany(
+                """
+                INSERT INTO portfolio_snapshots (
+                    instance_id, ts_us, timestamp, total_value, cash,
+                    positions_value, total_pnl, positions_count
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [(update.instance_id, *row) for row in update.portfolio_rows],
+            )
+
+        if update.trades:
+            await db.executemany(
+                """
+                INSERT OR REPLACE INTO trades (
+                    instance_id, seq, timestamp, symbol, action, trade_type,
+                    price, quantity, notional, pnl, portfolio_value_after,
+                    cash_after
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        update.instance_id,
+                        seq,
+                        t["timestamp"],
+                        t["symbol"],
+                        t["action"],
+                        t["trade_type"],
+                        t["price"],
+                        t["quantity"],
+                        t["notional"],
+                        t.get("pnl"),
+                        t.get("portfolio_value_after"),
+                        t.get("cash_after"),
+                    )
+                    for seq, t in update.trades
+                ],
+            )
+
+        if update.decisions:
+            await db.executemany(
+                """
+                INSERT OR REPLACE INTO decisions (
+                    instance_id, check_number, timestamp, data
+                ) VALUES (?, ?, ?, ?)
+                """,
+                [
+                    (
+                        update.instance_id,
+                        d["check_number"],
+                        d.get("timestamp"),
+                        json.dumps(d),
+                    )
+                    for d in update.decisions
+                ],
+            )
+
+        await db.execute(
+            "DELETE FROM open_positions WHERE instance_id = ?", (update.instance_id,)
+        )
+        if update.positions:
+            await db.executemany(
+                "INSERT INTO open_positions (instance_id, symbol, data) VALUES (?, ?, ?)",
+                [
+                    (update.instance_id, p["symbol"], json.dumps(p))
+                    for p in update.positions
+                ],
+            )
+
+        if update.checkpoint_cursor is not None:
+            await db.execute(
+                """
+                INSERT INTO instance_checkpoints (
+                    instance_id, session_id, state, cursor, updated_at
+                ) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(instance_id) DO UPDATE SET
+                    state = COALESCE(excluded.state, state),
+                    cursor = excluded.cursor,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    update.instance_id,
+                    update.session_id,
+                    (
+                        json.dumps(update.checkpoint_state)
+                        if update.checkpoint_state is not None
+                        else None
+                    ),
+                    json.dumps(update.checkpoint_cursor),
+                    update.updated_at,
+                ),
+            )
+
+    # ============ Reads ============
+
+    async def load_checkpoints(self) -> List[Dict[str, Any]]:
+        """
+        Resume checkpoints of the instances that were active, with their trades.
+
+        Returns:
+            Dicts with instance_id, session_id, check_count, state, cursor and
+            trades (oldest first)
+        """
+        await self._ensure_initialized()
+        async with self._connect() as db:
+            db.row_factory = sqlite3.Row
+            cur = await db.execute(
+                """
+                SELECT c.instance_id, c.session_id, i.check_count, c.state, c.cursor
+                FROM instance_checkpoints c
+                JOIN trading_instances i ON i.instance_id = c.instance_id
+                WHERE i.active = 1 AND c.state IS NOT NULL
+                """
+            )
+            checkpoints = {
+                row["instance_id"]: {
+                    "instance_id": row["instance_id"],
+                    "session_id": row["session_id"],
+                    "check_count": row["check_count"],
+                    "state": json.loads(row["state"]),
+                    "cursor": json.loads(row["cursor"]),
+                    "trades": [],
+                }
+                for row in await cur.fetchall()
+            }
+            cur = await db.execute(
+                """
+                SELECT t.instance_id, t.timestamp, t.symbol, t.action, t.trade_type,
+                       t.price, t.quantity, t.notional, t.pnl,
+                       t.portfolio_value_after, t.cash_after
+                FROM trades t
+                JOIN trading_instances i ON i.instance_id = t.instance_id
+                WHERE i.active = 1
+                ORDER BY t.instance_id, t.seq
+                """
+            )
+            for row in await cur.fetchall():
+                checkpoint = checkpoints.get(row["instance_id"])
+                if checkpoint is not None:
+                    checkpoint["trades"].append(dict(row))
+        return list(checkpoints.values())
+
+    @staticmethod
+    def _instance_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        instance = dict(row)
+        instance["config"] = json.loads(instance["config"])
+        instance["active"] = bool(instance["active"])
+        return instance
+
+    async def _fetchall(self, sql: str, params: Sequence = ()) -> List[sqlite3.Row]:
+        await self._ensure_initialized()
+        async with self._connect() as db:
+            db.row_factory = sqlite3.Row
+            cur = await db.execute(sql, params)
+            return await cur.fetchall()
+
+    async def list_instances(self) -> List[Dict[str, Any]]:
+        """All instances with their latest summary (one row each)."""
+        rows = await self._fetchall(
+            f"SELECT {_INSTANCE_COLUMNS} FROM trading_instances ORDER BY created_at"
+        )
+        return [self._instance_from_row(row) for row in rows]
+
+    async def get_instance(self, instance_id: str) -> Optional[Dict[str, Any]]:
+        rows = await self._fetchall(
+            f"SELECT {_INSTANCE_COLUMNS} FROM trading_instances WHERE instance_id = ?",
+            (instance_id,),
+        )
+        return self._instance_from_row(rows[0]) if rows else None
+
+    async def get_portfolio_history(
+        self, instance_id: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Portfolio snapshots, oldest first (the most recent ``limit``)."""
+        rows = await self._fetchall(
+            """
+            SELECT timestamp, total_value, cash, positions_value, total_pnl,
+                   positions_count
+            FROM portfolio_snapshots WHERE instance_id = ?
+            ORDER BY ts_us DESC LIMIT ?
+            """,
+            (instance_id, -1 if limit is None else int(limit)),
+        )
+        return [dict(row) for row in reversed(rows)]
+
+    async def get_trades(
+        self,
+        instance_id: str,
+        limit: Optional[int] = None,
+        action: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Trades, oldest first (the most recent ``limit``)."""
+        where = "instance_id = ?"
+        params: List[Any] = [instance_id]
+        if action is not None:
+            where += " AND action = ?"
+            params.append(action)
+        params.append(-1 if limit is None else int(limit))
+        rows = await self._fetchall(
+            f"""
+            SELECT timestamp, symbol, action, trade_type, price, quantity,
+                   notional, pnl
+            FROM trades WHERE {where}
+            ORDER BY seq DESC LIMIT ?
+            """,
+            params,
+        )
+        return [dict(row) for row in reversed(rows)]
+
+    async def get_portfolio_values(
+        self, instance_id: str, after_ts_us: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """(ts_us, total_value) of snapshots newer than ``after_ts_us``."""
+        rows = await self._fetchall(
+            """
+            SELECT ts_us, total_value FROM portfolio_snapshots
+            WHERE instance_id = ? AND ts_us > ?
+            ORDER BY ts_us
+            """,
+            (instance_id, -(2**63) if after_ts_us is None else int(after_ts_us)),
+        )
+        return [(row[0], row[1]) for row in rows]
+
+    async def get_closed_trade_pnls(
+        self, instance_id: str, after_seq: int = -1
+    ) -> List[Tuple[int, float]]:
+        """(seq, pnl) of closed trades with ``seq > after_seq``."""
+        rows = await self._fetchall(
+            """
+            SELECT seq, pnl FROM trades
+            WHERE instance_id = ? AND seq > ? AND action = 'closed'
+              AND pnl IS NOT NULL
+            ORDER BY seq
+            """,
+            (instance_id, int(after_seq)),
+        )
+        return [(row[0], row[1]) for row in rows]
+
+    async def get_positions(self, instance_id: str) -> List[Dict[str, Any]]:
+        """Open positions as of the last save."""
+        rows = await self._fetchall(
+            "SELECT data FROM open_positions WHERE instance_id = ? ORDER BY symbol",
+            (instance_id,),
+        )
+        return [json.loads(row["data"]) for row in rows]
+
+    async def get_open_positions_count(self) -> int:
+        rows = await self._fetchall("SELECT COUNT(1) FROM open_positions")
+        return rows[0][0]
+
+    async def get_decisions(
+        self, instance_id: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Decisions, newest first."""
+        rows = await self._fetchall(
+            """
+            SELECT data FROM decisions WHERE instance_id = ?
+            ORDER BY check_number DESC LIMIT ?
+            """,
+            (instance_id, -1 if limit is None else int(limit)),
+        )
+        return [json.loads(row["data"]) for row in rows]
+
+    async def count_decisions(self, instance_id: str) -> int:
+        rows = await self._fetchall(
+            "SELECT COUNT(1) FROM decisions WHERE instance_id = ?", (instance_id,)
+        )
+        return rows[0][0]
+
+    async def get_decision(
+        self, instance_id: str, check_number: int
+    ) -> Optional[Dict[str, Any]]:
+        rows = await self._fetchall(
+            "SELECT data FROM decisions WHERE instance_id = ? AND check_number = ?",
+            (instance_id, check_number),
+        )
+        return json.loads(rows[0]["data"]) if rows else None
+
+
+# Global instance
+_trading_state_store: Optional[TradingStateStore] = None
+
+
+def get_trading_state_store() -> TradingStateStore:
+    """Get the trading state store (path from TRADING_STATE_DB)."""
+    global _trading_state_store
+    if _trading_state_store is None:
+        _trading_state_store = TradingStateStore(
+            os.getenv("TRADING_STATE_DB", DEFAULT_TRADING_STATE_DB)
+        )
+    return _trading_state_store
+
+
+def reset_trading_state_store() -> None:
+    """Drop the global store (mainly for tests)."""
+    global _trading_state_store
+    _trading_state_store = None
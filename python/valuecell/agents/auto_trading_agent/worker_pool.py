@@ -0,0 +1,571 @@
+"""Trading instances sharded across worker processes.
+
+By default every trading instance runs in the agent's own process and event
+loop, so CPU-heavy work and blocking calls of one session delay the checks of
+all others. With worker processes enabled, the agent becomes a coordinator:
+
+- Each instance is placed on one worker process (all instances of a session
+  share a worker when sharding by session; otherwise the least loaded worker
+  is used) and its checks run there, in the worker's own event loop.
+- The coordinator computes every symbol's indicators once per tick and
+  publishes them to a ``SharedMarketBoard`` before dispatching the tick's
+  checks; workers read them from shared memory.
+- After every check the worker sends an ``InstanceSync`` with what changed:
+  cash and positions, new trades, new history rows, new decisions and new
+  notifications. The coordinator applies it to a mirror of the instance,
+  which its status, chart and persistence code keep working on.
+- When a worker process dies, it is restarted and its instances are restored
+  from their mirrors (``InstanceCheckpoint``); the history files in the
+  instance's history directory are recovered by the new worker.
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .constants import (
+    DECISION_HISTORY_LIMIT,
+    MARKET_BOARD_CAPACITY,
+    MAX_CONCURRENT_INSTANCE_CHECKS,
+    WORKER_MAX_RESTARTS,
+)
+from .models import (
+    AutoTradingConfig,
+    CashManagement,
+    Position,
+    TechnicalIndicators,
+    TradeHistoryRecord,
+)
+from .shared_market import SharedMarketBoard, SharedMarketSnapshots
+from .trading_executor import TradingExecutor
+
+logger = logging.getLogger(__name__)
+
+SHARD_BY_SESSION = "session"
+SHARD_BY_INSTANCE = "instance"
+
+
+class WorkerCrashedError(RuntimeError):
+    """The worker process handling a request exited."""
+
+
+@dataclass
+class InstanceCheckpoint:
+    """Everything needed to host an instance in a (new) worker process"""
+
+    session_id: str
+    instance_id: str
+    config: AutoTradingConfig
+    history_dir: Optional[str]
+    created_at: Optional[datetime]
+    check_count: int
+    last_check: Optional[datetime]
+    cash: CashManagement
+    positions: Dict[str, Position]
+    trades: List[TradeHistoryRecord]
+    decision_history: List[Dict[str, Any]]
+    # History rows the coordinator already has
+    position_rows: int
+    portfolio_rows: int
+
+
+@dataclass
+class InstanceSync:
+    """Changes of an instance since its previous sync"""
+
+    instance_id: str
+    check_count: int
+    last_check: Optional[datetime]
+    cash: CashManagement
+    positions: Dict[str, Position]
+    trades: List[TradeHistoryRecord]
+    position_rows: np.ndarray
+    portfolio_rows: np.ndarray
+    decisions: List[Dict[str, Any]]
+    # Notifications cached for the session (as dicts)
+    notifications: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def checkpoint_instance(
+    session_id: str, instance_id: str, instance: Dict[str, Any]
+) -> InstanceCheckpoint:
+    """Checkpoint of an instance (in practice: of its coordinator mirror)"""
+    executor: TradingExecutor = instance["executor"]
+    cash, positions = executor.get_state()
+    position_rows, portfolio_rows, _ = executor.get_history_counts()
+    return InstanceCheckpoint(
+        session_id=session_id,
+        instance_id=instance_id,
+        config=instance["config"],
+        history_dir=instance.get("history_dir"),
+        created_at=instance.get("created_at"),
+        check_count=instance["check_count"],
+        last_check=instance.get("last_check"),
+        cash=cash,
+        positions=positions,
+        trades=executor.get_trade_history(),
+        decision_history=list(instance.get("decision_history", [])),
+        position_rows=position_rows,
+        portfolio_rows=portfolio_rows,
+    )
+
+
+def apply_sync(instance: Dict[str, Any], sync: InstanceSync) -> None:
+    """Apply a worker's sync to the coordinator's mirror of the instance"""
+    executor: TradingExecutor = instance["executor"]
+    executor.restore_state(sync.cash, sync.positions, sync.trades)
+    executor.append_history(sync.position_rows, sync.portfolio_rows)
+    instance["check_count"] = sync.check_count
+    instance["last_check"] = sync.last_check
+    if sync.decisions:
+        history = instance.setdefault("decision_history", [])
+        history.extend(sync.decisions)
+        if len(history) > DECISION_HISTORY_LIMIT:
+            instance["decision_history"] = history[-DECISION_HISTORY_LIMIT:]
+
+
+# ============ Worker process ============
+
+
+class _WorkerRuntime:
+    """Hosts instances inside a worker process"""
+
+    def __init__(self, host):
+        # An AutoTradingAgent without parser or worker pool
+        self.host = host
+        self.semaphore = asyncio.Semaphore(MAX_CONCURRENT_INSTANCE_CHECKS)
+        # instance_id -> [position rows, portfolio rows, trades, check number]
+        self._cursors: Dict[str, List[int]] = {}
+        # session_id -> notifications already synced
+        self._notification_cursors: Dict[str, int] = {}
+
+    def add(
+        self, checkpoint: InstanceCheckpoint, snapshot_at: Optional[datetime]
+    ) -> InstanceSync:
+        config = checkpoint.config
+        executor = TradingExecutor(config, history_dir=checkpoint.history_dir)
+        executor.restore_state(checkpoint.cash, checkpoint.positions, checkpoint.trades)
+        self.host.trading_instances.setdefault(checkpoint.session_id, {})[
+            checkpoint.instance_id
+        ] = {
+            "instance_id": checkpoint.instance_id,
+            "config": config,
+            "executor": executor,
+            "ai_signal_generator": self.host._initialize_ai_signal_generator(config),
+            "active": True,
+            "created_at": checkpoint.created_at,
+            "check_count": checkpoint.check_count,
+            "last_check": checkpoint.last_check,
+            "decision_history": list(checkpoint.decision_history),
+            "history_dir": checkpoint.history_dir,
+        }
+        self.host._init_notification_cache(checkpoint.session_id)
+        self._notification_cursors.setdefault(
+            checkpoint.session_id,
+            self.host.notification_counts.get(checkpoint.session_id, 0),
+        )
+        self._cursors[checkpoint.instance_id] = [
+            checkpoint.position_rows,
+            checkpoint.portfolio_rows,
+            len(checkpoint.trades),
+            max(
+                (d.get("check_number", 0) for d in checkpoint.decision_history),
+                default=0,
+            ),
+        ]
+        if snapshot_at is not None:
+            executor.snapshot_portfolio(snapshot_at)
+        return self._sync(checkpoint.session_id, checkpoint.instance_id)
+
+    async def check(
+        self, session_id: str, instance_id: str, tick: Optional[datetime]
+    ) -> InstanceSync:
+        await self.host._process_trading_instance(
+            session_id, instance_id, self.semaphore, tick
+        )
+        return self._sync(session_id, instance_id)
+
+    def remove(self, session_id: str, instance_id: str) -> None:
+        self.host.trading_instances.get(session_id, {}).pop(instance_id, None)
+        self._cursors.pop(instance_id, None)
+
+    def _sync(self, session_id: str, instance_id: str) -> InstanceSync:
+        instance = self.host.trading_instances[session_id][instance_id]
+        executor: TradingExecutor = instance["executor"]
+        cursor = self._cursors[instance_id]
+
+        position_rows, portfolio_rows, trades = executor.get_history_since(*cursor[:3])
+        decisions = [
+            d
+            for d in instance["decision_history"]
+            if d.get("check_number", 0) > cursor[3]
+        ]
+        self._cursors[instance_id] = [
+            *executor.get_history_counts(),
+            decisions[-1]["check_number"] if decisions else cursor[3],
+        ]
+
+        # Notifications of concurrent checks in the session may ride along
+        # with either sync; each is sent exactly once
+        total = self.host.notification_counts.get(session_id, 0)
+        new_count = total - self._notification_cursors.get(session_id, 0)
+        self._notification_cursors[session_id] = total
+        cache = self.host.notification_cache.get(session_id, ())
+        notifications = [
+            n.model_dump()
+            for n in itertools.islice(cache, max(len(cache) - new_count, 0), None)
+        ]
+
+        cash, positions = executor.get_state()
+        return InstanceSync(
+            instance_id=instance_id,
+            check_count=instance["check_count"],
+            last_check=instance["last_check"],
+            cash=cash,
+            positions=positions,
+            trades=trades,
+            position_rows=position_rows,
+            portfolio_rows=portfolio_rows,
+            decisions=decisions,
+            notifications=notifications,
+        )
+
+    async def handle(self, conn, request_id: int, command: str, args: Tuple):
+        try:
+            if command == "add":
+                result = self.add(*args)
+            elif command == "check":
+                result = await self.check(*args)
+            elif command == "remove":
+                result = self.remove(*args)
+            else:
+                raise ValueError(f"Unknown worker command: {command}")
+        except Exception as e:
+            logger.error(f"Worker command {command} failed: {e}")
+            conn.send((request_id, False, f"{type(e).__name__}: {e}"))
+        else:
+            conn.send((request_id, True, result))
+
+
+async def _serve(conn, board_name: str, board_capacity: int) -> None:
+    # The agent module imports this one, so it is only imported here
+    from .agent import AutoTradingAgent
+
+    board = SharedMarketBoard(board_capacity, name=board_name)
+    runtime = _WorkerRuntime(
+        AutoTradingAgent.create_worker_host(SharedMarketSnapshots(board))
+    )
+    tasks = set()
+    try:
+        while True:
+            try:
+                request_id, command, args = await asyncio.to_thread(conn.recv)
+            except (EOFError, OSError):
+                break
+            if command == "stop":
+                break
+            task = asyncio.create_task(runtime.handle(conn, request_id, command, args))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    finally:
+        for task in tasks:
+            task.cancel()
+        board.close()
+
+
+def _worker_main(conn, board_name: str, board_capacity: int) -> None:
+    """Entry point of a worker process"""
+    asyncio.run(_serve(conn, board_name, board_capacity))
+
+
+# ============ Coordinator ============
+
+
+class _Worker:
+    def __init__(self, index: int, process, conn):
+        self.index = index
+        self.process = process
+        self.conn = conn
+        self.ready = asyncio.Event()
+
+
+class TradingWorkerPool:
+    """Coordinator of the worker processes hosting trading instances."""
+
+    def __init__(
+        self,
+        processes: int,
+        on_sync: Callable[[str, str, InstanceSync], None],
+        shard_by: str = SHARD_BY_SESSION,
+        board_capacity: int = MARKET_BOARD_CAPACITY,
+        max_restarts: int = WORKER_MAX_RESTARTS,
+    ):
+        """
+        Initialize the pool (processes start on first use).
+
+        Args:
+            processes: Number of worker processes
+            on_sync: Called with (session_id, instance_id, sync) for every
+                     sync received; applies it to the instance's mirror
+            shard_by: "session" keeps a session's instances on one worker,
+                      "instance" places each instance on the least loaded one
+            board_capacity: Symbols the shared market board holds
+            max_restarts: Times a worker is restarted after crashing
+        """
+        if processes < 1:
+            raise ValueError("A worker pool needs at least one process")
+        if shard_by not in (SHARD_BY_SESSION, SHARD_BY_INSTANCE):
+            raise ValueError(f"Unknown shard mode: {shard_by}")
+        self.processes = processes
+        self.shard_by = shard_by
+        self.board_capacity = board_capacity
+        self.max_restarts = max_restarts
+        self._on_sync = on_sync
+
+        self._context = get_context("spawn")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.board: Optional[SharedMarketBoard] = None
+        self._workers: List[Optional[_Worker]] = [None] * processes
+        self.restarts = [0] * processes
+        self._closed = False
+
+        # instance_id -> (worker index, session_id, mirror)
+        self._instances: Dict[str, Tuple[int, str, Dict[str, Any]]] = {}
+        # request id -> (worker index, future)
+        self._pending: Dict[int, Tuple[int, asyncio.Future]] = {}
+        self._request_ids = itertools.count()
+
+    # ============ Processes ============
+
+    def _ensure_started(self) -> None:
+        if self._closed:
+            raise RuntimeError("Worker pool is shut down")
+        if self._loop is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self.board = SharedMarketBoard(self.board_capacity)
+        for index in range(self.processes):
+            self._spawn(index)
+            self._workers[index].ready.set()
+
+    def _spawn(self, index: int) -> _Worker:
+        conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.board.name, self.board_capacity),
+            name=f"trading-worker-{index}",
+            daemon=True,
+        )
+        process.start()
+        # Only the child holds its end, so a dead child reads as EOF
+        child_conn.close()
+        worker = _Worker(index, process, conn)
+        self._workers[index] = worker
+        threading.Thread(
+            target=self._read, args=(worker,), name=process.name, daemon=True
+        ).start()
+        logger.info(f"Started trading worker {index} (pid {process.pid})")
+        return worker
+
+    def _read(self, worker: _Worker) -> None:
+        """Receive responses of one worker (runs in a thread)"""
+        while True:
+            try:
+                message = worker.conn.recv()
+            except (EOFError, OSError):
+                break
+            try:
+                self._loop.call_soon_threadsafe(self._resolve, *message)
+            except RuntimeError:
+                # The coordinator's event loop is closed
+                return
+        try:
+            self._loop.call_soon_threadsafe(self._worker_exited, worker)
+        except RuntimeError:
+            pass
+
+    def _resolve(self, request_id: int, ok: bool, payload: Any) -> None:
+        _, future = self._pending.pop(request_id, (None, None))
+        if future is None or future.done():
+            return
+        if ok:
+            future.set_result(payload)
+        else:
+            future.set_exception(RuntimeError(payload))
+
+    def _worker_exited(self, worker: _Worker) -> None:
+        if self._closed or self._workers[worker.index] is not worker:
+            return
+        worker.ready.clear()
+        worker.process.join(timeout=1)
+        logger.error(
+            f"Trading worker {worker.index} exited (code {worker.process.exitcode})"
+        )
+        for request_id, (index, future) in list(self._pending.items()):
+            if index == worker.index:
+                del self._pending[request_id]
+                if not future.done():
+                    future.set_exception(WorkerCrashedError(f"Worker {index} exited"))
+
+        if self.restarts[worker.index] >= self.max_restarts:
+            logger.error(f"Not restarting worker {worker.index} again")
+            self._workers[worker.index] = None
+            return
+        self.restarts[worker.index] += 1
+        asyncio.ensure_future(self._restart(worker.index))
+
+    async def _restart(self, index: int) -> None:
+        """Start a new worker and restore its instances from their mirrors"""
+        worker = self._spawn(index)
+        restored = 0
+        for instance_id, (assigned, session_id, mirror) in list(
+            self._instances.items()
+        ):
+            if assigned != index:
+                continue
+            try:
+                await self._add(
+                    worker,
+                    checkpoint_instance(session_id, instance_id, mirror),
+                    None,
+                )
+                restored += 1
+            except Exception as e:
+                logger.error(f"Failed to restore instance {instance_id}: {e}")
+        worker.ready.set()
+        logger.info(f"Restored {restored} instance(s) on worker {index}")
+
+    async def _request(self, worker: _Worker, command: str, *args) -> Any:
+        request_id = next(self._request_ids)
+        future = self._loop.create_future()
+        self._pending[request_id] = (worker.index, future)
+        try:
+            worker.conn.send((request_id, command, args))
+        except (BrokenPipeError, OSError) as e:
+            self._pending.pop(request_id, None)
+            raise WorkerCrashedError(f"Worker {worker.index} is gone: {e}")
+        return await future
+
+    async def _ready_worker(self, instance_id: str) -> _Worker:
+        index = self._instances[instance_id][0]
+        worker = self._workers[index]
+        if worker is None:
+            raise WorkerCrashedError(f"Worker {index} is not running")
+        await worker.ready.wait()
+        return worker
+
+    def _place(self, session_id: str) -> int:
+        if self.shard_by == SHARD_BY_SESSION:
+            for index, assigned_session, _ in self._instances.values():
+                if assigned_session == session_id:
+                    return index
+        load = [0] * self.processes
+        for index, _, _ in self._instances.values():
+            load[index] += 1
+        running = [i for i in range(self.processes) if self._workers[i] is not None]
+        if not running:
+            raise WorkerCrashedError("No worker process is running")
+        return min(running, key=lambda i: load[i])
+
+    # ============ Instances ============
+
+    async def _add(
+        self,
+        worker: _Worker,
+        checkpoint: InstanceCheckpoint,
+        snapshot_at: Optional[datetime],
+    ) -> None:
+        sync = await self._request(worker, "add", checkpoint, snapshot_at)
+        self._on_sync(checkpoint.session_id, checkpoint.instance_id, sync)
+
+    async def add_instance(
+        self,
+        session_id: str,
+        instance_id: str,
+        instance: Dict[str, Any],
+        snapshot_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Place an instance on a worker.
+
+        Args:
+            session_id: Session identifier
+            instance_id: Trading instance identifier
+            instance: The coordinator's mirror of the instance
+            snapshot_at: Take an initial portfolio snapshot at this time
+        """
+        self._ensure_started()
+        index = self._place(session_id)
+        self._instances[instance_id] = (index, session_id, instance)
+        worker = await self._ready_worker(instance_id)
+        await self._add(
+            worker, checkpoint_instance(session_id, instance_id, instance), snapshot_at
+        )
+
+    async def check(
+        self, session_id: str, instance_id: str, tick: Optional[datetime]
+    ) -> None:
+        """Run one trading check of an instance on its worker"""
+        worker = await self._ready_worker(instance_id)
+        sync = await self._request(worker, "check", session_id, instance_id, tick)
+        self._on_sync(session_id, instance_id, sync)
+
+    async def remove_instance(self, session_id: str, instance_id: str) -> None:
+        """Stop hosting an instance"""
+        entry = self._instances.pop(instance_id, None)
+        worker = self._workers[entry[0]] if entry else None
+        if worker is not None and worker.ready.is_set():
+            try:
+                await self._request(worker, "remove", session_id, instance_id)
+            except WorkerCrashedError:
+                pass
+
+    def publish(
+        self, symbol: str, tick: datetime, indicators: Optional[TechnicalIndicators]
+    ) -> None:
+        """Publish a symbol's snapshot of a tick to the workers"""
+        self._ensure_started()
+        self.board.publish(symbol, tick, indicators)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return instance placement and restart counters"""
+        load = [0] * self.processes
+        for index, _, _ in self._instances.values():
+            load[index] += 1
+        return {
+            "processes": self.processes,
+            "instances": load,
+            "restarts": list(self.restarts),
+        }
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop all worker processes and free the shared market board"""
+        self._closed = True
+        for worker in self._workers:
+            if worker is None:
+                continue
+            try:
+                worker.conn.send((-1, "stop", ()))
+            except (BrokenPipeError, OSError):
+                pass
+        for worker in self._workers:
+            if worker is None:
+                continue
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.conn.close()
+        for _, future in self._pending.values():
+            if not future.done():
+                future.set_exception(WorkerCrashedError("Worker pool shut down"))
+        self._pending.clear()
+        if self.board is not None:
+            self.board.close()
+            self.board = None
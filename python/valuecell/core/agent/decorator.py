@@ -205,6 +205,10 @@ class GenericAgentExecutor(AgentExecutor):
                 if response_event == CommonResponseEvent.COMPONENT_GENERATOR:
                     metadata["component_type"] = response.metadata.get("component_type")
                     metadata["component_id"] = response.metadata.get("component_id")
+                    metadata["component_seq"] = response.metadata.get("component_seq")
+                    metadata["component_delta"] = response.metadata.get(
+                        "component_delta"
+                    )
                 await updater.update_status(
                     TaskState.working,
                     message=new_agent_text_message(response.content or ""),
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from valuecell.core.types import (
     CommonResponseEvent,
+    ComponentAppendDelta,
+    ComponentDeltaOp,
     NotifyResponse,
     NotifyResponseEvent,
     StreamResponse,
@@ -78,7 +80,11 @@ class _StreamResponseNamespace:
         )
 
     def component_generator(
-        self, content: str, component_type: str, component_id: Optional[str] = None
+        self,
+        content: str,
+        component_type: str,
+        component_id: Optional[str] = None,
+        seq: Optional[int] = None,
     ) -> StreamResponse:
         """Create a component generator response.
 
@@ -88,6 +94,9 @@ class _StreamResponseNamespace:
             component_id: Optional stable component ID for replace behavior.
                          If provided, this will override the auto-generated item_id,
                          allowing the frontend to replace components with the same ID.
+            seq: Optional version of a sequenced component. Later
+                 `component_delta` responses for the same component_id apply
+                 on top of this snapshot.
 
         Returns:
             StreamResponse with COMPONENT_GENERATOR event.
@@ -100,6 +109,8 @@ class _StreamResponseNamespace:
         metadata = {"component_type": component_type}
         if component_id is not None:
             metadata["component_id"] = component_id
+        if seq is not None:
+            metadata["component_seq"] = seq
 
         return StreamResponse(
             event=CommonResponseEvent.COMPONENT_GENERATOR,
@@ -107,6 +118,45 @@ class _StreamResponseNamespace:
             metadata=metadata,
         )
 
+    def component_delta(
+        self,
+        items: List[Any],
+        component_type: str,
+        component_id: str,
+        seq: int,
+        max_items: Optional[int] = None,
+        fields: Optional[Dict[str, Any]] = None,
+        keep_head: int = 0,
+    ) -> StreamResponse:
+        """Create an append delta for a sequenced component.
+
+        Args:
+            items: Items appended to the component's list
+            component_type: Type of the component
+            component_id: ID of the component the delta applies to
+            seq: New component version; applies on top of version `seq - 1`
+            max_items: Keep only the newest `max_items` items after appending
+            fields: Top-level fields of an object component to overwrite
+            keep_head: Leading items never trimmed by `max_items`
+
+        Returns:
+            StreamResponse with COMPONENT_GENERATOR event carrying a
+            ComponentAppendDelta.
+        """
+        delta = ComponentAppendDelta(
+            items=items, max_items=max_items, fields=fields or {}, keep_head=keep_head
+        )
+        return StreamResponse(
+            event=CommonResponseEvent.COMPONENT_GENERATOR,
+            content=delta.model_dump_json(),
+            metadata={
+                "component_type": component_type,
+                "component_id": component_id,
+                "component_seq": seq,
+                "component_delta": ComponentDeltaOp.APPEND.value,
+            },
+        )
+
     def done(self, content: Optional[str] = None) -> StreamResponse:
         """Create a task completed response.
 
@@ -1,3 +1,5 @@
+import json
+import logging
 import time
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
@@ -8,6 +10,7 @@ from valuecell.core.types import (
     BaseResponse,
     BaseResponseDataPayload,
     CommonResponseEvent,
+    ComponentAppendDelta,
     NotifyResponseEvent,
     ResponseMetadata,
     ResponsePayload,
@@ -18,6 +21,8 @@ from valuecell.core.types import (
 )
 from valuecell.utils.uuid import generate_item_id
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class SaveItem:
@@ -76,6 +81,38 @@ class BufferEntry:
         return BaseResponseDataPayload(content=content)
 
 
+def apply_component_delta(content: str, delta: str) -> str:
+    """Apply a ComponentAppendDelta (JSON) to serialized component content.
+
+    Items are appended to the content itself when it is a JSON array, else to
+    its `data` field (a JSON-encoded string `data` stays JSON-encoded).
+    """
+    change = ComponentAppendDelta.model_validate_json(delta)
+    value = json.loads(content)
+
+    encoded = False
+    if isinstance(value, list):
+        target = value
+    else:
+        target = value.get("data")
+        encoded = isinstance(target, str)
+        if encoded:
+            target = json.loads(target)
+        elif target is None:
+            target = []
+
+    target.extend(change.items)
+    if change.max_items is not None and len(target) > change.max_items:
+        head = change.keep_head
+        del target[head : head + len(target) - change.max_items]
+
+    if isinstance(value, list):
+        return json.dumps(value)
+    value.update(change.fields)
+    value["data"] = json.dumps(target) if encoded else target
+    return json.dumps(value)
+
+
 class ResponseBuffer:
     """Buffer streaming responses and produce persistence-ready SaveItem objects.
 
@@ -87,10 +124,22 @@ class ResponseBuffer:
         is received. This preserves a stable paragraph `item_id` across chunks.
 
     The buffer key is a tuple (conversation_id, thread_id, task_id, event).
+
+    Sequenced components (payloads with a `seq`) are compacted: the latest
+    content of each component is kept by item_id, and an append delta is
+    persisted as the full component with the delta applied, so the stored
+    item is always a snapshot. Deltas that do not follow the last known
+    version are not persisted; the agent's next snapshot resyncs them.
+    Component state is dropped when its task is flushed.
     """
 
     def __init__(self):
         self._buffers: Dict[BufferKey, BufferEntry] = {}
+        # item_id -> (seq, content, (conversation_id, thread_id, task_id)) of
+        # sequenced components
+        self._components: Dict[
+            str, Tuple[int, str, Tuple[str, Optional[str], Optional[str]]]
+        ] = {}
 
         self._immediate_events = {
             StreamResponseEvent.TOOL_CALL_COMPLETED,
@@ -161,6 +210,11 @@ class ResponseBuffer:
             keys_to_flush = self._collect_task_keys(conv_id, th_id, tk_id)
             out.extend(self._finalize_keys(keys_to_flush))
             # Now write the immediate item
+            if ev == CommonResponseEvent.COMPONENT_GENERATOR:
+                item = self._compact_component(resp)
+                if item is not None:
+                    out.append(item)
+                return out
             out.append(self._make_save_item_from_response(resp))
             return out
 
@@ -260,11 +314,59 @@ class ResponseBuffer:
         """Finalize and emit all buffered aggregates for a given task context.
 
         This writes current aggregates (using their stable paragraph item_id)
-        and clears the corresponding buffers. Use at task end (success or fail).
+        and clears the corresponding buffers and component state. Use at task
+        end (success or fail).
         """
+        for item_id, (_, _, ctx) in list(self._components.items()):
+            k_conv, k_thread, k_task = ctx
+            if (
+                k_conv == conversation_id
+                and (thread_id is None or k_thread == thread_id)
+                and (task_id is None or k_task == task_id)
+            ):
+                del self._components[item_id]
         keys_to_flush = self._collect_task_keys(conversation_id, thread_id, task_id)
         return self._finalize_keys(keys_to_flush)
 
+    def _compact_component(self, resp: BaseResponse) -> Optional[SaveItem]:
+        """Return the SaveItem for a component event, applying deltas."""
+        data: UnifiedResponseData = resp.data
+        payload = data.payload
+        seq = getattr(payload, "seq", None)
+        if seq is None:
+            return self._make_save_item_from_response(resp)
+
+        ctx = (data.conversation_id, data.thread_id, data.task_id)
+        if payload.delta is None:
+            self._components[data.item_id] = (seq, payload.content, ctx)
+            return self._make_save_item_from_response(resp)
+
+        state = self._components.get(data.item_id)
+        if state is None or state[0] != seq - 1:
+            logger.warning(
+                f"Dropping delta {seq} for component {data.item_id}: "
+                f"base version {state[0] if state else None} is not {seq - 1}"
+            )
+            return None
+        try:
+            content = apply_component_delta(state[1], payload.content)
+        except (ValueError, TypeError, AttributeError) as e:
+            logger.warning(f"Invalid delta for component {data.item_id}: {e}")
+            return None
+
+        self._components[data.item_id] = (seq, content, ctx)
+        return SaveItem(
+            item_id=data.item_id,
+            event=resp.event,
+            conversation_id=data.conversation_id,
+            thread_id=data.thread_id,
+            task_id=data.task_id,
+            payload=payload.model_copy(update={"content": content, "delta": None}),
+            role=data.role,
+            agent_name=data.agent_name,
+            metadata=data.metadata,
+        )
+
     def _make_save_item_from_response(self, resp: BaseResponse) -> SaveItem:
         data: UnifiedResponseData = resp.data
         payload = data.payload
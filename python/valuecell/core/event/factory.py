@@ -501,6 +501,8 @@ class ResponseFactory:
         component_id: Optional[str] = None,
         agent_name: Optional[str] = None,
         metadata: Optional[dict] = None,
+        seq: Optional[int] = None,
+        delta: Optional[str] = None,
     ) -> ComponentGeneratorResponse:
         """Create a ComponentGeneratorResponse for UI component generation.
 
@@ -512,6 +514,8 @@ class ResponseFactory:
             component_type: Free-form type string for the generated component.
             item_id: Optional stable paragraph/item id; generated if omitted.
             component_id: Optional component id that overrides item_id for replace behavior.
+            seq: Optional version of a sequenced component.
+            delta: Delta operation when content is a delta rather than a snapshot.
 
         Returns:
             ComponentGeneratorResponse wrapping the payload.
@@ -524,6 +528,8 @@ class ResponseFactory:
                 payload=ComponentGeneratorResponseDataPayload(
                     content=content,
                     component_type=component_type,
+                    seq=seq,
+                    delta=delta,
                 ),
                 role=Role.AGENT,
                 item_id=component_id or generate_item_id(),
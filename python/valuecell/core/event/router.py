@@ -141,6 +141,13 @@ async def handle_status_update(
     ):
         component_type = event.metadata.get("component_type", "unknown")
         component_id = event.metadata.get("component_id")
+        # Sequenced components (snapshot + deltas) carry their version
+        sequence = {}
+        if event.metadata.get("component_seq") is not None:
+            sequence = {
+                "seq": event.metadata["component_seq"],
+                "delta": event.metadata.get("component_delta"),
+            }
         responses.append(
             response_factory.component_generator(
                 conversation_id=task.conversation_id,
@@ -150,6 +157,7 @@ async def handle_status_update(
                 component_type=component_type,
                 component_id=component_id,
                 agent_name=task.agent_name,
+                **sequence,
             )
         )
         return RouteResult(responses)
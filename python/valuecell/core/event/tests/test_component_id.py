@@ -1,5 +1,7 @@
 """Tests for component_id override functionality."""
 
+import json
+
 from valuecell.core.agent.responses import streaming, notification
 from valuecell.core.event.factory import ResponseFactory
 from valuecell.core.types import CommonResponseEvent
@@ -43,6 +45,39 @@ class TestComponentIdInStreamingResponse:
 
         assert "component_id" not in response.metadata
 
+    def test_component_generator_with_seq(self):
+        """Test that a sequenced snapshot carries its version"""
+        response = streaming.component_generator(
+            content="[]",
+            component_type="test_component",
+            component_id="my_custom_id",
+            seq=3,
+        )
+
+        assert response.metadata["component_seq"] == 3
+        assert "component_delta" not in response.metadata
+
+    def test_component_delta(self):
+        """Test that component_delta builds an append delta"""
+        response = streaming.component_delta(
+            items=[{"a": 1}],
+            component_type="test_component",
+            component_id="my_custom_id",
+            seq=4,
+            max_items=10,
+        )
+
+        assert response.event == CommonResponseEvent.COMPONENT_GENERATOR
+        assert json.loads(response.content) == {
+            "items": [{"a": 1}],
+            "max_items": 10,
+            "keep_head": 0,
+            "fields": {},
+        }
+        assert response.metadata["component_id"] == "my_custom_id"
+        assert response.metadata["component_seq"] == 4
+        assert response.metadata["component_delta"] == "append"
+
 
 class TestComponentIdInNotificationResponse:
     """Test component_id in notification.component_generator()"""
@@ -2,6 +2,7 @@
 Unit tests for valuecell.core.response.buffer module
 """
 
+import json
 import time
 
 import pytest
@@ -10,7 +11,9 @@ from valuecell.core.event.buffer import (
     BufferEntry,
     ResponseBuffer,
     SaveItem,
+    apply_component_delta,
 )
+from valuecell.core.event.factory import ResponseFactory
 from valuecell.core.types import (
     BaseResponse,
     BaseResponseDataPayload,
@@ -528,3 +531,80 @@ class TestResponseBuffer:
         assert len(result.item_id) > 0
         assert result.event == NotifyResponseEvent.MESSAGE
         assert result.role == Role.USER
+
+
+class TestComponentDeltas:
+    """Test compaction of sequenced component snapshots and deltas."""
+
+    @staticmethod
+    def _component(content, seq, delta=None):
+        return ResponseFactory().component_generator(
+            conversation_id="conv-123",
+            thread_id="thread-123",
+            task_id="task-123",
+            content=content,
+            component_type="filtered_card_push_notification",
+            component_id="status-1",
+            seq=seq,
+            delta=delta,
+        )
+
+    @staticmethod
+    def _delta(items, max_items=None):
+        return json.dumps({"items": items, "max_items": max_items})
+
+    def test_apply_delta_to_list_and_encoded_data(self):
+        """Items extend a JSON array, or an object's JSON-encoded data."""
+        assert apply_component_delta("[1, 2, 3]", self._delta([4, 5], 4)) == (
+            "[2, 3, 4, 5]"
+        )
+
+        chart = json.dumps({"title": "t", "data": json.dumps([["Time", "a"]])})
+        delta = json.dumps({"items": [["10:00", 1.0]], "fields": {"title": "u"}})
+        updated = json.loads(apply_component_delta(chart, delta))
+        assert updated["title"] == "u"
+        assert json.loads(updated["data"]) == [["Time", "a"], ["10:00", 1.0]]
+
+    def test_apply_delta_keeps_head_items_when_trimming(self):
+        """Leading items such as a chart header survive max_items."""
+        delta = json.dumps({"items": [4, 5], "max_items": 3, "keep_head": 1})
+        assert apply_component_delta("[0, 1, 2, 3]", delta) == "[0, 4, 5]"
+
+    def test_deltas_are_compacted_into_the_stored_item(self):
+        """Each delta persists the full component with the delta applied."""
+        buffer = ResponseBuffer()
+
+        (snapshot,) = buffer.ingest(self._component("[1]", 0))
+        assert snapshot.item_id == "status-1"
+        assert snapshot.payload.content == "[1]"
+
+        (item,) = buffer.ingest(self._component(self._delta([2]), 1, "append"))
+        assert item.item_id == "status-1"
+        assert json.loads(item.payload.content) == [1, 2]
+        assert item.payload.seq == 1
+        assert item.payload.delta is None
+
+        (item,) = buffer.ingest(self._component(self._delta([3], 2), 2, "append"))
+        assert json.loads(item.payload.content) == [2, 3]
+
+    def test_out_of_order_delta_is_dropped_until_next_snapshot(self):
+        """A delta that does not follow the stored version is not persisted."""
+        buffer = ResponseBuffer()
+        assert buffer.ingest(self._component(self._delta([2]), 1, "append")) == []
+
+        buffer.ingest(self._component("[1]", 0))
+        assert buffer.ingest(self._component(self._delta([3]), 2, "append")) == []
+
+        buffer.ingest(self._component("[5]", 3))
+        (item,) = buffer.ingest(self._component(self._delta([6]), 4, "append"))
+        assert json.loads(item.payload.content) == [5, 6]
+
+    def test_flushing_a_task_drops_its_component_state(self):
+        """Component versions are not kept after their task ends."""
+        buffer = ResponseBuffer()
+        buffer.ingest(self._component("[1]", 0))
+
+        buffer.flush_task("conv-123", "thread-123", "task-123")
+
+        assert buffer._components == {}
+        assert buffer.ingest(self._component(self._delta([2]), 1, "append")) == []
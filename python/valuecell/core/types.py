@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import AsyncGenerator, Callable, Dict, List, Literal, Optional, Union
+from typing import Any, AsyncGenerator, Callable, Dict, List, Literal, Optional, Union
 
 from a2a.types import Task, TaskArtifactUpdateEvent, TaskStatusUpdateEvent
 from pydantic import BaseModel, Field
@@ -133,6 +133,12 @@ class BaseResponseDataPayload(BaseModel, ABC):
     content: Optional[str] = Field(None, description="The message content")
 
 
+class ComponentDeltaOp(str, Enum):
+    """Operations a component delta applies to the previous component version."""
+
+    APPEND = "append"
+
+
 class ComponentGeneratorResponseDataPayload(BaseResponseDataPayload):
     """Payload for responses that generate UI components.
 
@@ -141,9 +147,44 @@ class ComponentGeneratorResponseDataPayload(BaseResponseDataPayload):
     Note: To enable component replacement behavior, pass a `component_id`
     via the StreamResponse metadata. This will override the auto-generated
     item_id, allowing the frontend to replace components with matching IDs.
+
+    Sequenced components carry a `seq` version. A payload without `delta` is
+    a full snapshot that replaces the component; a payload with `delta` holds
+    a ComponentAppendDelta that only applies on top of version `seq - 1`.
     """
 
     component_type: str = Field(..., description="The component type")
+    seq: Optional[int] = Field(
+        None, description="Version of a sequenced component (snapshot or delta)"
+    )
+    delta: Optional[ComponentDeltaOp] = Field(
+        None, description="Set when content is a delta instead of a full snapshot"
+    )
+
+
+class ComponentAppendDelta(BaseModel):
+    """Content of an append delta for a component.
+
+    Items are appended to the component's list: the content itself when it
+    is a JSON array, otherwise its `data` field (decoded first when `data` is
+    a JSON string, as in FilteredLineChartComponentData).
+    """
+
+    items: List[Any] = Field(
+        default_factory=list, description="Items appended to the component list"
+    )
+    max_items: Optional[int] = Field(
+        None, description="Keep only the newest max_items items after appending"
+    )
+    keep_head: int = Field(
+        0,
+        description="Leading items (e.g. a header row) kept when trimming to "
+        "max_items; they count towards max_items",
+    )
+    fields: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Top-level fields of an object component to overwrite",
+    )
 
 
 class ComponentType(str, Enum):
@@ -8,6 +8,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from ...adapters.assets import get_adapter_manager
 from ..config.settings import get_settings
+from ..services.assets.asset_service import get_asset_service
 from .exceptions import (
     APIException,
     api_exception_handler,
@@ -58,6 +59,15 @@ def create_app() -> FastAPI:
 
             print("Data adapters configuration completed")
 
+            # Build the local symbol index (assets table, then exchange
+            # listings in the background) so searches answer locally
+            try:
+                count = get_asset_service().build_symbol_index()
+                manager.refresh_symbol_index_async()
+                print(f"✓ Symbol index loaded with {count} local assets")
+            except Exception as e:
+                print(f"✗ Symbol index build failed: {e}")
+
         except Exception as e:
             print(f"Error configuring adapters: {e}")
 
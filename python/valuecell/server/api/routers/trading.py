@@ -2,124 +2,54 @@
 
 import json
 import logging
-import os
-from collections import defaultdict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List
 
 from fastapi import APIRouter, HTTPException
 
+from valuecell.agents.auto_trading_agent.performance_metrics import get_metrics_engine
+from valuecell.agents.auto_trading_agent.trading_store import get_trading_state_store
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/trading", tags=["trading"])
 
+# Number of most recent snapshots the charts are built from
+CHART_HISTORY_LIMIT = 100
+
 
-def get_all_trading_instances() -> List[Dict[str, Any]]:
+async def get_all_trading_instances() -> List[Dict[str, Any]]:
     """
-    Get all active trading instances from persisted data file
-    This reads the data saved by AutoTradingAgent
+    Get all trading instances (one summary row each) from the trading state store
+    This reads the state persisted by AutoTradingAgent after every check
     """
     try:
-        file_path = "/tmp/valuecell_trading_data.json"
-        
-        # Check if file exists
-        if not os.path.exists(file_path):
-            logger.debug(f"Trading data file not found: {file_path}")
-            return []
-        
-        # Read the file
-        with open(file_path, "r") as f:
-            data = json.load(f)
-        
-        instances_data = []
-        for instance in data.get("instances", []):
-            instances_data.append({
-                "instance_id": instance["instance_id"],
-                "session_id": instance["session_id"],
-                "data": instance,
-            })
-        
-        return instances_data
-    except FileNotFoundError:
-        logger.debug("Trading data file not found")
-        return []
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse trading data JSON: {e}")
-        return []
+        return await get_trading_state_store().list_instances()
     except Exception as e:
         logger.error(f"Failed to get trading instances: {e}")
         return []
 
 
-def calculate_sharpe_ratio(instance_data: Dict[str, Any]) -> float:
-    """Calculate Sharpe ratio from portfolio history"""
-    try:
-        portfolio_history = instance_data.get("portfolio_history", [])
-        if len(portfolio_history) < 2:
-            return 0.0
-        
-        # Calculate returns
-        returns = []
-        for i in range(1, len(portfolio_history)):
-            prev_value = portfolio_history[i-1].get("total_value", 0)
-            curr_value = portfolio_history[i].get("total_value", 0)
-            if prev_value > 0:
-                returns.append((curr_value - prev_value) / prev_value)
-        
-        if not returns:
-            return 0.0
-        
-        # Simple Sharpe ratio (assuming risk-free rate = 0)
-        import statistics
-        mean_return = statistics.mean(returns)
-        std_return = statistics.stdev(returns) if len(returns) > 1 else 0.001
-        
-        # Annualize (assuming each check is 1 minute)
-        sharpe = (mean_return / std_return) * (252 * 24 * 60) ** 0.5 if std_return > 0 else 0
-        return round(sharpe, 2)
-    except Exception as e:
-        logger.error(f"Failed to calculate Sharpe ratio: {e}")
-        return 0.0
-
-
-def calculate_win_rate(instance_data: Dict[str, Any]) -> float:
-    """Calculate win rate from trade history"""
-    try:
-        trade_history = instance_data.get("trade_history", [])
-        closed_trades = [t for t in trade_history if t.get("action") == "closed" and t.get("pnl") is not None]
-        
-        if not closed_trades:
-            return 0.0
-        
-        winning_trades = len([t for t in closed_trades if t.get("pnl", 0) > 0])
-        win_rate = (winning_trades / len(closed_trades)) * 100
-        return round(win_rate, 2)
-    except Exception as e:
-        logger.error(f"Failed to calculate win rate: {e}")
-        return 0.0
+async def get_trading_instance(instance_id: str) -> Dict[str, Any]:
+    """Get one trading instance by ID, raising 404 if it does not exist"""
+    instance = await get_trading_state_store().get_instance(instance_id)
+    if instance is None:
+        raise HTTPException(status_code=404, detail=f"Instance {instance_id} not found")
+    return instance
 
 
-def calculate_max_drawdown(instance_data: Dict[str, Any]) -> float:
-    """Calculate maximum drawdown from portfolio history"""
+def format_timestamp(timestamp: Any, fmt: str) -> str:
+    """Format an ISO timestamp string for display"""
+    if not timestamp:
+        return ""
     try:
-        portfolio_history = instance_data.get("portfolio_history", [])
-        if len(portfolio_history) < 2:
-            return 0.0
-        
-        values = [p.get("total_value", 0) for p in portfolio_history]
-        peak = values[0]
-        max_dd = 0.0
-        
-        for value in values:
-            if value > peak:
-                peak = value
-            dd = (peak - value) / peak if peak > 0 else 0
-            max_dd = max(max_dd, dd)
-        
-        return round(max_dd * 100, 2)
-    except Exception as e:
-        logger.error(f"Failed to calculate max drawdown: {e}")
-        return 0.0
+        if isinstance(timestamp, str):
+            dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+        else:
+            dt = timestamp
+        return dt.strftime(fmt)
+    except Exception:
+        return str(timestamp)
 
 
 @router.get("/dashboard")
@@ -130,8 +60,8 @@ async def get_trading_dashboard() -> Dict[str, Any]:
     Returns summary statistics for all active trading instances
     """
     try:
-        instances = get_all_trading_instances()
-        
+        instances = await get_all_trading_instances()
+
         if not instances:
             return {
                 "total_instances": 0,
@@ -141,34 +71,15 @@ async def get_trading_dashboard() -> Dict[str, Any]:
                 "active_positions": 0,
                 "total_trades": 0,
             }
-        
-        total_value = 0.0
-        total_initial = 0.0
-        active_positions = 0
-        total_trades = 0
-        
-        for inst in instances:
-            data = inst["data"]
-            config = data.get("config", {})
-            
-            # Get latest portfolio value
-            portfolio_history = data.get("portfolio_history", [])
-            if portfolio_history:
-                total_value += portfolio_history[-1].get("total_value", 0)
-            
-            total_initial += config.get("initial_capital", 0)
-            
-            # Count positions
-            position_history = data.get("position_history", [])
-            if position_history:
-                active_positions += len(position_history[-1:])  # Latest snapshot
-            
-            # Count trades
-            total_trades += len(data.get("trade_history", []))
-        
+
+        total_value = sum(inst["total_value"] or 0 for inst in instances)
+        total_initial = sum(inst["initial_capital"] or 0 for inst in instances)
+        total_trades = sum(inst["trade_count"] for inst in instances)
+        active_positions = await get_trading_state_store().get_open_positions_count()
+
         total_pnl = total_value - total_initial
         total_pnl_pct = (total_pnl / total_initial * 100) if total_initial > 0 else 0
-        
+
         return {
             "total_instances": len(instances),
             "total_value": round(total_value, 2),
@@ -190,35 +101,25 @@ async def get_leaderboard() -> List[Dict[str, Any]]:
     Returns ranked list of all trading instances with key metrics
     """
     try:
-        instances = get_all_trading_instances()
-        
-        if not instances:
-            return []
-        
+        store = get_trading_state_store()
+        engine = get_metrics_engine()
+        instances = await get_all_trading_instances()
+
         leaderboard = []
-        
+
         for inst in instances:
-            data = inst["data"]
-            config = data.get("config", {})
-            
-            # Calculate metrics
-            initial_capital = config.get("initial_capital", 0)
-            portfolio_history = data.get("portfolio_history", [])
-            
-            if not portfolio_history:
+            config = inst["config"]
+
+            # Cached per instance; only new snapshots/trades are read
+            metrics = await engine.get_metrics(store, inst)
+            if not metrics["snapshots"]:
                 continue
-            
-            current_value = portfolio_history[-1].get("total_value", 0)
+
+            initial_capital = inst["initial_capital"]
+            current_value = inst["total_value"]
             pnl = current_value - initial_capital
             pnl_pct = (pnl / initial_capital * 100) if initial_capital > 0 else 0
-            
-            sharpe_ratio = calculate_sharpe_ratio(data)
-            win_rate = calculate_win_rate(data)
-            max_drawdown = calculate_max_drawdown(data)
-            
-            trade_history = data.get("trade_history", [])
-            total_trades = len([t for t in trade_history if t.get("action") == "closed"])
-            
+
             leaderboard.append({
                 "instance_id": inst["instance_id"],
                 "model": config.get("agent_model", "unknown"),
@@ -227,21 +128,24 @@ async def get_leaderboard() -> List[Dict[str, Any]]:
                 "current_value": round(current_value, 2),
                 "pnl": round(pnl, 2),
                 "pnl_pct": round(pnl_pct, 2),
-                "sharpe_ratio": sharpe_ratio,
-                "win_rate": win_rate,
-                "max_drawdown": max_drawdown,
-                "total_trades": total_trades,
-                "created_at": data.get("created_at", ""),
-                "active": data.get("active", False),
+                "sharpe_ratio": metrics["sharpe_ratio"],
+                "sortino_ratio": metrics["sortino_ratio"],
+                "calmar_ratio": metrics["calmar_ratio"],
+                "win_rate": metrics["win_rate"],
+                "profit_factor": metrics["profit_factor"],
+                "max_drawdown": metrics["max_drawdown"],
+                "total_trades": inst["closed_trade_count"],
+                "created_at": inst.get("created_at") or "",
+                "active": inst["active"],
             })
-        
+
         # Sort by PnL percentage (descending)
         leaderboard.sort(key=lambda x: x["pnl_pct"], reverse=True)
-        
+
         # Add rank
         for i, entry in enumerate(leaderboard):
             entry["rank"] = i + 1
-        
+
         return leaderboard
     except Exception as e:
         logger.error(f"Failed to get leaderboard: {e}")
@@ -256,50 +160,25 @@ async def get_instance_chart(instance_id: str) -> Dict[str, Any]:
     Returns data in the format compatible with frontend mock data
     """
     try:
-        instances = get_all_trading_instances()
-        
-        # Find the instance
-        target_instance = None
-        for inst in instances:
-            if inst["instance_id"] == instance_id:
-                target_instance = inst
-                break
-        
-        if not target_instance:
-            raise HTTPException(status_code=404, detail="Instance not found")
-        
-        data = target_instance["data"]
-        config = data.get("config", {})
-        portfolio_history = data.get("portfolio_history", [])
-        
+        instance = await get_trading_instance(instance_id)
+        portfolio_history = await get_trading_state_store().get_portfolio_history(
+            instance_id, limit=CHART_HISTORY_LIMIT
+        )
+
         # Build chart data in format: [["Time", "Model"], [timestamp, value], ...]
         chart_data = [
-            ["Time", config.get("agent_model", "unknown")]
+            ["Time", instance["config"].get("agent_model", "unknown")]
         ]
-        
         for snapshot in portfolio_history:
-            timestamp = snapshot.get("timestamp", "")
-            total_value = snapshot.get("total_value", 0)
-            
-            # Format timestamp
-            if timestamp:
-                try:
-                    if isinstance(timestamp, str):
-                        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    else:
-                        dt = timestamp
-                    timestamp_str = dt.strftime("%Y-%m-%d %H:%M:%S")
-                except:
-                    timestamp_str = str(timestamp)
-            else:
-                timestamp_str = ""
-            
-            chart_data.append([timestamp_str, total_value])
-        
+            chart_data.append([
+                format_timestamp(snapshot["timestamp"], "%Y-%m-%d %H:%M:%S"),
+                snapshot["total_value"],
+            ])
+
         return {
             "title": f"Portfolio Value History - {instance_id[:20]}",
             "data": json.dumps(chart_data),
-            "create_time": data.get("created_at", ""),
+            "create_time": instance.get("created_at") or "",
         }
     except HTTPException:
         raise
@@ -316,55 +195,47 @@ async def get_multi_model_comparison() -> Dict[str, Any]:
     Returns aligned portfolio values for all active instances
     """
     try:
-        instances = get_all_trading_instances()
-        
+        store = get_trading_state_store()
+        instances = await get_all_trading_instances()
+
         if not instances:
             return {
                 "title": "Portfolio Value History - No Active Instances",
                 "data": json.dumps([["Time"]]),
                 "create_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             }
-        
+
         # Collect all timestamps and values
         model_data = {}
         all_timestamps = set()
-        
+
         for inst in instances:
-            data = inst["data"]
-            config = data.get("config", {})
-            model_name = config.get("agent_model", "unknown")
-            
+            model_name = inst["config"].get("agent_model", "unknown")
             model_data[model_name] = {}
-            
-            for snapshot in data.get("portfolio_history", []):
-                timestamp = snapshot.get("timestamp", "")
-                if timestamp:
-                    try:
-                        if isinstance(timestamp, str):
-                            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                        else:
-                            dt = timestamp
-                        timestamp_str = dt.strftime("%Y-%m-%d %H:%M:%S")
-                    except:
-                        timestamp_str = str(timestamp)
-                    
-                    model_data[model_name][timestamp_str] = snapshot.get("total_value", 0)
-                    all_timestamps.add(timestamp_str)
-        
+
+            portfolio_history = await store.get_portfolio_history(
+                inst["instance_id"], limit=CHART_HISTORY_LIMIT
+            )
+            for snapshot in portfolio_history:
+                timestamp_str = format_timestamp(
+                    snapshot["timestamp"], "%Y-%m-%d %H:%M:%S"
+                )
+                model_data[model_name][timestamp_str] = snapshot["total_value"]
+                all_timestamps.add(timestamp_str)
+
         # Sort timestamps
         sorted_timestamps = sorted(all_timestamps)
-        
+
         # Build chart data
         model_names = list(model_data.keys())
         chart_data = [["Time"] + model_names]
-        
+
         for timestamp in sorted_timestamps:
             row = [timestamp]
             for model_name in model_names:
-                value = model_data[model_name].get(timestamp, None)
-                row.append(value)
+                row.append(model_data[model_name].get(timestamp, None))
             chart_data.append(row)
-        
+
         return {
             "title": "Portfolio Value History - Multi Models Comparison",
             "data": json.dumps(chart_data),
@@ -383,63 +254,37 @@ async def get_instance_trades(instance_id: str) -> Dict[str, Any]:
     Returns formatted trade data compatible with frontend
     """
     try:
-        instances = get_all_trading_instances()
-        
-        # Find the instance
-        target_instance = None
-        for inst in instances:
-            if inst["instance_id"] == instance_id:
-                target_instance = inst
-                break
-        
-        if not target_instance:
-            raise HTTPException(status_code=404, detail="Instance not found")
-        
-        data = target_instance["data"]
-        config = data.get("config", {})
-        trade_history = data.get("trade_history", [])
-        
+        instance = await get_trading_instance(instance_id)
+        # Last 20 closed trades
+        closed_trades = await get_trading_state_store().get_trades(
+            instance_id, limit=20, action="closed"
+        )
+
         # Build markdown table
-        model_name = config.get("agent_model", "unknown")
+        model_name = instance["config"].get("agent_model", "unknown")
         trades_md = f"# Trade History - {model_name}\n\n"
         trades_md += f"**Instance ID:** `{instance_id}`\n\n"
         trades_md += "---\n\n"
-        
-        # Group trades by closed positions
-        closed_trades = [t for t in trade_history if t.get("action") == "closed"]
-        
-        for trade in closed_trades[-20:]:  # Last 20 trades
-            symbol = trade.get("symbol", "")
-            trade_type = trade.get("trade_type", "long").upper()
-            pnl = trade.get("pnl", 0)
-            price = trade.get("price", 0)
-            quantity = trade.get("quantity", 0)
-            timestamp = trade.get("timestamp", "")
-            
-            # Format timestamp
-            if timestamp:
-                try:
-                    if isinstance(timestamp, str):
-                        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    else:
-                        dt = timestamp
-                    timestamp_str = dt.strftime("%m/%d, %I:%M %p")
-                except:
-                    timestamp_str = str(timestamp)
-            else:
-                timestamp_str = ""
-            
+
+        for trade in closed_trades:
+            symbol = trade["symbol"]
+            trade_type = (trade["trade_type"] or "long").upper()
+            pnl = trade["pnl"] or 0
+            price = trade["price"]
+            quantity = trade["quantity"]
+            timestamp_str = format_timestamp(trade["timestamp"], "%m/%d, %I:%M %p")
+
             # PnL color
             pnl_color = "#16A34A" if pnl > 0 else "#DC2626"
             pnl_sign = "+" if pnl >= 0 else ""
-            
+
             trades_md += f"## 🔷 {model_name} completed a **{trade_type.lower()}** trade on {symbol}!\n"
             trades_md += f"*{timestamp_str}*\n\n"
             trades_md += f"**Price:** ${price:,.2f}  \n"
             trades_md += f"**Quantity:** {quantity:.4f}  \n"
             trades_md += f"**NET P&L:** <span style=\"color: {pnl_color}; font-weight: 600;\">{pnl_sign}${pnl:.2f}</span>\n\n"
             trades_md += "---\n\n"
-        
+
         return {
             "title": f"Trade History - {instance_id[:20]}",
             "data": trades_md,
@@ -460,35 +305,21 @@ async def get_instance_positions(instance_id: str) -> Dict[str, Any]:
     Get current positions for a specific instance
     """
     try:
-        instances = get_all_trading_instances()
-        
-        # Find the instance
-        target_instance = None
-        for inst in instances:
-            if inst["instance_id"] == instance_id:
-                target_instance = inst
-                break
-        
-        if not target_instance:
-            raise HTTPException(status_code=404, detail="Instance not found")
-        
-        data = target_instance["data"]
-        config = data.get("config", {})
-        position_history = data.get("position_history", [])
-        
-        # Get latest positions
-        current_positions = position_history[-1:] if position_history else []
-        
+        instance = await get_trading_instance(instance_id)
+        current_positions = await get_trading_state_store().get_positions(
+            instance_id
+        )
+
         # Build markdown table
-        model_name = config.get("agent_model", "unknown")
+        model_name = instance["config"].get("agent_model", "unknown")
         positions_md = f"# Open Positions - {model_name}\n\n"
         positions_md += f"**Instance ID:** `{instance_id}`\n\n"
-        
+
         if not current_positions:
             positions_md += "*No open positions*\n"
         else:
             positions_md += "---\n\n"
-            
+
             for pos in current_positions:
                 symbol = pos.get("symbol", "")
                 trade_type = pos.get("trade_type", "long").upper()
@@ -496,25 +327,14 @@ async def get_instance_positions(instance_id: str) -> Dict[str, Any]:
                 current_price = pos.get("current_price", 0)
                 quantity = pos.get("quantity", 0)
                 unrealized_pnl = pos.get("unrealized_pnl", 0)
-                timestamp = pos.get("timestamp", "")
-                
-                # Format timestamp
-                if timestamp:
-                    try:
-                        if isinstance(timestamp, str):
-                            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                        else:
-                            dt = timestamp
-                        timestamp_str = dt.strftime("%m/%d, %I:%M %p")
-                    except:
-                        timestamp_str = str(timestamp)
-                else:
-                    timestamp_str = ""
-                
+                timestamp_str = format_timestamp(
+                    pos.get("timestamp", ""), "%m/%d, %I:%M %p"
+                )
+
                 # PnL color
                 pnl_color = "#16A34A" if unrealized_pnl > 0 else "#DC2626"
                 pnl_sign = "+" if unrealized_pnl >= 0 else ""
-                
+
                 positions_md += f"## Open Position - {symbol}\n"
                 positions_md += f"*Opened: {timestamp_str}*\n\n"
                 positions_md += f"**Type:** {trade_type}  \n"
@@ -523,7 +343,7 @@ async def get_instance_positions(instance_id: str) -> Dict[str, Any]:
                 positions_md += f"**Quantity:** {quantity:.4f}  \n"
                 positions_md += f"**Unrealized P&L:** <span style=\"color: {pnl_color}; font-weight: 600;\">{pnl_sign}${unrealized_pnl:.2f}</span>\n\n"
                 positions_md += "---\n\n"
-        
+
         return {
             "title": f"Open Positions - {instance_id[:20]}",
             "data": positions_md,
@@ -551,29 +371,19 @@ async def get_instance_decisions(instance_id: str, limit: int = 50) -> Dict[str,
         决策历史数据
     """
     try:
-        instances = get_all_trading_instances()
-        
-        # Find the instance
-        instance_data = None
-        for inst in instances:
-            if inst["instance_id"] == instance_id:
-                instance_data = inst["data"]
-                break
-        
-        if not instance_data:
-            raise HTTPException(status_code=404, detail=f"Instance {instance_id} not found")
-        
-        # Get decision history
-        decision_history = instance_data.get("decision_history", [])
-        
-        # Apply limit and reverse to show latest first
-        limited_history = decision_history[-limit:][::-1] if limit > 0 else decision_history[::-1]
-        
+        store = get_trading_state_store()
+        await get_trading_instance(instance_id)
+
+        # Latest first
+        decisions = await store.get_decisions(
+            instance_id, limit=limit if limit > 0 else None
+        )
+
         return {
             "instance_id": instance_id,
-            "total_decisions": len(decision_history),
-            "returned_decisions": len(limited_history),
-            "decisions": limited_history,
+            "total_decisions": await store.count_decisions(instance_id),
+            "returned_decisions": len(decisions),
+            "decisions": decisions,
         }
     except HTTPException:
         raise
@@ -595,32 +405,16 @@ async def get_decision_detail(instance_id: str, check_number: int) -> Dict[str,
         详细决策数据
     """
     try:
-        instances = get_all_trading_instances()
-        
-        # Find the instance
-        instance_data = None
-        for inst in instances:
-            if inst["instance_id"] == instance_id:
-                instance_data = inst["data"]
-                break
-        
-        if not instance_data:
-            raise HTTPException(status_code=404, detail=f"Instance {instance_id} not found")
-        
-        # Find the specific decision
-        decision_history = instance_data.get("decision_history", [])
-        decision = None
-        for d in decision_history:
-            if d.get("check_number") == check_number:
-                decision = d
-                break
-        
+        store = get_trading_state_store()
+        await get_trading_instance(instance_id)
+
+        decision = await store.get_decision(instance_id, check_number)
         if not decision:
             raise HTTPException(
-                status_code=404, 
+                status_code=404,
                 detail=f"Decision with check_number {check_number} not found for instance {instance_id}"
             )
-        
+
         return {
             "instance_id": instance_id,
             "decision": decision,
@@ -637,20 +431,36 @@ async def get_market_prices() -> Dict[str, Any]:
     """
     获取实时加密货币价格（参考 nof1.ai）
     支持的币种：BTC, ETH, SOL, BNB, DOGE, XRP
-    使用 Binance API，失败时降级到 yfinance
+    优先使用 WebSocket 推送的行情（由交易智能体订阅，接口本身不启动行情流），
+    其次 Binance REST API，失败时降级到 yfinance
     """
     try:
         from valuecell.agents.auto_trading_agent.binance_data import BinanceMarketDataProvider
+        from valuecell.agents.auto_trading_agent.market_stream import (
+            get_market_data_store,
+        )
         
         symbols = ["BTC", "ETH", "SOL", "BNB", "DOGE", "XRP"]
         prices = {}
         binance_provider = BinanceMarketDataProvider()
+        store = get_market_data_store()
         
         for base_symbol in symbols:
             symbol = f"{base_symbol}-USD"  # Convert to standard format
+
+            # Streamed quote (no request needed while the feed is live)
+            quote = store.get_quote(symbol)
+            if quote is not None:
+                prices[base_symbol] = {
+                    "price": quote.price,
+                    "change_pct": quote.change_pct,
+                    "symbol": base_symbol,
+                }
+                continue
+
             try:
                 # Try Binance first
-                ticker_data = binance_provider.get_24h_ticker(symbol)
+                ticker_data = await binance_provider.get_24h_ticker_async(symbol)
                 if ticker_data:
                     prices[base_symbol] = {
                         "price": ticker_data["price"],
@@ -703,3 +513,18 @@ async def get_market_prices() -> Dict[str, Any]:
         logger.error(f"Failed to get market prices: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+
+
+@router.get("/rate-limits")
+async def get_rate_limits() -> Dict[str, Any]:
+    """
+    获取 Binance API 请求权重使用情况（进程内所有 Binance 客户端共享同一个限流器）
+    """
+    from valuecell.agents.auto_trading_agent.rate_limiter import (
+        get_binance_rate_limiter,
+    )
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "binance": get_binance_rate_limiter().get_metrics(),
+    }
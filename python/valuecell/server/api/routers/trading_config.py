@@ -11,6 +11,8 @@ from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 
+from valuecell.agents.auto_trading_agent.trading_store import get_trading_state_store
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/trading/config", tags=["trading-config"])
@@ -140,32 +142,29 @@ async def list_configs() -> List[TradingConfigResponse]:
     
     # Update active instances from trading data
     try:
-        trading_data_path = Path("/tmp/valuecell_trading_data.json")
-        if trading_data_path.exists():
-            with open(trading_data_path, "r") as f:
-                trading_data = json.load(f)
-            
-            # Map instance to config (by matching symbols and models)
-            config_to_instances = {}
-            for instance in trading_data.get("instances", []):
-                inst_config = instance.get("config", {})
-                inst_symbols = set(inst_config.get("crypto_symbols", []))
-                inst_models = inst_config.get("agent_model", "")
-                
-                # Find matching config
-                for cfg in configs:
-                    cfg_symbols = set(cfg.get("crypto_symbols", []))
-                    cfg_models = cfg.get("agent_models", [])
-                    
-                    if inst_symbols == cfg_symbols and inst_models in cfg_models:
-                        cfg_id = cfg["id"]
-                        if cfg_id not in config_to_instances:
-                            config_to_instances[cfg_id] = []
-                        config_to_instances[cfg_id].append(instance.get("instance_id", ""))
-            
-            # Update active instances
+        instances = await get_trading_state_store().list_instances()
+
+        # Map instance to config (by matching symbols and models)
+        config_to_instances = {}
+        for instance in instances:
+            inst_config = instance.get("config", {})
+            inst_symbols = set(inst_config.get("crypto_symbols", []))
+            inst_models = inst_config.get("agent_model", "")
+
+            # Find matching config
             for cfg in configs:
-                cfg["active_instances"] = config_to_instances.get(cfg["id"], [])
+                cfg_symbols = set(cfg.get("crypto_symbols", []))
+                cfg_models = cfg.get("agent_models", [])
+
+                if inst_symbols == cfg_symbols and inst_models in cfg_models:
+                    cfg_id = cfg["id"]
+                    if cfg_id not in config_to_instances:
+                        config_to_instances[cfg_id] = []
+                    config_to_instances[cfg_id].append(instance.get("instance_id", ""))
+
+        # Update active instances
+        for cfg in configs:
+            cfg["active_instances"] = config_to_instances.get(cfg["id"], [])
     except Exception as e:
         logger.debug(f"Failed to update active instances: {e}")
     
@@ -4,7 +4,7 @@ ValueCell Server - Asset Repository
 This module provides database operations for asset management.
 """
 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
@@ -112,6 +112,34 @@ class AssetRepository:
             if not self.db_session:
                 session.close()
 
+    def get_assets_by_symbols(self, symbols: Iterable[str]) -> Dict[str, Asset]:
+        """Get multiple assets by symbol in a single query.
+
+        Args:
+            symbols: Asset symbols/tickers
+
+        Returns:
+            Dictionary mapping symbol to Asset for the symbols that exist
+        """
+        unique_symbols = list(dict.fromkeys(symbols))
+        if not unique_symbols:
+            return {}
+
+        session = self._get_session()
+
+        try:
+            assets = session.query(Asset).filter(Asset.symbol.in_(unique_symbols)).all()
+
+            # Expunge all assets to avoid session issues
+            for asset in assets:
+                session.expunge(asset)
+
+            return {asset.symbol: asset for asset in assets}
+
+        finally:
+            if not self.db_session:
+                session.close()
+
     def get_asset_by_id(self, asset_id: int) -> Optional[Asset]:
         """Get asset by ID.
 
@@ -10,7 +10,9 @@ from typing import Any, Dict, List, Optional
 
 from ....adapters.assets.i18n_integration import get_asset_i18n_service
 from ....adapters.assets.manager import get_adapter_manager, get_watchlist_manager
-from ....adapters.assets.types import AssetSearchQuery, AssetType
+from ....adapters.assets.symbol_index import AssetSymbolIndex
+from ....adapters.assets.types import AssetSearchQuery, AssetType, Exchange
+from ....config.constants import DEFAULT_LANGUAGE
 from ...config.i18n import get_i18n_config
 
 logger = logging.getLogger(__name__)
@@ -25,6 +27,7 @@ class AssetService:
         self.watchlist_manager = get_watchlist_manager()
         self.i18n_service = get_asset_i18n_service()
         self._watchlist_repository = None
+        self._asset_repository = None
 
     @property
     def watchlist_repository(self):
@@ -35,6 +38,76 @@ class AssetService:
             self._watchlist_repository = get_watchlist_repository()
         return self._watchlist_repository
 
+    @property
+    def asset_repository(self):
+        """Lazy load asset repository to avoid circular imports."""
+        if self._asset_repository is None:
+            from ...db.repositories.asset_repository import get_asset_repository
+
+            self._asset_repository = get_asset_repository()
+        return self._asset_repository
+
+    def _get_asset_rows(self, tickers: List[str]) -> Dict[str, Any]:
+        """Load database asset rows for many tickers in one query.
+
+        Args:
+            tickers: Asset tickers in internal format
+
+        Returns:
+            Dictionary mapping ticker to database asset row (missing tickers
+            are omitted)
+        """
+        try:
+            return self.asset_repository.get_assets_by_symbols(tickers)
+        except Exception as e:
+            logger.debug(f"Could not get assets from database: {e}")
+            return {}
+
+    def build_symbol_index(self) -> int:
+        """Populate the adapter manager's symbol index from local data.
+
+        Loads every active asset from the ``assets`` table and merges in the
+        known localized names so searches can be answered without upstream calls.
+
+        Returns:
+            Number of entries added to the index
+        """
+        translations = self.i18n_service.get_known_translations()
+        entries = []
+
+        try:
+            from ...db.repositories.asset_repository import get_asset_repository
+
+            db_assets = get_asset_repository().get_all_assets(is_active=True)
+        except Exception as e:
+            logger.warning(f"Could not load assets for symbol index: {e}")
+            db_assets = []
+
+        for db_asset in db_assets:
+            try:
+                asset_type = AssetType(db_asset.asset_type)
+            except ValueError:
+                asset_type = AssetType.STOCK
+            names = {"en-US": db_asset.name, **translations.pop(db_asset.symbol, {})}
+            entry = AssetSymbolIndex.build_entry(db_asset.symbol, names, asset_type)
+            if entry:
+                entries.append(entry)
+
+        # Translated assets that are not in the database yet
+        for ticker, names in translations.items():
+            asset_type = (
+                AssetType.CRYPTO
+                if ticker.startswith(f"{Exchange.CRYPTO.value}:")
+                else AssetType.STOCK
+            )
+            entry = AssetSymbolIndex.build_entry(ticker, names, asset_type)
+            if entry:
+                entries.append(entry)
+
+        count = self.adapter_manager.symbol_index.add_many(entries)
+        logger.info(f"Loaded {count} local assets into symbol index")
+        return count
+
     def search_assets(
         self,
         query: str,
@@ -201,20 +274,10 @@ class AssetService:
                     "ticker": ticker,
                 }
 
-            # Get asset_type from database to handle formatting correctly
-            asset_type = None
-            try:
-                from ...db.repositories.asset_repository import get_asset_repository
-
-                asset_repo = get_asset_repository()
-                db_asset = asset_repo.get_asset_by_symbol(ticker)
-                if db_asset:
-                    asset_type = db_asset.asset_type
-            except Exception as e:
-                logger.debug(
-                    f"Could not get asset_type from database for {ticker}: {e}"
-                )
-                # If asset not in database, it will be treated as a regular asset with currency
+            # Get asset_type from database to handle formatting correctly.
+            # If asset not in database, it will be treated as a regular asset with currency
+            db_asset = self._get_asset_rows([ticker]).get(ticker)
+            asset_type = db_asset.asset_type if db_asset else None
 
             # Format price data with localization
             formatted_price = {
@@ -269,13 +332,17 @@ class AssetService:
             return {"success": False, "error": str(e), "ticker": ticker}
 
     def get_multiple_prices(
-        self, tickers: List[str], language: Optional[str] = None
+        self,
+        tickers: List[str],
+        language: Optional[str] = None,
+        asset_rows: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Get prices for multiple assets efficiently.
 
         Args:
             tickers: List of asset tickers
             language: Language for localized formatting
+            asset_rows: Database asset rows by ticker, if already loaded
 
         Returns:
             Dictionary containing price data for all tickers
@@ -283,18 +350,12 @@ class AssetService:
         try:
             price_data = self.adapter_manager.get_multiple_prices(tickers)
 
-            # Get asset_types from database for all tickers in batch
-            asset_types = {}
-            try:
-                from ...db.repositories.asset_repository import get_asset_repository
-
-                asset_repo = get_asset_repository()
-                for ticker in tickers:
-                    db_asset = asset_repo.get_asset_by_symbol(ticker)
-                    if db_asset:
-                        asset_types[ticker] = db_asset.asset_type
-            except Exception as e:
-                logger.debug(f"Could not get asset_types from database: {e}")
+            # Get asset_types from database for all tickers in one query
+            if asset_rows is None:
+                asset_rows = self._get_asset_rows(tickers)
+            asset_types = {
+                ticker: db_asset.asset_type for ticker, db_asset in asset_rows.items()
+            }
 
             formatted_prices = {}
 
@@ -579,20 +640,39 @@ class AssetService:
             assets_data = []
             tickers = [item.ticker for item in watchlist.items]
 
+            # Load asset rows once; used for both names and price formatting
+            asset_rows = self._get_asset_rows(tickers)
+
             # Get prices if requested
             prices_data = {}
             if include_prices and tickers:
-                prices_result = self.get_multiple_prices(tickers, language)
+                prices_result = self.get_multiple_prices(
+                    tickers, language, asset_rows=asset_rows
+                )
                 if prices_result["success"]:
                     prices_data = prices_result["prices"]
 
+            # Localize all names in one pass; names already known locally
+            # are stored in the default language and only used for other
+            # languages when no localized name can be found
+            known_names = {
+                ticker: db_asset.name for ticker, db_asset in asset_rows.items()
+            }
+            for item in watchlist.items:
+                if item.display_name and item.ticker not in known_names:
+                    known_names[item.ticker] = item.display_name
+            display_names = self.i18n_service.get_localized_asset_names(
+                tickers,
+                language,
+                fallback_names=known_names,
+                fallback_language=DEFAULT_LANGUAGE,
+            )
+
             # Build asset data
             for item in sorted(watchlist.items, key=lambda x: x.order_index):
                 asset_data = {
                     "ticker": item.ticker,
-                    "display_name": self.i18n_service.get_localized_asset_name(
-                        item.ticker, language
-                    ),
+                    "display_name": display_names[item.ticker],
                     "added_at": item.added_at.isoformat(),
                     "order": item.order_index,
                     "notes": item.notes or "",
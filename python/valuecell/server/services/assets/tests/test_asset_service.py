@@ -0,0 +1,153 @@
+"""
+Unit tests for valuecell.server.services.assets.asset_service module
+"""
+
+import threading
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from valuecell.adapters.assets.i18n_integration import AssetI18nService
+from valuecell.adapters.assets.types import AssetPrice
+from valuecell.server.db.models.base import Base
+from valuecell.server.db.models.watchlist import Watchlist, WatchlistItem
+from valuecell.server.db.repositories.asset_repository import AssetRepository
+from valuecell.server.db.repositories.watchlist_repository import (
+    WatchlistRepository,
+)
+from valuecell.server.services.assets.asset_service import AssetService
+
+
+@pytest.fixture
+def db():
+    """In-memory database with a statement counter."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    session = sessionmaker(bind=engine)()
+    yield session, statements
+    session.close()
+
+
+def _seed(session, size: int) -> None:
+    asset_repo = AssetRepository(session)
+    watchlist = Watchlist(user_id="user-1", name="Main", is_default=True)
+    session.add(watchlist)
+    session.commit()
+    for i in range(size):
+        ticker = f"NASDAQ:T{i:04d}"
+        asset_repo.create_asset(symbol=ticker, name=f"Test {i}", asset_type="stock")
+        session.add(
+            WatchlistItem(watchlist_id=watchlist.id, ticker=ticker, order_index=i)
+        )
+    session.commit()
+
+
+def _service(session) -> AssetService:
+    service = AssetService()
+    service._asset_repository = AssetRepository(session)
+    service._watchlist_repository = WatchlistRepository(session)
+    service.adapter_manager = MagicMock()
+    service.adapter_manager.get_multiple_prices.side_effect = lambda tickers: {
+        ticker: AssetPrice(
+            ticker=ticker,
+            price=Decimal("10"),
+            currency="USD",
+            timestamp=datetime(2024, 1, 1),
+        )
+        for ticker in tickers
+    }
+    service.adapter_manager.get_asset_info.side_effect = AssertionError(
+        "names should not be fetched upstream"
+    )
+    service.i18n_service = AssetI18nService(service.adapter_manager)
+    return service
+
+
+@pytest.mark.parametrize("size", [3, 200])
+def test_get_watchlist_uses_constant_queries(db, size):
+    session, statements = db
+    _seed(session, size)
+    session.expunge_all()
+    service = _service(session)
+
+    statements.clear()
+    result = service.get_watchlist("user-1", language="en-US")
+
+    assert result["success"], result
+    assets = result["watchlist"]["assets"]
+    assert len(assets) == size
+    assert assets[0]["display_name"] == "Test 0"
+    assert assets[-1]["price_data"]["price"] == 10.0
+    # watchlist + items + one bulk asset lookup
+    assert len(statements) == 3
+    service.adapter_manager.get_multiple_prices.assert_called_once()
+    # Database names are already in the requested language
+    service.adapter_manager.get_asset_info.assert_not_called()
+
+
+def test_get_watchlist_prefers_localized_names(db):
+    session, _ = db
+    _seed(session, 2)
+    session.expunge_all()
+    service = _service(session)
+    localized = MagicMock()
+    localized.get_localized_name.return_value = "测试"
+    service.adapter_manager.get_asset_info.side_effect = lambda ticker: (
+        localized if ticker == "NASDAQ:T0000" else None
+    )
+
+    result = service.get_watchlist("user-1", language="zh-Hans")
+
+    assert result["success"], result
+    names = [asset["display_name"] for asset in result["watchlist"]["assets"]]
+    assert names == ["测试", "Test 1"]
+
+
+def test_get_watchlist_looks_up_localized_names_concurrently(db):
+    session, _ = db
+    _seed(session, 3)
+    session.expunge_all()
+    service = _service(session)
+    # Sequential lookups would break the barrier and fall back to DB names
+    barrier = threading.Barrier(3, timeout=5)
+
+    def _asset_info(ticker):
+        barrier.wait()
+        asset = MagicMock()
+        asset.get_localized_name.return_value = f"测试{ticker[-1]}"
+        return asset
+
+    service.adapter_manager.get_asset_info.side_effect = _asset_info
+
+    result = service.get_watchlist("user-1", language="zh-Hans")
+
+    assert result["success"], result
+    names = [asset["display_name"] for asset in result["watchlist"]["assets"]]
+    assert names == ["测试0", "测试1", "测试2"]
+    assert service.adapter_manager.get_asset_info.call_count == 3
+
+
+def test_get_assets_by_symbols(db):
+    session, _ = db
+    _seed(session, 3)
+    repo = AssetRepository(session)
+
+    assets = repo.get_assets_by_symbols(["NASDAQ:T0000", "NASDAQ:T0002", "X:Y"])
+
+    assert set(assets) == {"NASDAQ:T0000", "NASDAQ:T0002"}
+    assert repo.get_assets_by_symbols([]) == {}